@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Skill, Industry, CandidateProfile
+from .models import Skill, Industry, CandidateProfile, CandidateExportJob
 
 
 @admin.register(Skill)
@@ -40,7 +40,7 @@ class CandidateProfileAdmin(admin.ModelAdmin):
         'city',
         'country',
     ]
-    readonly_fields = ['profile_completeness', 'created_at', 'updated_at', 'slug']
+    readonly_fields = ['profile_completeness', 'created_at', 'updated_at', 'slug', 'resume_text']
     filter_horizontal = ['industries']
 
     fieldsets = (
@@ -75,7 +75,7 @@ class CandidateProfileAdmin(admin.ModelAdmin):
             )
         }),
         ('Portfolio & Resume', {
-            'fields': ('portfolio_links', 'resume_url')
+            'fields': ('portfolio_links', 'resume_url', 'resume_text')
         }),
         ('Industries', {
             'fields': ('industries',)
@@ -88,3 +88,11 @@ class CandidateProfileAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(CandidateExportJob)
+class CandidateExportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'requested_by', 'status', 'row_count', 'compress', 'created_at', 'completed_at']
+    list_filter = ['status', 'compress']
+    readonly_fields = ['created_at', 'started_at', 'completed_at']
+    ordering = ['-created_at']
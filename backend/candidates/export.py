@@ -0,0 +1,250 @@
+"""
+Candidate CSV export pipeline.
+
+Streams candidate rows from a server-side cursor in fixed-size chunks. For each
+chunk, industries, experiences and education are loaded with one values() query
+per relation (instead of per candidate), and rows are rendered through a single
+reusable CSV buffer. Used by the streaming CSV endpoint and the background
+export job.
+"""
+import csv
+import io
+import zlib
+from collections import defaultdict
+
+from .models import CandidateProfile, Experience, Education
+
+
+# Number of candidates fetched from the cursor and rendered per batch
+EXPORT_CHUNK_SIZE = 2000
+
+# Max entries shown in the experience / education summary columns
+SUMMARY_LIMIT = 3
+
+EXPORT_HEADERS = [
+    'ID',
+    'Slug',
+    'Full Name',
+    'Email',
+    'Phone',
+    'Professional Title',
+    'Headline',
+    'Seniority',
+    'Years of Experience',
+    'City',
+    'Country',
+    'Location',
+    'Work Preference',
+    'Willing to Relocate',
+    'Preferred Locations',
+    'Salary Min',
+    'Salary Max',
+    'Salary Currency',
+    'Notice Period (Days)',
+    'Has Resume',
+    'Industries',
+    'Experience Count',
+    'Experience Summary',
+    'Education Count',
+    'Education Summary',
+    'Profile Completeness',
+    'Visibility',
+    'Created At',
+    'Updated At',
+]
+
+# Columns read from the candidate cursor (no model instances are built)
+CANDIDATE_EXPORT_FIELDS = (
+    'id',
+    'slug',
+    'user__first_name',
+    'user__last_name',
+    'user__email',
+    'user__phone',
+    'professional_title',
+    'headline',
+    'seniority',
+    'years_of_experience',
+    'city',
+    'city_rel__name',
+    'country',
+    'country_rel__name',
+    'work_preference',
+    'willing_to_relocate',
+    'preferred_locations',
+    'salary_expectation_min',
+    'salary_expectation_max',
+    'salary_currency',
+    'notice_period_days',
+    'resume_url',
+    'profile_completeness',
+    'visibility',
+    'created_at',
+    'updated_at',
+)
+
+
+class CSVRowBuffer:
+    """
+    A csv.writer bound to one in-memory buffer that is drained after each batch,
+    so a whole chunk of rows is encoded with a single write/flush.
+    """
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def render(self, rows):
+        """Write rows to the buffer and return the encoded CSV text."""
+        self._writer.writerows(rows)
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+def iter_candidate_chunks(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield lists of candidate value dicts, reading from a server-side cursor.
+    """
+    chunk = []
+    rows = queryset.values(*CANDIDATE_EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    for values in rows:
+        chunk.append(values)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_related(candidate_ids):
+    """
+    Load industries, experiences and education for a batch of candidates.
+
+    Returns three dicts keyed by candidate id, using one query per relation.
+    """
+    industries = defaultdict(list)
+    through = CandidateProfile.industries.through
+    industry_rows = through.objects.filter(
+        candidateprofile_id__in=candidate_ids
+    ).order_by('industry__name').values_list('candidateprofile_id', 'industry__name')
+    for candidate_id, name in industry_rows:
+        industries[candidate_id].append(name)
+
+    experiences = defaultdict(list)
+    experience_rows = Experience.objects.filter(
+        candidate_id__in=candidate_ids
+    ).values_list('candidate_id', 'job_title', 'company_name', 'is_current')
+    for candidate_id, job_title, company_name, is_current in experience_rows:
+        experiences[candidate_id].append((job_title, company_name, is_current))
+
+    education = defaultdict(list)
+    education_rows = Education.objects.filter(
+        candidate_id__in=candidate_ids
+    ).values_list('candidate_id', 'degree', 'field_of_study', 'institution')
+    for candidate_id, degree, field_of_study, institution in education_rows:
+        education[candidate_id].append((degree, field_of_study, institution))
+
+    return industries, experiences, education
+
+
+def _summarize(entries, formatter):
+    """Format the first few entries and note how many were left out."""
+    summary = '; '.join(formatter(entry) for entry in entries[:SUMMARY_LIMIT])
+    if len(entries) > SUMMARY_LIMIT:
+        summary += f"; +{len(entries) - SUMMARY_LIMIT} more"
+    return summary
+
+
+def _format_experience(entry):
+    job_title, company_name, is_current = entry
+    return f"{job_title} at {company_name}" + (" (Current)" if is_current else "")
+
+
+def _format_education(entry):
+    degree, field_of_study, institution = entry
+    if field_of_study:
+        return f"{degree} in {field_of_study} at {institution}"
+    return f"{degree} at {institution}"
+
+
+def _blank_if_none(value):
+    return value if value is not None else ''
+
+
+def _format_timestamp(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+
+def build_rows(chunk):
+    """Turn a chunk of candidate value dicts into CSV rows."""
+    candidate_ids = [values['id'] for values in chunk]
+    industries, experiences, education = load_related(candidate_ids)
+
+    rows = []
+    for c in chunk:
+        city = c['city'] or c['city_rel__name'] or ''
+        country = c['country'] or c['country_rel__name'] or ''
+        candidate_experiences = experiences.get(c['id'], [])
+        candidate_education = education.get(c['id'], [])
+
+        rows.append([
+            c['id'],
+            c['slug'],
+            f"{c['user__first_name']} {c['user__last_name']}".strip(),
+            c['user__email'],
+            c['user__phone'] or '',
+            c['professional_title'] or '',
+            c['headline'] or '',
+            c['seniority'] or '',
+            _blank_if_none(c['years_of_experience']),
+            city,
+            country,
+            ', '.join(filter(None, [city, country])),
+            c['work_preference'] or '',
+            'Yes' if c['willing_to_relocate'] else 'No',
+            ', '.join(c['preferred_locations'] or []),
+            _blank_if_none(c['salary_expectation_min']),
+            _blank_if_none(c['salary_expectation_max']),
+            c['salary_currency'] or '',
+            _blank_if_none(c['notice_period_days']),
+            'Yes' if c['resume_url'] else 'No',
+            ', '.join(industries.get(c['id'], [])),
+            len(candidate_experiences),
+            _summarize(candidate_experiences, _format_experience),
+            len(candidate_education),
+            _summarize(candidate_education, _format_education),
+            c['profile_completeness'],
+            c['visibility'],
+            _format_timestamp(c['created_at']),
+            _format_timestamp(c['updated_at']),
+        ])
+    return rows
+
+
+def iter_candidate_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE, on_chunk=None):
+    """
+    Yield the export as CSV text: the header row, then one string per chunk.
+
+    on_chunk, if given, is called with the number of candidates in each chunk.
+    """
+    buffer = CSVRowBuffer()
+    yield buffer.render([EXPORT_HEADERS])
+    for chunk in iter_candidate_chunks(queryset, chunk_size):
+        if on_chunk:
+            on_chunk(len(chunk))
+        yield buffer.render(build_rows(chunk))
+
+
+def gzip_stream(text_chunks, encoding='utf-8'):
+    """
+    Compress an iterable of text chunks into a gzip byte stream.
+    """
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for text in text_chunks:
+        data = compressor.compress(text.encode(encoding))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:10
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0012_candidateprofile_onboarding_stage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidateactivity',
+            name='activity_type',
+            field=models.CharField(choices=[('profile_updated', 'Profile Updated'), ('profile_viewed', 'Profile Viewed'), ('job_viewed', 'Job Viewed'), ('logged_in', 'Logged In'), ('resume_uploaded', 'Resume Uploaded'), ('resume_parsed', 'Resume Parsed'), ('experience_added', 'Experience Added'), ('experience_updated', 'Experience Updated'), ('education_added', 'Education Added'), ('education_updated', 'Education Updated'), ('note_added', 'Note Added'), ('call_logged', 'Call Logged')], max_length=30),
+        ),
+        migrations.CreateModel(
+            name='CandidateExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filters', models.JSONField(blank=True, default=dict)),
+                ('compress', models.BooleanField(default=True, help_text='Write the export as a gzip-compressed CSV')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('file', models.FileField(blank=True, null=True, upload_to='exports/candidates/')),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('error_message', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='candidate_export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'candidate_export_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0013_candidate_export_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='resume_text',
+            field=models.TextField(blank=True, help_text='Plain text extracted from the resume, used for search'),
+        ),
+    ]
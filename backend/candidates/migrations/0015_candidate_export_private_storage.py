@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 23:27
+
+import candidates.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0014_candidateprofile_resume_text'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidateexportjob',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=candidates.models.CandidateExportStorage(), upload_to='exports/candidates/'),
+        ),
+    ]
@@ -1,5 +1,9 @@
+import os
+
 from django.db import models
 from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
 from django.utils.text import slugify
 import uuid
 
@@ -252,6 +256,10 @@ class CandidateProfile(models.Model):
         blank=True,
         null=True,
     )
+    resume_text = models.TextField(
+        blank=True,
+        help_text='Plain text extracted from the resume, used for search',
+    )
 
     # Industries (ManyToMany)
     industries = models.ManyToManyField(
@@ -739,3 +747,77 @@ class ProfileSuggestion(models.Model):
 
     def __str__(self):
         return f"Suggestion for {self.candidate} - {self.field_name} ({self.status})"
+
+
+class ExportJobStatus(models.TextChoices):
+    PENDING = 'pending', 'Pending'
+    RUNNING = 'running', 'Running'
+    COMPLETED = 'completed', 'Completed'
+    FAILED = 'failed', 'Failed'
+
+
+@deconstructible
+class CandidateExportStorage(FileSystemStorage):
+    """
+    Private storage for candidate exports, at CANDIDATE_EXPORT_ROOT.
+
+    Files here have no public URL; they are served only by the authenticated
+    export download endpoint.
+    """
+
+    @property
+    def base_location(self):
+        return settings.CANDIDATE_EXPORT_ROOT
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+    def url(self, name):
+        raise ValueError('Candidate exports have no public URL')
+
+
+class CandidateExportJob(models.Model):
+    """
+    Background candidate CSV export, written to private storage.
+    Used for large exports that should not be streamed through a request.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='candidate_export_jobs',
+    )
+
+    # Same query params accepted by the streaming CSV export
+    filters = models.JSONField(default=dict, blank=True)
+    compress = models.BooleanField(
+        default=True,
+        help_text='Write the export as a gzip-compressed CSV',
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=ExportJobStatus.choices,
+        default=ExportJobStatus.PENDING,
+    )
+    file = models.FileField(
+        upload_to='exports/candidates/',
+        storage=CandidateExportStorage(),
+        blank=True,
+        null=True,
+    )
+    row_count = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'candidate_export_jobs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Candidate export {self.id} ({self.status})"
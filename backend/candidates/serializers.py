@@ -1,3 +1,4 @@
+from django.urls import reverse
 from rest_framework import serializers
 from .models import (
     Skill,
@@ -13,6 +14,7 @@ from .models import (
     SkillCategory,
     TechnologyCategory,
     CompanySize,
+    CandidateExportJob,
 )
 from companies.models import City, Country
 from core.serializers import OnboardingStageMinimalSerializer
@@ -902,3 +904,40 @@ class ProfileSuggestionCreateSerializer(serializers.ModelSerializer):
 class ProfileSuggestionDeclineSerializer(serializers.Serializer):
     """Serializer for candidate declining a suggestion."""
     reason = serializers.CharField(required=True, min_length=10)
+
+
+class CandidateExportJobSerializer(serializers.ModelSerializer):
+    """Read serializer for background candidate export jobs."""
+    requested_by_name = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CandidateExportJob
+        fields = [
+            'id',
+            'status',
+            'filters',
+            'compress',
+            'row_count',
+            'error_message',
+            'download_url',
+            'requested_by',
+            'requested_by_name',
+            'created_at',
+            'started_at',
+            'completed_at',
+        ]
+        read_only_fields = fields
+
+    def get_requested_by_name(self, obj):
+        return obj.requested_by.full_name if obj.requested_by else None
+
+    def get_download_url(self, obj):
+        # Served by the authenticated download endpoint, never from public media
+        if not obj.file:
+            return None
+        url = reverse('download-candidate-export-job', args=[obj.id])
+        request = self.context.get('request')
+        if request:
+            return request.build_absolute_uri(url)
+        return url
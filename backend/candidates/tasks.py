@@ -0,0 +1,108 @@
+"""
+Celery tasks for the candidates app.
+
+These tasks handle:
+- Writing large candidate CSV exports to private storage
+- Deleting export files past their retention period
+"""
+
+import logging
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+# Try to import Celery, but make it optional
+try:
+    from celery import shared_task
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+    def shared_task(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="candidates.export_candidates")
+def export_candidates_to_storage(job_id):
+    """
+    Run a CandidateExportJob: stream the filtered candidates into a temporary
+    file (optionally gzip-compressed) and save it to private export storage.
+    """
+    from candidates.export import iter_candidate_csv, gzip_stream
+    from candidates.export_views import filter_candidates
+    from candidates.models import CandidateExportJob, ExportJobStatus
+
+    try:
+        job = CandidateExportJob.objects.get(id=job_id)
+    except CandidateExportJob.DoesNotExist:
+        logger.warning(f"Candidate export job {job_id} not found")
+        return f"Export job {job_id} not found"
+
+    job.status = ExportJobStatus.RUNNING
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+
+    row_count = 0
+
+    def count_rows(count):
+        nonlocal row_count
+        row_count += count
+
+    try:
+        text_chunks = iter_candidate_csv(filter_candidates(job.filters), on_chunk=count_rows)
+        with tempfile.TemporaryFile() as tmp:
+            if job.compress:
+                for data in gzip_stream(text_chunks):
+                    tmp.write(data)
+                filename = f"candidates_export_{job.id}.csv.gz"
+            else:
+                for text in text_chunks:
+                    tmp.write(text.encode('utf-8'))
+                filename = f"candidates_export_{job.id}.csv"
+
+            tmp.seek(0)
+            job.file.save(filename, File(tmp), save=False)
+
+        job.status = ExportJobStatus.COMPLETED
+        job.row_count = row_count
+        job.completed_at = timezone.now()
+        job.save(update_fields=['file', 'status', 'row_count', 'completed_at'])
+    except Exception as e:
+        logger.error(f"Candidate export job {job_id} failed: {e}")
+        job.status = ExportJobStatus.FAILED
+        job.error_message = str(e)
+        job.completed_at = timezone.now()
+        job.save(update_fields=['status', 'error_message', 'completed_at'])
+        return f"Export failed: {e}"
+
+    return f"Exported {row_count} candidates"
+
+
+@shared_task(name="candidates.cleanup_candidate_exports")
+def cleanup_candidate_exports():
+    """
+    Delete export files older than CANDIDATE_EXPORT_RETENTION_DAYS.
+
+    The job rows are kept as a record of who exported what; only the files,
+    which hold candidate contact and salary details, are removed.
+    """
+    from candidates.models import CandidateExportJob
+
+    cutoff = timezone.now() - timedelta(days=settings.CANDIDATE_EXPORT_RETENTION_DAYS)
+    expired = CandidateExportJob.objects.filter(created_at__lt=cutoff).exclude(file='').exclude(file__isnull=True)
+
+    deleted = 0
+    for job in expired.iterator():
+        job.file.delete(save=False)
+        job.save(update_fields=['file'])
+        deleted += 1
+
+    logger.info(f"Deleted {deleted} expired candidate export file(s)")
+    return f"Deleted {deleted} expired export files"
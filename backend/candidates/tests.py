@@ -1,3 +1,162 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User, UserRole
+from .export import EXPORT_HEADERS, iter_candidate_csv
+from .models import CandidateExportJob, CandidateProfile, Education, Experience, ExportJobStatus, Industry
+from .serializers import CandidateExportJobSerializer
+from .tasks import cleanup_candidate_exports, export_candidates_to_storage
+
+TEST_MEDIA_ROOT = tempfile.mkdtemp()
+TEST_EXPORT_ROOT = tempfile.mkdtemp()
+
+
+def read_csv(text):
+    return list(csv.reader(io.StringIO(text)))
+
+
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT, CANDIDATE_EXPORT_ROOT=TEST_EXPORT_ROOT)
+class CandidateExportTests(TestCase):
+    """Tests for the chunked candidate CSV export and the background export job."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(TEST_EXPORT_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.candidates = [
+            self.create_candidate(f'candidate{number}', f'Candidate{number}') for number in range(3)
+        ]
+        first = self.candidates[0]
+        first.industries.add(
+            Industry.objects.create(name='Fintech', slug='fintech'),
+            Industry.objects.create(name='Banking', slug='banking'),
+        )
+        for number in range(4):
+            Experience.objects.create(
+                candidate=first,
+                job_title=f'Engineer {number}',
+                company_name='Acme',
+                start_date=date(2015 + number, 1, 1),
+                is_current=number == 3,
+            )
+        Education.objects.create(
+            candidate=first,
+            institution='University of Cape Town',
+            degree='BSc',
+            field_of_study='Computer Science',
+            start_date=date(2010, 1, 1),
+        )
+
+    def create_user(self, username, role, **kwargs):
+        return User.objects.create_user(
+            username=username,
+            email=f'{username}@example.com',
+            password='password123',
+            role=role,
+            **kwargs,
+        )
+
+    def create_candidate(self, username, first_name):
+        user = self.create_user(username, UserRole.CANDIDATE, first_name=first_name, last_name='Doe')
+        profile, _ = CandidateProfile.objects.get_or_create(user=user)
+        profile.professional_title = 'Engineer'
+        profile.save()
+        return profile
+
+    def test_rows_include_related_summaries(self):
+        rows = read_csv(''.join(iter_candidate_csv(CandidateProfile.objects.order_by('user__username'))))
+
+        self.assertEqual(rows[0], EXPORT_HEADERS)
+        self.assertEqual(len(rows), 4)
+        row = dict(zip(EXPORT_HEADERS, rows[1]))
+        self.assertEqual(row['ID'], str(self.candidates[0].id))
+        self.assertEqual(row['Full Name'], 'Candidate0 Doe')
+        self.assertEqual(row['Email'], 'candidate0@example.com')
+        self.assertEqual(row['Industries'], 'Banking, Fintech')
+        self.assertEqual(row['Experience Count'], '4')
+        self.assertEqual(row['Experience Summary'].count(';'), 3)
+        self.assertTrue(row['Experience Summary'].endswith('; +1 more'))
+        self.assertEqual(row['Education Summary'], 'BSc in Computer Science at University of Cape Town')
+        empty = dict(zip(EXPORT_HEADERS, rows[2]))
+        self.assertEqual((empty['Industries'], empty['Experience Count'], empty['Education Summary']), ('', '0', ''))
+
+    def test_related_data_is_loaded_once_per_chunk(self):
+        queryset = CandidateProfile.objects.order_by('user__username')
+
+        # One candidate query, then industries, experiences and education per chunk
+        with self.assertNumQueries(1 + 3 * 2):
+            chunked = ''.join(iter_candidate_csv(queryset, chunk_size=2))
+        with self.assertNumQueries(1 + 3):
+            whole = ''.join(iter_candidate_csv(queryset, chunk_size=10))
+
+        self.assertEqual(chunked, whole)
+
+    def test_export_job_writes_compressed_csv(self):
+        job = CandidateExportJob.objects.create(compress=True)
+
+        export_candidates_to_storage(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJobStatus.COMPLETED)
+        self.assertEqual(job.row_count, 3)
+        with job.file.open('rb') as f:
+            rows = read_csv(gzip.decompress(f.read()).decode('utf-8'))
+        self.assertEqual(rows[0], EXPORT_HEADERS)
+        self.assertCountEqual([row[0] for row in rows[1:]], [str(candidate.id) for candidate in self.candidates])
+
+    def test_export_file_is_private_and_downloaded_through_the_api(self):
+        recruiter = self.create_user('recruiter', UserRole.RECRUITER)
+        job = CandidateExportJob.objects.create(requested_by=recruiter, compress=False)
+        export_candidates_to_storage(job.id)
+        job.refresh_from_db()
+        url = reverse('download-candidate-export-job', args=[job.id])
+
+        self.assertTrue(job.file.path.startswith(os.path.abspath(TEST_EXPORT_ROOT)))
+        self.assertFalse(job.file.path.startswith(os.path.abspath(settings.MEDIA_ROOT)))
+        self.assertTrue(CandidateExportJobSerializer(job).data['download_url'].endswith(url))
+
+        client = APIClient()
+        self.assertEqual(client.get(url).status_code, 401)
+        client.force_authenticate(self.create_user('other', UserRole.RECRUITER))
+        self.assertEqual(client.get(url).status_code, 403)
+
+        for user in (recruiter, self.create_user('admin', UserRole.ADMIN)):
+            client.force_authenticate(user)
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Cache-Control'], 'private, no-store')
+            rows = read_csv(b''.join(response.streaming_content).decode('utf-8'))
+            self.assertEqual(len(rows), 4)
+
+    @override_settings(CANDIDATE_EXPORT_RETENTION_DAYS=7)
+    def test_cleanup_deletes_files_past_retention(self):
+        old = CandidateExportJob.objects.create()
+        recent = CandidateExportJob.objects.create()
+        for job in (old, recent):
+            export_candidates_to_storage(job.id)
+            job.refresh_from_db()
+        old_path = old.file.path
+        CandidateExportJob.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=8))
+
+        cleanup_candidate_exports()
+
+        old.refresh_from_db()
+        recent.refresh_from_db()
+        self.assertFalse(old.file)
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.exists(recent.file.path))
+        self.assertIsNone(CandidateExportJobSerializer(old).data['download_url'])
@@ -21,6 +21,9 @@ urlpatterns = [
     path('candidates/all/', views.list_all_candidates, name='list-all-candidates'),
     path('candidates/company/', views.list_company_candidates, name='list-company-candidates'),
     path('candidates/export/csv/', export_views.export_candidates_csv, name='export-candidates-csv'),
+    path('candidates/export/jobs/', export_views.create_candidate_export_job, name='create-candidate-export-job'),
+    path('candidates/export/jobs/<uuid:job_id>/', export_views.get_candidate_export_job, name='get-candidate-export-job'),
+    path('candidates/export/jobs/<uuid:job_id>/download/', export_views.download_candidate_export_job, name='download-candidate-export-job'),
     path('candidates/<slug:slug>/', views.get_candidate, name='get-candidate'),
 
     # Experience - CRUD for authenticated candidates
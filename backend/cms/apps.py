@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CmsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cms'
+
+    def ready(self):
+        # Import signals to register them
+        import cms.signals  # noqa: F401
@@ -0,0 +1,87 @@
+"""
+Batched counters for public CMS traffic.
+
+Counts (redirect hits, blog post views) are kept in memory and written by a
+background thread every CMS_HIT_COUNT_FLUSH_SECONDS as one UPDATE, so serving
+a cached page or a redirect never writes to the database on the request path.
+The UPDATE goes through the queryset, so it fires no save signals and doesn't
+invalidate cached content.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from django import db
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, Value, When
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_SECONDS = 30
+
+
+class HitCounter:
+    """
+    In-memory increments of model.field, flushed to the database in batches.
+
+    Rows are identified by key (the primary key by default); filters restrict
+    which rows the flush may update.
+    """
+
+    def __init__(self, model, field: str, key: str = 'id', filters: Optional[dict] = None):
+        self.model = model
+        self.field = field
+        self.key = key
+        self.filters = filters or {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def record(self, key_value: str) -> None:
+        with self._lock:
+            self._counts[key_value] = self._counts.get(key_value, 0) + 1
+            if self._thread is None:
+                self._start()
+
+    def flush(self) -> int:
+        """Write pending counts in one UPDATE. Returns the number of hits written."""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if not counts:
+            return 0
+
+        try:
+            self.model.objects.filter(**{f'{self.key}__in': counts}, **self.filters).update(**{
+                self.field: F(self.field) + Case(
+                    *[When(**{self.key: key_value}, then=Value(count)) for key_value, count in counts.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            })
+        except Exception as e:
+            # Don't lose the hits if the database is briefly unavailable
+            logger.warning(f"Failed to flush {self.model.__name__}.{self.field} counts: {e}")
+            with self._lock:
+                for key_value, count in counts.items():
+                    self._counts[key_value] = self._counts.get(key_value, 0) + count
+            return 0
+        return sum(counts.values())
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name=f'{self.model.__name__.lower()}-{self.field}-flush', daemon=True,
+        )
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self) -> None:
+        interval = getattr(settings, 'CMS_HIT_COUNT_FLUSH_SECONDS', DEFAULT_FLUSH_SECONDS)
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            finally:
+                db.connection.close()
@@ -0,0 +1,32 @@
+"""
+Management command to generate sitemap files in storage.
+
+Usage:
+    python manage.py generate_sitemaps                # All sitemap types
+    python manage.py generate_sitemaps job candidate  # Only the given types
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cms.sitemaps import SITEMAP_TYPES, regenerate_sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Generate sitemap files in storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'types',
+            nargs='*',
+            help=f'Sitemap types to regenerate ({", ".join(SITEMAP_TYPES)}); all if omitted',
+        )
+
+    def handle(self, *args, **options):
+        unknown = [t for t in options['types'] if t not in SITEMAP_TYPES]
+        if unknown:
+            raise CommandError(f'Unknown sitemap types: {", ".join(unknown)}')
+
+        manifest = regenerate_sitemaps(options['types'] or None)
+        for sitemap_type, entry in manifest['types'].items():
+            self.stdout.write(f'{sitemap_type}: {len(entry["chunks"])} chunk(s)')
+        self.stdout.write(self.style.SUCCESS('Sitemaps generated'))
@@ -0,0 +1,108 @@
+"""
+In-process PageSEO path resolution for the public page-seo endpoint.
+
+Active PageSEO entries are compiled once per process into a PageSEOResolver:
+exact paths in a dict and wildcard paths (e.g. /jobs/*) in a character trie,
+so a lookup is O(path length) and needs no queries. The resolver holds each
+entry's serialized public payload, and is rebuilt when the PageSEO version in
+the cache is bumped (bump_version(), called whenever PageSEO rows change), and
+in any case once it is ENTRIES_TIMEOUT old, since with the default
+per-process cache other workers never see the bump.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+
+from .models import PageSEO
+from .serializers import PageSEOPublicSerializer
+
+VERSION_KEY = 'cms_page_seo_version'
+ENTRIES_KEY = 'cms_page_seo:{version}'
+ENTRIES_TIMEOUT = 300  # 5 minutes
+
+# Marks a trie node where a wildcard pattern ends
+_ENTRY = ''
+
+
+class PageSEOResolver:
+    """Finds the PageSEO payload for a path: exact match first, then the longest wildcard prefix."""
+
+    def __init__(self, entries: List[dict]):
+        self.exact: Dict[str, dict] = {}
+        self.trie: dict = {}
+        for entry in entries:
+            path = entry['path']
+            self.exact[path] = entry
+            if path.endswith('*'):
+                # Convert /jobs/* to /jobs/ for prefix matching
+                node = self.trie
+                for char in path.rstrip('*'):
+                    node = node.setdefault(char, {})
+                # Entries arrive ordered by -path, so '/jobs**' wins over '/jobs*'
+                node.setdefault(_ENTRY, entry)
+
+    def resolve(self, path: str) -> Optional[dict]:
+        entry = self.exact.get(path)
+        if entry is not None:
+            return entry
+
+        node = self.trie
+        found = node.get(_ENTRY)
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(_ENTRY, found)
+        return found
+
+
+def _load_entries() -> List[dict]:
+    pages = PageSEO.objects.filter(is_active=True).order_by('-path')
+    return list(PageSEOPublicSerializer(pages, many=True).data)
+
+
+_resolver: Optional[PageSEOResolver] = None
+_resolver_version = object()
+_resolver_built_at = 0.0
+_resolver_lock = threading.Lock()
+
+
+def _resolver_fresh(version) -> bool:
+    return (
+        _resolver is not None
+        and version == _resolver_version
+        and time.monotonic() - _resolver_built_at < ENTRIES_TIMEOUT
+    )
+
+
+def get_resolver() -> PageSEOResolver:
+    """The process-local resolver, rebuilt if the PageSEO version changed or it expired."""
+    global _resolver, _resolver_version, _resolver_built_at
+    version = cache.get(VERSION_KEY)
+    if _resolver_fresh(version):
+        return _resolver
+
+    with _resolver_lock:
+        if not _resolver_fresh(version):
+            entries_key = ENTRIES_KEY.format(version=version)
+            # An expired resolver reloads from the database: the cached entries
+            # for an unchanged version may be as old as the resolver itself
+            entries = cache.get(entries_key) if version != _resolver_version else None
+            if entries is None:
+                entries = _load_entries()
+                cache.set(entries_key, entries, ENTRIES_TIMEOUT)
+            _resolver = PageSEOResolver(entries)
+            _resolver_version = version
+            _resolver_built_at = time.monotonic()
+    return _resolver
+
+
+def bump_version() -> None:
+    """Invalidate resolvers in every process after PageSEO entries change."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
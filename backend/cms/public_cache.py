@@ -0,0 +1,120 @@
+"""
+Versioned read-through cache for public CMS endpoints.
+
+Wrapping a public view in @public_cache(Model, ...) caches its rendered
+response per endpoint, host and query string. Each model listed has a version
+number in the cache, bumped by post_save/post_delete signals (see
+cms.signals), and the versions are part of the cache key: a content change
+makes every dependent response miss once, with nothing to delete.
+
+Anonymous requests that hit the cache are answered without touching the
+database or running DRF's request handling, and carry an ETag so clients can
+revalidate with If-None-Match and get a 304. Requests with an Authorization
+header (e.g. staff previews) always go to the view.
+"""
+
+import functools
+import hashlib
+import time
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+VERSION_KEY = 'cms_public_version:{label}'
+RESPONSE_KEY = 'cms_public:{view}:{versions}:{request}'
+
+DEFAULT_TIMEOUT = 300  # 5 minutes
+DEFAULT_MAX_AGE = 60  # 1 minute
+
+# Not-found responses are cached too, so probing missing slugs stays off the database
+CACHEABLE_STATUSES = (200, 404)
+
+
+def _version_key(model) -> str:
+    return VERSION_KEY.format(label=model._meta.label_lower)
+
+
+def get_versions(models) -> str:
+    """Current content version of each model, joined for use in a cache key."""
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Start from a timestamp rather than 0, so a version evicted from
+            # the cache can't come back as a number older responses used
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return '.'.join(str(versions[key]) for key in keys)
+
+
+def bump_version(model) -> None:
+    """Invalidate cached responses that depend on model."""
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def _request_key(request) -> str:
+    query = sorted(
+        (name, value) for name, values in request.GET.lists() for value in values
+    )
+    raw = f'{request.get_host()}|{request.path}|{query}'
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def public_cache(*models, on_request: Optional[Callable] = None):
+    """
+    Cache a public view's responses until any of models changes.
+
+    Apply outside @api_view. on_request(request, *args, **kwargs), if given,
+    runs for every request, cached or not (e.g. to count views).
+    """
+    def decorator(view):
+        view_name = f'{view.__module__}.{view.__name__}'
+
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if on_request is not None:
+                on_request(request, *args, **kwargs)
+
+            if request.method not in ('GET', 'HEAD') or 'HTTP_AUTHORIZATION' in request.META:
+                return view(request, *args, **kwargs)
+
+            key = RESPONSE_KEY.format(
+                view=view_name, versions=get_versions(models), request=_request_key(request),
+            )
+            cached = cache.get(key)
+            if cached is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code not in CACHEABLE_STATUSES or response.streaming:
+                    return response
+                if hasattr(response, 'render'):
+                    response.render()
+                cached = {
+                    'status': response.status_code,
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                    'etag': f'"{hashlib.md5(response.content).hexdigest()}"',
+                }
+                cache.set(key, cached, getattr(settings, 'CMS_PUBLIC_CACHE_TIMEOUT', DEFAULT_TIMEOUT))
+
+            response = None
+            if cached['status'] == 200:
+                response = get_conditional_response(request, etag=cached['etag'])
+            if response is None:
+                response = HttpResponse(
+                    cached['content'], status=cached['status'], content_type=cached['content_type'],
+                )
+            response['ETag'] = cached['etag']
+            max_age = getattr(settings, 'CMS_PUBLIC_CACHE_MAX_AGE', DEFAULT_MAX_AGE)
+            response['Cache-Control'] = f'public, max-age={max_age}'
+            patch_vary_headers(response, ('Authorization',))
+            return response
+
+        return wrapped
+    return decorator
@@ -0,0 +1,152 @@
+"""
+Compiled redirect matching and batched hit counting for RedirectMiddleware.
+
+Active redirects are compiled once per process into a RedirectMatcher: exact
+sources in a dict, regex sources precompiled and combined into a single
+alternation so one match call finds the first matching rule. The matcher is
+rebuilt when the redirect version in the cache is bumped (bump_version(),
+called whenever redirects change), and in any case once it is RULES_TIMEOUT
+old: with the default per-process cache a bump in one worker never reaches
+the others, so the age limit bounds how long they serve stale rules.
+
+Hits are counted in memory by a HitCounter (see cms.counters) and written in
+batches, so serving a redirect never writes to the database on the request
+path.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+
+from .counters import HitCounter
+from .models import Redirect
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'cms_redirects_version'
+RULES_KEY = 'cms_redirects:{version}'
+RULES_TIMEOUT = 300  # 5 minutes
+
+# Patterns that refer to their own groups by number or name can't be merged
+# into one alternation, where every rule's groups share the numbering
+_BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+
+class RedirectMatcher:
+    """Finds the redirect for a path: exact sources first, then regex sources in order."""
+
+    def __init__(self, rules: List[dict]):
+        self.exact: Dict[str, dict] = {}
+        self.patterns = []
+        for rule in rules:
+            if not rule['is_regex']:
+                self.exact.setdefault(rule['source'], rule)
+                continue
+            try:
+                self.patterns.append((re.compile(rule['source']), rule))
+            except re.error:
+                # Invalid regex, skip
+                logger.warning(f"Skipping invalid redirect pattern: {rule['source']}")
+
+        self.combined = None
+        if self.patterns and not any(_BACKREFERENCE.search(rule['source']) for _, rule in self.patterns):
+            try:
+                self.combined = re.compile('|'.join(
+                    f'(?P<r{index}>{pattern.pattern})' for index, (pattern, _) in enumerate(self.patterns)
+                ))
+            except re.error:
+                # e.g. two rules defining the same named group
+                self.combined = None
+
+    def match(self, path: str) -> Optional[dict]:
+        rule = self.exact.get(path)
+        if rule is not None:
+            return rule
+
+        if self.combined is not None:
+            found = self.combined.match(path)
+            if not found:
+                return None
+            # The leftmost alternative that matched is the first matching rule
+            index = next(
+                index for index in range(len(self.patterns))
+                if found.group(f'r{index}') is not None
+            )
+            candidates = [self.patterns[index]]
+        else:
+            candidates = self.patterns
+
+        for pattern, rule in candidates:
+            if pattern.match(path):
+                return {
+                    'id': rule['id'],
+                    'destination': pattern.sub(rule['destination'], path),
+                    'type': rule['type'],
+                }
+        return None
+
+
+def _load_rules() -> List[dict]:
+    return [
+        {
+            'id': str(r['id']),
+            'source': r['source_path'],
+            'destination': r['destination_url'],
+            'type': r['redirect_type'],
+            'is_regex': r['is_regex'],
+        }
+        for r in Redirect.objects.filter(is_active=True).values(
+            'id', 'source_path', 'destination_url', 'redirect_type', 'is_regex'
+        )
+    ]
+
+
+_matcher: Optional[RedirectMatcher] = None
+_matcher_version = object()
+_matcher_built_at = 0.0
+_matcher_lock = threading.Lock()
+
+
+def _matcher_fresh(version) -> bool:
+    return (
+        _matcher is not None
+        and version == _matcher_version
+        and time.monotonic() - _matcher_built_at < RULES_TIMEOUT
+    )
+
+
+def get_matcher() -> RedirectMatcher:
+    """The process-local matcher, rebuilt if the redirect version changed or it expired."""
+    global _matcher, _matcher_version, _matcher_built_at
+    version = cache.get(VERSION_KEY)
+    if _matcher_fresh(version):
+        return _matcher
+
+    with _matcher_lock:
+        if not _matcher_fresh(version):
+            rules_key = RULES_KEY.format(version=version)
+            # An expired matcher reloads from the database: the cached rules
+            # for an unchanged version may be as old as the matcher itself
+            rules = cache.get(rules_key) if version != _matcher_version else None
+            if rules is None:
+                rules = _load_rules()
+                cache.set(rules_key, rules, RULES_TIMEOUT)
+            _matcher = RedirectMatcher(rules)
+            _matcher_version = version
+            _matcher_built_at = time.monotonic()
+    return _matcher
+
+
+def bump_version() -> None:
+    """Invalidate compiled matchers in every process after redirects change."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+hit_counter = HitCounter(Redirect, 'hit_count')
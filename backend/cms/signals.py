@@ -0,0 +1,104 @@
+"""
+Django signals for the cms app.
+
+- Invalidates compiled redirect matchers when redirects change
+- Invalidates PageSEO path resolvers when PageSEO entries change
+- Bumps public content versions so cached public responses are rebuilt
+- Queues sitemap regeneration when listed content is published, unpublished,
+  edited or deleted
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from branding.models import BrandingSettings
+
+from . import page_seo, public_cache, redirects
+from .models import (
+    BlogPost, FAQ, FAQCategory, GlossaryTerm, MetaTagDefaults, Page, PageSEO,
+    PricingConfig, Redirect, SiteSettings,
+)
+from .sitemaps import SITEMAP_SOURCES, is_listed, schedule_regeneration
+
+
+@receiver(post_save, sender=Redirect)
+@receiver(post_delete, sender=Redirect)
+def invalidate_redirects(sender, **kwargs):
+    """Rebuild redirect matchers after any redirect is saved or deleted."""
+    redirects.bump_version()
+
+
+@receiver(post_save, sender=PageSEO)
+@receiver(post_delete, sender=PageSEO)
+def invalidate_page_seo(sender, **kwargs):
+    """Rebuild PageSEO resolvers after any entry is saved or deleted."""
+    page_seo.bump_version()
+
+
+# Models whose content is served by @public_cache views
+PUBLIC_CONTENT_MODELS = [
+    BlogPost, Page, FAQ, FAQCategory, GlossaryTerm, PricingConfig,
+    MetaTagDefaults, BrandingSettings, SiteSettings,
+]
+
+
+def invalidate_public_content(sender, **kwargs):
+    """Rebuild cached public responses that depend on the changed model."""
+    public_cache.bump_version(sender)
+
+
+def invalidate_public_content_m2m(sender, instance, action, model, **kwargs):
+    """Related FAQs and terms are part of blog post and glossary responses."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        public_cache.bump_version(type(instance))
+        public_cache.bump_version(model)
+
+
+for model in PUBLIC_CONTENT_MODELS:
+    uid = f'cms_public_content_{model._meta.label_lower}'
+    post_save.connect(invalidate_public_content, sender=model, dispatch_uid=uid)
+    post_delete.connect(invalidate_public_content, sender=model, dispatch_uid=uid)
+
+for through in (BlogPost.faqs.through, GlossaryTerm.faqs.through, GlossaryTerm.related_terms.through):
+    m2m_changed.connect(
+        invalidate_public_content_m2m, sender=through,
+        dispatch_uid=f'cms_public_content_{through._meta.label_lower}',
+    )
+
+
+def _sitemap_pre_save(sitemap_type, listed):
+    def handler(sender, instance, **kwargs):
+        # Only look up the stored row when the save could be an unpublish
+        instance._sitemap_was_listed = (
+            not instance._state.adding
+            and not is_listed(instance, listed)
+            and sender.objects.filter(pk=instance.pk, **listed).exists()
+        )
+    return handler
+
+
+def _sitemap_post_save(sitemap_type, listed):
+    def handler(sender, instance, **kwargs):
+        if is_listed(instance, listed) or getattr(instance, '_sitemap_was_listed', False):
+            schedule_regeneration([sitemap_type])
+    return handler
+
+
+def _sitemap_post_delete(sitemap_type, listed):
+    def handler(sender, instance, **kwargs):
+        if is_listed(instance, listed):
+            schedule_regeneration([sitemap_type])
+    return handler
+
+
+for model, sitemap_type, listed in SITEMAP_SOURCES:
+    uid = f'cms_sitemap_{model._meta.label_lower}'
+    pre_save.connect(_sitemap_pre_save(sitemap_type, listed), sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(_sitemap_post_save(sitemap_type, listed), sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(_sitemap_post_delete(sitemap_type, listed), sender=model, weak=False, dispatch_uid=uid)
+
+
+@receiver(post_save, sender=SiteSettings)
+def regenerate_sitemaps_on_settings_change(sender, instance, **kwargs):
+    """Sitemap toggles and the site URL affect every sitemap type."""
+    schedule_regeneration(None)
@@ -0,0 +1,584 @@
+"""
+Pre-generated sitemap files.
+
+Sitemaps are written to storage by a background task rather than built on
+every crawler request. Each content type is split into numbered chunks of at
+most CMS_SITEMAP_CHUNK_SIZE URLs (candidate-sitemap-1.xml,
+candidate-sitemap-2.xml, ...), each with a gzip variant, and listed in
+sitemap_index.xml. manifest.json records the ETag and Last-Modified of every
+file so the views can answer conditional requests without touching the
+database.
+
+Regeneration is incremental:
+- Signals mark a content type dirty when a listed row is saved or deleted,
+  and a debounced task rebuilds only the dirty types
+- Rows are chunked in primary key order, so an edit only changes the chunk
+  containing it; chunks whose bytes didn't change keep their file, ETag and
+  Last-Modified
+- A periodic full run catches changes no signal sees (e.g. job deadlines
+  passing)
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from html import escape as html_escape
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings as django_settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from cms.models import Page, BlogPost, GlossaryTerm, CaseStudy, SiteSettings, PageSEO
+from jobs.models import Job
+from candidates.models import CandidateProfile
+from companies.models import Company
+
+logger = logging.getLogger(__name__)
+
+# Protocol limit is 50,000 URLs (and 50MB uncompressed) per sitemap file
+DEFAULT_CHUNK_SIZE = 50000
+DEFAULT_STORAGE_DIR = 'sitemaps'
+
+INDEX_FILENAME = 'sitemap_index.xml'
+MANIFEST_FILENAME = 'manifest.json'
+
+MANIFEST_CACHE_KEY = 'cms_sitemap_manifest'
+MANIFEST_CACHE_TIMEOUT = 60  # 1 minute
+
+# Saves within this window are folded into one regeneration per type
+DEFAULT_DEBOUNCE_SECONDS = 60
+PENDING_KEY = 'cms_sitemap_pending:{sitemap_type}'
+
+# Sitemap types, in index order
+SITEMAP_TYPES = [
+    'page',       # Static pages + CMS pages
+    'post',       # Blog posts
+    'job',        # Job listings
+    'candidate',  # Public candidate profiles
+    'company',    # Company profiles
+    'glossary',   # Glossary terms
+    'case-study', # Case studies
+]
+
+
+def get_sitemap_settings():
+    """Get sitemap settings from SiteSettings."""
+    settings = SiteSettings.objects.first()
+    if not settings:
+        settings = SiteSettings.objects.create()
+    return settings
+
+
+def escape_xml(text: str) -> str:
+    """Escape special characters for XML."""
+    if not text:
+        return text
+    return html_escape(text, quote=True)
+
+
+def format_lastmod(dt) -> str:
+    """Format datetime for sitemap lastmod field (ISO 8601 with timezone)."""
+    if dt is None:
+        return None
+    # Format as ISO 8601 with timezone: 2025-12-02T11:09:02+00:00
+    return dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+
+
+def make_absolute_url(relative_url: str, base_url: str) -> str:
+    """Convert a relative URL to absolute URL."""
+    if not relative_url:
+        return None
+    if relative_url.startswith('http://') or relative_url.startswith('https://'):
+        return relative_url
+    if relative_url.startswith('/'):
+        return f"{base_url}{relative_url}"
+    return f"{base_url}/{relative_url}"
+
+
+def get_base_url(settings) -> str:
+    """Get the base URL for sitemaps."""
+    base_url = (settings.site_url or django_settings.SITE_URL).rstrip('/')
+    if '/api/' in base_url:
+        base_url = base_url.split('/api/')[0]
+    return base_url
+
+
+# =============================================================================
+# URL collectors for each sitemap type
+# =============================================================================
+#
+# Collectors yield URLs in primary key order so chunk boundaries stay stable
+# between runs and an edited row only changes the chunk it falls in.
+
+ITERATOR_CHUNK_SIZE = 2000
+
+
+def collect_pages_urls(base_url: str, settings) -> Iterator[dict]:
+    """Collect static pages (from PageSEO) and CMS legal pages."""
+    # Get static/app pages from PageSEO entries (configurable from CMS)
+    # Only include pages marked as include_in_sitemap, active, and not noindex
+    # Exclude wildcard patterns (e.g., /jobs/*) as those are covered by specific sitemaps
+    page_seo_entries = PageSEO.objects.filter(
+        is_active=True,
+        include_in_sitemap=True,
+        noindex=False,
+    ).exclude(
+        path__endswith='*'  # Exclude wildcards - those are for SEO meta only
+    ).only('path', 'updated_at').order_by('pk')
+
+    for entry in page_seo_entries.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        # Normalize path (ensure it starts with /)
+        path = entry.path if entry.path.startswith('/') else f'/{entry.path}'
+        yield {
+            'loc': f"{base_url}{path}",
+            'lastmod': format_lastmod(entry.updated_at),
+        }
+
+    # CMS Legal Pages - served at root level (e.g., /privacy-policy not /pages/privacy-policy)
+    if settings.sitemap_include_pages:
+        pages = Page.objects.filter(status='published').only('slug', 'updated_at').order_by('pk')
+        for page in pages.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+            yield {
+                'loc': f"{base_url}/{page.slug}",
+                'lastmod': format_lastmod(page.updated_at),
+            }
+
+
+def collect_blog_urls(base_url: str, settings) -> Iterator[dict]:
+    """Collect blog post URLs with images."""
+    posts = BlogPost.objects.filter(
+        status='published'
+    ).only('slug', 'updated_at', 'featured_image', 'title').order_by('pk')
+
+    for post in posts.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        url_entry = {
+            'loc': f"{base_url}/blog/{post.slug}",
+            'lastmod': format_lastmod(post.updated_at),
+        }
+        if post.featured_image:
+            image_url = post.featured_image.url if hasattr(post.featured_image, 'url') else str(post.featured_image)
+            url_entry['images'] = [{
+                'loc': make_absolute_url(image_url, base_url),
+                'title': post.title,
+            }]
+        yield url_entry
+
+
+def collect_jobs_urls(base_url: str, settings) -> Iterator[dict]:
+    """Collect active job listing URLs."""
+    # Include jobs that are published AND either:
+    # - Have no deadline (open indefinitely), OR
+    # - Have a future deadline
+    jobs = Job.objects.filter(
+        status='published'
+    ).filter(
+        Q(application_deadline__isnull=True) | Q(application_deadline__gte=timezone.now())
+    ).only('slug', 'updated_at').order_by('pk')
+
+    for job in jobs.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield {
+            'loc': f"{base_url}/jobs/{job.slug}",
+            'lastmod': format_lastmod(job.updated_at),
+        }
+
+
+def collect_candidates_urls(base_url: str, settings) -> Iterator[dict]:
+    """Collect public candidate profile URLs."""
+    candidates = CandidateProfile.objects.filter(
+        visibility='public_sanitised'
+    ).only('slug', 'updated_at').order_by('pk')
+
+    for candidate in candidates.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield {
+            'loc': f"{base_url}/candidates/{candidate.slug}",
+            'lastmod': format_lastmod(candidate.updated_at),
+        }
+
+
+def collect_companies_urls(base_url: str, settings) -> Iterator[dict]:
+    """Collect company profile URLs with logos."""
+    companies = Company.objects.filter(
+        is_published=True
+    ).only('slug', 'updated_at', 'logo', 'name').order_by('pk')
+
+    for company in companies.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        url_entry = {
+            'loc': f"{base_url}/companies/{company.slug}",
+            'lastmod': format_lastmod(company.updated_at),
+        }
+        if company.logo:
+            logo_url = company.logo.url if hasattr(company.logo, 'url') else str(company.logo)
+            url_entry['images'] = [{
+                'loc': make_absolute_url(logo_url, base_url),
+                'title': f"{company.name} logo",
+            }]
+        yield url_entry
+
+
+def collect_glossary_urls(base_url: str, settings) -> Iterator[dict]:
+    """Collect glossary term URLs."""
+    terms = GlossaryTerm.objects.filter(is_active=True).only('slug', 'updated_at').order_by('pk')
+
+    for term in terms.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield {
+            'loc': f"{base_url}/glossary/{term.slug}",
+            'lastmod': format_lastmod(term.updated_at),
+        }
+
+
+def collect_case_studies_urls(base_url: str, settings) -> Iterator[dict]:
+    """Collect case study URLs."""
+    studies = CaseStudy.objects.filter(status='published').only('slug', 'updated_at').order_by('pk')
+
+    for study in studies.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield {
+            'loc': f"{base_url}/case-studies/{study.slug}",
+            'lastmod': format_lastmod(study.updated_at),
+        }
+
+
+# Map sitemap types to their collectors
+SITEMAP_COLLECTORS = {
+    'page': collect_pages_urls,
+    'post': collect_blog_urls,
+    'job': collect_jobs_urls,
+    'candidate': collect_candidates_urls,
+    'company': collect_companies_urls,
+    'glossary': collect_glossary_urls,
+    'case-study': collect_case_studies_urls,
+}
+
+# Models whose rows appear in each sitemap type, with the field values that
+# make a row listed. Used by signals to decide which types to regenerate.
+SITEMAP_SOURCES = [
+    (PageSEO, 'page', {'is_active': True, 'include_in_sitemap': True, 'noindex': False}),
+    (Page, 'page', {'status': 'published'}),
+    (BlogPost, 'post', {'status': 'published'}),
+    (Job, 'job', {'status': 'published'}),
+    (CandidateProfile, 'candidate', {'visibility': 'public_sanitised'}),
+    (Company, 'company', {'is_published': True}),
+    (GlossaryTerm, 'glossary', {'is_active': True}),
+    (CaseStudy, 'case-study', {'status': 'published'}),
+]
+
+
+def is_sitemap_enabled(sitemap_type: str, settings) -> bool:
+    """Check if a sitemap type is enabled."""
+    if sitemap_type == 'page':
+        return True  # Always include static pages
+    elif sitemap_type == 'post':
+        return settings.sitemap_include_blog
+    elif sitemap_type == 'job':
+        return settings.sitemap_include_jobs
+    elif sitemap_type == 'candidate':
+        return settings.sitemap_include_candidates
+    elif sitemap_type == 'company':
+        return settings.sitemap_include_companies
+    elif sitemap_type == 'glossary':
+        return settings.sitemap_include_glossary
+    elif sitemap_type == 'case-study':
+        return settings.sitemap_include_case_studies
+    return False
+
+
+# =============================================================================
+# XML generators
+# =============================================================================
+
+def generate_sitemap_xml(urls: list, base_url: str) -> str:
+    """Generate XML sitemap from URL list (Yoast-style format)."""
+    has_images = any('images' in url for url in urls)
+
+    # XML declaration with XSL stylesheet
+    xml_parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<?xml-stylesheet type="text/xsl" href="{base_url}/sitemap.xsl"?>',
+    ]
+
+    # Urlset with namespaces and schema locations
+    if has_images:
+        xml_parts.append(
+            '<urlset xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1" '
+            'xsi:schemaLocation="http://www.sitemaps.org/schemas/sitemap/0.9 '
+            'http://www.sitemaps.org/schemas/sitemap/0.9/sitemap.xsd '
+            'http://www.google.com/schemas/sitemap-image/1.1 '
+            'http://www.google.com/schemas/sitemap-image/1.1/sitemap-image.xsd" '
+            'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        )
+    else:
+        xml_parts.append(
+            '<urlset xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            'xsi:schemaLocation="http://www.sitemaps.org/schemas/sitemap/0.9 '
+            'http://www.sitemaps.org/schemas/sitemap/0.9/sitemap.xsd" '
+            'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        )
+
+    for url in urls:
+        xml_parts.append('\t<url>')
+        xml_parts.append(f'\t\t<loc>{escape_xml(url["loc"])}</loc>')
+
+        if url.get('lastmod'):
+            xml_parts.append(f'\t\t<lastmod>{url["lastmod"]}</lastmod>')
+
+        for image in url.get('images', []):
+            xml_parts.append('\t\t<image:image>')
+            xml_parts.append(f'\t\t\t<image:loc>{escape_xml(image["loc"])}</image:loc>')
+            xml_parts.append('\t\t</image:image>')
+
+        xml_parts.append('\t</url>')
+
+    xml_parts.append('</urlset>')
+    return '\n'.join(xml_parts)
+
+
+def generate_sitemap_index_xml(sitemaps: list, base_url: str) -> str:
+    """Generate sitemap index XML (Yoast-style format)."""
+    xml_parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<?xml-stylesheet type="text/xsl" href="{base_url}/sitemap.xsl"?>',
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+
+    for sitemap in sitemaps:
+        xml_parts.append('\t<sitemap>')
+        xml_parts.append(f'\t\t<loc>{escape_xml(sitemap["loc"])}</loc>')
+        if sitemap.get('lastmod'):
+            xml_parts.append(f'\t\t<lastmod>{sitemap["lastmod"]}</lastmod>')
+        xml_parts.append('\t</sitemap>')
+
+    xml_parts.append('</sitemapindex>')
+    return '\n'.join(xml_parts)
+
+
+# =============================================================================
+# Storage
+# =============================================================================
+
+def chunk_filename(sitemap_type: str, chunk: int) -> str:
+    return f'{sitemap_type}-sitemap-{chunk}.xml'
+
+
+def storage_path(filename: str) -> str:
+    storage_dir = getattr(django_settings, 'CMS_SITEMAP_STORAGE_DIR', DEFAULT_STORAGE_DIR)
+    return f'{storage_dir}/{filename}'
+
+
+def gzip_etag(etag: str) -> str:
+    """ETag of the gzip variant of a file with the given ETag."""
+    return f'{etag[:-1]}-gzip"'
+
+
+def _empty_manifest() -> dict:
+    return {'enabled': True, 'base_url': None, 'generated_at': None, 'types': {}, 'files': {}}
+
+
+def _read_manifest() -> Optional[dict]:
+    path = storage_path(MANIFEST_FILENAME)
+    if not default_storage.exists(path):
+        return None
+    with default_storage.open(path, 'rb') as f:
+        return json.loads(f.read())
+
+
+def load_manifest(refresh: bool = False) -> Optional[dict]:
+    """
+    The current manifest, or None if sitemaps were never generated.
+
+    The cached copy can be up to MANIFEST_CACHE_TIMEOUT old; refresh reads the
+    manifest from storage instead.
+    """
+    manifest = None if refresh else cache.get(MANIFEST_CACHE_KEY)
+    if manifest is None:
+        manifest = _read_manifest()
+        if manifest is not None:
+            cache.set(MANIFEST_CACHE_KEY, manifest, MANIFEST_CACHE_TIMEOUT)
+    return manifest
+
+
+def _save(path: str, content: bytes) -> None:
+    """
+    Replace the file at path.
+
+    The content is written under a temporary name and renamed over the old
+    file, so a concurrent reader sees the old or the new file, never a missing
+    or partial one.
+    """
+    try:
+        target = default_storage.path(path)
+    except NotImplementedError:
+        # No local paths to rename; storage picks a new name rather than
+        # overwrite, so delete first
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        default_storage.save(path, ContentFile(content))
+        return
+
+    temp = default_storage.save(f'{path}.tmp', ContentFile(content))
+    os.replace(default_storage.path(temp), target)
+
+
+def _write_file(manifest: dict, filename: str, content: str, lastmod: Optional[str] = None) -> bool:
+    """Write filename and its .gz variant if the content changed. Returns True if written."""
+    data = content.encode('utf-8')
+    etag = f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+    entry = manifest['files'].get(filename)
+    if entry and entry['etag'] == etag and default_storage.exists(storage_path(filename)):
+        entry['lastmod'] = lastmod
+        return False
+
+    _save(storage_path(filename), data)
+    # mtime=0 keeps the compressed bytes identical for identical content
+    _save(storage_path(f'{filename}.gz'), gzip.compress(data, mtime=0))
+    manifest['files'][filename] = {
+        'etag': etag,
+        'last_modified': timezone.now().isoformat(),
+        'lastmod': lastmod,
+    }
+    return True
+
+
+def _delete_file(manifest: dict, filename: str) -> None:
+    for path in (storage_path(filename), storage_path(f'{filename}.gz')):
+        if default_storage.exists(path):
+            default_storage.delete(path)
+    manifest['files'].pop(filename, None)
+
+
+def _iter_chunks(urls: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    urls = iter(urls)
+    while True:
+        chunk = list(islice(urls, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _generate_type(manifest: dict, sitemap_type: str, base_url: str, settings) -> int:
+    """Rewrite the chunks of one sitemap type. Returns the number of files written."""
+    previous = manifest['types'].get(sitemap_type, {}).get('chunks', [])
+    chunks = []
+    written = 0
+
+    if settings.sitemap_enabled and is_sitemap_enabled(sitemap_type, settings):
+        size = getattr(django_settings, 'CMS_SITEMAP_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+        urls = SITEMAP_COLLECTORS[sitemap_type](base_url, settings)
+        for number, chunk_urls in enumerate(_iter_chunks(urls, size), start=1):
+            filename = chunk_filename(sitemap_type, number)
+            lastmod = max((url['lastmod'] for url in chunk_urls if url.get('lastmod')), default=None)
+            written += _write_file(manifest, filename, generate_sitemap_xml(chunk_urls, base_url), lastmod)
+            chunks.append(filename)
+
+        if not chunks:
+            # An enabled type with no URLs is still listed, as an empty urlset
+            filename = chunk_filename(sitemap_type, 1)
+            written += _write_file(manifest, filename, generate_sitemap_xml([], base_url))
+            chunks.append(filename)
+
+    for filename in previous[len(chunks):]:
+        _delete_file(manifest, filename)
+
+    if chunks:
+        manifest['types'][sitemap_type] = {'chunks': chunks}
+    else:
+        manifest['types'].pop(sitemap_type, None)
+    return written
+
+
+def _generate_index(manifest: dict, base_url: str) -> None:
+    sitemaps = []
+    for sitemap_type in SITEMAP_TYPES:
+        for filename in manifest['types'].get(sitemap_type, {}).get('chunks', []):
+            sitemaps.append({
+                'loc': f"{base_url}/{filename}",
+                'lastmod': manifest['files'][filename].get('lastmod'),
+            })
+    _write_file(manifest, INDEX_FILENAME, generate_sitemap_index_xml(sitemaps, base_url))
+
+
+def regenerate_sitemaps(sitemap_types: Optional[List[str]] = None) -> dict:
+    """
+    Regenerate sitemap files in storage and return the new manifest.
+
+    Only the given types are rebuilt (all types if None). A change to the base
+    URL or the global sitemap switch rebuilds everything. Runs are serialized
+    by locking the SiteSettings row.
+    """
+    with transaction.atomic():
+        settings = SiteSettings.objects.select_for_update().order_by('pk').first()
+        if settings is None:
+            settings = get_sitemap_settings()
+
+        manifest = _read_manifest() or _empty_manifest()
+        base_url = get_base_url(settings)
+        if (
+            sitemap_types is None
+            or manifest['base_url'] != base_url
+            or manifest['enabled'] != settings.sitemap_enabled
+        ):
+            sitemap_types = SITEMAP_TYPES
+
+        written = 0
+        for sitemap_type in sitemap_types:
+            if sitemap_type in SITEMAP_COLLECTORS:
+                written += _generate_type(manifest, sitemap_type, base_url, settings)
+        _generate_index(manifest, base_url)
+
+        manifest['enabled'] = settings.sitemap_enabled
+        manifest['base_url'] = base_url
+        manifest['generated_at'] = timezone.now().isoformat()
+        _save(storage_path(MANIFEST_FILENAME), json.dumps(manifest).encode('utf-8'))
+
+    cache.set(MANIFEST_CACHE_KEY, manifest, MANIFEST_CACHE_TIMEOUT)
+    logger.info(f"Regenerated sitemaps {', '.join(sitemap_types)}: {written} files written")
+    return manifest
+
+
+# =============================================================================
+# Incremental regeneration
+# =============================================================================
+
+def is_listed(instance, listed: Dict[str, object]) -> bool:
+    return all(getattr(instance, field) == value for field, value in listed.items())
+
+
+def schedule_regeneration(sitemap_types: Optional[List[str]] = None) -> None:
+    """
+    Queue regeneration of the given types (all types if None) once the current
+    transaction commits.
+
+    A type already queued within CMS_SITEMAP_DEBOUNCE_SECONDS isn't queued
+    again; the queued run starts after the window and picks up every change.
+    """
+    debounce = getattr(django_settings, 'CMS_SITEMAP_DEBOUNCE_SECONDS', DEFAULT_DEBOUNCE_SECONDS)
+    sitemap_types = sitemap_types or SITEMAP_TYPES
+
+    def dispatch():
+        pending = [
+            sitemap_type for sitemap_type in sitemap_types
+            if cache.add(PENDING_KEY.format(sitemap_type=sitemap_type), True, debounce)
+        ]
+        if not pending:
+            return
+
+        from cms.tasks import regenerate_sitemaps_task, CELERY_AVAILABLE
+
+        try:
+            if CELERY_AVAILABLE:
+                regenerate_sitemaps_task.apply_async(args=[pending], countdown=debounce)
+            else:
+                # Run synchronously if Celery not available
+                regenerate_sitemaps_task(pending)
+        except Exception as e:
+            # The periodic full regeneration will pick the change up
+            logger.error(f"Failed to queue sitemap regeneration for {', '.join(pending)}: {e}")
+
+    transaction.on_commit(dispatch)
@@ -0,0 +1,39 @@
+"""
+Celery tasks for the cms app.
+
+These tasks handle:
+- Regenerating pre-built sitemap files in storage
+"""
+
+import logging
+
+# Try to import Celery, but make it optional
+try:
+    from celery import shared_task
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+    def shared_task(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="cms.regenerate_sitemaps")
+def regenerate_sitemaps_task(sitemap_types=None):
+    """
+    Rebuild the given sitemap types (all types if None) and the sitemap index.
+
+    Queued by signals when listed content changes, and run periodically to
+    catch changes no signal sees, such as job deadlines passing.
+    """
+    from cms.sitemaps import regenerate_sitemaps
+
+    manifest = regenerate_sitemaps(sitemap_types)
+    return {
+        'types': list(manifest['types']),
+        'files': len(manifest['files']),
+    }
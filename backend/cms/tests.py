@@ -1,3 +1,328 @@
-from django.test import TestCase
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from . import page_seo, redirects, sitemaps, tasks
+from .counters import HitCounter
+from .models import GlossaryTerm, PageSEO, Redirect
+from .page_seo import PageSEOResolver
+from .redirects import RedirectMatcher
+
+
+def rule(source, destination='/new', is_regex=False, id='1', type='301'):
+    return {'id': id, 'source': source, 'destination': destination, 'type': type, 'is_regex': is_regex}
+
+
+class RedirectMatcherTests(TestCase):
+    """The compiled matcher finds the same redirect as checking every rule in order."""
+
+    def test_exact_source_wins_over_regex(self):
+        matcher = RedirectMatcher([
+            rule(r'^/jobs/.*$', '/careers', is_regex=True, id='regex'),
+            rule('/jobs/old', '/jobs/new', id='exact'),
+        ])
+
+        self.assertEqual(matcher.match('/jobs/old')['id'], 'exact')
+        self.assertEqual(matcher.match('/jobs/other')['id'], 'regex')
+        self.assertIsNone(matcher.match('/about'))
+
+    def test_first_matching_regex_wins_and_substitutes_groups(self):
+        matcher = RedirectMatcher([
+            rule(r'^/blog/(\d+)$', r'/posts/\1', is_regex=True, id='numeric'),
+            rule(r'^/blog/(.+)$', r'/articles/\1', is_regex=True, id='any'),
+        ])
+
+        self.assertEqual(matcher.match('/blog/42'), {'id': 'numeric', 'destination': '/posts/42', 'type': '301'})
+        self.assertEqual(matcher.match('/blog/hello')['destination'], '/articles/hello')
+
+    def test_backreferences_fall_back_to_ordered_scan(self):
+        matcher = RedirectMatcher([
+            rule(r'^/(a+)-\1$', '/twice', is_regex=True, id='backref'),
+            rule(r'^/a.*$', '/fallback', is_regex=True, id='plain'),
+        ])
+
+        self.assertIsNone(matcher.combined)
+        self.assertEqual(matcher.match('/aa-aa')['id'], 'backref')
+        self.assertEqual(matcher.match('/aa-a')['id'], 'plain')
+
+    def test_invalid_pattern_is_skipped(self):
+        matcher = RedirectMatcher([
+            rule(r'^/broken($', is_regex=True, id='broken'),
+            rule(r'^/ok$', is_regex=True, id='ok'),
+        ])
+
+        self.assertEqual(matcher.match('/ok')['id'], 'ok')
+
+
+class GetMatcherTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        redirects._matcher = None
+        self.addCleanup(setattr, redirects, '_matcher', None)
+
+    def test_rebuilt_when_redirects_change(self):
+        Redirect.objects.create(source_path='/old', destination_url='/new')
+        self.assertEqual(redirects.get_matcher().match('/old')['destination'], '/new')
+
+        Redirect.objects.filter(source_path='/old').get().delete()
+
+        self.assertIsNone(redirects.get_matcher().match('/old'))
+
+    def test_rebuilt_once_expired_without_a_version_bump(self):
+        # A change made in another worker doesn't bump this process's cache
+        Redirect.objects.create(source_path='/old', destination_url='/new')
+        redirects.get_matcher()
+        Redirect.objects.filter(source_path='/old').update(is_active=False)
+        self.assertIsNotNone(redirects.get_matcher().match('/old'))
+
+        redirects._matcher_built_at -= redirects.RULES_TIMEOUT
+
+        self.assertIsNone(redirects.get_matcher().match('/old'))
+
+
+@override_settings(CMS_HIT_COUNT_FLUSH_SECONDS=3600)
+class HitCounterTests(TestCase):
+    """Hits are held in memory and written in one UPDATE."""
+
+    def setUp(self):
+        self.first = Redirect.objects.create(source_path='/first', destination_url='/new')
+        self.second = Redirect.objects.create(source_path='/second', destination_url='/new', hit_count=5)
+        self.counter = HitCounter(Redirect, 'hit_count')
+
+    def test_flush_writes_all_counts_in_one_query(self):
+        for _ in range(3):
+            self.counter.record(self.first.id)
+        self.counter.record(self.second.id)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.counter.flush(), 4)
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.hit_count, 3)
+        self.assertEqual(self.second.hit_count, 6)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.counter.flush(), 0)
+
+    def test_filters_restrict_updated_rows(self):
+        counter = HitCounter(Redirect, 'hit_count', filters={'is_active': True})
+        Redirect.objects.filter(pk=self.second.pk).update(is_active=False)
+        counter.record(self.first.id)
+        counter.record(self.second.id)
+
+        counter.flush()
+
+        self.assertEqual(Redirect.objects.get(pk=self.first.pk).hit_count, 1)
+        self.assertEqual(Redirect.objects.get(pk=self.second.pk).hit_count, 5)
+
+
+def old_page_seo_scan(paths, path):
+    """The query-per-request lookup PageSEOResolver replaced."""
+    if path in paths:
+        return path
+    for pattern in sorted((p for p in paths if p.endswith('*')), reverse=True):
+        if path.startswith(pattern.rstrip('*')):
+            return pattern
+    return None
+
+
+class PageSEOResolverTests(TestCase):
+    """The resolver picks the same entry as the old ordered scan."""
+
+    PATHS = [
+        '/', '/jobs', '/jobs/*', '/jobs/engineering/*', '/jobs/engineering/backend',
+        '/blog*', '/blog/*', '/*', '/about', '/companies/*/jobs',
+    ]
+
+    def test_matches_old_scan(self):
+        resolver = PageSEOResolver([{'path': p} for p in sorted(self.PATHS, reverse=True)])
+
+        for path in [
+            '/', '/jobs', '/jobs/', '/jobs/123', '/jobs/engineering', '/jobs/engineering/',
+            '/jobs/engineering/backend', '/jobs/engineering/frontend', '/blog', '/blog/post',
+            '/blogs', '/about', '/about/team', '/companies/acme/jobs', '/pricing', '',
+        ]:
+            with self.subTest(path=path):
+                found = resolver.resolve(path)
+                self.assertEqual(found and found['path'], old_page_seo_scan(self.PATHS, path))
+
+    def test_exact_match_wins_over_wildcard(self):
+        resolver = PageSEOResolver([{'path': '/jobs/engineering/backend'}, {'path': '/jobs/*'}])
+
+        self.assertEqual(resolver.resolve('/jobs/engineering/backend')['path'], '/jobs/engineering/backend')
+        self.assertEqual(resolver.resolve('/jobs/engineering/frontend')['path'], '/jobs/*')
+
+
+class GetResolverTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        page_seo._resolver = None
+        self.addCleanup(setattr, page_seo, '_resolver', None)
+        PageSEO.objects.create(path='/jobs/*', name='Jobs', title='Jobs', description='All jobs')
+
+    def test_rebuilt_when_entries_change(self):
+        self.assertEqual(page_seo.get_resolver().resolve('/jobs/1')['title'], 'Jobs')
+
+        entry = PageSEO.objects.get(path='/jobs/*')
+        entry.title = 'Open roles'
+        entry.save()
+
+        self.assertEqual(page_seo.get_resolver().resolve('/jobs/1')['title'], 'Open roles')
+
+    def test_rebuilt_once_expired_without_a_version_bump(self):
+        page_seo.get_resolver()
+        PageSEO.objects.filter(path='/jobs/*').update(title='Open roles')
+        self.assertEqual(page_seo.get_resolver().resolve('/jobs/1')['title'], 'Jobs')
+
+        page_seo._resolver_built_at -= page_seo.ENTRIES_TIMEOUT
+
+        self.assertEqual(page_seo.get_resolver().resolve('/jobs/1')['title'], 'Open roles')
+
+
+SITEMAP_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=SITEMAP_MEDIA_ROOT, CMS_SITEMAP_CHUNK_SIZE=2)
+class SitemapTestCase(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(SITEMAP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        shutil.rmtree(os.path.join(SITEMAP_MEDIA_ROOT, sitemaps.DEFAULT_STORAGE_DIR), ignore_errors=True)
+
+    def create_terms(self, *titles):
+        return [GlossaryTerm.objects.create(title=title, slug=title.lower()) for title in titles]
+
+    def read(self, filename):
+        with default_storage.open(sitemaps.storage_path(filename), 'rb') as f:
+            return f.read()
+
+
+class RegenerateSitemapsTests(SitemapTestCase):
+
+    def test_splits_types_into_chunks_listed_in_the_index(self):
+        self.create_terms('Alpha', 'Beta', 'Gamma')
+
+        manifest = sitemaps.regenerate_sitemaps()
+
+        chunks = manifest['types']['glossary']['chunks']
+        self.assertEqual(chunks, ['glossary-sitemap-1.xml', 'glossary-sitemap-2.xml'])
+        listed = b''.join(self.read(filename) for filename in chunks)
+        for slug in (b'alpha', b'beta', b'gamma'):
+            self.assertEqual(listed.count(b'/glossary/' + slug + b'<'), 1)
+        index = self.read(sitemaps.INDEX_FILENAME)
+        self.assertIn(b'/glossary-sitemap-2.xml</loc>', index)
+        self.assertEqual(gzip.decompress(self.read('glossary-sitemap-1.xml.gz')), self.read('glossary-sitemap-1.xml'))
+
+    def test_unchanged_chunks_keep_their_etag_and_removed_chunks_are_deleted(self):
+        terms = self.create_terms('Alpha', 'Beta', 'Gamma')
+        first = sitemaps.regenerate_sitemaps(['glossary'])
+        entry = first['files']['glossary-sitemap-1.xml']
+
+        GlossaryTerm.objects.filter(pk=max(term.pk for term in terms)).delete()
+        second = sitemaps.regenerate_sitemaps(['glossary'])
+
+        self.assertEqual(second['files']['glossary-sitemap-1.xml'], entry)
+        self.assertNotIn('glossary-sitemap-2.xml', second['files'])
+        self.assertFalse(default_storage.exists(sitemaps.storage_path('glossary-sitemap-2.xml')))
+        self.assertEqual(sitemaps.load_manifest(refresh=True), second)
+
+    def test_rewrites_leave_no_temporary_files(self):
+        self.create_terms('Alpha')
+        sitemaps.regenerate_sitemaps()
+        GlossaryTerm.objects.update(title='Changed', slug='changed')
+        sitemaps.regenerate_sitemaps()
+
+        _, files = default_storage.listdir(sitemaps.DEFAULT_STORAGE_DIR)
+        self.assertFalse([name for name in files if '.tmp' in name])
+        self.assertIn(b'/glossary/changed<', self.read('glossary-sitemap-1.xml'))
+
+
+class SitemapSignalTests(SitemapTestCase):
+    """Saving listed content queues its sitemap type once per debounce window."""
+
+    def setUp(self):
+        super().setUp()
+        self.enterContext(mock.patch.object(tasks, 'CELERY_AVAILABLE', True))
+        self.apply_async = self.enterContext(mock.patch.object(tasks.regenerate_sitemaps_task, 'apply_async'))
+
+    def queued(self):
+        return [call.kwargs['args'][0] for call in self.apply_async.call_args_list]
+
+    def test_publishing_queues_its_type_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            alpha, = self.create_terms('Alpha')
+        with self.captureOnCommitCallbacks(execute=True):
+            alpha.definition_plain = 'First letter'
+            alpha.save()
+
+        self.assertEqual(self.queued(), [['glossary']])
+
+    def test_unpublishing_queues_and_unlisted_saves_do_not(self):
+        alpha, = self.create_terms('Alpha')
+        with self.captureOnCommitCallbacks(execute=True):
+            alpha.is_active = False
+            alpha.save()
+        self.assertEqual(self.queued(), [['glossary']])
+
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            alpha.definition_plain = 'Still hidden'
+            alpha.save()
+        self.assertEqual(self.queued(), [['glossary']])
+
+
+class SitemapViewTests(SitemapTestCase):
+
+    def chunk_url(self, sitemap_type, chunk):
+        return reverse('sitemap-chunk', kwargs={'sitemap_type': sitemap_type, 'chunk': chunk})
+
+    def test_serves_file_with_conditional_and_gzip_responses(self):
+        self.create_terms('Alpha')
+        manifest = sitemaps.regenerate_sitemaps()
+        url = self.chunk_url('glossary', 1)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.read('glossary-sitemap-1.xml'))
+        self.assertEqual(response['ETag'], manifest['files']['glossary-sitemap-1.xml']['etag'])
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        encoded = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(encoded['Content-Encoding'], 'gzip')
+        self.assertEqual(b''.join(encoded.streaming_content), self.read('glossary-sitemap-1.xml.gz'))
+
+    def test_cold_start_queues_generation_instead_of_building_in_the_request(self):
+        with mock.patch('cms.views.sitemap.schedule_regeneration') as schedule:
+            response = self.client.get(reverse('sitemap-index'))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+        schedule.assert_called_once_with()
+        self.assertIsNone(sitemaps.load_manifest())
+
+    def test_chunk_removed_since_the_cached_manifest_is_not_found(self):
+        terms = self.create_terms('Alpha', 'Beta', 'Gamma')
+        stale = sitemaps.regenerate_sitemaps()
+
+        # Another process removes the second chunk while this one still caches the old manifest
+        GlossaryTerm.objects.filter(pk=max(term.pk for term in terms)).delete()
+        sitemaps.regenerate_sitemaps()
+        cache.set(sitemaps.MANIFEST_CACHE_KEY, stale)
+
+        self.assertEqual(self.client.get(self.chunk_url('glossary', 2)).status_code, 404)
+        self.assertEqual(self.client.get(self.chunk_url('glossary', 1)).status_code, 200)
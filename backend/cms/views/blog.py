@@ -7,7 +7,9 @@ from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from users.models import UserRole
-from ..models import BlogPost, ContentStatus
+from ..counters import HitCounter
+from ..models import BlogPost, ContentStatus, FAQ
+from ..public_cache import public_cache
 from ..serializers import (
     BlogPostListSerializer,
     BlogPostDetailSerializer,
@@ -20,6 +22,16 @@ def is_staff_user(user):
     return user.role in [UserRole.ADMIN, UserRole.RECRUITER]
 
 
+# Public post views are counted in memory and written in batches, so cached
+# responses stay off the database
+blog_view_counter = HitCounter(BlogPost, 'view_count', key='slug', filters={'status': ContentStatus.PUBLISHED})
+
+
+def record_blog_post_view(request, slug, **kwargs):
+    if request.GET.get('preview', '').lower() != 'true':
+        blog_view_counter.record(slug)
+
+
 # =============================================================================
 # Admin/Staff Endpoints
 # =============================================================================
@@ -153,6 +165,7 @@ def delete_blog_post(request, post_id):
 # Public Endpoints
 # =============================================================================
 
+@public_cache(BlogPost, FAQ)
 @extend_schema(
     responses={200: BlogPostPublicSerializer(many=True)},
     tags=['CMS - Blog (Public)'],
@@ -184,6 +197,7 @@ def list_public_blog_posts(request):
     return Response(serializer.data)
 
 
+@public_cache(BlogPost, FAQ, on_request=record_blog_post_view)
 @extend_schema(
     responses={200: BlogPostPublicSerializer},
     tags=['CMS - Blog (Public)'],
@@ -211,7 +225,6 @@ def get_public_blog_post(request, slug):
             post = BlogPost.objects.get(slug=slug, status=ContentStatus.PUBLISHED)
         except BlogPost.DoesNotExist:
             return Response({'error': 'Blog post not found'}, status=status.HTTP_404_NOT_FOUND)
-        post.increment_views()
 
     serializer = BlogPostPublicSerializer(post, context={'request': request})
     return Response(serializer.data)
@@ -7,6 +7,7 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from users.models import UserRole
 from ..models import FAQ, FAQCategory
+from ..public_cache import public_cache
 from ..serializers import (
     FAQCategorySerializer,
     FAQCategoryCreateUpdateSerializer,
@@ -228,6 +229,7 @@ def delete_faq(request, faq_id):
 # Public Endpoints
 # =============================================================================
 
+@public_cache(FAQ, FAQCategory)
 @extend_schema(
     responses={200: FAQCategoryWithFAQsSerializer(many=True)},
     tags=['CMS - FAQs (Public)'],
@@ -7,6 +7,7 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from users.models import UserRole
 from ..models import GlossaryTerm
+from ..public_cache import public_cache
 from ..serializers import (
     GlossaryTermListSerializer,
     GlossaryTermDetailSerializer,
@@ -141,6 +142,7 @@ def delete_glossary_term(request, term_id):
 # Public Endpoints
 # =============================================================================
 
+@public_cache(GlossaryTerm)
 @extend_schema(
     responses={200: GlossaryTermListSerializer(many=True)},
     tags=['CMS - Glossary (Public)'],
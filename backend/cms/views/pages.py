@@ -8,6 +8,7 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from users.models import UserRole
 from ..models import Page, ContentStatus
+from ..public_cache import public_cache
 from ..serializers import (
     PageListSerializer,
     PageDetailSerializer,
@@ -153,6 +154,7 @@ def delete_page(request, page_id):
 # Public Endpoints
 # =============================================================================
 
+@public_cache(Page)
 @extend_schema(
     responses={200: PageListSerializer(many=True)},
     tags=['CMS - Pages (Public)'],
@@ -190,6 +192,7 @@ def list_public_pages(request):
     return Response(serializer.data)
 
 
+@public_cache(Page)
 @extend_schema(
     responses={200: PagePublicSerializer},
     tags=['CMS - Pages (Public)'],
@@ -5,6 +5,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
 from cms.models import PricingConfig, PricingFeature
+from cms.public_cache import public_cache
 from cms.serializers import (
     PricingConfigSerializer,
     PricingConfigUpdateSerializer,
@@ -26,6 +27,7 @@ def get_or_create_pricing_config():
 # Public Endpoints
 # ==========================================================================
 
+@public_cache(PricingConfig)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_public_pricing_config(request):
@@ -142,6 +144,10 @@ def reorder_pricing_features(request):
         for index, feature_id in enumerate(feature_ids):
             PricingFeature.objects.filter(pk=feature_id).update(order=index)
 
+        # update() sends no signals; feature order is part of cached entitlements
+        from subscriptions.entitlements import bump_features_version
+        bump_features_version()
+
         # Return updated list
         features = PricingFeature.objects.all().order_by('order', 'name')
         return Response(PricingFeatureSerializer(features, many=True).data)
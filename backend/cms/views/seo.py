@@ -1,10 +1,16 @@
 """SEO management views - Redirects and meta tags."""
 import fnmatch
+import hashlib
+import json
+
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+
+from branding.models import BrandingSettings
 
 from ..models import Redirect, MetaTagDefaults, PageSEO
 from ..serializers import (
@@ -14,6 +20,11 @@ from ..serializers import (
     PageSEOPublicSerializer,
 )
 from ..middleware import RedirectMiddleware
+from ..page_seo import get_resolver as get_page_seo_resolver
+from ..public_cache import public_cache
+
+# Public SEO lookups may be cached by browsers and CDNs, revalidated by ETag
+PAGE_SEO_CACHE_CONTROL = 'public, max-age=300'
 
 
 # ============================================================================
@@ -113,12 +124,11 @@ def meta_tag_defaults(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@public_cache(MetaTagDefaults, BrandingSettings)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_public_seo_defaults(request):
     """Public endpoint to get SEO defaults for frontend rendering."""
-    from branding.models import BrandingSettings
-
     defaults = MetaTagDefaults.objects.first()
     if not defaults:
         # Return defaults from BrandingSettings if no MetaTagDefaults configured
@@ -236,29 +246,21 @@ def get_page_seo_by_path(request):
     if not path.startswith('/'):
         path = '/' + path
 
-    # Try exact match first
-    page_seo = PageSEO.objects.filter(path=path, is_active=True).first()
-
-    # If no exact match, try wildcard patterns
-    if not page_seo:
-        # Get all wildcard patterns (ending with *)
-        wildcard_entries = PageSEO.objects.filter(
-            path__endswith='*',
-            is_active=True
-        ).order_by('-path')  # Longer patterns first for more specific matches
-
-        for entry in wildcard_entries:
-            # Convert /jobs/* to /jobs/ for prefix matching
-            pattern = entry.path.rstrip('*')
-            if path.startswith(pattern):
-                page_seo = entry
-                break
-
-    if not page_seo:
+    entry = get_page_seo_resolver().resolve(path)
+    if entry is None:
         return Response({'detail': 'No SEO settings found for this path'}, status=status.HTTP_404_NOT_FOUND)
 
-    serializer = PageSEOPublicSerializer(page_seo, context={'request': request})
-    return Response(serializer.data)
+    data = dict(entry)
+    if data['og_image_url']:
+        data['og_image_url'] = request.build_absolute_uri(data['og_image_url'])
+
+    etag = '"%s"' % hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = Response(data)
+    response['ETag'] = etag
+    response['Cache-Control'] = PAGE_SEO_CACHE_CONTROL
+    return response
 
 
 @api_view(['GET'])
@@ -6,6 +6,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
 from cms.models import SiteSettings
+from cms.public_cache import public_cache
 from cms.serializers import (
     SiteSettingsSerializer,
     AnalyticsSettingsSerializer,
@@ -150,6 +151,7 @@ def get_public_analytics_settings(request):
     return Response(serializer.data)
 
 
+@public_cache(SiteSettings)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def robots_txt(request):
@@ -161,6 +163,7 @@ def robots_txt(request):
     )
 
 
+@public_cache(SiteSettings)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def llms_txt(request):
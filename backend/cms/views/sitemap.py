@@ -1,4 +1,4 @@
-"""Sitemap generation views following Google's best practices.
+"""Sitemap views following Google's best practices.
 
 Best practices implemented:
 - Sitemap index as entry point with separate sitemaps per content type
@@ -8,417 +8,90 @@ Best practices implemented:
 - Proper XML escaping for special characters
 - Image sitemap extension for content with images
 - XSL stylesheet for human-readable formatting
+- Sitemaps split into chunks at the 50,000 URL protocol limit
+
+Sitemap files are pre-generated to storage by cms.sitemaps (see that module);
+these views only serve them, with gzip variants and ETag/Last-Modified
+conditional responses, so crawler traffic doesn't query the database.
 
 References:
 - https://developers.google.com/search/docs/crawling-indexing/sitemaps/build-sitemap
 - https://www.sitemaps.org/protocol.html
 """
-from html import escape as html_escape
-from django.http import HttpResponse, Http404
-from django.utils import timezone
-from django.db.models import Max
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 
-from cms.models import Page, BlogPost, GlossaryTerm, CaseStudy, SiteSettings, PageSEO
-from jobs.models import Job
-from candidates.models import CandidateProfile
-from companies.models import Company
-
-
-# Sitemap types configuration - {url_name: display_name}
-SITEMAP_TYPES = [
-    'page',       # Static pages + CMS pages
-    'post',       # Blog posts
-    'job',        # Job listings
-    'candidate',  # Public candidate profiles
-    'company',    # Company profiles
-    'glossary',   # Glossary terms
-    'case-study', # Case studies
-]
-
-
-def get_sitemap_settings():
-    """Get sitemap settings from SiteSettings."""
-    settings = SiteSettings.objects.first()
-    if not settings:
-        settings = SiteSettings.objects.create()
-    return settings
-
-
-def escape_xml(text: str) -> str:
-    """Escape special characters for XML."""
-    if not text:
-        return text
-    return html_escape(text, quote=True)
-
-
-def format_lastmod(dt) -> str:
-    """Format datetime for sitemap lastmod field (ISO 8601 with timezone)."""
-    if dt is None:
-        return None
-    # Format as ISO 8601 with timezone: 2025-12-02T11:09:02+00:00
-    return dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
-
-
-def make_absolute_url(relative_url: str, base_url: str) -> str:
-    """Convert a relative URL to absolute URL."""
-    if not relative_url:
-        return None
-    if relative_url.startswith('http://') or relative_url.startswith('https://'):
-        return relative_url
-    if relative_url.startswith('/'):
-        return f"{base_url}{relative_url}"
-    return f"{base_url}/{relative_url}"
-
-
-def get_base_url(request, settings):
-    """Get the base URL for sitemaps."""
-    base_url = settings.site_url.rstrip('/') if settings.site_url else request.build_absolute_uri('/').rstrip('/')
-    if '/api/' in base_url:
-        base_url = base_url.split('/api/')[0]
-    return base_url
-
-
-# =============================================================================
-# URL collectors for each sitemap type
-# =============================================================================
-
-def collect_pages_urls(base_url: str, settings) -> list:
-    """Collect static pages (from PageSEO) and CMS legal pages."""
-    urls = []
-
-    # Get static/app pages from PageSEO entries (configurable from CMS)
-    # Only include pages marked as include_in_sitemap, active, and not noindex
-    # Exclude wildcard patterns (e.g., /jobs/*) as those are covered by specific sitemaps
-    page_seo_entries = PageSEO.objects.filter(
-        is_active=True,
-        include_in_sitemap=True,
-        noindex=False,
-    ).exclude(
-        path__endswith='*'  # Exclude wildcards - those are for SEO meta only
-    ).only('path', 'sitemap_priority', 'updated_at')
-
-    for entry in page_seo_entries:
-        # Normalize path (ensure it starts with /)
-        path = entry.path if entry.path.startswith('/') else f'/{entry.path}'
-        urls.append({
-            'loc': f"{base_url}{path}",
-            'lastmod': format_lastmod(entry.updated_at),
-        })
-
-    # CMS Legal Pages - served at root level (e.g., /privacy-policy not /pages/privacy-policy)
-    if settings.sitemap_include_pages:
-        pages = Page.objects.filter(status='published').only('slug', 'updated_at')
-        for page in pages:
-            urls.append({
-                'loc': f"{base_url}/{page.slug}",
-                'lastmod': format_lastmod(page.updated_at),
-            })
-
-    return urls
-
-
-def collect_blog_urls(base_url: str, settings) -> list:
-    """Collect blog post URLs with images."""
-    urls = []
-
-    if not settings.sitemap_include_blog:
-        return urls
-
-    posts = BlogPost.objects.filter(
-        status='published'
-    ).only('slug', 'updated_at', 'featured_image', 'title')
-
-    for post in posts:
-        url_entry = {
-            'loc': f"{base_url}/blog/{post.slug}",
-            'lastmod': format_lastmod(post.updated_at),
-        }
-        if post.featured_image:
-            image_url = post.featured_image.url if hasattr(post.featured_image, 'url') else str(post.featured_image)
-            url_entry['images'] = [{
-                'loc': make_absolute_url(image_url, base_url),
-                'title': post.title,
-            }]
-        urls.append(url_entry)
-
-    return urls
-
-
-def collect_jobs_urls(base_url: str, settings) -> list:
-    """Collect active job listing URLs."""
-    from django.db.models import Q
-
-    urls = []
-
-    if not settings.sitemap_include_jobs:
-        return urls
-
-    # Include jobs that are published AND either:
-    # - Have no deadline (open indefinitely), OR
-    # - Have a future deadline
-    jobs = Job.objects.filter(
-        status='published'
-    ).filter(
-        Q(application_deadline__isnull=True) | Q(application_deadline__gte=timezone.now())
-    ).only('slug', 'updated_at')
-
-    for job in jobs:
-        urls.append({
-            'loc': f"{base_url}/jobs/{job.slug}",
-            'lastmod': format_lastmod(job.updated_at),
-        })
-
-    return urls
-
-
-def collect_candidates_urls(base_url: str, settings) -> list:
-    """Collect public candidate profile URLs."""
-    urls = []
-
-    if not settings.sitemap_include_candidates:
-        return urls
-
-    candidates = CandidateProfile.objects.filter(
-        visibility='public_sanitised'
-    ).only('slug', 'updated_at')
-
-    for candidate in candidates:
-        urls.append({
-            'loc': f"{base_url}/candidates/{candidate.slug}",
-            'lastmod': format_lastmod(candidate.updated_at),
-        })
-
-    return urls
-
-
-def collect_companies_urls(base_url: str, settings) -> list:
-    """Collect company profile URLs with logos."""
-    urls = []
-
-    if not settings.sitemap_include_companies:
-        return urls
-
-    companies = Company.objects.filter(
-        is_published=True
-    ).only('slug', 'updated_at', 'logo', 'name')
-
-    for company in companies:
-        url_entry = {
-            'loc': f"{base_url}/companies/{company.slug}",
-            'lastmod': format_lastmod(company.updated_at),
-        }
-        if company.logo:
-            logo_url = company.logo.url if hasattr(company.logo, 'url') else str(company.logo)
-            url_entry['images'] = [{
-                'loc': make_absolute_url(logo_url, base_url),
-                'title': f"{company.name} logo",
-            }]
-        urls.append(url_entry)
-
-    return urls
-
-
-def collect_glossary_urls(base_url: str, settings) -> list:
-    """Collect glossary term URLs."""
-    urls = []
-
-    if not settings.sitemap_include_glossary:
-        return urls
-
-    terms = GlossaryTerm.objects.filter(is_active=True).only('slug', 'updated_at')
-
-    for term in terms:
-        urls.append({
-            'loc': f"{base_url}/glossary/{term.slug}",
-            'lastmod': format_lastmod(term.updated_at),
-        })
-
-    return urls
-
-
-def collect_case_studies_urls(base_url: str, settings) -> list:
-    """Collect case study URLs."""
-    urls = []
-
-    if not settings.sitemap_include_case_studies:
-        return urls
-
-    studies = CaseStudy.objects.filter(status='published').only('slug', 'updated_at')
-
-    for study in studies:
-        urls.append({
-            'loc': f"{base_url}/case-studies/{study.slug}",
-            'lastmod': format_lastmod(study.updated_at),
-        })
-
-    return urls
-
-
-# Map sitemap types to their collectors
-SITEMAP_COLLECTORS = {
-    'page': collect_pages_urls,
-    'post': collect_blog_urls,
-    'job': collect_jobs_urls,
-    'candidate': collect_candidates_urls,
-    'company': collect_companies_urls,
-    'glossary': collect_glossary_urls,
-    'case-study': collect_case_studies_urls,
-}
-
-
-# =============================================================================
-# Last modified date helpers
-# =============================================================================
-
-def get_sitemap_lastmod(sitemap_type: str, settings) -> str:
-    """Get the last modified date for a sitemap type."""
-    lastmod = None
-
-    if sitemap_type == 'page':
-        # Get most recent from both PageSEO entries and CMS legal pages
-        page_seo_result = PageSEO.objects.filter(
-            is_active=True,
-            include_in_sitemap=True,
-            noindex=False,
-        ).exclude(
-            path__endswith='*'
-        ).aggregate(Max('updated_at'))
-        page_seo_lastmod = page_seo_result.get('updated_at__max')
-
-        cms_page_lastmod = None
-        if settings.sitemap_include_pages:
-            cms_result = Page.objects.filter(status='published').aggregate(Max('updated_at'))
-            cms_page_lastmod = cms_result.get('updated_at__max')
-
-        # Return the most recent of the two
-        if page_seo_lastmod and cms_page_lastmod:
-            lastmod = max(page_seo_lastmod, cms_page_lastmod)
-        else:
-            lastmod = page_seo_lastmod or cms_page_lastmod
-
-    elif sitemap_type == 'post' and settings.sitemap_include_blog:
-        result = BlogPost.objects.filter(status='published').aggregate(Max('updated_at'))
-        lastmod = result.get('updated_at__max')
-
-    elif sitemap_type == 'job' and settings.sitemap_include_jobs:
-        from django.db.models import Q
-        result = Job.objects.filter(
-            status='published'
-        ).filter(
-            Q(application_deadline__isnull=True) | Q(application_deadline__gte=timezone.now())
-        ).aggregate(Max('updated_at'))
-        lastmod = result.get('updated_at__max')
-
-    elif sitemap_type == 'candidate' and settings.sitemap_include_candidates:
-        result = CandidateProfile.objects.filter(
-            visibility='public_sanitised'
-        ).aggregate(Max('updated_at'))
-        lastmod = result.get('updated_at__max')
-
-    elif sitemap_type == 'company' and settings.sitemap_include_companies:
-        result = Company.objects.filter(is_published=True).aggregate(Max('updated_at'))
-        lastmod = result.get('updated_at__max')
-
-    elif sitemap_type == 'glossary' and settings.sitemap_include_glossary:
-        result = GlossaryTerm.objects.filter(is_active=True).aggregate(Max('updated_at'))
-        lastmod = result.get('updated_at__max')
-
-    elif sitemap_type == 'case-study' and settings.sitemap_include_case_studies:
-        result = CaseStudy.objects.filter(status='published').aggregate(Max('updated_at'))
-        lastmod = result.get('updated_at__max')
-
-    return format_lastmod(lastmod)
-
-
-def is_sitemap_enabled(sitemap_type: str, settings) -> bool:
-    """Check if a sitemap type is enabled."""
-    if sitemap_type == 'page':
-        return True  # Always include static pages
-    elif sitemap_type == 'post':
-        return settings.sitemap_include_blog
-    elif sitemap_type == 'job':
-        return settings.sitemap_include_jobs
-    elif sitemap_type == 'candidate':
-        return settings.sitemap_include_candidates
-    elif sitemap_type == 'company':
-        return settings.sitemap_include_companies
-    elif sitemap_type == 'glossary':
-        return settings.sitemap_include_glossary
-    elif sitemap_type == 'case-study':
-        return settings.sitemap_include_case_studies
-    return False
-
-
-# =============================================================================
-# XML generators
-# =============================================================================
-
-def generate_sitemap_xml(urls: list, base_url: str) -> str:
-    """Generate XML sitemap from URL list (Yoast-style format)."""
-    has_images = any('images' in url for url in urls)
-
-    # XML declaration with XSL stylesheet
-    xml_parts = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        f'<?xml-stylesheet type="text/xsl" href="{base_url}/sitemap.xsl"?>',
-    ]
-
-    # Urlset with namespaces and schema locations
-    if has_images:
-        xml_parts.append(
-            '<urlset xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
-            'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1" '
-            'xsi:schemaLocation="http://www.sitemaps.org/schemas/sitemap/0.9 '
-            'http://www.sitemaps.org/schemas/sitemap/0.9/sitemap.xsd '
-            'http://www.google.com/schemas/sitemap-image/1.1 '
-            'http://www.google.com/schemas/sitemap-image/1.1/sitemap-image.xsd" '
-            'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
-        )
-    else:
-        xml_parts.append(
-            '<urlset xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
-            'xsi:schemaLocation="http://www.sitemaps.org/schemas/sitemap/0.9 '
-            'http://www.sitemaps.org/schemas/sitemap/0.9/sitemap.xsd" '
-            'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+from cms.sitemaps import (
+    INDEX_FILENAME,
+    chunk_filename,
+    gzip_etag,
+    load_manifest,
+    schedule_regeneration,
+    storage_path,
+)
+
+SITEMAP_CACHE_CONTROL = 'public, max-age=3600'
+SITEMAP_RETRY_AFTER = 120  # seconds; covers the regeneration debounce
+
+
+def serve_sitemap_file(request, filename: str, compressed: bool = False) -> HttpResponse:
+    """
+    Serve a pre-generated sitemap file from storage.
+
+    compressed serves the .xml.gz file itself; otherwise the gzip variant is
+    sent with Content-Encoding when the client accepts it.
+    """
+    manifest = load_manifest()
+    if manifest is None:
+        # Sitemaps have never been generated (e.g. fresh deploy); build them in
+        # the background rather than in a crawler's request
+        schedule_regeneration()
+        response = HttpResponse(status=503)
+        response['Retry-After'] = SITEMAP_RETRY_AFTER
+        return response
+
+    try:
+        return _serve_from_manifest(request, manifest, filename, compressed)
+    except FileNotFoundError:
+        # The cached manifest can list a chunk that a later run has removed;
+        # retry once against the manifest in storage
+        manifest = load_manifest(refresh=True) or {'files': {}}
+        try:
+            return _serve_from_manifest(request, manifest, filename, compressed)
+        except FileNotFoundError:
+            raise Http404(f"Unknown sitemap: {filename}")
+
+
+def _serve_from_manifest(request, manifest: dict, filename: str, compressed: bool) -> HttpResponse:
+    entry = manifest['files'].get(filename)
+    if entry is None:
+        raise Http404(f"Unknown sitemap: {filename}")
+
+    encode = not compressed and 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+    etag = gzip_etag(entry['etag']) if compressed or encode else entry['etag']
+    last_modified = parse_datetime(entry['last_modified']).timestamp()
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        path = storage_path(f'{filename}.gz' if compressed or encode else filename)
+        response = FileResponse(
+            default_storage.open(path, 'rb'),
+            content_type='application/gzip' if compressed else 'application/xml',
         )
-
-    for url in urls:
-        xml_parts.append('\t<url>')
-        xml_parts.append(f'\t\t<loc>{escape_xml(url["loc"])}</loc>')
-
-        if url.get('lastmod'):
-            xml_parts.append(f'\t\t<lastmod>{url["lastmod"]}</lastmod>')
-
-        for image in url.get('images', []):
-            xml_parts.append('\t\t<image:image>')
-            xml_parts.append(f'\t\t\t<image:loc>{escape_xml(image["loc"])}</image:loc>')
-            xml_parts.append('\t\t</image:image>')
-
-        xml_parts.append('\t</url>')
-
-    xml_parts.append('</urlset>')
-    return '\n'.join(xml_parts)
-
-
-def generate_sitemap_index_xml(sitemaps: list, base_url: str) -> str:
-    """Generate sitemap index XML (Yoast-style format)."""
-    xml_parts = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        f'<?xml-stylesheet type="text/xsl" href="{base_url}/sitemap.xsl"?>',
-        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
-    ]
-
-    for sitemap in sitemaps:
-        xml_parts.append('\t<sitemap>')
-        xml_parts.append(f'\t\t<loc>{escape_xml(sitemap["loc"])}</loc>')
-        if sitemap.get('lastmod'):
-            xml_parts.append(f'\t\t<lastmod>{sitemap["lastmod"]}</lastmod>')
-        xml_parts.append('\t</sitemap>')
-
-    xml_parts.append('</sitemapindex>')
-    return '\n'.join(xml_parts)
+        if encode:
+            response['Content-Encoding'] = 'gzip'
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = SITEMAP_CACHE_CONTROL
+    if not compressed:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    return response
 
 
 # =============================================================================
@@ -427,59 +100,16 @@ def generate_sitemap_index_xml(sitemaps: list, base_url: str) -> str:
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
-def sitemap_index(request):
-    """Return the sitemap index listing all individual sitemaps."""
-    settings = get_sitemap_settings()
-
-    if not settings.sitemap_enabled:
-        return HttpResponse(
-            '<?xml version="1.0" encoding="UTF-8"?>\n'
-            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"></sitemapindex>',
-            content_type='application/xml',
-        )
-
-    base_url = get_base_url(request, settings)
-    sitemaps = []
-
-    for sitemap_type in SITEMAP_TYPES:
-        if is_sitemap_enabled(sitemap_type, settings):
-            lastmod = get_sitemap_lastmod(sitemap_type, settings)
-            sitemaps.append({
-                'loc': f"{base_url}/{sitemap_type}-sitemap.xml",
-                'lastmod': lastmod,
-            })
-
-    xml_content = generate_sitemap_index_xml(sitemaps, base_url)
-
-    response = HttpResponse(xml_content, content_type='application/xml')
-    response['Cache-Control'] = 'public, max-age=3600'
-    return response
+def sitemap_index(request, compressed=False):
+    """Return the sitemap index listing all individual sitemap chunks."""
+    return serve_sitemap_file(request, INDEX_FILENAME, compressed)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
-def sitemap_by_type(request, sitemap_type: str):
-    """Return a sitemap for a specific content type."""
-    settings = get_sitemap_settings()
-
-    if not settings.sitemap_enabled:
-        raise Http404("Sitemap is disabled")
-
-    if sitemap_type not in SITEMAP_COLLECTORS:
-        raise Http404(f"Unknown sitemap type: {sitemap_type}")
-
-    if not is_sitemap_enabled(sitemap_type, settings):
-        raise Http404(f"Sitemap type '{sitemap_type}' is disabled")
-
-    base_url = get_base_url(request, settings)
-    collector = SITEMAP_COLLECTORS[sitemap_type]
-    urls = collector(base_url, settings)
-
-    xml_content = generate_sitemap_xml(urls, base_url)
-
-    response = HttpResponse(xml_content, content_type='application/xml')
-    response['Cache-Control'] = 'public, max-age=3600'
-    return response
+def sitemap_by_type(request, sitemap_type: str, chunk: int = 1, compressed=False):
+    """Return one chunk of the sitemap for a content type ({type}-sitemap.xml is chunk 1)."""
+    return serve_sitemap_file(request, chunk_filename(sitemap_type, chunk), compressed)
 
 
 # Keep backward compatibility - sitemap.xml now serves the index
@@ -487,7 +117,7 @@ def sitemap_by_type(request, sitemap_type: str):
 @permission_classes([AllowAny])
 def sitemap_xml(request):
     """Redirect to sitemap index for backward compatibility."""
-    return sitemap_index(request)
+    return serve_sitemap_file(request, INDEX_FILENAME)
 
 
 @api_view(['GET'])
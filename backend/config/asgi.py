@@ -2,6 +2,8 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the app with an ASGI server (e.g. uvicorn config.asgi:application) so
+long-lived streams such as /api/v1/notifications/stream/ don't tie up workers.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
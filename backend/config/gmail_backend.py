@@ -3,11 +3,23 @@ Gmail API Email Backend for Django
 
 Uses a Google Cloud Service Account with Domain-Wide Delegation
 to send emails via the Gmail API.
+
+Credentials and the Gmail discovery document are loaded once per process, so
+the access token is reused until it expires instead of being fetched for
+every backend instance. The API service built from them is cached per thread,
+since googleapiclient services aren't thread-safe.
+
+send_messages() sends messages in Gmail batch requests (one HTTP call per
+BATCH_SIZE messages), retries messages rejected with 429/5xx, and records the
+outcome on each message: message.send_error is None once sent, or the
+exception it failed with.
 """
 
 import base64
 import json
 import logging
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -17,33 +29,41 @@ from django.conf import settings
 from django.core.mail.backends.base import BaseEmailBackend
 
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from googleapiclient.discovery import V2_DISCOVERY_URI, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
 
 logger = logging.getLogger(__name__)
 
 GMAIL_SCOPES = ['https://www.googleapis.com/auth/gmail.send']
 
+# Gmail accepts up to 100 calls per batch but recommends no more than 50
+BATCH_SIZE = 50
 
-class GmailAPIBackend(BaseEmailBackend):
-    """
-    Django email backend that sends emails via Gmail API using a service account.
+# Messages rejected with these statuses are retried in a later batch
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+BATCH_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 1
 
-    Required settings:
-        GMAIL_SERVICE_ACCOUNT_FILE: Path to service account JSON key file
-        GMAIL_DELEGATED_USER: Email address to send from (e.g., notifications@yourdomain.com)
+_credentials = None
+_discovery_document = None
+_lock = threading.Lock()
+_local = threading.local()
 
-    Optional settings:
-        GMAIL_SERVICE_ACCOUNT_INFO: Dict of service account credentials (alternative to file)
+
+def get_credentials():
     """
+    Service account credentials, created once per process.
 
-    def __init__(self, fail_silently=False, **kwargs):
-        super().__init__(fail_silently=fail_silently, **kwargs)
-        self.service = None
-        self._init_service()
+    google-auth refreshes the access token on these credentials only when it
+    expires, so every send in the process shares one token.
+    """
+    global _credentials
+    if _credentials is not None:
+        return _credentials
 
-    def _init_service(self):
-        """Initialize the Gmail API service with service account credentials."""
-        try:
+    with _lock:
+        if _credentials is None:
             # Get delegated user (the email address to send from)
             delegated_user = getattr(settings, 'GMAIL_DELEGATED_USER', None)
             if not delegated_user:
@@ -54,7 +74,7 @@ class GmailAPIBackend(BaseEmailBackend):
             service_account_info = getattr(settings, 'GMAIL_SERVICE_ACCOUNT_INFO', None)
 
             if service_account_file:
-                credentials = service_account.Credentials.from_service_account_file(
+                _credentials = service_account.Credentials.from_service_account_file(
                     service_account_file,
                     scopes=GMAIL_SCOPES,
                     subject=delegated_user
@@ -63,7 +83,7 @@ class GmailAPIBackend(BaseEmailBackend):
                 # Handle JSON string or dict
                 if isinstance(service_account_info, str):
                     service_account_info = json.loads(service_account_info)
-                credentials = service_account.Credentials.from_service_account_info(
+                _credentials = service_account.Credentials.from_service_account_info(
                     service_account_info,
                     scopes=GMAIL_SCOPES,
                     subject=delegated_user
@@ -72,36 +92,136 @@ class GmailAPIBackend(BaseEmailBackend):
                 raise ValueError(
                     "Either GMAIL_SERVICE_ACCOUNT_FILE or GMAIL_SERVICE_ACCOUNT_INFO is required"
                 )
+            logger.info(f"Gmail API credentials initialized for {delegated_user}")
+    return _credentials
 
-            self.service = build('gmail', 'v1', credentials=credentials)
-            logger.info(f"Gmail API service initialized for {delegated_user}")
 
-        except Exception as e:
-            logger.error(f"Failed to initialize Gmail API service: {e}")
-            if not self.fail_silently:
-                raise
+def get_discovery_document() -> str:
+    """The Gmail v1 discovery document, from the copy bundled with googleapiclient if present."""
+    global _discovery_document
+    if _discovery_document is None:
+        document = get_static_doc('gmail', 'v1')
+        if document is None:
+            from core.utils import http_client
+
+            response = http_client.get(V2_DISCOVERY_URI.format(api='gmail', apiVersion='v1'))
+            response.raise_for_status()
+            document = response.text
+        _discovery_document = document
+    return _discovery_document
+
+
+def get_gmail_service():
+    """The Gmail API service for the current thread."""
+    service = getattr(_local, 'service', None)
+    if service is None:
+        service = build_from_document(get_discovery_document(), credentials=get_credentials())
+        _local.service = service
+    return service
+
+
+def reset_gmail_service():
+    """Drop cached credentials and services (e.g. after changing Gmail settings)."""
+    global _credentials, _discovery_document
+    with _lock:
+        _credentials = None
+        _discovery_document = None
+    _local.__dict__.clear()
+
+
+class GmailAPIBackend(BaseEmailBackend):
+    """
+    Django email backend that sends emails via Gmail API using a service account.
+
+    Required settings:
+        GMAIL_SERVICE_ACCOUNT_FILE: Path to service account JSON key file
+        GMAIL_DELEGATED_USER: Email address to send from (e.g., notifications@yourdomain.com)
+
+    Optional settings:
+        GMAIL_SERVICE_ACCOUNT_INFO: Dict of service account credentials (alternative to file)
+
+    A prebuilt Gmail service can be passed as service= (e.g. one built from a
+    stub discovery document in tests).
+    """
+
+    def __init__(self, fail_silently=False, service=None, **kwargs):
+        super().__init__(fail_silently=fail_silently, **kwargs)
+        self.service = service
+        if self.service is None:
+            try:
+                self.service = get_gmail_service()
+            except Exception as e:
+                logger.error(f"Failed to initialize Gmail API service: {e}")
+                if not self.fail_silently:
+                    raise
 
     def send_messages(self, email_messages):
-        """Send one or more EmailMessage objects and return the number sent."""
+        """Send one or more EmailMessage objects in batches and return the number sent."""
+        email_messages = list(email_messages)
+        if not email_messages:
+            return 0
         if not self.service:
             if not self.fail_silently:
                 raise RuntimeError("Gmail API service not initialized")
             return 0
 
-        sent_count = 0
-        for message in email_messages:
+        raw_messages = {}
+        for index, message in enumerate(email_messages):
+            message.send_error = None
             try:
-                self._send(message)
-                sent_count += 1
+                raw_messages[index] = self._build_raw(message)
             except Exception as e:
-                logger.error(f"Failed to send email to {message.to}: {e}")
-                if not self.fail_silently:
-                    raise
+                message.send_error = e
+
+        pending = list(raw_messages)
+        for attempt in range(BATCH_RETRIES + 1):
+            if attempt:
+                time.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            retry = []
+            for start in range(0, len(pending), BATCH_SIZE):
+                retry += self._send_batch(email_messages, raw_messages, pending[start:start + BATCH_SIZE])
+            pending = retry
+            if not pending:
+                break
+
+        failed = [message for message in email_messages if message.send_error is not None]
+        for message in failed:
+            logger.error(f"Failed to send email to {message.to}: {message.send_error}")
+        if failed and not self.fail_silently:
+            raise failed[0].send_error
+
+        return len(email_messages) - len(failed)
 
-        return sent_count
+    def _send_batch(self, email_messages, raw_messages, indexes):
+        """Send one batch request. Returns the indexes of messages worth retrying."""
+        retry = []
 
-    def _send(self, message):
-        """Send a single EmailMessage via Gmail API."""
+        def callback(request_id, response, exception):
+            message = email_messages[int(request_id)]
+            message.send_error = exception
+            if exception is None:
+                message.gmail_message_id = response.get('id')
+                logger.info(f"Email sent to {message.to} via Gmail API")
+            elif isinstance(exception, HttpError) and exception.resp.status in RETRYABLE_STATUSES:
+                retry.append(int(request_id))
+
+        batch = self.service.new_batch_http_request(callback=callback)
+        for index in indexes:
+            batch.add(
+                self.service.users().messages().send(userId='me', body={'raw': raw_messages[index]}),
+                request_id=str(index),
+            )
+        try:
+            batch.execute()
+        except Exception as e:
+            # The batch itself failed; Gmail may have sent some of it, so don't retry
+            for index in indexes:
+                email_messages[index].send_error = e
+            return []
+        return retry
+
+    def _build_raw(self, message):
+        """Build the base64url-encoded MIME message for an EmailMessage."""
         # Build MIME message
         if message.content_subtype == 'html' or (hasattr(message, 'alternatives') and message.alternatives):
             # HTML email
@@ -148,12 +268,4 @@ class GmailAPIBackend(BaseEmailBackend):
                     part.add_header('Content-Disposition', f'attachment; filename="{filename}"')
                     mime_message.attach(part)
 
-        # Encode and send
-        raw_message = base64.urlsafe_b64encode(mime_message.as_bytes()).decode('utf-8')
-
-        self.service.users().messages().send(
-            userId='me',
-            body={'raw': raw_message}
-        ).execute()
-
-        logger.info(f"Email sent to {message.to} via Gmail API")
+        return base64.urlsafe_b64encode(mime_message.as_bytes()).decode('utf-8')
@@ -81,6 +81,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'core.middleware.MediaCacheMiddleware',  # Add cache headers for media files
     'cms.middleware.RedirectMiddleware',  # CMS URL redirects
+    'subscriptions.middleware.EntitlementMemoMiddleware',  # Per-request feature entitlement memo
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -118,6 +119,30 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Set CACHE_REDIS_URL (requires the redis package) so all processes share one
+# cache; otherwise each process gets its own in-memory cache.
+
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', '')
+
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': 'oneo',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -291,6 +316,23 @@ GMAIL_DELEGATED_USER = os.getenv('GMAIL_DELEGATED_USER', '')
 EMAIL_CC = os.getenv('EMAIL_CC', '')  # Comma-separated list of CC addresses
 EMAIL_REPLY_TO = os.getenv('EMAIL_REPLY_TO', '')  # Reply-To address
 
+# Email outbox sender (notifications.services.email_outbox): messages per
+# batch, provider rate limit per worker process (sustained rate and burst),
+# and send attempts before a message is marked failed
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '50'))
+EMAIL_OUTBOX_RATE_PER_SECOND = float(os.getenv('EMAIL_OUTBOX_RATE_PER_SECOND', '10'))
+EMAIL_OUTBOX_BURST = int(os.getenv('EMAIL_OUTBOX_BURST', '50'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+
+# Notification coalescing (notifications.services.coalescing): bursts of
+# high-churn notifications (stage moves, feedback, offers) to one recipient
+# within this many seconds merge into a single digest. 0 disables it.
+NOTIFICATION_COALESCE_WINDOW_SECONDS = int(os.getenv('NOTIFICATION_COALESCE_WINDOW_SECONDS', '120'))
+
+# Notification event stream (notifications.stream): seconds between heartbeat
+# comments on idle connections, kept below proxy read timeouts
+NOTIFICATION_STREAM_HEARTBEAT_SECONDS = int(os.getenv('NOTIFICATION_STREAM_HEARTBEAT_SECONDS', '15'))
+
 # Legacy SMTP settings (fallback if not using Gmail API)
 EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
 EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
@@ -330,6 +372,8 @@ XERO_REDIRECT_URI = os.getenv(
     'XERO_REDIRECT_URI',
     f'{SITE_URL}/settings/integrations/xero/callback'
 )
+# Accounting API base URL; point at a local fake server in tests
+XERO_API_URL = os.getenv('XERO_API_URL', 'https://api.xero.com/api.xro/2.0')
 XERO_SCOPES = [
     'offline_access',
     'accounting.transactions',
@@ -337,6 +381,45 @@ XERO_SCOPES = [
     'accounting.settings.read',
 ]
 
+# Outbound HTTP client for calendar and Xero APIs (see core/utils/http_client.py)
+# Timeouts are in seconds; idempotent requests are retried on 429/5xx with exponential backoff
+OUTBOUND_HTTP_CONNECT_TIMEOUT = float(os.getenv('OUTBOUND_HTTP_CONNECT_TIMEOUT', '5'))
+OUTBOUND_HTTP_READ_TIMEOUT = float(os.getenv('OUTBOUND_HTTP_READ_TIMEOUT', '30'))
+OUTBOUND_HTTP_RETRIES = int(os.getenv('OUTBOUND_HTTP_RETRIES', '3'))
+OUTBOUND_HTTP_BACKOFF_FACTOR = float(os.getenv('OUTBOUND_HTTP_BACKOFF_FACTOR', '0.5'))
+# Keep-alive connections kept per host
+OUTBOUND_HTTP_POOL_MAXSIZE = int(os.getenv('OUTBOUND_HTTP_POOL_MAXSIZE', '10'))
+
+# Calendar free/busy cache (see scheduling/services/free_busy.py)
+# Busy intervals are refreshed incrementally from the provider once older than this
+CALENDAR_FREE_BUSY_CACHE_TTL = int(os.getenv('CALENDAR_FREE_BUSY_CACHE_TTL', '60'))
+# Concurrent provider calls when computing pooled (multi-interviewer) availability
+CALENDAR_FREE_BUSY_MAX_WORKERS = int(os.getenv('CALENDAR_FREE_BUSY_MAX_WORKERS', '8'))
+
+# CMS redirect hits and blog post views are buffered in memory and written in one batch this often
+CMS_HIT_COUNT_FLUSH_SECONDS = int(os.getenv('CMS_HIT_COUNT_FLUSH_SECONDS', '30'))
+
+# Subscription dashboard summary and alerts (subscriptions.services.summary):
+# seconds results are cached for; any billing change invalidates them sooner
+SUBSCRIPTION_SUMMARY_CACHE_SECONDS = int(os.getenv('SUBSCRIPTION_SUMMARY_CACHE_SECONDS', '60'))
+
+# Public CMS responses: how long rendered responses stay in the server-side
+# cache, and the max-age clients and CDNs may reuse them for before revalidating
+CMS_PUBLIC_CACHE_TIMEOUT = int(os.getenv('CMS_PUBLIC_CACHE_TIMEOUT', '300'))
+CMS_PUBLIC_CACHE_MAX_AGE = int(os.getenv('CMS_PUBLIC_CACHE_MAX_AGE', '60'))
+
+# Pre-generated sitemaps: storage directory, URLs per chunk file (protocol max
+# 50,000) and how long content changes are batched before regenerating
+CMS_SITEMAP_STORAGE_DIR = os.getenv('CMS_SITEMAP_STORAGE_DIR', 'sitemaps')
+CMS_SITEMAP_CHUNK_SIZE = int(os.getenv('CMS_SITEMAP_CHUNK_SIZE', '50000'))
+CMS_SITEMAP_DEBOUNCE_SECONDS = int(os.getenv('CMS_SITEMAP_DEBOUNCE_SECONDS', '60'))
+
+# Background candidate exports hold personal data: they are written outside
+# MEDIA_ROOT (never publicly served), downloaded through an authenticated
+# endpoint, and deleted after CANDIDATE_EXPORT_RETENTION_DAYS
+CANDIDATE_EXPORT_ROOT = os.getenv('CANDIDATE_EXPORT_ROOT', str(BASE_DIR / 'private' / 'candidate_exports'))
+CANDIDATE_EXPORT_RETENTION_DAYS = int(os.getenv('CANDIDATE_EXPORT_RETENTION_DAYS', '7'))
+
 # Celery Configuration (for background tasks)
 # https://docs.celeryq.dev/en/stable/django/first-steps-with-django.html
 #
@@ -396,6 +479,22 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'bottlenecks.resolve_stale_detections',
         'schedule': 60 * 60 * 24,  # Daily - auto-resolve old detections
     },
+    'regenerate-sitemaps': {
+        'task': 'cms.regenerate_sitemaps',
+        'schedule': 60 * 60,  # Hourly - full rebuild catches expired job deadlines
+    },
+    'drain-email-outbox': {
+        'task': 'notifications.drain_email_outbox',
+        'schedule': 60,  # Every minute - retries and emails left by crashed workers
+    },
+    'reconcile-notification-counters': {
+        'task': 'notifications.reconcile_notification_counters',
+        'schedule': 60 * 60,  # Hourly - corrects drifted unread counters
+    },
+    'cleanup-candidate-exports': {
+        'task': 'candidates.cleanup_candidate_exports',
+        'schedule': 60 * 60 * 24,  # Daily - deletes export files past their retention
+    },
 }
 
 # Template directories (for email templates)
@@ -28,7 +28,15 @@ urlpatterns = [
 
     # SEO files at root level (clean URLs)
     path('sitemap.xml', cms_views.sitemap_index, name='sitemap-index'),
+    path('sitemap.xml.gz', cms_views.sitemap_index, {'compressed': True}, name='sitemap-index-gz'),
     path('sitemap.xsl', cms_views.sitemap_xsl, name='sitemap-xsl'),
+    path('<str:sitemap_type>-sitemap-<int:chunk>.xml', cms_views.sitemap_by_type, name='sitemap-chunk'),
+    path(
+        '<str:sitemap_type>-sitemap-<int:chunk>.xml.gz',
+        cms_views.sitemap_by_type,
+        {'compressed': True},
+        name='sitemap-chunk-gz',
+    ),
     path('<str:sitemap_type>-sitemap.xml', cms_views.sitemap_by_type, name='sitemap-by-type'),
     path('robots.txt', cms_views.robots_txt, name='robots-txt'),
     path('llms.txt', cms_views.llms_txt, name='llms-txt'),
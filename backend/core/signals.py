@@ -1,9 +1,11 @@
 """
 Signals for the core app.
-Handles automatic activity logging for tasks.
+Handles automatic activity logging for tasks, and pushes task assignments
+to the assignee's notification stream.
 """
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
+from notifications import events
 from .models import Task, TaskActivity, TaskActivityType, TaskNote, TaskStatus
 
 
@@ -29,6 +31,13 @@ def task_pre_save(sender, instance, **kwargs):
             pass
 
 
+def publish_task_assigned(task):
+    """Push a newly assigned task to the assignee's notification stream."""
+    from notifications.stream import task_event_data
+
+    events.publish('task_assigned', task_event_data(task), users=[task.assigned_to_id])
+
+
 @receiver(post_save, sender=Task)
 def task_post_save(sender, instance, created, **kwargs):
     """Log task activity after save."""
@@ -37,6 +46,8 @@ def task_post_save(sender, instance, created, **kwargs):
     performed_by = getattr(instance, '_current_user', None) or instance.assigned_to
 
     if created:
+        publish_task_assigned(instance)
+
         # New task created
         TaskActivity.objects.create(
             task=instance,
@@ -91,6 +102,7 @@ def task_post_save(sender, instance, created, **kwargs):
 
         # Assignee change
         if original['assigned_to_id'] != instance.assigned_to_id:
+            publish_task_assigned(instance)
             TaskActivity.objects.create(
                 task=instance,
                 activity_type=TaskActivityType.REASSIGNED,
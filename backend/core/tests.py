@@ -1,3 +1,193 @@
-from django.test import TestCase
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+import requests
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from urllib3.util import connection as urllib3_connection
+
+from users.models import User
+from .utils import http_client
+
+
+class StubServer:
+    """
+    A localhost HTTP server that answers each request with the next status in
+    statuses (200 once they run out), after an optional delay.
+    """
+
+    def __init__(self, statuses=(), delay=0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.hits = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self):
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                with stub.lock:
+                    stub.hits.append(self.command)
+                    status = stub.statuses.pop(0) if stub.statuses else 200
+                time.sleep(stub.delay)
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            do_GET = do_POST = _reply
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.host = f"127.0.0.1:{self.server.server_port}"
+        self.url = f"http://{self.host}/resource"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def closed_port_url():
+    """A localhost URL nothing is listening on, so connecting is refused."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/resource"
+
+
+@override_settings(OUTBOUND_HTTP_RETRIES=2, OUTBOUND_HTTP_BACKOFF_FACTOR=0)
+class OutboundSessionTests(SimpleTestCase):
+    """Tests for the shared outbound session's timeout, retry policy and metrics."""
+
+    def setUp(self):
+        http_client.reset_metrics()
+        self.addCleanup(http_client.reset_metrics)
+
+    def serve(self, *args, **kwargs):
+        return self.enterContext(StubServer(*args, **kwargs))
+
+    def test_default_timeout_from_settings(self):
+        with override_settings(OUTBOUND_HTTP_CONNECT_TIMEOUT=1, OUTBOUND_HTTP_READ_TIMEOUT=0.2):
+            session = http_client.build_session()
+        self.enterContext(session)
+        self.assertEqual(session.default_timeout, (1, 0.2))
+        stub = self.serve(delay=0.5)
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            session.post(stub.url)
+        # An explicit timeout still wins over the default
+        self.assertEqual(session.post(stub.url, timeout=5).status_code, 200)
+
+    def test_get_retried_on_throttling_and_server_errors(self):
+        session = self.enterContext(http_client.build_session())
+        stub = self.serve([429, 503])
+
+        response = session.get(stub.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(stub.hits, ['GET'] * 3)
+
+    def test_get_returns_last_response_once_retries_run_out(self):
+        session = self.enterContext(http_client.build_session())
+        stub = self.serve([502, 502, 502, 502])
+
+        response = session.get(stub.url)
+
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(len(stub.hits), 3)
+
+    def test_post_not_retried_after_a_response(self):
+        session = self.enterContext(http_client.build_session())
+        stub = self.serve([503, 429])
+
+        self.assertEqual(session.post(stub.url).status_code, 503)
+        self.assertEqual(session.post(stub.url).status_code, 429)
+        self.assertEqual(stub.hits, ['POST', 'POST'])
+
+    def test_post_retried_on_connection_errors(self):
+        session = self.enterContext(http_client.build_session())
+        connect = self.enterContext(mock.patch.object(
+            urllib3_connection, 'create_connection', wraps=urllib3_connection.create_connection,
+        ))
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            session.post(closed_port_url())
+
+        self.assertEqual(connect.call_count, 3)
+
+    def test_metrics_per_host(self):
+        session = self.enterContext(http_client.build_session())
+        first = self.serve([500, 500, 500, 404])
+        second = self.serve()
+
+        session.get(first.url)
+        session.post(first.url)
+        session.get(second.url)
+
+        metrics = http_client.get_metrics()
+        self.assertEqual(set(metrics), {first.host, second.host})
+        # Retries happen below the session, so a retried GET counts once
+        self.assertEqual(metrics[first.host]['requests'], 2)
+        self.assertEqual(metrics[first.host]['errors'], 1)
+        self.assertEqual(metrics[second.host]['requests'], 1)
+        self.assertEqual(metrics[second.host]['errors'], 0)
+
+    def test_connection_errors_count_as_failures(self):
+        session = self.enterContext(http_client.build_session())
+        url = closed_port_url()
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            session.get(url)
+
+        host = url.split('/')[2]
+        self.assertEqual(http_client.get_metrics()[host]['errors'], 1)
+
+
+class SingleFlightRefreshTests(TestCase):
+    """Tests for single_flight_refresh's lock-and-recheck."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='worker', email='worker@example.com', password='password123', first_name='stale',
+        )
+
+    @staticmethod
+    def needs_refresh(user):
+        return user.first_name == 'stale'
+
+    @staticmethod
+    def refresh(user):
+        user.first_name = 'fresh'
+        user.save(update_fields=['first_name'])
+
+    def test_refreshes_under_row_lock(self):
+        refresh = mock.Mock(side_effect=self.refresh)
+
+        with CaptureQueriesContext(connection) as queries:
+            http_client.single_flight_refresh(self.user, self.needs_refresh, refresh)
+
+        refresh.assert_called_once()
+        self.assertIsNot(refresh.call_args.args[0], self.user)
+        selects = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertIn('FOR UPDATE', selects[0])
+        self.assertEqual(self.user.first_name, 'fresh')
+
+    def test_skips_refresh_done_by_another_worker(self):
+        # Another worker refreshed the row after this instance was loaded
+        User.objects.filter(pk=self.user.pk).update(first_name='fresh')
+        refresh = mock.Mock(side_effect=self.refresh)
+
+        http_client.single_flight_refresh(self.user, self.needs_refresh, refresh)
+
+        refresh.assert_not_called()
+        self.assertEqual(self.user.first_name, 'fresh')
@@ -4,6 +4,7 @@ Core utilities for the application.
 Provides shared functionality used across multiple apps:
 - Template rendering with {variable} syntax
 - Recipient resolution for notifications/automations
+- Pooled outbound HTTP client for integrations (http_client)
 """
 from .templating import TemplateRenderer, ContextBuilder
 from .recipients import RecipientResolver, ExternalRecipient, resolve_recipients
@@ -0,0 +1,192 @@
+"""
+Shared outbound HTTP client for third-party integrations.
+
+Calendar (Google/Microsoft) and Xero calls go through one requests.Session per
+process so connections to each host are kept alive and reused instead of
+paying a TCP+TLS handshake per call. The session applies:
+
+- A default (connect, read) timeout to every request
+- Retries with exponential backoff on connection errors and on 429/5xx
+  responses for idempotent methods, honouring Retry-After
+- Per-host request metrics (count, errors, total time), logged when slow
+
+Usage mirrors the requests API:
+
+    from core.utils import http_client
+    response = http_client.get(url, headers=headers, params=params)
+
+single_flight_refresh() serializes OAuth token refreshes for a connection row
+so two workers never spend the same refresh token.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_POOL_MAXSIZE = 10
+
+# Number of distinct hosts whose keep-alive pools are kept open
+POOL_CONNECTIONS = 20
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Requests slower than this are logged as warnings
+SLOW_REQUEST_SECONDS = 5
+
+
+class _HostMetrics:
+    __slots__ = ('requests', 'errors', 'total_seconds')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+
+
+_metrics: Dict[str, _HostMetrics] = defaultdict(_HostMetrics)
+_metrics_lock = threading.Lock()
+
+
+def _record(host: str, seconds: float, failed: bool) -> None:
+    with _metrics_lock:
+        metrics = _metrics[host]
+        metrics.requests += 1
+        metrics.total_seconds += seconds
+        if failed:
+            metrics.errors += 1
+
+
+def get_metrics() -> Dict[str, Dict[str, float]]:
+    """Snapshot of outbound request metrics per host since process start."""
+    with _metrics_lock:
+        return {
+            host: {
+                'requests': metrics.requests,
+                'errors': metrics.errors,
+                'total_seconds': round(metrics.total_seconds, 3),
+                'avg_ms': round(metrics.total_seconds * 1000 / metrics.requests, 1) if metrics.requests else 0,
+            }
+            for host, metrics in _metrics.items()
+        }
+
+
+def reset_metrics() -> None:
+    with _metrics_lock:
+        _metrics.clear()
+
+
+class OutboundSession(requests.Session):
+    """requests.Session with a default timeout and per-host metrics."""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.default_timeout)
+        host = urlsplit(url).netloc
+        started = time.monotonic()
+        failed = True
+        try:
+            response = super().request(method, url, **kwargs)
+            failed = response.status_code >= 500
+            return response
+        finally:
+            elapsed = time.monotonic() - started
+            _record(host, elapsed, failed)
+            if elapsed > SLOW_REQUEST_SECONDS:
+                logger.warning(f"Slow outbound request: {method} {host} took {elapsed:.1f}s")
+
+
+def build_session() -> OutboundSession:
+    """Create a session configured from the OUTBOUND_HTTP_* settings."""
+    session = OutboundSession(timeout=(
+        getattr(settings, 'OUTBOUND_HTTP_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT),
+        getattr(settings, 'OUTBOUND_HTTP_READ_TIMEOUT', DEFAULT_READ_TIMEOUT),
+    ))
+    retry = Retry(
+        total=getattr(settings, 'OUTBOUND_HTTP_RETRIES', DEFAULT_RETRIES),
+        backoff_factor=getattr(settings, 'OUTBOUND_HTTP_BACKOFF_FACTOR', DEFAULT_BACKOFF_FACTOR),
+        status_forcelist=RETRY_STATUSES,
+        # POST/PATCH are only retried on connection errors, never after a response
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=getattr(settings, 'OUTBOUND_HTTP_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE),
+        max_retries=retry,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> OutboundSession:
+    """The process-wide outbound session, created on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
+
+
+def patch(url: str, **kwargs) -> requests.Response:
+    return request('PATCH', url, **kwargs)
+
+
+def put(url: str, **kwargs) -> requests.Response:
+    return request('PUT', url, **kwargs)
+
+
+def delete(url: str, **kwargs) -> requests.Response:
+    return request('DELETE', url, **kwargs)
+
+
+def single_flight_refresh(instance, needs_refresh: Callable, refresh: Callable) -> None:
+    """
+    Refresh an OAuth token stored on a model row at most once across workers.
+
+    The row is locked with SELECT ... FOR UPDATE and re-read; refresh(locked)
+    only runs if needs_refresh(locked) is still true, so a worker that waited
+    on the lock picks up the token the first worker saved. instance is
+    reloaded from the database afterwards.
+    """
+    with transaction.atomic():
+        locked = type(instance).objects.select_for_update().get(pk=instance.pk)
+        if needs_refresh(locked):
+            refresh(locked)
+    instance.refresh_from_db()
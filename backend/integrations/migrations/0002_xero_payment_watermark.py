@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-18 22:44
+
+from django.db import migrations, models
+
+
+def seed_watermark(apps, schema_editor):
+    """Continue from the last sync rather than downloading every payment again."""
+    XeroConnection = apps.get_model('integrations', 'XeroConnection')
+    XeroConnection.objects.update(payments_modified_since=models.F('last_sync_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='xeroconnection',
+            name='payments_modified_since',
+            field=models.DateTimeField(blank=True, help_text='Xero UpdatedDateUTC of the newest payment synced; the next sync asks for payments modified since then', null=True),
+        ),
+        migrations.RunPython(seed_watermark, migrations.RunPython.noop),
+    ]
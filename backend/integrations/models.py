@@ -46,6 +46,11 @@ class XeroConnection(models.Model):
         blank=True,
         help_text='Last successful payment sync timestamp'
     )
+    payments_modified_since = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Xero UpdatedDateUTC of the newest payment synced; the next sync asks for payments modified since then"
+    )
 
     # Audit
     connected_by = models.ForeignKey(
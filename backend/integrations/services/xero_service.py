@@ -1,18 +1,27 @@
 """
 Xero integration service for OAuth, invoice sync, and payment reconciliation.
+
+Invoices are pushed in Xero's batch form, INVOICE_BATCH_SIZE per request,
+with any missing contacts created in batches first. Payments are pulled
+incrementally: each sync asks only for payments modified since the
+connection's stored watermark (If-Modified-Since), a page at a time, and
+reconciles each page in bulk.
 """
 
 import logging
 import re
 from datetime import datetime, timedelta, timezone as dt_timezone
-from decimal import Decimal
-from typing import Optional
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urlencode
 
-import requests
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Sum
 from django.utils import timezone
 
+from core.utils import http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,6 +52,16 @@ XERO_TOKEN_URL = 'https://identity.xero.com/connect/token'
 XERO_API_URL = 'https://api.xero.com/api.xro/2.0'
 XERO_CONNECTIONS_URL = 'https://api.xero.com/connections'
 
+# Xero accepts up to 50 invoices (and contacts) per batch request
+INVOICE_BATCH_SIZE = 50
+
+# Xero returns /Payments 100 at a time
+PAYMENTS_PAGE_SIZE = 100
+
+# Payments modified this close to the watermark are fetched again (and
+# skipped as already recorded), since If-Modified-Since has second precision
+PAYMENT_SYNC_OVERLAP = timedelta(minutes=1)
+
 
 class XeroError(Exception):
     """Base exception for Xero-related errors."""
@@ -76,6 +95,7 @@ class XeroService:
         self.client_secret = settings.XERO_CLIENT_SECRET
         self.redirect_uri = settings.XERO_REDIRECT_URI
         self.scopes = settings.XERO_SCOPES
+        self.api_url = getattr(settings, 'XERO_API_URL', XERO_API_URL)
 
     # -------------------------------------------------------------------------
     # OAuth Methods
@@ -113,7 +133,7 @@ class XeroService:
         Raises:
             XeroAuthError: If token exchange fails
         """
-        response = requests.post(
+        response = http_client.post(
             XERO_TOKEN_URL,
             data={
                 'grant_type': 'authorization_code',
@@ -143,7 +163,7 @@ class XeroService:
         Raises:
             XeroAuthError: If token refresh fails
         """
-        response = requests.post(
+        response = http_client.post(
             XERO_TOKEN_URL,
             data={
                 'grant_type': 'refresh_token',
@@ -169,7 +189,7 @@ class XeroService:
         Returns:
             List of connected tenants with tenantId and tenantName
         """
-        response = requests.get(
+        response = http_client.get(
             XERO_CONNECTIONS_URL,
             headers={'Authorization': f'Bearer {access_token}'},
         )
@@ -190,27 +210,37 @@ class XeroService:
         Returns:
             Valid access token
         """
-        if connection.token_expires_at <= timezone.now():
-            logger.info(f"Refreshing Xero token for tenant {connection.tenant_id}")
-            tokens = self.refresh_token(connection.refresh_token)
-
-            connection.access_token = tokens['access_token']
-            connection.refresh_token = tokens['refresh_token']
-            connection.token_expires_at = timezone.now() + timedelta(
-                seconds=tokens['expires_in']
-            )
-            connection.save(update_fields=[
-                'access_token', 'refresh_token', 'token_expires_at', 'updated_at'
-            ])
+        if self._token_expired(connection):
+            # Xero refresh tokens are single-use, so concurrent workers must not both refresh
+            http_client.single_flight_refresh(connection, self._token_expired, self._refresh_connection)
 
         return connection.access_token
 
+    @staticmethod
+    def _token_expired(connection) -> bool:
+        return connection.token_expires_at <= timezone.now()
+
+    def _refresh_connection(self, connection) -> None:
+        logger.info(f"Refreshing Xero token for tenant {connection.tenant_id}")
+        tokens = self.refresh_token(connection.refresh_token)
+
+        connection.access_token = tokens['access_token']
+        connection.refresh_token = tokens['refresh_token']
+        connection.token_expires_at = timezone.now() + timedelta(
+            seconds=tokens['expires_in']
+        )
+        connection.save(update_fields=[
+            'access_token', 'refresh_token', 'token_expires_at', 'updated_at'
+        ])
+
     def _make_api_request(
         self,
         connection,
         method: str,
         endpoint: str,
         data: Optional[dict] = None,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
     ) -> dict:
         """
         Make an authenticated API request to Xero.
@@ -220,25 +250,29 @@ class XeroService:
             method: HTTP method (GET, POST, PUT)
             endpoint: API endpoint (e.g., '/Contacts')
             data: Request body data
+            params: Query string parameters
+            headers: Extra headers (e.g., If-Modified-Since)
 
         Returns:
             API response data
         """
         access_token = self._get_valid_token(connection)
 
-        headers = {
+        request_headers = {
             'Authorization': f'Bearer {access_token}',
             'Xero-Tenant-Id': connection.tenant_id,
             'Content-Type': 'application/json',
             'Accept': 'application/json',
+            **(headers or {}),
         }
 
-        url = f"{XERO_API_URL}{endpoint}"
+        url = f"{self.api_url}{endpoint}"
 
-        response = requests.request(
+        response = http_client.request(
             method=method,
             url=url,
-            headers=headers,
+            headers=request_headers,
+            params=params,
             json=data,
         )
 
@@ -417,83 +451,235 @@ class XeroService:
 
         Returns:
             Xero Invoice ID
+
+        Raises:
+            XeroAPIError: If Xero rejects the invoice
         """
         from integrations.models import (
             XeroInvoiceMapping,
             XeroInvoiceMappingSyncStatus,
         )
 
-        # Ensure contact exists in Xero
-        xero_contact_id = self.sync_contact(connection, invoice.company)
+        mapping = XeroInvoiceMapping.objects.filter(invoice=invoice).first()
+        if mapping and mapping.sync_status == XeroInvoiceMappingSyncStatus.SYNCED:
+            logger.info(f"Invoice {invoice.id} already synced to Xero")
+            return mapping.xero_invoice_id
+
+        self.push_invoices(connection, [invoice])
+
+        mapping = XeroInvoiceMapping.objects.get(invoice=invoice)
+        if mapping.sync_status != XeroInvoiceMappingSyncStatus.SYNCED:
+            raise XeroAPIError(mapping.sync_error)
+        return mapping.xero_invoice_id
+
+    def pending_invoices(self):
+        """Invoices waiting to be pushed: pending or failed syncs, and sent invoices never synced."""
+        from integrations.models import XeroInvoiceMappingSyncStatus
+        from subscriptions.models import Invoice, InvoiceStatus
+
+        return (
+            Invoice.objects.filter(
+                Q(xero_mapping__sync_status__in=[
+                    XeroInvoiceMappingSyncStatus.PENDING,
+                    XeroInvoiceMappingSyncStatus.ERROR,
+                ])
+                | Q(status=InvoiceStatus.SENT, xero_mapping__isnull=True)
+            )
+            .select_related('company')
+            .prefetch_related('line_items')
+            .order_by('created_at')
+        )
 
-        # Build invoice data
-        invoice_data = self._build_invoice_data(invoice, xero_contact_id)
+    @staticmethod
+    def _item_errors(item: dict, id_field: str) -> Optional[str]:
+        """The error for one item of a summarizeErrors=false batch response, or None."""
+        validation_errors = item.get('ValidationErrors') or []
+        if (
+            item.get(id_field)
+            and not item.get('HasErrors')
+            and not validation_errors
+            and item.get('StatusAttributeString') != 'ERROR'
+        ):
+            return None
+        return '; '.join(
+            error.get('Message', '') for error in validation_errors
+        ) or 'Rejected by Xero'
 
-        # Check if mapping already exists (retry scenario)
-        try:
-            mapping = XeroInvoiceMapping.objects.get(invoice=invoice)
+    def _ensure_contacts(self, connection, companies: Iterable) -> Tuple[Dict, Dict]:
+        """
+        Xero contact IDs for the given companies, creating missing contacts in batches.
 
-            if mapping.sync_status == XeroInvoiceMappingSyncStatus.SYNCED:
-                logger.info(f"Invoice {invoice.id} already synced to Xero")
-                return mapping.xero_invoice_id
+        Batches are sent with summarizeErrors=false, so a contact Xero
+        rejects fails alone. Existing contacts are not re-posted here;
+        billing detail changes are pushed by the sync_company_contact task.
 
-            # Retry failed sync
-            invoice_data['InvoiceID'] = mapping.xero_invoice_id
+        Returns:
+            Tuple of (company id to Xero Contact ID, company id to error)
+        """
+        from integrations.models import XeroContactMapping
 
-        except XeroInvoiceMapping.DoesNotExist:
-            mapping = None
+        companies = {company.id: company for company in companies}
+        contact_ids = dict(
+            XeroContactMapping.objects.filter(company_id__in=companies)
+            .values_list('company_id', 'xero_contact_id')
+        )
+        contact_errors = {}
 
-        try:
-            response = self._make_api_request(
-                connection,
-                'POST',
-                '/Invoices',
-                {'Invoices': [invoice_data]},
-            )
+        missing = [company for company_id, company in companies.items() if company_id not in contact_ids]
+        for start in range(0, len(missing), INVOICE_BATCH_SIZE):
+            batch = missing[start:start + INVOICE_BATCH_SIZE]
+            try:
+                response = self._make_api_request(
+                    connection,
+                    'POST',
+                    '/Contacts',
+                    {'Contacts': [self._build_contact_data(company) for company in batch]},
+                    params={'summarizeErrors': 'false'},
+                )
+            except XeroAPIError as e:
+                for company in batch:
+                    contact_errors[company.id] = f"Could not create Xero contact: {e}"
+                continue
+
+            # Xero returns the contacts in the order they were sent
+            returned = response.get('Contacts', [])
+            mappings = []
+            for index, company in enumerate(batch):
+                contact = returned[index] if index < len(returned) else {}
+                error = self._item_errors(contact, 'ContactID')
+                if error:
+                    logger.error(f"Failed to create Xero contact for company {company.id}: {error}")
+                    contact_errors[company.id] = f"Could not create Xero contact: {error}"
+                    continue
+                contact_ids[company.id] = contact['ContactID']
+                mappings.append(XeroContactMapping(company=company, xero_contact_id=contact['ContactID']))
+            XeroContactMapping.objects.bulk_create(mappings)
+            logger.info(f"Created {len(mappings)} Xero contact(s)")
+
+        return contact_ids, contact_errors
+
+    def push_invoices(self, connection, invoices: Iterable) -> dict:
+        """
+        Push invoices to Xero, INVOICE_BATCH_SIZE per request.
 
-            xero_invoice = response['Invoices'][0]
-            xero_invoice_id = xero_invoice['InvoiceID']
-            xero_invoice_number = xero_invoice.get('InvoiceNumber', '')
+        Each batch is sent with summarizeErrors=false, so Xero accepts the
+        valid invoices and reports errors per invoice. Mappings record the
+        outcome of every invoice; a failed request marks its whole batch.
 
-            if mapping:
-                mapping.xero_invoice_id = xero_invoice_id
-                mapping.xero_invoice_number = xero_invoice_number
-                mapping.sync_status = XeroInvoiceMappingSyncStatus.SYNCED
-                mapping.sync_error = ''
-                mapping.last_synced_at = timezone.now()
-                mapping.save()
-            else:
-                XeroInvoiceMapping.objects.create(
-                    invoice=invoice,
-                    xero_invoice_id=xero_invoice_id,
-                    xero_invoice_number=xero_invoice_number,
-                    sync_status=XeroInvoiceMappingSyncStatus.SYNCED,
-                    last_synced_at=timezone.now(),
-                )
+        Args:
+            connection: XeroConnection instance
+            invoices: Invoices, ideally with company and line_items loaded
 
-            # Update invoice with external reference
-            invoice.external_invoice_number = xero_invoice_number
-            invoice.external_system = 'Xero'
-            invoice.save(update_fields=['external_invoice_number', 'external_system', 'updated_at'])
+        Returns:
+            Dict with counts of synced invoices and errors
+        """
+        from integrations.models import (
+            XeroInvoiceMapping,
+            XeroInvoiceMappingSyncStatus,
+        )
+        from subscriptions.models import Invoice
 
-            logger.info(f"Synced invoice {invoice.id} to Xero as {xero_invoice_id}")
-            return xero_invoice_id
+        invoices = list(invoices)
+        synced = 0
+        errors = 0
 
-        except XeroAPIError as e:
-            # Record sync error
-            if mapping:
-                mapping.sync_status = XeroInvoiceMappingSyncStatus.ERROR
-                mapping.sync_error = str(e)
-                mapping.save()
+        contact_ids, contact_errors = self._ensure_contacts(
+            connection, [invoice.company for invoice in invoices],
+        )
+
+        mappings = {
+            mapping.invoice_id: mapping
+            for mapping in XeroInvoiceMapping.objects.filter(invoice__in=invoices)
+        }
+
+        to_send = []
+        results = {}  # invoice id -> (xero invoice, error)
+        for invoice in invoices:
+            if invoice.company_id not in contact_ids:
+                results[invoice.id] = (
+                    None, contact_errors.get(invoice.company_id, 'Could not create Xero contact'),
+                )
             else:
-                XeroInvoiceMapping.objects.create(
-                    invoice=invoice,
-                    xero_invoice_id='',
-                    xero_invoice_number='',
-                    sync_status=XeroInvoiceMappingSyncStatus.ERROR,
-                    sync_error=str(e),
+                to_send.append(invoice)
+
+        for start in range(0, len(to_send), INVOICE_BATCH_SIZE):
+            batch = to_send[start:start + INVOICE_BATCH_SIZE]
+            payload = []
+            for invoice in batch:
+                invoice_data = self._build_invoice_data(invoice, contact_ids[invoice.company_id])
+                mapping = mappings.get(invoice.id)
+                if mapping and mapping.xero_invoice_id:
+                    # Retry of an invoice Xero already has
+                    invoice_data['InvoiceID'] = mapping.xero_invoice_id
+                payload.append(invoice_data)
+
+            try:
+                response = self._make_api_request(
+                    connection,
+                    'POST',
+                    '/Invoices',
+                    {'Invoices': payload},
+                    params={'summarizeErrors': 'false'},
                 )
-            raise
+            except XeroAPIError as e:
+                for invoice in batch:
+                    results[invoice.id] = (None, str(e))
+                continue
+
+            # Xero returns the invoices in the order they were sent
+            returned = response.get('Invoices', [])
+            for index, invoice in enumerate(batch):
+                xero_invoice = returned[index] if index < len(returned) else {}
+                error = self._item_errors(xero_invoice, 'InvoiceID')
+                results[invoice.id] = (None, error) if error else (xero_invoice, '')
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        synced_invoices = []
+        for invoice in invoices:
+            xero_invoice, error = results[invoice.id]
+            mapping = mappings.get(invoice.id)
+            if mapping is None:
+                mapping = XeroInvoiceMapping(invoice=invoice, xero_invoice_id='', xero_invoice_number='')
+                to_create.append(mapping)
+            else:
+                mapping.updated_at = now
+                to_update.append(mapping)
+
+            if xero_invoice:
+                mapping.xero_invoice_id = xero_invoice['InvoiceID']
+                mapping.xero_invoice_number = xero_invoice.get('InvoiceNumber', '')
+                mapping.sync_status = XeroInvoiceMappingSyncStatus.SYNCED
+                mapping.sync_error = ''
+                mapping.last_synced_at = now
+
+                invoice.external_invoice_number = mapping.xero_invoice_number
+                invoice.external_system = 'Xero'
+                invoice.updated_at = now
+                synced_invoices.append(invoice)
+                synced += 1
+            else:
+                mapping.sync_status = XeroInvoiceMappingSyncStatus.ERROR
+                mapping.sync_error = error
+                logger.error(f"Failed to sync invoice {invoice.id}: {error}")
+                errors += 1
+
+        with transaction.atomic():
+            XeroInvoiceMapping.objects.bulk_create(to_create)
+            XeroInvoiceMapping.objects.bulk_update(to_update, [
+                'xero_invoice_id', 'xero_invoice_number', 'sync_status',
+                'sync_error', 'last_synced_at', 'updated_at',
+            ])
+            Invoice.objects.bulk_update(
+                synced_invoices, ['external_invoice_number', 'external_system', 'updated_at'],
+            )
+
+        logger.info(f"Pushed invoices to Xero: {synced} synced, {errors} errors")
+        return {
+            'synced': synced,
+            'errors': errors,
+        }
 
     def _build_invoice_data(self, invoice, xero_contact_id: str) -> dict:
         """Build Xero invoice data from Oneo invoice."""
@@ -558,46 +744,80 @@ class XeroService:
     # Payment Methods
     # -------------------------------------------------------------------------
 
-    def fetch_payments(self, connection, since_date: Optional[datetime] = None) -> list:
+    def fetch_payment_pages(
+        self,
+        connection,
+        modified_since: Optional[datetime] = None,
+    ) -> Iterator[List[dict]]:
         """
-        Fetch payments from Xero since a given date.
+        Fetch payments from Xero a page at a time, oldest change first.
 
         Args:
             connection: XeroConnection instance
-            since_date: Fetch payments modified since this date
+            modified_since: Only fetch payments modified since this time
 
-        Returns:
-            List of Xero payment objects
+        Yields:
+            Lists of up to PAYMENTS_PAGE_SIZE Xero payment objects
         """
-        endpoint = '/Payments'
+        headers = {}
+        if modified_since:
+            headers['If-Modified-Since'] = (
+                modified_since.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+            )
 
-        if since_date:
-            # Xero uses If-Modified-Since header
-            pass  # For now, fetch all and filter
+        page = 1
+        while True:
+            response = self._make_api_request(
+                connection,
+                'GET',
+                '/Payments',
+                params={'page': page, 'order': 'UpdatedDateUTC ASC'},
+                headers=headers,
+            )
+            payments = response.get('Payments', [])
+            if payments:
+                yield payments
+            if len(payments) < PAYMENTS_PAGE_SIZE:
+                return
+            page += 1
 
-        response = self._make_api_request(connection, 'GET', endpoint)
-        payments = response.get('Payments', [])
+    def fetch_payments(self, connection, since_date: Optional[datetime] = None) -> list:
+        """
+        Fetch payments from Xero modified since a given date.
 
-        if since_date:
-            payments = [
-                p for p in payments
-                if parse_xero_date(p['Date']) >= since_date
-            ]
+        Args:
+            connection: XeroConnection instance
+            since_date: Fetch payments modified since this date
 
-        return payments
+        Returns:
+            List of Xero payment objects
+        """
+        return [
+            payment
+            for page in self.fetch_payment_pages(connection, since_date)
+            for payment in page
+        ]
 
-    def reconcile_payment(self, connection, xero_payment: dict) -> Optional[str]:
+    def reconcile_payments(self, connection, xero_payments: List[dict]) -> dict:
         """
-        Reconcile a Xero payment with an Oneo invoice.
+        Reconcile a batch of Xero payments with Oneo invoices.
+
+        Payments already recorded, or for invoices that weren't pushed from
+        Oneo, are skipped. The rest are inserted in bulk, and each affected
+        invoice's amount_paid and status are recomputed from its payments.
 
         Args:
             connection: XeroConnection instance
-            xero_payment: Xero payment object
+            xero_payments: Xero payment objects
 
         Returns:
-            Payment ID if created, None if already exists or no match
+            Dict with counts of synced, skipped and errored payments
         """
-        from integrations.models import XeroInvoiceMapping, XeroPaymentMapping
+        from integrations.models import (
+            XeroConnection,
+            XeroInvoiceMapping,
+            XeroPaymentMapping,
+        )
         from subscriptions.models import (
             Invoice,
             InvoiceStatus,
@@ -606,119 +826,178 @@ class XeroService:
             SubscriptionActivityLog,
             SubscriptionActivityType,
         )
+        from subscriptions.services.summary import bump_billing_version
 
-        xero_payment_id = xero_payment['PaymentID']
+        synced = 0
+        skipped = 0
+        errors = 0
 
-        # Check if payment already recorded
-        if XeroPaymentMapping.objects.filter(xero_payment_id=xero_payment_id).exists():
-            logger.debug(f"Payment {xero_payment_id} already recorded")
-            return None
+        # Map payment type
+        method_map = {
+            'ACCRECPAYMENT': PaymentMethod.BANK_TRANSFER,
+        }
 
-        # Find matching invoice
-        xero_invoice_id = xero_payment.get('Invoice', {}).get('InvoiceID')
-        if not xero_invoice_id:
-            logger.warning(f"Payment {xero_payment_id} has no invoice reference")
-            return None
+        with transaction.atomic():
+            # Overlapping syncs queue here rather than both inserting a payment
+            XeroConnection.objects.select_for_update().filter(pk=connection.pk).first()
 
-        try:
-            mapping = XeroInvoiceMapping.objects.get(xero_invoice_id=xero_invoice_id)
-            invoice = mapping.invoice
-        except XeroInvoiceMapping.DoesNotExist:
-            logger.warning(
-                f"No invoice mapping found for Xero invoice {xero_invoice_id}"
+            payment_ids = [p['PaymentID'] for p in xero_payments if p.get('PaymentID')]
+            recorded = set(
+                XeroPaymentMapping.objects.filter(xero_payment_id__in=payment_ids)
+                .values_list('xero_payment_id', flat=True)
             )
-            return None
+            invoice_ids = {(p.get('Invoice') or {}).get('InvoiceID') for p in xero_payments} - {None}
+            invoices = {
+                mapping.xero_invoice_id: mapping.invoice
+                for mapping in XeroInvoiceMapping.objects.filter(xero_invoice_id__in=invoice_ids)
+                .select_related('invoice')
+            }
 
-        # Parse payment amount
-        amount = Decimal(str(xero_payment['Amount']))
+            payments = []
+            payment_mappings = []
+            for xero_payment in xero_payments:
+                xero_payment_id = xero_payment.get('PaymentID')
+                if not xero_payment_id or xero_payment_id in recorded:
+                    logger.debug(f"Payment {xero_payment_id} already recorded")
+                    skipped += 1
+                    continue
 
-        # Map payment type
-        payment_type = xero_payment.get('PaymentType', 'ACCRECPAYMENT')
-        method_map = {
-            'ACCRECPAYMENT': PaymentMethod.BANK_TRANSFER,
-        }
-        payment_method = method_map.get(payment_type, PaymentMethod.BANK_TRANSFER)
-
-        # Parse payment date using Xero date helper
-        payment_date = parse_xero_date(xero_payment['Date']).date()
-
-        # Create payment record
-        payment = Payment.objects.create(
-            invoice=invoice,
-            amount=amount,
-            payment_date=payment_date,
-            payment_method=payment_method,
-            reference_number=xero_payment.get('Reference', f"XERO-{xero_payment_id[:8]}"),
-            notes=f"Imported from Xero (Payment ID: {xero_payment_id})",
-        )
+                xero_invoice_id = (xero_payment.get('Invoice') or {}).get('InvoiceID')
+                invoice = invoices.get(xero_invoice_id)
+                if invoice is None:
+                    logger.warning(f"No invoice mapping found for Xero payment {xero_payment_id}")
+                    skipped += 1
+                    continue
 
-        # Create mapping to prevent duplicates
-        XeroPaymentMapping.objects.create(
-            payment=payment,
-            xero_payment_id=xero_payment_id,
-        )
+                try:
+                    amount = Decimal(str(xero_payment['Amount']))
+                    payment_date = parse_xero_date(xero_payment['Date']).date()
+                except (KeyError, InvalidOperation, ValueError, AttributeError) as e:
+                    logger.error(f"Error reconciling payment {xero_payment_id}: {e}")
+                    errors += 1
+                    continue
 
-        # Update invoice status
-        total_paid = sum(p.amount for p in invoice.payments.all())
-        old_status = invoice.status
-
-        if total_paid >= invoice.total_amount:
-            invoice.status = InvoiceStatus.PAID
-        elif total_paid > 0:
-            invoice.status = InvoiceStatus.PARTIALLY_PAID
-
-        if invoice.status != old_status:
-            invoice.save(update_fields=['status', 'updated_at'])
-
-            # Log activity
-            SubscriptionActivityLog.objects.create(
-                company=invoice.company,
-                subscription=invoice.subscription,
-                invoice=invoice,
-                activity_type=SubscriptionActivityType.PAYMENT_RECORDED,
-                metadata={
-                    'source': 'xero_sync',
-                    'xero_payment_id': xero_payment_id,
-                    'payment_id': str(payment.id),
-                    'amount': str(amount),
-                },
+                payment = Payment(
+                    invoice=invoice,
+                    amount=amount,
+                    payment_date=payment_date,
+                    payment_method=method_map.get(
+                        xero_payment.get('PaymentType', 'ACCRECPAYMENT'), PaymentMethod.BANK_TRANSFER,
+                    ),
+                    reference_number=xero_payment.get('Reference', f"XERO-{xero_payment_id[:8]}"),
+                    notes=f"Imported from Xero (Payment ID: {xero_payment_id})",
+                )
+                payments.append(payment)
+                payment_mappings.append(XeroPaymentMapping(payment=payment, xero_payment_id=xero_payment_id))
+                recorded.add(xero_payment_id)
+
+            if not payments:
+                return {'synced': 0, 'skipped': skipped, 'errors': errors}
+
+            Payment.objects.bulk_create(payments)
+            XeroPaymentMapping.objects.bulk_create(payment_mappings)
+            synced = len(payments)
+
+            # Recompute amount_paid from every payment on the affected invoices
+            affected = {payment.invoice_id: payment.invoice for payment in payments}
+            totals = dict(
+                Payment.objects.filter(invoice_id__in=affected)
+                .values('invoice_id')
+                .annotate(total=Sum('amount'))
+                .values_list('invoice_id', 'total')
+                .order_by()
             )
+            latest_payment = {mapping.payment.invoice_id: mapping for mapping in payment_mappings}
+
+            now = timezone.now()
+            unchanged = []
+            for invoice_id, invoice in affected.items():
+                invoice.amount_paid = totals.get(invoice_id) or Decimal('0')
+                invoice.updated_at = now
+                old_status = invoice.status
+
+                if invoice.amount_paid >= invoice.total_amount:
+                    invoice.status = InvoiceStatus.PAID
+                    invoice.paid_at = invoice.paid_at or now
+                elif invoice.amount_paid > 0:
+                    invoice.status = InvoiceStatus.PARTIALLY_PAID
+
+                if invoice.status == old_status:
+                    unchanged.append(invoice)
+                    continue
+
+                # A status change goes through save() so automations see it
+                invoice.save(update_fields=['amount_paid', 'status', 'paid_at', 'updated_at'])
+
+                payment_mapping = latest_payment[invoice_id]
+                SubscriptionActivityLog.objects.create(
+                    company_id=invoice.company_id,
+                    subscription_id=invoice.subscription_id,
+                    invoice=invoice,
+                    activity_type=SubscriptionActivityType.PAYMENT_RECORDED,
+                    metadata={
+                        'source': 'xero_sync',
+                        'xero_payment_id': payment_mapping.xero_payment_id,
+                        'payment_id': str(payment_mapping.payment.id),
+                        'amount': str(payment_mapping.payment.amount),
+                    },
+                )
 
-        logger.info(
-            f"Created payment {payment.id} from Xero payment {xero_payment_id}"
-        )
-        return str(payment.id)
+            Invoice.objects.bulk_update(unchanged, ['amount_paid', 'updated_at'])
+
+            # bulk_create skips the Payment signals that invalidate the billing summary
+            bump_billing_version()
+
+        logger.info(f"Created {synced} payment(s) from Xero")
+        return {
+            'synced': synced,
+            'skipped': skipped,
+            'errors': errors,
+        }
 
     def sync_all_payments(self, connection) -> dict:
         """
-        Sync all payments from Xero since last sync.
+        Sync payments modified in Xero since the last sync.
+
+        Pages are reconciled as they arrive. After each page the connection's
+        payments_modified_since watermark moves up to the newest payment seen,
+        so an interrupted sync resumes where it stopped. If any payment fails,
+        the watermark stays put for the rest of the run and the next sync
+        fetches those payments again.
 
         Args:
             connection: XeroConnection instance
 
         Returns:
-            Dict with counts of synced and skipped payments
+            Dict with counts of synced, skipped and errored payments
         """
-        since_date = connection.last_sync_at
-
-        payments = self.fetch_payments(connection, since_date)
+        since = connection.payments_modified_since
+        if since:
+            since -= PAYMENT_SYNC_OVERLAP
 
         synced = 0
         skipped = 0
         errors = 0
 
-        for xero_payment in payments:
-            try:
-                result = self.reconcile_payment(connection, xero_payment)
-                if result:
-                    synced += 1
-                else:
-                    skipped += 1
-            except Exception as e:
-                logger.error(
-                    f"Error reconciling payment {xero_payment.get('PaymentID')}: {e}"
-                )
-                errors += 1
+        for page in self.fetch_payment_pages(connection, since):
+            result = self.reconcile_payments(connection, page)
+            synced += result['synced']
+            skipped += result['skipped']
+            errors += result['errors']
+
+            if errors:
+                continue
+            modified = [
+                parse_xero_date(payment['UpdatedDateUTC'])
+                for payment in page
+                if payment.get('UpdatedDateUTC')
+            ]
+            if modified and (
+                connection.payments_modified_since is None
+                or max(modified) > connection.payments_modified_since
+            ):
+                connection.payments_modified_since = max(modified)
+                connection.save(update_fields=['payments_modified_since', 'updated_at'])
 
         # Update last sync timestamp
         connection.last_sync_at = timezone.now()
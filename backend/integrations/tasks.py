@@ -28,7 +28,7 @@ def sync_xero_payments():
     """
     Pull payments from Xero and reconcile with invoices.
 
-    Runs hourly. Fetches all payments since the last sync and
+    Runs hourly. Fetches payments modified since the last sync and
     creates corresponding Payment records in Oneo.
     """
     from integrations.models import XeroConnection
@@ -61,15 +61,10 @@ def push_pending_invoices():
     Push pending invoices to Xero.
 
     Runs every 15 minutes. Retries any invoices that failed to sync
-    or are still pending.
+    or are still pending, in batches.
     """
-    from integrations.models import (
-        XeroConnection,
-        XeroInvoiceMapping,
-        XeroInvoiceMappingSyncStatus,
-    )
+    from integrations.models import XeroConnection
     from integrations.services.xero_service import XeroService, XeroError
-    from subscriptions.models import Invoice, InvoiceStatus
 
     try:
         connection = XeroConnection.objects.get(is_active=True)
@@ -78,38 +73,15 @@ def push_pending_invoices():
         return "No active Xero connection"
 
     service = XeroService()
-    synced = 0
-    errors = 0
-
-    # Find invoices with pending or error status
-    mappings_to_retry = XeroInvoiceMapping.objects.filter(
-        sync_status__in=[
-            XeroInvoiceMappingSyncStatus.PENDING,
-            XeroInvoiceMappingSyncStatus.ERROR,
-        ]
-    ).select_related('invoice')
-
-    for mapping in mappings_to_retry:
-        try:
-            service.sync_invoice(connection, mapping.invoice)
-            synced += 1
-        except XeroError as e:
-            logger.error(f"Failed to sync invoice {mapping.invoice.id}: {e}")
-            errors += 1
-
-    # Find sent invoices without any mapping
-    synced_invoice_ids = XeroInvoiceMapping.objects.values_list('invoice_id', flat=True)
-    unsynced_invoices = Invoice.objects.filter(
-        status=InvoiceStatus.SENT,
-    ).exclude(id__in=synced_invoice_ids)
-
-    for invoice in unsynced_invoices:
-        try:
-            service.sync_invoice(connection, invoice)
-            synced += 1
-        except XeroError as e:
-            logger.error(f"Failed to sync invoice {invoice.id}: {e}")
-            errors += 1
+
+    try:
+        result = service.push_invoices(connection, service.pending_invoices())
+    except XeroError as e:
+        logger.error(f"Xero invoice sync failed: {e}")
+        return f"Sync failed: {e}"
+
+    synced = result['synced']
+    errors = result['errors']
 
     message = f"Invoice sync complete: {synced} synced, {errors} errors"
     logger.info(message)
@@ -1,3 +1,366 @@
-from django.test import TestCase
+import json
+import threading
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from companies.models import Company
+from subscriptions.models import Invoice, InvoiceStatus, InvoiceType
+
+from .models import (
+    XeroConnection,
+    XeroContactMapping,
+    XeroInvoiceMapping,
+    XeroInvoiceMappingSyncStatus,
+    XeroPaymentMapping,
+)
+from .services.xero_service import PAYMENTS_PAGE_SIZE, XeroService
+
+
+def xero_date(value: datetime) -> str:
+    return f"/Date({int(value.timestamp() * 1000)}+0000)/"
+
+
+class FakeXero:
+    """
+    Just enough of the Xero Accounting API, served over HTTP on localhost.
+
+    Payments honour If-Modified-Since and paging; posted contacts and
+    invoices get IDs, except contact names in reject_contacts and invoice
+    numbers in reject. As in Xero, a rejected item fails the whole request
+    with a 400 unless summarizeErrors=false is passed.
+    """
+
+    def __init__(self):
+        self.payments = []
+        self.reject = set()
+        self.reject_contacts = set()
+        self.requests = []
+        self.lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, body, status=200):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                fake.record('GET', url, self.headers, None)
+                self._reply(fake.list_payments(parse_qs(url.query), self.headers))
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                fake.record('POST', url, self.headers, body)
+                if url.path.endswith('/Contacts'):
+                    items = fake.save_contacts(body)
+                else:
+                    items = fake.save_invoices(body)
+                failed = any(item.get('HasErrors') for item in next(iter(items.values())))
+                if failed and parse_qs(url.query).get('summarizeErrors') != ['false']:
+                    self._reply({'Type': 'ValidationException', 'Message': 'A validation exception occurred'}, 400)
+                else:
+                    self._reply(items)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api.xro/2.0"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def record(self, method, url, headers, body):
+        with self.lock:
+            self.requests.append({
+                'method': method,
+                'path': url.path.rsplit('/', 1)[-1],
+                'query': parse_qs(url.query),
+                'if_modified_since': headers.get('If-Modified-Since'),
+                'body': body,
+            })
+
+    def calls(self, method, path):
+        return [r for r in self.requests if r['method'] == method and r['path'] == path]
+
+    def add_payment(self, payment_id, xero_invoice_id, amount, updated):
+        self.payments.append({
+            'PaymentID': payment_id,
+            'Invoice': {'InvoiceID': xero_invoice_id},
+            'Amount': amount,
+            'Date': xero_date(updated),
+            'UpdatedDateUTC': xero_date(updated),
+            'PaymentType': 'ACCRECPAYMENT',
+        })
+
+    def list_payments(self, query, headers):
+        payments = self.payments
+        if headers.get('If-Modified-Since'):
+            since = datetime.strptime(headers['If-Modified-Since'], '%Y-%m-%dT%H:%M:%S')
+            since_ms = since.replace(tzinfo=dt_timezone.utc).timestamp() * 1000
+            payments = [p for p in payments if int(p['UpdatedDateUTC'][6:-7]) >= since_ms]
+        payments = sorted(payments, key=lambda p: p['UpdatedDateUTC'])
+        page = int(query.get('page', ['1'])[0])
+        start = (page - 1) * PAYMENTS_PAGE_SIZE
+        return {'Payments': payments[start:start + PAYMENTS_PAGE_SIZE]}
+
+    def save_contacts(self, body):
+        contacts = []
+        for contact in body['Contacts']:
+            if contact['Name'] in self.reject_contacts:
+                contacts.append({
+                    'Name': contact['Name'],
+                    'HasErrors': True,
+                    'StatusAttributeString': 'ERROR',
+                    'ValidationErrors': [{'Message': 'The contact name must be unique'}],
+                })
+            else:
+                contacts.append({
+                    'ContactID': f"contact-{contact['ContactNumber']}",
+                    'ContactNumber': contact['ContactNumber'],
+                    'StatusAttributeString': 'OK',
+                })
+        return {'Contacts': contacts}
+
+    def save_invoices(self, body):
+        invoices = []
+        for invoice in body['Invoices']:
+            if invoice['InvoiceNumber'] in self.reject:
+                invoices.append({
+                    'InvoiceNumber': invoice['InvoiceNumber'],
+                    'HasErrors': True,
+                    'StatusAttributeString': 'ERROR',
+                    'ValidationErrors': [{'Message': 'Account code is not valid'}],
+                })
+            else:
+                invoices.append({
+                    'InvoiceID': invoice.get('InvoiceID') or f"xero-{invoice['InvoiceNumber']}",
+                    'InvoiceNumber': invoice['InvoiceNumber'],
+                    'StatusAttributeString': 'OK',
+                })
+        return {'Invoices': invoices}
+
+
+class XeroSyncTestCase(TestCase):
+
+    def setUp(self):
+        self.fake = FakeXero().__enter__()
+        self.addCleanup(self.fake.__exit__)
+        settings_override = override_settings(XERO_API_URL=self.fake.url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.connection = XeroConnection.objects.create(
+            access_token='token',
+            refresh_token='refresh',
+            token_expires_at=timezone.now() + timedelta(hours=1),
+            tenant_id='tenant',
+            tenant_name='Test Org',
+        )
+        self.service = XeroService()
+
+    def create_invoices(self, company, count, total=Decimal('1000.00'), prefix='INV'):
+        return Invoice.objects.bulk_create([
+            Invoice(
+                company=company,
+                invoice_number=f"{prefix}-{company.slug}-{i:04d}",
+                invoice_type=InvoiceType.RETAINER,
+                status=InvoiceStatus.SENT,
+                invoice_date=date(2026, 1, 1),
+                due_date=date(2026, 1, 15),
+                subtotal=total,
+                vat_amount=Decimal('0'),
+                total_amount=total,
+            )
+            for i in range(count)
+        ])
+
+
+class PaymentSyncTests(XeroSyncTestCase):
+    """Payments are pulled a page at a time, and only those modified since the last sync."""
+
+    def setUp(self):
+        super().setUp()
+        company = Company.objects.create(name='Acme')
+        self.paid, self.partial = self.create_invoices(company, 2)
+        XeroInvoiceMapping.objects.bulk_create([
+            XeroInvoiceMapping(invoice=self.paid, xero_invoice_id='X-PAID', sync_status='synced'),
+            XeroInvoiceMapping(invoice=self.partial, xero_invoice_id='X-PARTIAL', sync_status='synced'),
+        ])
+
+        self.start = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+        for i in range(100):
+            self.fake.add_payment(f"pay-{i}", 'X-PAID', 10, self.start + timedelta(minutes=i))
+        for i in range(100, 149):
+            self.fake.add_payment(f"pay-{i}", 'X-PARTIAL', 10, self.start + timedelta(minutes=i))
+        self.fake.add_payment('pay-unknown', 'X-ELSEWHERE', 10, self.start + timedelta(minutes=149))
+
+    def test_first_sync_pages_through_everything(self):
+        result = self.service.sync_all_payments(self.connection)
+
+        self.assertEqual(result, {'synced': 149, 'skipped': 1, 'errors': 0})
+        gets = self.fake.calls('GET', 'Payments')
+        self.assertEqual([r['query']['page'] for r in gets], [['1'], ['2']])
+        self.assertIsNone(gets[0]['if_modified_since'])
+
+        self.paid.refresh_from_db()
+        self.partial.refresh_from_db()
+        self.assertEqual(self.paid.amount_paid, Decimal('1000.00'))
+        self.assertEqual(self.paid.status, InvoiceStatus.PAID)
+        self.assertIsNotNone(self.paid.paid_at)
+        self.assertEqual(self.partial.amount_paid, Decimal('490.00'))
+        self.assertEqual(self.partial.status, InvoiceStatus.PARTIALLY_PAID)
+
+        self.connection.refresh_from_db()
+        self.assertEqual(self.connection.payments_modified_since, self.start + timedelta(minutes=149))
+        self.assertIsNotNone(self.connection.last_sync_at)
+
+    def test_next_sync_only_asks_for_changes(self):
+        self.service.sync_all_payments(self.connection)
+        self.fake.add_payment('pay-new', 'X-PARTIAL', 10, self.start + timedelta(minutes=200))
+        self.fake.requests.clear()
+
+        result = self.service.sync_all_payments(self.connection)
+
+        # The overlap refetches the last minute's payments, which are skipped
+        self.assertEqual(result, {'synced': 1, 'skipped': 2, 'errors': 0})
+        gets = self.fake.calls('GET', 'Payments')
+        self.assertEqual(len(gets), 1)
+        self.assertEqual(gets[0]['if_modified_since'], '2026-01-01T02:28:00')
+
+        self.partial.refresh_from_db()
+        self.assertEqual(self.partial.amount_paid, Decimal('500.00'))
+        self.assertEqual(self.partial.status, InvoiceStatus.PARTIALLY_PAID)
+        self.assertEqual(XeroPaymentMapping.objects.count(), 150)
+        self.connection.refresh_from_db()
+        self.assertEqual(self.connection.payments_modified_since, self.start + timedelta(minutes=200))
+
+
+class InvoicePushTests(XeroSyncTestCase):
+    """Pending invoices go to Xero in batches, with one result per invoice."""
+
+    def setUp(self):
+        super().setUp()
+        self.acme = Company.objects.create(name='Acme')
+        self.globex = Company.objects.create(name='Globex')
+        self.invoices = self.create_invoices(self.acme, 70) + self.create_invoices(self.globex, 50)
+        self.rejected = self.invoices[60]
+        self.fake.reject.add(self.rejected.invoice_number)
+
+    def test_pushes_in_batches(self):
+        result = self.service.push_invoices(self.connection, self.service.pending_invoices())
+
+        self.assertEqual(result, {'synced': 119, 'errors': 1})
+        contact_posts = self.fake.calls('POST', 'Contacts')
+        self.assertEqual(len(contact_posts), 1)
+        self.assertEqual(len(contact_posts[0]['body']['Contacts']), 2)
+        invoice_posts = self.fake.calls('POST', 'Invoices')
+        self.assertEqual([len(r['body']['Invoices']) for r in invoice_posts], [50, 50, 20])
+        self.assertEqual(invoice_posts[0]['query']['summarizeErrors'], ['false'])
+
+        self.assertEqual(XeroContactMapping.objects.count(), 2)
+        self.assertEqual(
+            XeroInvoiceMapping.objects.filter(sync_status=XeroInvoiceMappingSyncStatus.SYNCED).count(), 119,
+        )
+        mapping = XeroInvoiceMapping.objects.get(invoice=self.rejected)
+        self.assertEqual(mapping.sync_status, XeroInvoiceMappingSyncStatus.ERROR)
+        self.assertEqual(mapping.sync_error, 'Account code is not valid')
+
+        invoice = Invoice.objects.get(pk=self.invoices[0].pk)
+        self.assertEqual(invoice.external_system, 'Xero')
+        self.assertEqual(invoice.external_invoice_number, self.invoices[0].invoice_number)
+
+    def test_retry_sends_only_failed_invoices(self):
+        self.service.push_invoices(self.connection, self.service.pending_invoices())
+        self.fake.reject.clear()
+        self.fake.requests.clear()
+
+        result = self.service.push_invoices(self.connection, self.service.pending_invoices())
+
+        self.assertEqual(result, {'synced': 1, 'errors': 0})
+        self.assertEqual(self.fake.calls('POST', 'Contacts'), [])
+        invoice_posts = self.fake.calls('POST', 'Invoices')
+        self.assertEqual(len(invoice_posts), 1)
+        self.assertEqual(
+            [i['InvoiceNumber'] for i in invoice_posts[0]['body']['Invoices']], [self.rejected.invoice_number],
+        )
+        self.assertEqual(
+            XeroInvoiceMapping.objects.get(invoice=self.rejected).sync_status, XeroInvoiceMappingSyncStatus.SYNCED,
+        )
+
+    def test_rejected_contact_fails_only_its_invoices(self):
+        initech = Company.objects.create(name='Initech')
+        self.create_invoices(initech, 2)
+        self.fake.reject.clear()
+        self.fake.reject_contacts.add('Initech')
+
+        result = self.service.push_invoices(self.connection, self.service.pending_invoices())
+
+        self.assertEqual(result, {'synced': 120, 'errors': 2})
+        contact_posts = self.fake.calls('POST', 'Contacts')
+        self.assertEqual(len(contact_posts), 1)
+        self.assertEqual(contact_posts[0]['query']['summarizeErrors'], ['false'])
+        self.assertEqual(
+            set(XeroContactMapping.objects.values_list('company__name', flat=True)), {'Acme', 'Globex'},
+        )
+        failed = XeroInvoiceMapping.objects.filter(sync_status=XeroInvoiceMappingSyncStatus.ERROR)
+        self.assertEqual({mapping.invoice.company_id for mapping in failed}, {initech.id})
+        self.assertEqual(
+            failed.first().sync_error, 'Could not create Xero contact: The contact name must be unique',
+        )
+
+
+class TokenRefreshTests(TestCase):
+    """Xero refresh tokens are single-use, so a connection is refreshed once across workers."""
+
+    def setUp(self):
+        self.connection = XeroConnection.objects.create(
+            access_token='token',
+            refresh_token='refresh',
+            token_expires_at=timezone.now() - timedelta(minutes=1),
+            tenant_id='tenant',
+            tenant_name='Test Org',
+        )
+        self.service = XeroService()
+        self.refresh = self.enterContext(mock.patch.object(XeroService, 'refresh_token', return_value={
+            'access_token': 'new-token', 'refresh_token': 'new-refresh', 'expires_in': 1800,
+        }))
+
+    def test_expired_token_is_refreshed(self):
+        token = self.service._get_valid_token(self.connection)
+
+        self.refresh.assert_called_once_with('refresh')
+        self.assertEqual(token, 'new-token')
+        self.connection.refresh_from_db()
+        self.assertEqual(self.connection.refresh_token, 'new-refresh')
+        self.assertGreater(self.connection.token_expires_at, timezone.now())
+
+    def test_token_refreshed_by_another_worker_is_reused(self):
+        XeroConnection.objects.filter(pk=self.connection.pk).update(
+            access_token='other-token',
+            refresh_token='other-refresh',
+            token_expires_at=timezone.now() + timedelta(minutes=30),
+        )
+
+        token = self.service._get_valid_token(self.connection)
+
+        self.refresh.assert_not_called()
+        self.assertEqual(token, 'other-token')
+        self.assertEqual(self.connection.refresh_token, 'other-refresh')
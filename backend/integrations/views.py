@@ -14,7 +14,7 @@ from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from api.permissions import IsAdmin
-from .models import XeroConnection, XeroInvoiceMapping, XeroInvoiceMappingSyncStatus
+from .models import XeroConnection, XeroInvoiceMapping
 from .serializers import (
     XeroConnectionSerializer,
     XeroAuthResponseSerializer,
@@ -220,54 +220,20 @@ def xero_sync_invoices(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    from subscriptions.models import Invoice, InvoiceStatus
-
-    # Find invoices that need syncing
-    pending_mappings = XeroInvoiceMapping.objects.filter(
-        sync_status=XeroInvoiceMappingSyncStatus.PENDING,
-    ).select_related('invoice')
-
-    error_mappings = XeroInvoiceMapping.objects.filter(
-        sync_status=XeroInvoiceMappingSyncStatus.ERROR,
-    ).select_related('invoice')
+    service = XeroService()
 
-    # Also find sent invoices without any mapping
-    synced_invoice_ids = XeroInvoiceMapping.objects.values_list('invoice_id', flat=True)
-    unsynced_invoices = Invoice.objects.filter(
-        status=InvoiceStatus.SENT,
-    ).exclude(id__in=synced_invoice_ids)
+    try:
+        result = service.push_invoices(connection, service.pending_invoices())
+    except XeroError as e:
+        logger.error(f"Failed to sync invoices: {e}")
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
 
-    service = XeroService()
-    synced = 0
+    synced = result['synced']
     skipped = 0
-    errors = 0
-
-    # Sync pending mappings
-    for mapping in pending_mappings:
-        try:
-            service.sync_invoice(connection, mapping.invoice)
-            synced += 1
-        except XeroError as e:
-            logger.error(f"Failed to sync invoice {mapping.invoice.id}: {e}")
-            errors += 1
-
-    # Retry error mappings
-    for mapping in error_mappings:
-        try:
-            service.sync_invoice(connection, mapping.invoice)
-            synced += 1
-        except XeroError as e:
-            logger.error(f"Failed to sync invoice {mapping.invoice.id}: {e}")
-            errors += 1
-
-    # Sync unsynced invoices
-    for invoice in unsynced_invoices:
-        try:
-            service.sync_invoice(connection, invoice)
-            synced += 1
-        except XeroError as e:
-            logger.error(f"Failed to sync invoice {invoice.id}: {e}")
-            errors += 1
+    errors = result['errors']
 
     return Response({
         'synced': synced,
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0023_add_replacement_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicationstageinstance',
+            index=models.Index(fields=['interviewer', 'scheduled_at'], name='application_intervi_530900_idx'),
+        ),
+    ]
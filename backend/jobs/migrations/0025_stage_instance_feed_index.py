@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0024_stage_instance_interviewer_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicationstageinstance',
+            index=models.Index(fields=['scheduled_at', 'id'], name='application_schedul_e0b02b_idx'),
+        ),
+    ]
@@ -377,6 +377,11 @@ class ApplicationStageInstance(models.Model):
         db_table = 'application_stage_instances'
         ordering = ['stage_template__order']
         unique_together = ['application', 'stage_template']
+        indexes = [
+            models.Index(fields=['interviewer', 'scheduled_at']),
+            # Keyset pagination of the calendar feed
+            models.Index(fields=['scheduled_at', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.application.candidate} - {self.stage_template.name}"
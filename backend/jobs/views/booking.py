@@ -12,6 +12,7 @@ from ..models import (
     StageInstanceStatus,
 )
 from scheduling.models import UserCalendarConnection, BookingToken
+from scheduling.services.availability import SlotUnavailable, release, reserve_slot
 from scheduling.services.calendar_service import CalendarService, CalendarServiceError
 from notifications.services.notification_service import NotificationService
 from .activity import log_activity
@@ -179,12 +180,32 @@ def book_slot(request, token):
         elif template.custom_location:
             location = template.custom_location
 
+    duration_minutes = template.default_duration_minutes or 60
+
+    # Hold the interviewer's slot so concurrent bookers can't take it
+    hold = None
+    if instance.interviewer:
+        connection = UserCalendarConnection.objects.filter(user=instance.interviewer, is_active=True).first()
+        try:
+            hold = reserve_slot(
+                instance.interviewer,
+                scheduled_datetime,
+                duration_minutes,
+                buffer_minutes=connection.buffer_minutes if connection else 0,
+                exclude_stage_instance_id=instance.id,
+            )
+        except SlotUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
     # Update the stage instance
-    instance.scheduled_at = scheduled_datetime
-    instance.duration_minutes = template.default_duration_minutes or 60
-    instance.status = StageInstanceStatus.SCHEDULED
-    instance.location = location
-    instance.save()
+    try:
+        instance.scheduled_at = scheduled_datetime
+        instance.duration_minutes = duration_minutes
+        instance.status = StageInstanceStatus.SCHEDULED
+        instance.location = location
+        instance.save()
+    finally:
+        release(hold)
 
     # Create calendar event with auto-generated meeting link
     if instance.interviewer:
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification, NotificationTemplate
+from .models import EmailOutbox, Notification, NotificationCounter, NotificationTemplate
 
 
 @admin.register(Notification)
@@ -18,3 +18,19 @@ class NotificationTemplateAdmin(admin.ModelAdmin):
     search_fields = ['name', 'description', 'title_template', 'body_template']
     readonly_fields = ['id', 'created_at', 'updated_at']
     ordering = ['name']
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ['id', 'subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status']
+    search_fields = ['subject', 'dedupe_key', 'provider_message_id']
+    readonly_fields = ['id', 'notification', 'created_at', 'sent_at', 'provider_message_id']
+    ordering = ['-created_at']
+
+
+@admin.register(NotificationCounter)
+class NotificationCounterAdmin(admin.ModelAdmin):
+    list_display = ['user', 'unread_count', 'latest_notification_id', 'version', 'updated_at']
+    search_fields = ['user__email']
+    readonly_fields = ['user', 'latest_notification_id', 'version', 'updated_at']
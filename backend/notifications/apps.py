@@ -5,3 +5,7 @@ class NotificationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'notifications'
     verbose_name = 'Notifications'
+
+    def ready(self):
+        # Import signals to register them
+        import notifications.signals  # noqa: F401
@@ -0,0 +1,196 @@
+"""
+Real-time events for connected clients, over PostgreSQL LISTEN/NOTIFY.
+
+publish() sends an event with NOTIFY on EVENTS_CHANNEL. NOTIFY is
+transactional: the event is delivered when the surrounding transaction
+commits, and never if it rolls back. Each server process runs one listener
+thread (EventHub) holding a single database connection that LISTENs on the
+channel and hands events to the streams connected to that process (see
+notifications.stream), so no broker is needed and streams don't hold
+database connections.
+
+Events are addressed to users by id, or to everyone who can see a job
+(activity on its applications).
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from typing import Iterable, Optional, Set
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = 'app_events'
+
+# NOTIFY payloads are limited to 8000 bytes; larger events are sent without
+# their data and clients refetch
+MAX_PAYLOAD_BYTES = 7900
+
+RECONNECT_SECONDS = 5
+POLL_SECONDS = 5
+
+# Events buffered per connected stream before it's told to resync
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def event_id() -> str:
+    """A millisecond timestamp: event ids sort by time, so streams can resume from one."""
+    return str(int(time.time() * 1000))
+
+
+def publish(event: str, data: dict, users: Iterable = (), job=None) -> None:
+    """
+    Send an event to streams of the given users, and of users who can see job.
+
+    Delivered when the current transaction commits. Does nothing on
+    databases without LISTEN/NOTIFY.
+    """
+    if connection.vendor != 'postgresql':
+        return
+
+    message = {
+        'id': event_id(),
+        'event': event,
+        'users': [str(user) for user in users],
+        'job': str(job) if job is not None else None,
+        'data': data,
+    }
+    payload = json.dumps(message, cls=DjangoJSONEncoder)
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        message['data'] = {'truncated': True}
+        payload = json.dumps(message, cls=DjangoJSONEncoder)
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_notify(%s, %s)', [EVENTS_CHANNEL, payload])
+
+
+class Subscriber:
+    """One connected stream: a user, the jobs whose activity they see, and a queue on their event loop."""
+
+    def __init__(self, user_id, job_ids: Optional[Set[str]], loop: asyncio.AbstractEventLoop):
+        self.user_id = str(user_id)
+        # None means every job (admins)
+        self.job_ids = job_ids
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def wants(self, message: dict) -> bool:
+        if self.user_id in message['users']:
+            return True
+        job = message.get('job')
+        return job is not None and (self.job_ids is None or job in self.job_ids)
+
+    def _put(self, message: dict) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The stream tells the client to refetch instead
+            self.overflowed = True
+
+    def deliver(self, message: dict) -> None:
+        """Queue a message from the listener thread."""
+        self.loop.call_soon_threadsafe(self._put, message)
+
+
+class EventHub:
+    """Listens on EVENTS_CHANNEL in a background thread and fans events out to subscribers."""
+
+    def __init__(self, channel: str = EVENTS_CHANNEL):
+        self.channel = channel
+        self.subscribers: Set[Subscriber] = set()
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.listening = threading.Event()
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        with self.lock:
+            self.subscribers.add(subscriber)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='notification-events', daemon=True)
+                self.thread.start()
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def dispatch(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed event payload: {payload[:100]}")
+            return
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            if subscriber.wants(message):
+                subscriber.deliver(message)
+
+    def _connect(self):
+        # A dedicated connection, outside Django's per-thread connection handling
+        wrapper = connections['default']
+        conn = wrapper.get_new_connection(wrapper.get_connection_params())
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return conn
+
+    def _resync_all(self) -> None:
+        # Events published while the listener was disconnected were missed
+        message = {'id': event_id(), 'event': 'resync', 'users': [], 'job': None, 'data': {}}
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber.deliver(message)
+
+    def _run(self) -> None:
+        lost = False
+        while True:
+            with self.lock:
+                if not self.subscribers:
+                    # Stop when idle; the next subscriber starts a new thread
+                    self.thread = None
+                    self.listening.clear()
+                    return
+            try:
+                conn = self._connect()
+            except Exception as e:
+                logger.error(f"Event listener could not connect: {e}")
+                lost = True
+                time.sleep(RECONNECT_SECONDS)
+                continue
+
+            self.listening.set()
+            if lost:
+                self._resync_all()
+                lost = False
+            try:
+                while True:
+                    with self.lock:
+                        if not self.subscribers:
+                            break
+                    if select.select([conn], [], [], POLL_SECONDS) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.dispatch(conn.notifies.pop(0).payload)
+            except Exception as e:
+                # Streams resume from their Last-Event-ID when they reconnect
+                logger.error(f"Event listener connection lost: {e}")
+                lost = True
+                time.sleep(RECONNECT_SECONDS)
+            finally:
+                self.listening.clear()
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+
+hub = EventHub()
@@ -8,6 +8,7 @@ Usage:
 
 from django.core.management.base import BaseCommand
 from notifications.models import NotificationTemplate, NotificationType, NotificationChannel, RecipientType
+from notifications.services.coalescing import DEFAULT_DIGEST_TEMPLATE
 
 
 class Command(BaseCommand):
@@ -976,6 +977,7 @@ class Command(BaseCommand):
                 'default_channel': NotificationChannel.BOTH,
                 'is_active': True,
             },
+            DEFAULT_DIGEST_TEMPLATE,
         ]
 
     def _get_email_template(self, template_name):
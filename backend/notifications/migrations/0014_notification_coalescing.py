@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-18 22:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automations', '0005_add_signal_trigger_types'),
+        ('jobs', '0025_stage_instance_feed_index'),
+        ('notifications', '0013_email_outbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='coalesce_key',
+            field=models.CharField(blank=True, help_text='Groups notifications that merge into one digest within the coalescing window', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='digest_items',
+            field=models.JSONField(blank=True, default=list, help_text='Title and body of each update merged into this notification'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('welcome', 'Welcome'), ('email_verification', 'Email Verification'), ('password_reset', 'Password Reset'), ('password_changed', 'Password Changed'), ('team_invite', 'Team Member Invitation'), ('client_invite', 'Client Invitation'), ('company_member_invite', 'Company Member Invitation'), ('candidate_booking_invite', 'Candidate Booking Invitation'), ('stage_scheduled', 'Interview Scheduled'), ('stage_reminder', 'Interview Reminder'), ('stage_rescheduled', 'Interview Rescheduled'), ('stage_cancelled', 'Interview Cancelled'), ('stage_completed', 'Interview Completed'), ('stage_feedback_received', 'Interview Feedback Received'), ('booking_link_sent', 'Booking Link Sent'), ('booking_confirmed', 'Booking Confirmed'), ('booking_reminder', 'Booking Reminder'), ('assessment_assigned', 'Assessment Assigned'), ('assessment_reminder', 'Assessment Deadline Reminder'), ('submission_received', 'Submission Received'), ('application_received', 'Application Received'), ('application_shortlisted', 'Application Shortlisted'), ('application_rejected', 'Application Rejected'), ('application_withdrawn', 'Application Withdrawn'), ('advanced_to_application_screen', 'Advanced to Application Screen'), ('advanced_to_phone_screening', 'Advanced to Phone Screening'), ('advanced_to_video_interview', 'Advanced to Video Interview'), ('advanced_to_in_person_interview', 'Advanced to In-Person Interview'), ('advanced_to_take_home_assessment', 'Advanced to Take-Home Assessment'), ('advanced_to_in_person_assessment', 'Advanced to In-Person Assessment'), ('advanced_to_custom_stage', 'Advanced to Next Stage'), ('offer_received', 'Offer Received'), ('offer_accepted', 'Offer Accepted'), ('offer_declined', 'Offer Declined'), ('job_published', 'Job Published'), ('job_closed', 'Job Closed'), ('job_filled', 'Job Filled'), ('job_updated', 'Job Updated'), ('replacement_requested', 'Replacement Requested'), ('replacement_approved', 'Replacement Approved'), ('replacement_rejected', 'Replacement Rejected'), ('job_reopened_for_replacement', 'Job Reopened for Replacement'), ('lead_created', 'New Lead'), ('lead_stage_changed', 'Lead Stage Changed'), ('lead_converted', 'Lead Converted'), ('lead_assigned', 'Lead Assigned'), ('company_created', 'New Company'), ('company_stage_changed', 'Company Stage Changed'), ('invoice_sent', 'Invoice Sent'), ('invoice_paid', 'Invoice Paid'), ('invoice_overdue', 'Invoice Overdue'), ('subscription_activated', 'Subscription Activated'), ('subscription_paused', 'Subscription Paused'), ('subscription_terminated', 'Subscription Terminated'), ('subscription_renewed', 'Subscription Renewed'), ('subscription_expiring', 'Subscription Expiring'), ('admin_broadcast', 'Admin Broadcast'), ('custom', 'Custom Notification'), ('digest', 'Notification Digest')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='notificationtemplate',
+            name='template_type',
+            field=models.CharField(blank=True, choices=[('welcome', 'Welcome'), ('email_verification', 'Email Verification'), ('password_reset', 'Password Reset'), ('password_changed', 'Password Changed'), ('team_invite', 'Team Member Invitation'), ('client_invite', 'Client Invitation'), ('company_member_invite', 'Company Member Invitation'), ('candidate_booking_invite', 'Candidate Booking Invitation'), ('stage_scheduled', 'Interview Scheduled'), ('stage_reminder', 'Interview Reminder'), ('stage_rescheduled', 'Interview Rescheduled'), ('stage_cancelled', 'Interview Cancelled'), ('stage_completed', 'Interview Completed'), ('stage_feedback_received', 'Interview Feedback Received'), ('booking_link_sent', 'Booking Link Sent'), ('booking_confirmed', 'Booking Confirmed'), ('booking_reminder', 'Booking Reminder'), ('assessment_assigned', 'Assessment Assigned'), ('assessment_reminder', 'Assessment Deadline Reminder'), ('submission_received', 'Submission Received'), ('application_received', 'Application Received'), ('application_shortlisted', 'Application Shortlisted'), ('application_rejected', 'Application Rejected'), ('application_withdrawn', 'Application Withdrawn'), ('advanced_to_application_screen', 'Advanced to Application Screen'), ('advanced_to_phone_screening', 'Advanced to Phone Screening'), ('advanced_to_video_interview', 'Advanced to Video Interview'), ('advanced_to_in_person_interview', 'Advanced to In-Person Interview'), ('advanced_to_take_home_assessment', 'Advanced to Take-Home Assessment'), ('advanced_to_in_person_assessment', 'Advanced to In-Person Assessment'), ('advanced_to_custom_stage', 'Advanced to Next Stage'), ('offer_received', 'Offer Received'), ('offer_accepted', 'Offer Accepted'), ('offer_declined', 'Offer Declined'), ('job_published', 'Job Published'), ('job_closed', 'Job Closed'), ('job_filled', 'Job Filled'), ('job_updated', 'Job Updated'), ('replacement_requested', 'Replacement Requested'), ('replacement_approved', 'Replacement Approved'), ('replacement_rejected', 'Replacement Rejected'), ('job_reopened_for_replacement', 'Job Reopened for Replacement'), ('lead_created', 'New Lead'), ('lead_stage_changed', 'Lead Stage Changed'), ('lead_converted', 'Lead Converted'), ('lead_assigned', 'Lead Assigned'), ('company_created', 'New Company'), ('company_stage_changed', 'Company Stage Changed'), ('invoice_sent', 'Invoice Sent'), ('invoice_paid', 'Invoice Paid'), ('invoice_overdue', 'Invoice Overdue'), ('subscription_activated', 'Subscription Activated'), ('subscription_paused', 'Subscription Paused'), ('subscription_terminated', 'Subscription Terminated'), ('subscription_renewed', 'Subscription Renewed'), ('subscription_expiring', 'Subscription Expiring'), ('admin_broadcast', 'Admin Broadcast'), ('custom', 'Custom Notification'), ('digest', 'Notification Digest')], help_text='System notification type this template is for (leave blank for custom)', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'coalesce_key', '-sent_at'], name='notificatio_recipie_677155_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-18 22:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0014_notification_coalescing'),
+        ('users', '0006_add_archive_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread_count', models.IntegerField(default=0)),
+                ('latest_notification_id', models.UUIDField(blank=True, null=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'notification_counters',
+            },
+        ),
+    ]
@@ -120,6 +120,8 @@ class NotificationType(models.TextChoices):
     # =========================================================================
     ADMIN_BROADCAST = 'admin_broadcast', 'Admin Broadcast'
     CUSTOM = 'custom', 'Custom Notification'
+    # Template for notifications that coalesce a burst of updates
+    DIGEST = 'digest', 'Notification Digest'
 
 
 class NotificationChannel(models.TextChoices):
@@ -208,6 +210,18 @@ class Notification(models.Model):
         help_text='Error message if email sending failed',
     )
 
+    # Coalescing (see notifications.services.coalescing)
+    coalesce_key = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text='Groups notifications that merge into one digest within the coalescing window',
+    )
+    digest_items = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='Title and body of each update merged into this notification',
+    )
+
     sent_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -216,6 +230,7 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['recipient', '-sent_at']),
             models.Index(fields=['recipient', 'is_read']),
+            models.Index(fields=['recipient', 'coalesce_key', '-sent_at']),
         ]
 
     def __str__(self):
@@ -224,9 +239,38 @@ class Notification(models.Model):
     def mark_as_read(self):
         """Mark notification as read."""
         if not self.is_read:
+            from notifications.services import counters
+
             self.is_read = True
             self.read_at = timezone.now()
             self.save(update_fields=['is_read', 'read_at'])
+            counters.record_read(self.recipient_id, 1)
+
+
+class NotificationCounter(models.Model):
+    """
+    Per-user unread count and newest-notification watermark, so polling for
+    notifications is a primary-key lookup. Adjusted atomically as
+    notifications are created, read and deleted, and reconciled against the
+    notifications table periodically (see notifications.services.counters).
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='notification_counter',
+    )
+    unread_count = models.IntegerField(default=0)
+    latest_notification_id = models.UUIDField(null=True, blank=True)
+    # Incremented on every change; clients revalidate against it with ETags
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'notification_counters'
+
+    def __str__(self):
+        return f"{self.unread_count} unread for user {self.user_id}"
 
 
 class NotificationTemplate(models.Model):
@@ -333,3 +377,63 @@ class NotificationTemplate(models.Model):
                 self.email_body_template or self.body_template, context
             ),
         }
+
+
+class EmailOutboxStatus(models.TextChoices):
+    PENDING = 'pending', 'Pending'
+    SENDING = 'sending', 'Sending'
+    SENT = 'sent', 'Sent'
+    FAILED = 'failed', 'Failed'
+
+
+class EmailOutbox(models.Model):
+    """
+    An email waiting to be sent, written in the same transaction as the
+    Notification it belongs to and delivered by the outbox sender worker
+    (see notifications.services.email_outbox).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    notification = models.ForeignKey(
+        Notification,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='outbox_emails',
+    )
+    # Enqueueing a message with a key that's already in the outbox is a no-op
+    dedupe_key = models.CharField(max_length=255, unique=True, null=True, blank=True)
+
+    # Message
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list, blank=True)
+    reply_to = models.JSONField(default=list, blank=True)
+    subject = models.CharField(max_length=998)
+    html_body = models.TextField()
+
+    # Delivery
+    status = models.CharField(
+        max_length=20,
+        choices=EmailOutboxStatus.choices,
+        default=EmailOutboxStatus.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    # When the row is next due: the retry time for pending rows, the claim
+    # expiry for rows being sent (so a crashed worker's rows are picked up)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    provider_message_id = models.CharField(max_length=255, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'email_outbox'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"Email to {', '.join(self.to)} ({self.status})"
@@ -0,0 +1,123 @@
+"""
+Coalescing of high-churn notifications into digests.
+
+Bulk recruiter actions and batch imports can fire many notifications of the
+same kind at one recipient within minutes (e.g. an application moved through
+several stages). Notification types listed in COALESCE_GROUPS share a
+coalesce key per recipient, group and application (or job); within
+NOTIFICATION_COALESCE_WINDOW_SECONDS of the first notification, later ones
+are merged into it instead of creating new rows. The merged notification is
+re-rendered from the DIGEST NotificationTemplate, and its email, held in the
+outbox until the window closes, is sent once with every update.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.utils.html import escape
+
+from notifications.models import NotificationChannel, NotificationTemplate, NotificationType, RecipientType
+
+DEFAULT_WINDOW_SECONDS = 120
+
+# Notification type -> (group, scope). Types in one group merge with each
+# other; scope is what the burst is about: one 'application' or one 'job'.
+COALESCE_GROUPS = {
+    NotificationType.ADVANCED_TO_APPLICATION_SCREEN: ('stage_advanced', 'application'),
+    NotificationType.ADVANCED_TO_PHONE_SCREENING: ('stage_advanced', 'application'),
+    NotificationType.ADVANCED_TO_VIDEO_INTERVIEW: ('stage_advanced', 'application'),
+    NotificationType.ADVANCED_TO_IN_PERSON_INTERVIEW: ('stage_advanced', 'application'),
+    NotificationType.ADVANCED_TO_TAKE_HOME_ASSESSMENT: ('stage_advanced', 'application'),
+    NotificationType.ADVANCED_TO_IN_PERSON_ASSESSMENT: ('stage_advanced', 'application'),
+    NotificationType.ADVANCED_TO_CUSTOM_STAGE: ('stage_advanced', 'application'),
+    NotificationType.STAGE_COMPLETED: ('stage_completed', 'application'),
+    NotificationType.STAGE_FEEDBACK_RECEIVED: ('stage_feedback', 'application'),
+    NotificationType.OFFER_RECEIVED: ('offer', 'application'),
+    NotificationType.OFFER_ACCEPTED: ('offer', 'application'),
+    NotificationType.OFFER_DECLINED: ('offer', 'application'),
+    # Batch imports create many applications for the same job
+    NotificationType.APPLICATION_RECEIVED: ('application_received', 'job'),
+}
+
+# Used when no active DIGEST template exists in the database
+DEFAULT_DIGEST_TEMPLATE = {
+    'name': 'Notification Digest',
+    'description': 'Combines a burst of related notifications into one',
+    'template_type': NotificationType.DIGEST,
+    'recipient_type': RecipientType.ALL,
+    'is_custom': False,
+    'title_template': '{count} updates: {latest_title}',
+    'body_template': '{items}',
+    'email_subject_template': '{count} updates from {brand_name}',
+    'email_body_template': '''
+<p>Hi {first_name},</p>
+<p>Here's what happened recently:</p>
+{items_html}
+''',
+    'default_channel': NotificationChannel.BOTH,
+    'is_active': True,
+}
+
+
+def get_window() -> int:
+    """The coalescing window in seconds; 0 turns coalescing off."""
+    return getattr(settings, 'NOTIFICATION_COALESCE_WINDOW_SECONDS', DEFAULT_WINDOW_SECONDS)
+
+
+def coalesce_key(notification_type: str, application=None, job=None) -> str:
+    """The key bursts of this notification are merged under, or '' if it doesn't coalesce."""
+    group = COALESCE_GROUPS.get(notification_type)
+    if group is None:
+        return ''
+    name, scope = group
+    if scope == 'application' and application is not None:
+        return f'{name}:application:{application.pk}'
+    if job is None and application is not None:
+        job = application.job
+    if job is not None:
+        return f'{name}:job:{job.pk}'
+    return ''
+
+
+def digest_item(rendered: Dict[str, str]) -> Dict[str, str]:
+    """What a digest keeps of one rendered notification."""
+    return {'title': rendered['title'], 'body': rendered['body']}
+
+
+def get_digest_template() -> NotificationTemplate:
+    template = NotificationTemplate.objects.filter(
+        template_type=NotificationType.DIGEST,
+        is_active=True,
+    ).first()
+    return template or NotificationTemplate(**DEFAULT_DIGEST_TEMPLATE)
+
+
+def render_digest(
+    items: List[Dict[str, str]],
+    context: Dict[str, Any],
+    template: Optional[NotificationTemplate] = None,
+) -> Dict[str, str]:
+    """
+    Render the digest of items with the DIGEST template.
+
+    Besides the notification's own context, the template can use {count},
+    {items} (one line per update), {items_html}, {latest_title} and
+    {latest_body}.
+    """
+    template = template or get_digest_template()
+    latest = items[-1]
+    rendered = template.render({
+        **context,
+        'count': len(items),
+        'items': '\n'.join(f"- {item['title']}" for item in items),
+        'items_html': '<ul>{}</ul>'.format(''.join(
+            f"<li><strong>{escape(item['title'])}</strong><br>{escape(item['body'])}</li>"
+            for item in items
+        )),
+        'latest_title': latest['title'],
+        'latest_body': latest['body'],
+    })
+    # Notification.title is limited to 200 characters
+    if len(rendered['title']) > 200:
+        rendered['title'] = rendered['title'][:197] + '...'
+    return rendered
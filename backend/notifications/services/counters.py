@@ -0,0 +1,117 @@
+"""
+Denormalized unread counters for notifications.
+
+Each user's NotificationCounter holds their unread count, the id of their
+newest notification and a version that changes with either, so the polling
+endpoints read one row by primary key instead of counting notifications.
+
+Counters are adjusted with single UPDATE ... SET x = x + n statements as
+notifications are created and deleted (see notifications.signals) and read,
+so concurrent changes never lose an update, and each change is announced to
+the user's notification streams. A user's counter is created from the
+notifications table the first time it's read, and reconcile_all() (run
+periodically) corrects any drift.
+"""
+
+from typing import Optional
+
+from django.db.models import Count, F
+from django.utils import timezone
+
+from notifications import events
+from notifications.models import Notification, NotificationCounter
+
+
+def _apply(user_id, **changes) -> None:
+    # A user without a counter row yet gets an exact one on first read
+    NotificationCounter.objects.filter(user_id=user_id).update(
+        version=F('version') + 1,
+        updated_at=timezone.now(),
+        **changes,
+    )
+    # Streams read the counter themselves when they get this
+    events.publish('unread_count', {}, users=[user_id])
+
+
+def record_created(notification: Notification) -> None:
+    changes = {'latest_notification_id': notification.id}
+    if not notification.is_read:
+        changes['unread_count'] = F('unread_count') + 1
+    _apply(notification.recipient_id, **changes)
+
+
+def record_updated(notification: Notification, became_unread: bool = False) -> None:
+    """An existing notification changed to show as new (e.g. merged into a digest)."""
+    changes = {'latest_notification_id': notification.id}
+    if became_unread:
+        changes['unread_count'] = F('unread_count') + 1
+    _apply(notification.recipient_id, **changes)
+
+
+def record_read(user_id, count: int) -> None:
+    """count of the user's notifications were marked read."""
+    if count:
+        _apply(user_id, unread_count=F('unread_count') - count)
+
+
+def record_deleted(notification: Notification) -> None:
+    if not notification.is_read:
+        _apply(notification.recipient_id, unread_count=F('unread_count') - 1)
+
+
+def _latest_notification_id(user_id) -> Optional[str]:
+    return (
+        Notification.objects.filter(recipient_id=user_id)
+        .order_by('-sent_at')
+        .values_list('id', flat=True)
+        .first()
+    )
+
+
+def reconcile(user_id) -> NotificationCounter:
+    """Recount a user's counter from the notifications table."""
+    values = {
+        'unread_count': Notification.objects.filter(recipient_id=user_id, is_read=False).count(),
+        'latest_notification_id': _latest_notification_id(user_id),
+    }
+    counter, _ = NotificationCounter.objects.update_or_create(
+        user_id=user_id,
+        defaults={**values, 'version': F('version') + 1},
+        create_defaults={**values, 'version': 1},
+    )
+    counter.refresh_from_db()
+    return counter
+
+
+def get_counter(user) -> NotificationCounter:
+    """The user's counter, created from the notifications table if missing."""
+    try:
+        return NotificationCounter.objects.get(user_id=user.id)
+    except NotificationCounter.DoesNotExist:
+        return reconcile(user.id)
+
+
+def get_unread_count(user) -> int:
+    return max(get_counter(user).unread_count, 0)
+
+
+def reconcile_all() -> int:
+    """Correct every counter whose unread count has drifted. Returns how many were fixed."""
+    unread = dict(
+        Notification.objects.filter(is_read=False)
+        .values('recipient_id')
+        .annotate(count=Count('id'))
+        .values_list('recipient_id', 'count')
+        .order_by()
+    )
+    fixed = 0
+    for counter in NotificationCounter.objects.only('user_id', 'unread_count').iterator():
+        actual = unread.get(counter.user_id, 0)
+        if counter.unread_count != actual:
+            NotificationCounter.objects.filter(user_id=counter.user_id).update(
+                unread_count=actual,
+                version=F('version') + 1,
+                updated_at=timezone.now(),
+            )
+            fixed += 1
+    return fixed
@@ -0,0 +1,321 @@
+"""
+Durable email outbox.
+
+Emails aren't sent on the request path. enqueue_emails() writes EmailOutbox
+rows in the caller's transaction, so they commit or roll back with the
+Notification they belong to, and queues the sender once the transaction
+commits. drain_outbox() (the notifications.drain_email_outbox task, also run
+every minute by beat) claims due rows with SELECT ... FOR UPDATE SKIP LOCKED,
+so several workers can drain at once, and sends each batch through a single
+email backend connection.
+
+- A token bucket keeps each worker process under EMAIL_OUTBOX_RATE_PER_SECOND,
+  with bursts of up to EMAIL_OUTBOX_BURST messages
+- Failed messages are retried with exponential backoff, then marked failed
+  after EMAIL_OUTBOX_MAX_ATTEMPTS
+- A dedupe key makes enqueueing the same email twice a no-op
+- Outcomes are copied to the Notification's email_sent/email_error fields
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from notifications.models import EmailOutbox, EmailOutboxStatus, Notification
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_RATE_PER_SECOND = 10
+DEFAULT_BURST = 50
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 60  # 1, 2, 4, 8 minutes...
+# A claimed row not finished within this long is taken to be abandoned by a
+# crashed worker, and becomes due again
+CLAIM_SECONDS = 300
+# One drain run stops claiming after this long and leaves the rest to the next
+MAX_RUN_SECONDS = 50
+
+
+class TokenBucket:
+    """Allows `rate` tokens per second on average, with bursts of up to `capacity`."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens: int = 1) -> float:
+        """Block until `tokens` are available and take them. Returns the seconds waited."""
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        with self.lock:
+            self._refill()
+            while self.tokens < tokens:
+                delay = (tokens - self.tokens) / self.rate
+                self.sleep(delay)
+                waited += delay
+                self._refill()
+            self.tokens -= tokens
+        return waited
+
+
+_bucket: Optional[TokenBucket] = None
+_bucket_lock = threading.Lock()
+
+
+def get_bucket() -> TokenBucket:
+    """The process-wide token bucket for the email provider."""
+    global _bucket
+    if _bucket is None:
+        with _bucket_lock:
+            if _bucket is None:
+                _bucket = TokenBucket(
+                    rate=getattr(settings, 'EMAIL_OUTBOX_RATE_PER_SECOND', DEFAULT_RATE_PER_SECOND),
+                    capacity=getattr(settings, 'EMAIL_OUTBOX_BURST', DEFAULT_BURST),
+                )
+    return _bucket
+
+
+# Per-process delivery counters, for logs and health checks
+_counters: Dict[str, float] = {}
+_counters_lock = threading.Lock()
+
+
+def _count(**amounts) -> None:
+    with _counters_lock:
+        for name, amount in amounts.items():
+            _counters[name] = _counters.get(name, 0) + amount
+
+
+def get_counters() -> Dict[str, float]:
+    """Emails sent, retried and failed, and seconds spent throttled, by this process."""
+    with _counters_lock:
+        return {'sent': 0, 'retried': 0, 'failed': 0, 'throttled_seconds': 0.0, **_counters}
+
+
+def reset_counters() -> None:
+    with _counters_lock:
+        _counters.clear()
+
+
+def status_counts() -> Dict[str, int]:
+    """Number of outbox rows in each status."""
+    counts = dict.fromkeys(EmailOutboxStatus.values, 0)
+    for row in EmailOutbox.objects.values('status').annotate(count=Count('id')).order_by():
+        counts[row['status']] = row['count']
+    return counts
+
+
+# =========================================================================
+# Enqueueing
+# =========================================================================
+
+def build_outbox_entry(
+    message: EmailMessage,
+    notification: Optional[Notification] = None,
+    dedupe_key: Optional[str] = None,
+    not_before: Optional[datetime] = None,
+) -> EmailOutbox:
+    """An unsaved outbox row for an HTML EmailMessage, not sent before not_before if given."""
+    return EmailOutbox(
+        notification=notification,
+        dedupe_key=dedupe_key,
+        from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(message.to),
+        cc=list(message.cc),
+        reply_to=list(message.reply_to),
+        subject=message.subject,
+        html_body=message.body,
+        next_attempt_at=not_before or timezone.now(),
+    )
+
+
+def enqueue_emails(entries: List[EmailOutbox]) -> List[EmailOutbox]:
+    """
+    Save outbox rows in the current transaction and queue the sender to run
+    after it commits. Rows whose dedupe key is already in the outbox are skipped.
+    """
+    if not entries:
+        return []
+    EmailOutbox.objects.bulk_create(entries, ignore_conflicts=True)
+    transaction.on_commit(_dispatch_drain)
+    return entries
+
+
+def enqueue_email(
+    message: EmailMessage,
+    notification: Optional[Notification] = None,
+    dedupe_key: Optional[str] = None,
+    not_before: Optional[datetime] = None,
+) -> EmailOutbox:
+    """Queue a single email; see enqueue_emails()."""
+    return enqueue_emails([build_outbox_entry(message, notification, dedupe_key, not_before)])[0]
+
+
+def _dispatch_drain() -> None:
+    from notifications.tasks import drain_email_outbox, CELERY_AVAILABLE
+
+    try:
+        if CELERY_AVAILABLE:
+            drain_email_outbox.delay()
+        else:
+            # Run synchronously if Celery not available
+            drain_email_outbox()
+    except Exception as e:
+        # The periodic drain will send it
+        logger.error(f"Failed to queue email outbox drain: {e}")
+
+
+# =========================================================================
+# Sending
+# =========================================================================
+
+def send_email_messages(messages: List[EmailMessage]) -> List[Optional[str]]:
+    """
+    Send messages through a single email backend connection.
+
+    Returns an error string (or None if sent) per message. Backends that
+    record per-message outcomes (GmailAPIBackend sets message.send_error)
+    are mapped exactly; otherwise a short send count fails every message.
+    """
+    if not messages:
+        return []
+    try:
+        sent = get_connection(fail_silently=True).send_messages(messages) or 0
+    except Exception as e:
+        return [str(e)] * len(messages)
+
+    errors = [getattr(message, 'send_error', None) for message in messages]
+    if sent < len(messages) and not any(errors):
+        errors = ['Email backend did not send the message'] * len(messages)
+    return [str(error) if error else None for error in errors]
+
+
+def _to_message(entry: EmailOutbox) -> EmailMessage:
+    message = EmailMessage(
+        subject=entry.subject,
+        body=entry.html_body,
+        from_email=entry.from_email,
+        to=entry.to,
+        cc=entry.cc,
+        reply_to=entry.reply_to,
+    )
+    message.content_subtype = 'html'
+    return message
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def _claim_batch(batch_size: int) -> List[EmailOutbox]:
+    """Lock and claim up to batch_size due rows: pending ones, and abandoned claims."""
+    now = timezone.now()
+    with transaction.atomic():
+        entries = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=[EmailOutboxStatus.PENDING, EmailOutboxStatus.SENDING],
+                next_attempt_at__lte=now,
+            )
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        for entry in entries:
+            entry.status = EmailOutboxStatus.SENDING
+            entry.attempts += 1
+            entry.next_attempt_at = now + timedelta(seconds=CLAIM_SECONDS)
+        EmailOutbox.objects.bulk_update(entries, ['status', 'attempts', 'next_attempt_at'])
+    return entries
+
+
+def _send_batch(entries: List[EmailOutbox]) -> Dict[str, int]:
+    messages = [_to_message(entry) for entry in entries]
+    _count(throttled_seconds=get_bucket().acquire(len(messages)))
+    errors = send_email_messages(messages)
+
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+    now = timezone.now()
+    result = {'sent': 0, 'retried': 0, 'failed': 0}
+    sent_notification_ids = []
+    failed_notifications = []
+    for entry, message, error in zip(entries, messages, errors):
+        if error is None:
+            entry.status = EmailOutboxStatus.SENT
+            entry.sent_at = now
+            entry.last_error = ''
+            entry.provider_message_id = getattr(message, 'gmail_message_id', None) or ''
+            result['sent'] += 1
+            if entry.notification_id:
+                sent_notification_ids.append(entry.notification_id)
+            continue
+
+        entry.last_error = error
+        if entry.attempts >= max_attempts:
+            entry.status = EmailOutboxStatus.FAILED
+            result['failed'] += 1
+            logger.warning(f"Giving up on email to {', '.join(entry.to)} after {entry.attempts} attempts: {error}")
+        else:
+            entry.status = EmailOutboxStatus.PENDING
+            entry.next_attempt_at = now + _retry_delay(entry.attempts)
+            result['retried'] += 1
+        if entry.notification_id:
+            failed_notifications.append(Notification(id=entry.notification_id, email_error=error))
+
+    EmailOutbox.objects.bulk_update(
+        entries, ['status', 'sent_at', 'last_error', 'provider_message_id', 'next_attempt_at'],
+    )
+    if sent_notification_ids:
+        Notification.objects.filter(id__in=sent_notification_ids).update(
+            email_sent=True, email_sent_at=now, email_error='',
+        )
+    if failed_notifications:
+        Notification.objects.bulk_update(failed_notifications, ['email_error'])
+
+    _count(**result)
+    return result
+
+
+def drain_outbox(batch_size: Optional[int] = None, max_seconds: float = MAX_RUN_SECONDS) -> Dict[str, int]:
+    """
+    Send due outbox emails in batches until none are left or max_seconds pass.
+
+    Returns how many were sent, scheduled for retry and given up on.
+    """
+    batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    # A batch never needs more tokens than the bucket can hold
+    batch_size = min(batch_size, get_bucket().capacity)
+
+    totals = {'sent': 0, 'retried': 0, 'failed': 0}
+    started = time.monotonic()
+    while time.monotonic() - started < max_seconds:
+        entries = _claim_batch(batch_size)
+        if not entries:
+            break
+        for name, amount in _send_batch(entries).items():
+            totals[name] += amount
+    return totals
+
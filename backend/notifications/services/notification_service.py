@@ -15,15 +15,21 @@ by enabling/disabling templates for specific recipient types.
 import logging
 from django.conf import settings
 from django.core.mail import EmailMessage
+from django.db import transaction
 from django.template import Template, Context
 from django.utils import timezone
-from django.utils.html import strip_tags
 from datetime import timedelta
 from typing import Optional, Dict, Any, List, Union
 
 from core.utils import ExternalRecipient
+from notifications import events
+from notifications.services import coalescing, counters
+from notifications.services.email_outbox import build_outbox_entry, enqueue_email, enqueue_emails
+from notifications.stream import notification_event_data
 
 from notifications.models import (
+    EmailOutbox,
+    EmailOutboxStatus,
     Notification,
     NotificationType,
     NotificationTemplate,
@@ -388,19 +394,6 @@ class NotificationService:
             )
             raise
 
-        # Create the notification
-        notification = Notification.objects.create(
-            recipient=recipient,
-            notification_type=template.template_type,
-            channel=template.default_channel,
-            title=rendered['title'],
-            body=rendered['body'],
-            application=application,
-            stage_instance=stage_instance,
-            action_url=action_url,
-            sent_at=timezone.now(),
-        )
-
         # Send email if configured
         should_send_email = (
             send_email and
@@ -408,14 +401,114 @@ class NotificationService:
             template.default_channel in [NotificationChannel.EMAIL, NotificationChannel.BOTH]
         )
 
-        if should_send_email:
-            cls._send_notification_email(
-                notification=notification,
-                template=template,
-                rendered=rendered,
-                context=full_context,
+        # High-churn types merge into a recent notification for the same
+        # recipient and application/job instead of creating another one
+        coalesce_key = coalescing.coalesce_key(template.template_type, application, context.get('job'))
+        window = coalescing.get_window() if coalesce_key else 0
+
+        # Create the notification and queue its email together, so neither
+        # exists without the other
+        with transaction.atomic():
+            if window:
+                notification = cls._coalesce_notification(
+                    recipient=recipient,
+                    coalesce_key=coalesce_key,
+                    window=window,
+                    template=template,
+                    rendered=rendered,
+                    context=full_context,
+                    action_url=action_url,
+                    send_email=should_send_email,
+                )
+                if notification is not None:
+                    return notification
+
+            notification = Notification.objects.create(
+                recipient=recipient,
+                notification_type=template.template_type,
+                channel=template.default_channel,
+                title=rendered['title'],
+                body=rendered['body'],
+                application=application,
+                stage_instance=stage_instance,
+                action_url=action_url,
+                coalesce_key=coalesce_key if window else '',
+                digest_items=[coalescing.digest_item(rendered)] if window else [],
+                sent_at=timezone.now(),
             )
 
+            if should_send_email:
+                cls._send_notification_email(
+                    notification=notification,
+                    template=template,
+                    rendered=rendered,
+                    context=full_context,
+                    # Hold the email for the window so a burst goes out as one digest
+                    not_before=timezone.now() + timedelta(seconds=window) if window else None,
+                )
+
+        return notification
+
+    @classmethod
+    def _coalesce_notification(
+        cls,
+        recipient,
+        coalesce_key: str,
+        window: int,
+        template: NotificationTemplate,
+        rendered: Dict[str, str],
+        context: Dict[str, Any],
+        action_url: str = "",
+        send_email: bool = True,
+    ) -> Optional[Notification]:
+        """
+        Merge a notification into the recipient's open digest for coalesce_key.
+
+        Returns the updated digest notification, or None if there is no
+        notification to merge into: none within the window, or its email has
+        already left the outbox. Must run inside a transaction.
+        """
+        since = timezone.now() - timedelta(seconds=window)
+        notification = (
+            Notification.objects.select_for_update()
+            .filter(recipient=recipient, coalesce_key=coalesce_key, sent_at__gte=since)
+            .order_by('-sent_at')
+            .first()
+        )
+        if notification is None:
+            return None
+
+        outbox_entry = (
+            EmailOutbox.objects.select_for_update()
+            .filter(notification=notification, status=EmailOutboxStatus.PENDING)
+            .first()
+        )
+        if send_email and outbox_entry is None:
+            return None
+
+        items = notification.digest_items + [coalescing.digest_item(rendered)]
+        digest = coalescing.render_digest(items, context)
+
+        was_read = notification.is_read
+        notification.notification_type = template.template_type
+        notification.title = digest['title']
+        notification.body = digest['body']
+        notification.digest_items = items
+        notification.action_url = action_url or notification.action_url
+        notification.is_read = False
+        notification.read_at = None
+        notification.save(update_fields=[
+            'notification_type', 'title', 'body', 'digest_items', 'action_url', 'is_read', 'read_at',
+        ])
+        events.publish('notification', notification_event_data(notification), users=[notification.recipient_id])
+        counters.record_updated(notification, became_unread=was_read)
+
+        if outbox_entry is not None:
+            email = cls._render_notification_email(notification, digest, context)
+            outbox_entry.subject = email.subject
+            outbox_entry.html_body = email.body
+            outbox_entry.save(update_fields=['subject', 'html_body'])
+
         return notification
 
     @classmethod
@@ -481,86 +574,142 @@ class NotificationService:
         }
 
     @classmethod
-    def _send_notification_email(
+    def _render_notification_email(
         cls,
         notification: Notification,
-        template: NotificationTemplate,
         rendered: Dict[str, str],
         context: Dict[str, Any],
-    ) -> bool:
-        """Send an email for a notification using templates."""
-        try:
-            # Get branding settings for base template
-            branding = BrandingSettings.get_settings()
-            branding_context = branding.get_email_context()
+    ) -> EmailMessage:
+        """Render a notification's email into the branded base template."""
+        # Get branding settings for base template
+        branding = BrandingSettings.get_settings()
+        branding_context = branding.get_email_context()
 
-            # Build full email context
-            email_context = {
-                **context,
-                **branding_context,
-                "notification": notification,
-            }
+        # Build full email context
+        email_context = {
+            **context,
+            **branding_context,
+            "notification": notification,
+        }
 
-            # Get the email content from the template
-            email_body_html = rendered.get('email_body') or rendered['body']
-            email_subject = rendered.get('email_subject') or rendered['title']
+        # Get the email content from the template
+        email_body_html = rendered.get('email_body') or rendered['body']
+        email_subject = rendered.get('email_subject') or rendered['title']
 
-            # Build action URL
-            site_url = email_context.get('site_url', '')
-            action_url = notification.action_url or ''
-            full_action_url = f"{site_url}{action_url}" if action_url and not action_url.startswith('http') else action_url
+        # Build action URL
+        site_url = email_context.get('site_url', '')
+        action_url = notification.action_url or ''
+        full_action_url = f"{site_url}{action_url}" if action_url and not action_url.startswith('http') else action_url
 
-            # Wrap email content with title and action button
-            email_content = f'''
+        # Wrap email content with title and action button
+        email_content = f'''
 <h1>{rendered['title']}</h1>
 {email_body_html}
 {f'<p><a href="{full_action_url}" class="button">View Details</a></p>' if full_action_url else ''}
 '''
 
-            # Get the base template from branding
-            base_template = branding.get_email_template()
-
-            # Render the full email
-            full_context = {**email_context, 'email_content': email_content}
-            django_template = Template(base_template)
-            html_content = django_template.render(Context(full_context))
-
-            text_content = strip_tags(html_content)
-
-            # Build CC and Reply-To from settings
-            cc = []
-            reply_to = []
-            if hasattr(settings, 'EMAIL_CC') and settings.EMAIL_CC:
-                cc = [addr.strip() for addr in settings.EMAIL_CC.split(',') if addr.strip()]
-            if hasattr(settings, 'EMAIL_REPLY_TO') and settings.EMAIL_REPLY_TO:
-                reply_to = [settings.EMAIL_REPLY_TO.strip()]
-
-            # Send email using EmailMessage for CC/Reply-To support
-            email = EmailMessage(
-                subject=email_subject,
-                body=text_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[notification.recipient.email],
-                cc=cc,
-                reply_to=reply_to,
-            )
-            email.content_subtype = 'html'
-            email.body = html_content
-            email.send(fail_silently=False)
+        # Get the base template from branding
+        base_template = branding.get_email_template()
+
+        # Render the full email
+        full_context = {**email_context, 'email_content': email_content}
+        django_template = Template(base_template)
+        html_content = django_template.render(Context(full_context))
+
+        return cls._build_email_message(notification.recipient.email, email_subject, html_content)
+
+    @classmethod
+    def _send_notification_email(
+        cls,
+        notification: Notification,
+        template: NotificationTemplate,
+        rendered: Dict[str, str],
+        context: Dict[str, Any],
+        not_before=None,
+    ) -> bool:
+        """
+        Queue an email for a notification using templates.
 
-            # Mark email as sent
-            notification.email_sent = True
-            notification.email_sent_at = timezone.now()
-            notification.save(update_fields=['email_sent', 'email_sent_at'])
+        The email is written to the outbox in the caller's transaction and
+        sent by the outbox worker (not before not_before, if given), which
+        records the outcome on the notification (email_sent/email_error).
+        """
+        try:
+            email = cls._render_notification_email(notification, rendered, context)
+            enqueue_email(
+                email,
+                notification=notification,
+                dedupe_key=f'notification:{notification.id}',
+                not_before=not_before,
+            )
 
             return True
 
         except Exception as e:
             notification.email_error = str(e)
             notification.save(update_fields=['email_error'])
-            logger.error(f"Error sending notification email: {e}")
+            logger.error(f"Error queueing notification email: {e}")
             return False
 
+    @classmethod
+    def _build_email_message(cls, to_email: str, subject: str, html_content: str) -> EmailMessage:
+        """Build an HTML EmailMessage with the configured CC and Reply-To."""
+        # Build CC and Reply-To from settings
+        cc = []
+        reply_to = []
+        if hasattr(settings, 'EMAIL_CC') and settings.EMAIL_CC:
+            cc = [addr.strip() for addr in settings.EMAIL_CC.split(',') if addr.strip()]
+        if hasattr(settings, 'EMAIL_REPLY_TO') and settings.EMAIL_REPLY_TO:
+            reply_to = [settings.EMAIL_REPLY_TO.strip()]
+
+        # EmailMessage rather than send_mail for CC/Reply-To support
+        email = EmailMessage(
+            subject=subject,
+            body=html_content,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[to_email],
+            cc=cc,
+            reply_to=reply_to,
+        )
+        email.content_subtype = 'html'
+        return email
+
+    @classmethod
+    def _render_email(
+        cls,
+        to_email: str,
+        subject: str,
+        body: str,
+        action_url: str = None,
+        branding: BrandingSettings = None,
+    ) -> EmailMessage:
+        """Render a direct (non-notification) email into the branded base template."""
+        # Get branding settings for base template
+        branding = branding or BrandingSettings.get_settings()
+        branding_context = branding.get_email_context()
+
+        # Build action URL
+        site_url = branding_context.get('site_url', '')
+        full_action_url = action_url or ''
+        if full_action_url and not full_action_url.startswith('http'):
+            full_action_url = f"{site_url}{full_action_url}"
+
+        # Wrap email content with action button
+        email_content = f'''
+{body}
+{f'<p><a href="{full_action_url}" class="button">View Details</a></p>' if full_action_url else ''}
+'''
+
+        # Get the base template from branding
+        base_template = branding.get_email_template()
+
+        # Render the full email
+        full_context = {**branding_context, 'email_content': email_content}
+        django_template = Template(base_template)
+        html_content = django_template.render(Context(full_context))
+
+        return cls._build_email_message(to_email, subject, html_content)
+
     @classmethod
     def _send_email(
         cls,
@@ -570,61 +719,16 @@ class NotificationService:
         action_url: str = None,
     ) -> bool:
         """
-        Send an email directly without a notification object.
+        Queue an email directly without a notification object.
         Used for invitations to non-users.
         """
         try:
-            # Get branding settings for base template
-            branding = BrandingSettings.get_settings()
-            branding_context = branding.get_email_context()
-
-            # Build action URL
-            site_url = branding_context.get('site_url', '')
-            full_action_url = action_url or ''
-            if full_action_url and not full_action_url.startswith('http'):
-                full_action_url = f"{site_url}{full_action_url}"
-
-            # Wrap email content with action button
-            email_content = f'''
-{body}
-{f'<p><a href="{full_action_url}" class="button">View Details</a></p>' if full_action_url else ''}
-'''
-
-            # Get the base template from branding
-            base_template = branding.get_email_template()
-
-            # Render the full email
-            full_context = {**branding_context, 'email_content': email_content}
-            django_template = Template(base_template)
-            html_content = django_template.render(Context(full_context))
-
-            text_content = strip_tags(html_content)
-
-            # Build CC and Reply-To from settings
-            cc = []
-            reply_to = []
-            if hasattr(settings, 'EMAIL_CC') and settings.EMAIL_CC:
-                cc = [addr.strip() for addr in settings.EMAIL_CC.split(',') if addr.strip()]
-            if hasattr(settings, 'EMAIL_REPLY_TO') and settings.EMAIL_REPLY_TO:
-                reply_to = [settings.EMAIL_REPLY_TO.strip()]
-
-            # Send email using EmailMessage for CC/Reply-To support
-            email = EmailMessage(
-                subject=subject,
-                body=text_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[to_email],
-                cc=cc,
-                reply_to=reply_to,
-            )
-            email.content_subtype = 'html'
-            email.body = html_content
-            email.send(fail_silently=False)
-
+            email = cls._render_email(to_email, subject, body, action_url)
+            enqueue_email(email)
             return True
 
         except Exception as e:
-            logger.error(f"Error sending email to {to_email}: {e}")
+            logger.error(f"Error queueing email to {to_email}: {e}")
             raise
 
     # =========================================================================
@@ -1976,74 +2080,57 @@ class NotificationService:
 
         send_email = channel in [NotificationChannel.EMAIL, NotificationChannel.BOTH, 'email', 'both']
 
-        notifications = []
-        for recipient in recipients:
-            # For admin broadcasts, we create the notification directly
-            # since the content is custom
-            notification = Notification.objects.create(
-                recipient=recipient,
-                notification_type=notification_type,
-                channel=channel,
-                title=title,
-                body=body,
-                action_url=action_url,
-                sent_at=timezone.now(),
-            )
-
-            if send_email and recipient.email:
-                # Send email with the custom content
-                try:
-                    branding = BrandingSettings.get_settings()
-                    base_template = branding.get_email_template()
-                    branding_context = branding.get_email_context()
-
-                    email_content = f'<h1>{title}</h1><p>{body}</p>'
-                    if action_url:
-                        site_url = getattr(settings, 'SITE_URL', 'http://localhost:3000')
-                        full_url = f"{site_url}{action_url}" if not action_url.startswith('http') else action_url
-                        email_content += f'<p><a href="{full_url}" class="button">View Details</a></p>'
-
-                    full_context = {
-                        **branding_context,
-                        'email_content': email_content,
-                        'recipient_name': recipient.get_full_name() or recipient.email,
-                        'first_name': recipient.first_name or recipient.email.split('@')[0],
-                    }
-
-                    django_template = Template(base_template)
-                    html_content = django_template.render(Context(full_context))
-                    text_content = strip_tags(html_content)
-
-                    # Build CC and Reply-To from settings
-                    cc = []
-                    reply_to = []
-                    if hasattr(settings, 'EMAIL_CC') and settings.EMAIL_CC:
-                        cc = [addr.strip() for addr in settings.EMAIL_CC.split(',') if addr.strip()]
-                    if hasattr(settings, 'EMAIL_REPLY_TO') and settings.EMAIL_REPLY_TO:
-                        reply_to = [settings.EMAIL_REPLY_TO.strip()]
-
-                    # Send email using EmailMessage for CC/Reply-To support
-                    email = EmailMessage(
-                        subject=title,
-                        body=text_content,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        to=[recipient.email],
-                        cc=cc,
-                        reply_to=reply_to,
-                    )
-                    email.content_subtype = 'html'
-                    email.body = html_content
-                    email.send(fail_silently=True)
+        if send_email:
+            branding = BrandingSettings.get_settings()
+            base_template = Template(branding.get_email_template())
+            branding_context = branding.get_email_context()
 
-                    notification.email_sent = True
-                    notification.email_sent_at = timezone.now()
-                    notification.save(update_fields=['email_sent', 'email_sent_at'])
+            email_content = f'<h1>{title}</h1><p>{body}</p>'
+            if action_url:
+                site_url = getattr(settings, 'SITE_URL', 'http://localhost:3000')
+                full_url = f"{site_url}{action_url}" if not action_url.startswith('http') else action_url
+                email_content += f'<p><a href="{full_url}" class="button">View Details</a></p>'
 
-                except Exception as e:
-                    notification.email_error = str(e)
-                    notification.save(update_fields=['email_error'])
+        notifications = []
+        emails = []  # Outbox entries, queued together below
+        with transaction.atomic():
+            for recipient in recipients:
+                # For admin broadcasts, we create the notification directly
+                # since the content is custom
+                notification = Notification.objects.create(
+                    recipient=recipient,
+                    notification_type=notification_type,
+                    channel=channel,
+                    title=title,
+                    body=body,
+                    action_url=action_url,
+                    sent_at=timezone.now(),
+                )
 
-            notifications.append(notification)
+                if send_email and recipient.email:
+                    # Render email with the custom content
+                    try:
+                        full_context = {
+                            **branding_context,
+                            'email_content': email_content,
+                            'recipient_name': recipient.get_full_name() or recipient.email,
+                            'first_name': recipient.first_name or recipient.email.split('@')[0],
+                        }
+                        html_content = base_template.render(Context(full_context))
+                        emails.append(build_outbox_entry(
+                            cls._build_email_message(recipient.email, title, html_content),
+                            notification=notification,
+                            dedupe_key=f'notification:{notification.id}',
+                        ))
+
+                    except Exception as e:
+                        notification.email_error = str(e)
+                        notification.save(update_fields=['email_error'])
+
+                notifications.append(notification)
+
+            # The outbox worker sends them through one backend connection
+            enqueue_emails(emails)
 
         return notifications
 
@@ -2216,24 +2303,26 @@ class NotificationService:
 
         # Handle external recipients (email only, no Notification record)
         if external_recipients:
+            branding = BrandingSettings.get_settings()
+            emails = []  # Outbox entries, queued together below
             for ext_recipient in external_recipients:
                 ext_info = {
                     'email': ext_recipient.email,
                     'name': ext_recipient.name,
                 }
                 try:
-                    success = cls._send_email(
+                    message = cls._render_email(
                         to_email=ext_recipient.email,
                         subject=title,
                         body=body,
                         action_url=action_url,
+                        branding=branding,
                     )
-                    ext_info['email_sent'] = success
-                    ext_info['email_error'] = None if success else 'Send failed'
-                    if success:
-                        logger.info(f"Sent automation email to external recipient: {ext_recipient.email}")
-                    else:
-                        logger.warning(f"Failed to send email to {ext_recipient.email}")
+                    emails.append(build_outbox_entry(message))
+                    # Sent by the outbox worker; no Notification to record the outcome on
+                    ext_info['email_sent'] = False
+                    ext_info['email_queued'] = True
+                    ext_info['email_error'] = None
                 except Exception as e:
                     ext_info['email_sent'] = False
                     ext_info['email_error'] = str(e)
@@ -2241,6 +2330,10 @@ class NotificationService:
 
                 external_emails.append(ext_info)
 
+            enqueue_emails(emails)
+            if emails:
+                logger.info(f"Queued {len(emails)} automation emails to external recipients")
+
         # Only store external_emails (no Notification record for them)
         # User notifications are linked via rule_execution FK
         result = {}
@@ -0,0 +1,41 @@
+"""
+Django signals for the notifications app.
+
+- Keeps per-user unread counters in step as notifications are created and deleted
+- Publishes real-time events for the notification stream (see notifications.stream)
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from jobs.models import ActivityLog
+
+from . import events
+from .models import Notification
+from .services import counters
+from .stream import notification_event_data
+
+
+@receiver(post_save, sender=Notification)
+def count_created_notification(sender, instance, created, **kwargs):
+    """Count a new notification towards its recipient's unread total, and push it to their streams."""
+    if created:
+        events.publish('notification', notification_event_data(instance), users=[instance.recipient_id])
+        counters.record_created(instance)
+
+
+@receiver(post_delete, sender=Notification)
+def count_deleted_notification(sender, instance, **kwargs):
+    """Stop counting a deleted unread notification."""
+    counters.record_deleted(instance)
+
+
+@receiver(post_save, sender=ActivityLog)
+def publish_application_activity(sender, instance, created, **kwargs):
+    """Tell everyone who can see the job that its recent activity changed."""
+    if created:
+        events.publish(
+            'activity',
+            {'application_id': instance.application_id, 'activity_type': instance.activity_type},
+            job=instance.application.job_id,
+        )
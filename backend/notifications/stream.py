@@ -0,0 +1,196 @@
+"""
+Server-sent events stream of notification and dashboard updates.
+
+GET /api/v1/notifications/stream/ keeps a text/event-stream response open
+and pushes, for the signed-in user:
+
+- notification: a new notification (or a digest that gained an update)
+- unread_count: the unread count and newest notification id changed
+- task_assigned: a task was assigned to the user
+- activity: new activity on an application the user can see
+  (refetch recent activity)
+- resync: events may have been missed; refetch everything
+
+Events arrive from notifications.events over PostgreSQL LISTEN/NOTIFY. Each
+event has an id, so a reconnecting EventSource sends Last-Event-ID and gets
+the notifications and task assignments it missed. A comment line is sent
+every NOTIFICATION_STREAM_HEARTBEAT_SECONDS to keep proxies from closing
+idle connections.
+
+EventSource can't send an Authorization header, so the access token may
+also be passed as ?token=. Serve this under ASGI (config.asgi); under WSGI
+each open stream holds a worker.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import AsyncIterator, List, Optional, Set
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from .events import Subscriber, event_id, hub
+from .models import Notification
+from .serializers import NotificationListSerializer
+from .services import counters
+
+DEFAULT_HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 5000
+
+# How far back, and how many events, a reconnecting stream is caught up on
+REPLAY_WINDOW = timedelta(days=1)
+REPLAY_LIMIT = 50
+
+
+def format_event(event: str, data, id: Optional[str] = None) -> str:
+    """One SSE message."""
+    lines = []
+    if id is not None:
+        lines.append(f'id: {id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, default=str)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def _to_event_id(moment: datetime) -> str:
+    return str(int(moment.timestamp() * 1000))
+
+
+def _from_event_id(value: Optional[str]) -> Optional[datetime]:
+    try:
+        since = datetime.fromtimestamp(int(value) / 1000, tz=dt_timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+    return max(since, timezone.now() - REPLAY_WINDOW)
+
+
+def _authenticate(request):
+    """The user for a bearer token in the Authorization header or ?token=, or None."""
+    authentication = JWTAuthentication()
+    try:
+        result = authentication.authenticate(request)
+        if result is not None:
+            return result[0]
+        token = request.GET.get('token')
+        if token:
+            return authentication.get_user(authentication.get_validated_token(token))
+    except (InvalidToken, TokenError):
+        return None
+    return None
+
+
+def _activity_job_ids(user) -> Optional[Set[str]]:
+    """Jobs whose application activity the user sees, mirroring recent_activity; None means all."""
+    from jobs.models import Job
+    from users.models import UserRole
+
+    if user.role == UserRole.ADMIN:
+        return None
+    if user.role == UserRole.RECRUITER:
+        jobs = Job.objects.filter(Q(assigned_recruiters=user) | Q(created_by=user))
+    elif user.role == UserRole.CLIENT:
+        membership = user.company_memberships.first()
+        if membership is None:
+            return set()
+        jobs = Job.objects.filter(company_id=membership.company_id)
+    else:
+        return set()
+    return {str(job_id) for job_id in jobs.values_list('id', flat=True).distinct()}
+
+
+def notification_event_data(notification: Notification) -> dict:
+    return NotificationListSerializer(notification).data
+
+
+def task_event_data(task) -> dict:
+    return {
+        'id': task.id,
+        'title': task.title,
+        'entity_type': task.entity_type,
+        'entity_id': task.entity_id,
+        'priority': task.priority,
+        'status': task.status,
+        'due_date': task.due_date,
+    }
+
+
+def _unread_event(user) -> str:
+    counter = counters.get_counter(user)
+    return format_event('unread_count', {
+        'unread_count': max(counter.unread_count, 0),
+        'latest_notification_id': counter.latest_notification_id,
+    }, id=_to_event_id(counter.updated_at))
+
+
+def _replay(user, since: datetime) -> List[str]:
+    """Events for notifications and task assignments since a reconnecting stream's last event."""
+    from core.models import Task
+
+    events = []
+    notifications = (
+        Notification.objects.filter(recipient=user, sent_at__gte=since)
+        .order_by('-sent_at')[:REPLAY_LIMIT]
+    )
+    for notification in notifications:
+        events.append((notification.sent_at, format_event(
+            'notification', notification_event_data(notification), id=_to_event_id(notification.sent_at),
+        )))
+    tasks = Task.objects.filter(assigned_to=user, updated_at__gte=since).order_by('-updated_at')[:REPLAY_LIMIT]
+    for task in tasks:
+        events.append((task.updated_at, format_event(
+            'task_assigned', task_event_data(task), id=_to_event_id(task.updated_at),
+        )))
+    return [event for _, event in sorted(events, key=lambda pair: pair[0])]
+
+
+async def _stream(user, subscriber: Subscriber, since: Optional[datetime]) -> AsyncIterator[str]:
+    heartbeat = getattr(settings, 'NOTIFICATION_STREAM_HEARTBEAT_SECONDS', DEFAULT_HEARTBEAT_SECONDS)
+    # Subscribe before catching up, so nothing published meanwhile is lost
+    hub.subscribe(subscriber)
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        if since is not None:
+            for event in await sync_to_async(_replay)(user, since):
+                yield event
+        yield await sync_to_async(_unread_event)(user)
+
+        while True:
+            try:
+                message = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ': heartbeat\n\n'
+                continue
+
+            if subscriber.overflowed:
+                subscriber.overflowed = False
+                yield format_event('resync', {}, id=event_id())
+            elif message['event'] == 'unread_count':
+                # Read the counter now rather than trusting a stale payload
+                yield await sync_to_async(_unread_event)(user)
+            else:
+                yield format_event(message['event'], message['data'], id=message['id'])
+    finally:
+        hub.unsubscribe(subscriber)
+
+
+async def notification_stream(request):
+    """Stream notification, unread-count, task and activity events to the signed-in user."""
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided.'}, status=401)
+
+    since = _from_event_id(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id'))
+    job_ids = await sync_to_async(_activity_job_ids)(user)
+    subscriber = Subscriber(user.id, job_ids, asyncio.get_running_loop())
+
+    response = StreamingHttpResponse(_stream(user, subscriber, since), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
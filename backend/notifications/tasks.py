@@ -0,0 +1,50 @@
+"""
+Celery tasks for the notifications app.
+
+These tasks handle:
+- Sending queued emails from the email outbox
+- Reconciling per-user unread notification counters
+"""
+
+import logging
+
+# Try to import Celery, but make it optional
+try:
+    from celery import shared_task
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+    def shared_task(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="notifications.drain_email_outbox")
+def drain_email_outbox():
+    """
+    Send due emails from the outbox.
+
+    Queued whenever emails are enqueued, and run periodically to pick up
+    retries and rows left behind by a crashed worker.
+    """
+    from notifications.services.email_outbox import drain_outbox, status_counts
+
+    result = drain_outbox()
+    if result['sent'] or result['retried'] or result['failed']:
+        logger.info(f"Email outbox drained: {result}, outbox now {status_counts()}")
+    return result
+
+
+@shared_task(name="notifications.reconcile_notification_counters")
+def reconcile_notification_counters():
+    """Correct unread counters that drifted from the notifications table."""
+    from notifications.services.counters import reconcile_all
+
+    fixed = reconcile_all()
+    if fixed:
+        logger.warning(f"Reconciled {fixed} drifted notification counters")
+    return {'fixed': fixed}
@@ -0,0 +1,523 @@
+import asyncio
+import json
+import threading
+from unittest import mock
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from googleapiclient.discovery import build_from_document
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpMockSequence
+from rest_framework.test import APITestCase
+
+from candidates.models import CandidateProfile
+from companies.models import Company
+from config import gmail_backend
+from config.gmail_backend import GmailAPIBackend
+from jobs.models import Application, Job
+from users.models import User, UserRole
+from .models import (
+    EmailOutbox, EmailOutboxStatus, Notification, NotificationCounter, NotificationTemplate, NotificationType,
+    RecipientType,
+)
+from . import events, stream
+from .services import counters, email_outbox
+from .services.email_outbox import TokenBucket, drain_outbox
+from .services.notification_service import NotificationService
+
+# Just enough of the Gmail discovery document to build users.messages.send
+STUB_DISCOVERY_DOCUMENT = json.dumps({
+    'kind': 'discovery#restDescription',
+    'discoveryVersion': 'v1',
+    'id': 'gmail:v1',
+    'name': 'gmail',
+    'version': 'v1',
+    'protocol': 'rest',
+    'rootUrl': 'https://gmail.googleapis.com/',
+    'servicePath': '',
+    'batchPath': 'batch',
+    'parameters': {},
+    'resources': {'users': {'resources': {'messages': {'methods': {'send': {
+        'id': 'gmail.users.messages.send',
+        'path': 'gmail/v1/users/{userId}/messages/send',
+        'httpMethod': 'POST',
+        'parameters': {'userId': {'type': 'string', 'required': True, 'location': 'path'}},
+        'parameterOrder': ['userId'],
+        'request': {'$ref': 'Message'},
+        'response': {'$ref': 'Message'},
+    }}}}}},
+    'schemas': {'Message': {'id': 'Message', 'type': 'object', 'properties': {
+        'id': {'type': 'string'},
+        'raw': {'type': 'string', 'format': 'byte'},
+    }}},
+})
+
+BOUNDARY = 'batch_boundary'
+
+
+def batch_response(*parts):
+    """A Gmail batch HTTP response; parts are (request_id, status, body) tuples."""
+    chunks = []
+    for request_id, status_code, body in parts:
+        chunks.append(
+            f'--{BOUNDARY}\r\n'
+            'Content-Type: application/http\r\n'
+            f'Content-ID: <response-batch + {request_id}>\r\n\r\n'
+            f'HTTP/1.1 {status_code} Status\r\n'
+            'Content-Type: application/json\r\n\r\n'
+            f'{json.dumps(body)}\r\n'
+        )
+    content = ''.join(chunks) + f'--{BOUNDARY}--'
+    return ({'status': '200', 'content-type': f'multipart/mixed; boundary="{BOUNDARY}"'}, content)
+
+
+def stub_service(*responses):
+    return build_from_document(STUB_DISCOVERY_DOCUMENT, http=HttpMockSequence(list(responses)))
+
+
+def make_messages(count):
+    return [
+        EmailMessage(subject=f'Subject {i}', body='Body', from_email='from@example.com', to=[f'user{i}@example.com'])
+        for i in range(count)
+    ]
+
+
+@mock.patch.object(gmail_backend, 'RETRY_BACKOFF_SECONDS', 0)
+class GmailAPIBackendTests(SimpleTestCase):
+    def test_sends_messages_in_one_batch_request(self):
+        service = stub_service(batch_response((0, 200, {'id': 'm0'}), (1, 200, {'id': 'm1'})))
+        messages = make_messages(2)
+
+        sent = GmailAPIBackend(service=service).send_messages(messages)
+
+        self.assertEqual(sent, 2)
+        self.assertEqual([m.gmail_message_id for m in messages], ['m0', 'm1'])
+        self.assertEqual([m.send_error for m in messages], [None, None])
+
+    def test_maps_errors_to_messages(self):
+        service = stub_service(batch_response(
+            (0, 200, {'id': 'm0'}),
+            (1, 400, {'error': {'code': 400, 'message': 'Invalid To header'}}),
+        ))
+        messages = make_messages(2)
+
+        sent = GmailAPIBackend(fail_silently=True, service=service).send_messages(messages)
+
+        self.assertEqual(sent, 1)
+        self.assertIsNone(messages[0].send_error)
+        self.assertIsInstance(messages[1].send_error, HttpError)
+        self.assertEqual(messages[1].send_error.resp.status, 400)
+
+    def test_raises_first_error_unless_fail_silently(self):
+        service = stub_service(batch_response((0, 400, {'error': {'code': 400, 'message': 'Bad'}})))
+
+        with self.assertRaises(HttpError):
+            GmailAPIBackend(service=service).send_messages(make_messages(1))
+
+    def test_retries_rate_limited_messages(self):
+        service = stub_service(
+            batch_response((0, 200, {'id': 'm0'}), (1, 429, {'error': {'code': 429, 'message': 'Slow down'}})),
+            batch_response((1, 200, {'id': 'm1'})),
+        )
+        messages = make_messages(2)
+
+        sent = GmailAPIBackend(service=service).send_messages(messages)
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(messages[1].gmail_message_id, 'm1')
+
+    def test_splits_large_sends_into_batches(self):
+        service = stub_service(
+            batch_response((0, 200, {'id': 'm0'}), (1, 200, {'id': 'm1'})),
+            batch_response((2, 200, {'id': 'm2'})),
+        )
+        messages = make_messages(3)
+
+        with mock.patch.object(gmail_backend, 'BATCH_SIZE', 2):
+            sent = GmailAPIBackend(service=service).send_messages(messages)
+
+        self.assertEqual(sent, 3)
+        self.assertEqual(messages[2].gmail_message_id, 'm2')
+
+
+def service_account_info():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    return {
+        'type': 'service_account',
+        'project_id': 'test',
+        'private_key_id': 'key',
+        'private_key': pem,
+        'client_email': 'sender@test.iam.gserviceaccount.com',
+        'client_id': '1',
+        'token_uri': 'https://oauth2.googleapis.com/token',
+    }
+
+
+@override_settings(
+    GMAIL_SERVICE_ACCOUNT_FILE='',
+    GMAIL_SERVICE_ACCOUNT_INFO=service_account_info(),
+    GMAIL_DELEGATED_USER='notifications@example.com',
+)
+@mock.patch.object(gmail_backend, 'get_static_doc', lambda api, version: STUB_DISCOVERY_DOCUMENT)
+class GmailServiceCacheTests(SimpleTestCase):
+    def setUp(self):
+        gmail_backend.reset_gmail_service()
+        self.addCleanup(gmail_backend.reset_gmail_service)
+
+    def test_backends_share_credentials_and_service(self):
+        first = GmailAPIBackend()
+        second = GmailAPIBackend()
+
+        self.assertIs(first.service, second.service)
+        self.assertIs(gmail_backend.get_credentials(), gmail_backend.get_credentials())
+
+    def test_each_thread_gets_its_own_service_with_shared_credentials(self):
+        services = []
+        thread = threading.Thread(target=lambda: services.append(gmail_backend.get_gmail_service()))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(services[0], gmail_backend.get_gmail_service())
+        self.assertIs(services[0]._http.credentials, gmail_backend.get_gmail_service()._http.credentials)
+
+
+class CountingEmailBackend(LocmemEmailBackend):
+    """Locmem backend that counts how many connections senders open."""
+    instances = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingEmailBackend.instances += 1
+
+
+@override_settings(EMAIL_BACKEND='notifications.tests.CountingEmailBackend')
+class BatchedNotificationEmailTests(TestCase):
+    def setUp(self):
+        CountingEmailBackend.instances = 0
+        self.users = [
+            User.objects.create_user(
+                username=f'user{i}',
+                email=f'user{i}@example.com',
+                password='password123',
+                role=UserRole.CANDIDATE,
+            )
+            for i in range(3)
+        ]
+
+    def test_send_to_users_uses_one_connection(self):
+        from django.core import mail
+
+        notifications = NotificationService.send_to_users(self.users, title='Hello', body='Body', channel='both')
+        drain_outbox()
+
+        self.assertEqual(CountingEmailBackend.instances, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(
+            Notification.objects.filter(id__in=[n.id for n in notifications], email_sent=True).count(), 3,
+        )
+
+
+class FailingEmailBackend(LocmemEmailBackend):
+    """Backend whose sends never go through."""
+    def send_messages(self, messages):
+        return 0
+
+
+class EmailOutboxTests(TestCase):
+    def setUp(self):
+        email_outbox.reset_counters()
+        self.user = User.objects.create_user(
+            username='outbox', email='outbox@example.com', password='password123', role=UserRole.CANDIDATE,
+        )
+
+    def test_send_to_users_queues_emails_instead_of_sending(self):
+        from django.core import mail
+
+        notifications = NotificationService.send_to_users([self.user], title='Hello', body='Body', channel='both')
+
+        self.assertEqual(len(mail.outbox), 0)
+        entry = EmailOutbox.objects.get()
+        self.assertEqual(entry.notification, notifications[0])
+        self.assertEqual(entry.to, ['outbox@example.com'])
+        self.assertEqual(entry.status, EmailOutboxStatus.PENDING)
+
+    def test_drain_sends_and_marks_notification(self):
+        from django.core import mail
+
+        notification = NotificationService.send_to_users([self.user], title='Hello', body='Body', channel='both')[0]
+
+        result = drain_outbox()
+
+        self.assertEqual(result, {'sent': 1, 'retried': 0, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(EmailOutbox.objects.get().status, EmailOutboxStatus.SENT)
+        notification.refresh_from_db()
+        self.assertTrue(notification.email_sent)
+        self.assertEqual(email_outbox.get_counters()['sent'], 1)
+        self.assertEqual(email_outbox.status_counts()[EmailOutboxStatus.SENT], 1)
+
+    def test_dedupe_key_skips_duplicates(self):
+        message = make_messages(1)[0]
+
+        email_outbox.enqueue_email(message, dedupe_key='welcome:1')
+        email_outbox.enqueue_email(message, dedupe_key='welcome:1')
+
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+
+    @override_settings(EMAIL_BACKEND='notifications.tests.FailingEmailBackend', EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_give_up(self):
+        notification = NotificationService.send_to_users([self.user], title='Hello', body='Body', channel='both')[0]
+
+        self.assertEqual(drain_outbox(), {'sent': 0, 'retried': 1, 'failed': 0})
+        entry = EmailOutbox.objects.get()
+        self.assertEqual(entry.status, EmailOutboxStatus.PENDING)
+        self.assertEqual(entry.attempts, 1)
+        self.assertGreater(entry.next_attempt_at, entry.created_at)
+
+        # Not due yet
+        self.assertEqual(drain_outbox(), {'sent': 0, 'retried': 0, 'failed': 0})
+
+        EmailOutbox.objects.update(next_attempt_at=entry.created_at)
+        self.assertEqual(drain_outbox(), {'sent': 0, 'retried': 0, 'failed': 1})
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, EmailOutboxStatus.FAILED)
+        notification.refresh_from_db()
+        self.assertFalse(notification.email_sent)
+        self.assertEqual(notification.email_error, 'Email backend did not send the message')
+
+    def test_abandoned_claims_are_retried(self):
+        email_outbox.enqueue_email(make_messages(1)[0])
+        EmailOutbox.objects.update(status=EmailOutboxStatus.SENDING, attempts=1)
+
+        self.assertEqual(drain_outbox()['sent'], 1)
+        self.assertEqual(EmailOutbox.objects.get().attempts, 2)
+
+
+class TokenBucketTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def test_allows_bursts_up_to_capacity(self):
+        bucket = TokenBucket(rate=2, capacity=5, clock=self.clock, sleep=self.sleep)
+
+        self.assertEqual(bucket.acquire(5), 0)
+        self.assertEqual(self.sleeps, [])
+
+    def test_waits_for_tokens_at_the_given_rate(self):
+        bucket = TokenBucket(rate=2, capacity=5, clock=self.clock, sleep=self.sleep)
+        bucket.acquire(5)
+
+        self.assertEqual(bucket.acquire(3), 1.5)
+        self.now += 1
+        self.assertEqual(bucket.acquire(2), 0)
+
+
+@override_settings(NOTIFICATION_COALESCE_WINDOW_SECONDS=120)
+class NotificationCoalescingTests(TestCase):
+    def setUp(self):
+        self.candidate = User.objects.create_user(
+            username='candidate', email='candidate@example.com', password='password123', role=UserRole.CANDIDATE,
+        )
+        job = Job.objects.create(company=Company.objects.create(name='Acme'), title='Engineer')
+        self.application = Application.objects.create(
+            job=job, candidate=CandidateProfile.objects.create(user=self.candidate),
+        )
+        self.templates = [
+            NotificationTemplate.objects.create(
+                name=f'Advanced {i}',
+                template_type=notification_type,
+                recipient_type=RecipientType.CANDIDATE,
+                title_template=f'Moved to stage {i}',
+                body_template='Your application moved on.',
+            )
+            for i, notification_type in enumerate([
+                NotificationType.ADVANCED_TO_PHONE_SCREENING,
+                NotificationType.ADVANCED_TO_VIDEO_INTERVIEW,
+            ])
+        ]
+
+    def send(self, template):
+        return NotificationService._send_single_notification(
+            recipient=self.candidate, template=template, context={}, application=self.application,
+        )
+
+    def test_burst_merges_into_one_digest(self):
+        first = self.send(self.templates[0])
+        second = self.send(self.templates[1])
+
+        self.assertEqual(first.id, second.id)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.notification_type, NotificationType.ADVANCED_TO_VIDEO_INTERVIEW)
+        self.assertEqual(notification.title, '2 updates: Moved to stage 1')
+        self.assertEqual(len(notification.digest_items), 2)
+
+        entry = EmailOutbox.objects.get()
+        self.assertTrue(entry.subject.startswith('2 updates from'))
+        self.assertIn('Moved to stage 0', entry.html_body)
+        self.assertGreater(entry.next_attempt_at, timezone.now())
+
+    def test_sent_email_starts_a_new_notification(self):
+        self.send(self.templates[0])
+        EmailOutbox.objects.update(status=EmailOutboxStatus.SENT)
+
+        self.send(self.templates[1])
+
+        self.assertEqual(Notification.objects.count(), 2)
+        self.assertEqual(EmailOutbox.objects.count(), 2)
+
+    @override_settings(NOTIFICATION_COALESCE_WINDOW_SECONDS=0)
+    def test_zero_window_disables_coalescing(self):
+        self.send(self.templates[0])
+        self.send(self.templates[1])
+
+        self.assertEqual(Notification.objects.count(), 2)
+        self.assertLessEqual(EmailOutbox.objects.get(notification__title='Moved to stage 0').next_attempt_at, timezone.now())
+
+
+class NotificationCounterTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='password123', role=UserRole.CANDIDATE,
+        )
+        self.client.force_authenticate(self.user)
+        self.url = reverse('get-unread-count')
+
+    def notify(self, title='Hello'):
+        return Notification.objects.create(
+            recipient=self.user, notification_type=NotificationType.CUSTOM, title=title, body='Body',
+        )
+
+    def test_counter_is_built_on_first_read_then_adjusted(self):
+        self.notify()
+
+        self.assertEqual(self.client.get(self.url).data['unread_count'], 1)
+
+        latest = self.notify()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['unread_count'], 2)
+        self.assertEqual(response.data['latest_notification_id'], latest.id)
+
+        latest.mark_as_read()
+        self.assertEqual(self.client.get(self.url).data['unread_count'], 1)
+
+        self.client.post(reverse('mark-notifications-read'), {}, format='json')
+        self.assertEqual(self.client.get(self.url).data['unread_count'], 0)
+
+        self.notify().delete()
+        self.assertEqual(NotificationCounter.objects.get(user=self.user).unread_count, 0)
+
+    def test_poll_is_one_query_and_revalidates(self):
+        self.notify()
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.notify()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_reconcile_all_fixes_drift(self):
+        self.notify()
+        counters.get_counter(self.user)
+        NotificationCounter.objects.update(unread_count=7)
+
+        self.assertEqual(counters.reconcile_all(), 1)
+        self.assertEqual(NotificationCounter.objects.get(user=self.user).unread_count, 1)
+
+
+class NotificationEventTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='listener', email='listener@example.com', password='password123', role=UserRole.CANDIDATE,
+        )
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def receive(self, subscriber):
+        return self.loop.run_until_complete(asyncio.wait_for(subscriber.queue.get(), 5))
+
+    def test_committed_notification_reaches_subscriber(self):
+        subscriber = events.Subscriber(self.user.id, set(), self.loop)
+        other = events.Subscriber('someone-else', set(), self.loop)
+        events.hub.subscribe(subscriber)
+        events.hub.subscribe(other)
+        self.addCleanup(events.hub.unsubscribe, subscriber)
+        self.addCleanup(events.hub.unsubscribe, other)
+        self.assertTrue(events.hub.listening.wait(5))
+
+        notification = Notification.objects.create(
+            recipient=self.user, notification_type=NotificationType.CUSTOM, title='Live', body='Body',
+        )
+
+        message = self.receive(subscriber)
+        self.assertEqual(message['event'], 'notification')
+        self.assertEqual(message['data']['id'], str(notification.id))
+        self.assertEqual(self.receive(subscriber)['event'], 'unread_count')
+        self.assertTrue(other.queue.empty())
+
+    def test_activity_is_scoped_to_visible_jobs(self):
+        admin = events.Subscriber(1, None, self.loop)
+        recruiter = events.Subscriber(2, {'job-1'}, self.loop)
+        message = {'id': '1', 'event': 'activity', 'users': [], 'job': 'job-2', 'data': {}}
+
+        self.assertTrue(admin.wants(message))
+        self.assertFalse(recruiter.wants(message))
+        self.assertTrue(recruiter.wants({**message, 'job': 'job-1'}))
+
+
+class NotificationStreamTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='streamer', email='streamer@example.com', password='password123', role=UserRole.CANDIDATE,
+        )
+
+    def first_events(self, since, count):
+        async def collect():
+            subscriber = events.Subscriber(self.user.id, set(), asyncio.get_running_loop())
+            generator = stream._stream(self.user, subscriber, since)
+            try:
+                return [await generator.__anext__() for _ in range(count)]
+            finally:
+                await generator.aclose()
+        with mock.patch.object(events.hub, 'subscribe'):
+            return async_to_sync(collect)()
+
+    def test_reconnect_replays_missed_notifications(self):
+        notification = Notification.objects.create(
+            recipient=self.user, notification_type=NotificationType.CUSTOM, title='Missed', body='Body',
+        )
+        last_event_id = str(int(notification.sent_at.timestamp() * 1000) - 1000)
+
+        retry, replayed, unread = self.first_events(stream._from_event_id(last_event_id), 3)
+
+        self.assertTrue(retry.startswith('retry:'))
+        self.assertIn('event: notification', replayed)
+        self.assertIn(str(notification.id), replayed)
+        self.assertIn('"unread_count": 1', unread)
+
+    def test_rejects_unauthenticated_requests(self):
+        response = self.client.get(reverse('notification-stream'))
+
+        self.assertEqual(response.status_code, 401)
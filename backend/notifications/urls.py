@@ -1,11 +1,12 @@
 from django.urls import path
-from . import views
+from . import stream, views
 
 urlpatterns = [
     # User endpoints (current user's notifications)
     path('', views.list_notifications, name='list-notifications'),
     path('unread-count/', views.get_unread_count, name='get-unread-count'),
     path('mark-read/', views.mark_notifications_read, name='mark-notifications-read'),
+    path('stream/', stream.notification_stream, name='notification-stream'),
     path('<uuid:notification_id>/', views.get_notification, name='get-notification'),
 
     # Admin endpoints
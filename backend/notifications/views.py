@@ -5,6 +5,7 @@ from rest_framework import status
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.core.paginator import Paginator
+from django.utils.cache import get_conditional_response, patch_vary_headers
 
 from api.permissions import IsAdmin, IsRecruiterOrAdmin
 from .models import Notification, NotificationTemplate, NotificationType
@@ -20,6 +21,7 @@ from .serializers import (
     NotificationTemplateSerializer,
     NotificationTemplateListSerializer,
 )
+from .services import counters
 from .services.notification_service import NotificationService
 
 User = get_user_model()
@@ -47,7 +49,7 @@ def list_notifications(request):
     serializer = NotificationListSerializer(notifications, many=True)
 
     # Also return unread count
-    unread_count = Notification.objects.filter(recipient=request.user, is_read=False).count()
+    unread_count = counters.get_unread_count(request.user)
 
     return Response({
         'notifications': serializer.data,
@@ -84,18 +86,19 @@ def mark_notifications_read(request):
         notification_ids = serializer.validated_data.get('notification_ids', [])
 
         if notification_ids:
-            Notification.objects.filter(
+            marked = Notification.objects.filter(
                 id__in=notification_ids,
                 recipient=request.user,
                 is_read=False
             ).update(is_read=True, read_at=timezone.now())
         else:
-            Notification.objects.filter(
+            marked = Notification.objects.filter(
                 recipient=request.user,
                 is_read=False
             ).update(is_read=True, read_at=timezone.now())
+        counters.record_read(request.user.id, marked)
 
-        unread_count = Notification.objects.filter(recipient=request.user, is_read=False).count()
+        unread_count = counters.get_unread_count(request.user)
         return Response({'unread_count': unread_count})
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -104,10 +107,26 @@ def mark_notifications_read(request):
 @permission_classes([IsAuthenticated])
 def get_unread_count(request):
     """
-    Get the count of unread notifications.
+    Get the count of unread notifications and the id of the newest one.
+
+    Reads the user's counter row only. Responses carry an ETag that changes
+    whenever either value does, so pollers can send If-None-Match and get a
+    304 until something changes.
     """
-    unread_count = Notification.objects.filter(recipient=request.user, is_read=False).count()
-    return Response({'unread_count': unread_count})
+    counter = counters.get_counter(request.user)
+    etag = f'"{request.user.id}-{counter.version}"'
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = Response({
+            'unread_count': max(counter.unread_count, 0),
+            'latest_notification_id': counter.latest_notification_id,
+        })
+    response['ETag'] = etag
+    # Always revalidate; the ETag makes that cheap
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ('Authorization',))
+    return response
 
 
 # =============================================================================
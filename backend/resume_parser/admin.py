@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import ResumeParseJob
+
+
+@admin.register(ResumeParseJob)
+class ResumeParseJobAdmin(admin.ModelAdmin):
+    list_display = ['file_name', 'candidate', 'status', 'is_cached', 'created_at', 'completed_at']
+    list_filter = ['status', 'is_cached']
+    search_fields = ['file_name', 'content_hash', 'candidate__user__email']
+    readonly_fields = ['content_hash', 'created_at', 'started_at', 'completed_at']
+    ordering = ['-created_at']
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ResumeParserConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'resume_parser'
+
+    def ready(self):
+        # Import signals to register them
+        import resume_parser.signals  # noqa: F401
@@ -0,0 +1,373 @@
+"""
+Bulk resume import pipeline for recruiter back-catalogues.
+
+Used by the import_resumes management command. Resumes are processed in
+batches: text is extracted in a process pool, parsed by the LLM with bounded
+thread concurrency (or reused from earlier parses of identical files), then
+candidates are upserted and their experiences, education and technology/skill
+links are inserted with bulk_create. Progress is written to a JSON checkpoint
+after every batch so an interrupted import can be resumed.
+"""
+import json
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.validators import validate_email
+from django.db import transaction
+from django.utils import timezone
+
+from candidates.models import CandidateProfile
+from users.models import User, UserRole
+from .extraction import DOCX_CONTENT_TYPE, PDF_CONTENT_TYPE, extract_texts
+from .import_service import apply_profile_data, import_experiences_and_education
+from .models import ResumeParseJob, ResumeParseJobStatus
+from .services import compute_content_hash, get_llm_client, parse_resume_content
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {
+    '.pdf': PDF_CONTENT_TYPE,
+    '.docx': DOCX_CONTENT_TYPE,
+}
+
+# Same limit as ResumeParseView
+MAX_FILE_SIZE = 5 * 1024 * 1024
+
+
+class CheckpointStatus:
+    IMPORTED = 'imported'
+    FAILED = 'failed'
+
+
+@dataclass
+class ResumeFile:
+    """One resume moving through the pipeline."""
+    path: Path
+    content: bytes
+    content_type: str
+    content_hash: str
+    text: str = ''
+    parsed: Optional[dict] = None
+    cached: bool = False
+    error: str = ''
+    candidate: Optional[CandidateProfile] = None
+
+
+@dataclass
+class ImportStats:
+    files_found: int = 0
+    skipped: int = 0
+    imported: int = 0
+    failed: int = 0
+    parsed: int = 0
+    cached: int = 0
+    candidates_created: int = 0
+    candidates_updated: int = 0
+    experiences_created: int = 0
+    education_created: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def processed(self) -> int:
+        return self.imported + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def files_per_minute(self) -> float:
+        return self.processed / self.elapsed * 60 if self.elapsed else 0.0
+
+
+class ImportCheckpoint:
+    """
+    JSON record of processed files, keyed by content hash so renamed or
+    duplicated files are not imported twice.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        if path and path.exists():
+            with open(path) as f:
+                self.entries = json.load(f).get('files', {})
+
+    def should_skip(self, content_hash: str, retry_failed: bool = False) -> bool:
+        entry = self.entries.get(content_hash)
+        if not entry:
+            return False
+        return not (retry_failed and entry['status'] == CheckpointStatus.FAILED)
+
+    def record(self, resume: ResumeFile) -> None:
+        self.entries[resume.content_hash] = {
+            'path': str(resume.path),
+            'status': CheckpointStatus.FAILED if resume.error else CheckpointStatus.IMPORTED,
+            'error': resume.error,
+            'candidate_id': resume.candidate.id if resume.candidate and not resume.error else None,
+            'processed_at': timezone.now().isoformat(),
+        }
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        # Write to a temp file first so an interrupted save never corrupts the checkpoint
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'files': self.entries}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def discover_resumes(directory: Path, recursive: bool = True) -> List[Path]:
+    """List PDF/DOCX files in a directory, sorted for a stable processing order."""
+    pattern = '**/*' if recursive else '*'
+    return sorted(
+        path for path in directory.glob(pattern)
+        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
+    )
+
+
+class BulkResumeImporter:
+    """Imports resumes from disk in bounded-concurrency batches."""
+
+    def __init__(
+        self,
+        batch_size: int = 20,
+        concurrency: int = 4,
+        extract_workers: Optional[int] = None,
+        checkpoint: Optional[ImportCheckpoint] = None,
+        retry_failed: bool = False,
+        client=None,
+        on_file: Optional[Callable[[ResumeFile], None]] = None,
+        on_batch: Optional[Callable[[ImportStats], None]] = None,
+    ):
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.extract_workers = extract_workers
+        self.checkpoint = checkpoint or ImportCheckpoint(None)
+        self.retry_failed = retry_failed
+        self.client = client
+        self.on_file = on_file
+        self.on_batch = on_batch
+        self.stats = ImportStats()
+
+    def run(self, paths: Iterable[Path]) -> ImportStats:
+        paths = list(paths)
+        self.stats.files_found = len(paths)
+        for start in range(0, len(paths), self.batch_size):
+            self.import_batch(paths[start:start + self.batch_size])
+        return self.stats
+
+    def import_batch(self, paths: List[Path]) -> None:
+        resumes = self._load(paths)
+        if resumes:
+            self._extract(resumes)
+            self._parse(resumes)
+            self._upsert(resumes)
+
+            for resume in resumes:
+                self.checkpoint.record(resume)
+                if resume.error:
+                    self.stats.failed += 1
+                else:
+                    self.stats.imported += 1
+                if self.on_file:
+                    self.on_file(resume)
+            self.checkpoint.save()
+
+        if self.on_batch:
+            self.on_batch(self.stats)
+
+    def _load(self, paths: List[Path]) -> List[ResumeFile]:
+        resumes = []
+        seen = set()
+        for path in paths:
+            content = path.read_bytes()
+            content_hash = compute_content_hash(content)
+            if content_hash in seen or self.checkpoint.should_skip(content_hash, self.retry_failed):
+                self.stats.skipped += 1
+                continue
+            seen.add(content_hash)
+
+            resume = ResumeFile(
+                path=path,
+                content=content,
+                content_type=SUPPORTED_EXTENSIONS[path.suffix.lower()],
+                content_hash=content_hash,
+            )
+            if len(content) > MAX_FILE_SIZE:
+                resume.error = 'File too large. Maximum size is 5MB'
+            resumes.append(resume)
+        return resumes
+
+    def _extract(self, resumes: List[ResumeFile]) -> None:
+        pending = [resume for resume in resumes if not resume.error]
+        texts = extract_texts(
+            [(resume.path.name, resume.content, resume.content_type) for resume in pending],
+            max_workers=self.extract_workers,
+        )
+        for resume, text in zip(pending, texts):
+            resume.text = text
+
+    def _parse(self, resumes: List[ResumeFile]) -> None:
+        pending = [resume for resume in resumes if not resume.error]
+
+        # Reuse results of earlier parses of identical files
+        previous = {}
+        completed_jobs = ResumeParseJob.objects.filter(
+            content_hash__in=[resume.content_hash for resume in pending],
+            status=ResumeParseJobStatus.COMPLETED,
+            result__isnull=False,
+        ).order_by('completed_at').values_list('content_hash', 'result')
+        for content_hash, result in completed_jobs:
+            previous[content_hash] = result
+
+        to_parse = []
+        for resume in pending:
+            if resume.content_hash in previous:
+                resume.parsed = previous[resume.content_hash]
+                resume.cached = True
+                self.stats.cached += 1
+            else:
+                to_parse.append(resume)
+
+        if not to_parse:
+            return
+
+        client = self.client or get_llm_client()
+
+        def parse(resume):
+            try:
+                resume.parsed = parse_resume_content(
+                    resume.path.name,
+                    resume.content,
+                    resume.content_type,
+                    client=client,
+                    text=resume.text,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to parse {resume.path}: {e}")
+                resume.error = f"Parse failed: {e}"
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            list(executor.map(parse, to_parse))
+        self.stats.parsed += sum(1 for resume in to_parse if not resume.error)
+
+    def _upsert_candidate(self, resume: ResumeFile) -> None:
+        """Create or update the user and candidate profile for one resume."""
+        profile_data = (resume.parsed or {}).get('profile') or {}
+        email = (profile_data.get('email') or '').strip().lower()
+        try:
+            validate_email(email)
+        except ValidationError:
+            raise ValueError('No valid email address found in resume')
+
+        user = User.objects.filter(email__iexact=email).first()
+        if user and user.role != UserRole.CANDIDATE:
+            raise ValueError(f'{email} belongs to a non-candidate user')
+
+        created = user is None
+        if created:
+            # Pending candidate, same as users auto-created from bookings
+            user = User(
+                email=email,
+                username=f"pending_{uuid.uuid4().hex[:8]}",
+                role=UserRole.CANDIDATE,
+                is_active=False,
+                is_pending_signup=True,
+            )
+            user.set_unusable_password()
+            user.save()
+
+        profile, _ = CandidateProfile.objects.get_or_create(user=user)
+        if not profile.resume_url:
+            profile.resume_url.save(resume.path.name, ContentFile(resume.content), save=False)
+        if resume.text:
+            profile.resume_text = resume.text
+
+        # Existing profiles only have blank fields filled in
+        apply_profile_data(profile, profile_data, only_blank=not created)
+
+        resume.candidate = profile
+        if created:
+            self.stats.candidates_created += 1
+        else:
+            self.stats.candidates_updated += 1
+
+    def _import_experiences(self, resumes: List[ResumeFile]) -> Dict[int, dict]:
+        """
+        Import experiences and education for the batch in one pass.
+
+        If the batch fails, each resume is retried in its own savepoint, so a
+        bad entry fails only the file it came from.
+        """
+        try:
+            with transaction.atomic():
+                return import_experiences_and_education(
+                    [(resume.candidate, resume.parsed) for resume in resumes],
+                    skip_existing=True,
+                )
+        except Exception as e:
+            logger.warning(f"Batch experience import failed, retrying file by file: {e}")
+
+        summaries = {}
+        for resume in resumes:
+            try:
+                with transaction.atomic():
+                    summaries.update(import_experiences_and_education(
+                        [(resume.candidate, resume.parsed)],
+                        skip_existing=True,
+                    ))
+            except Exception as e:
+                logger.warning(f"Failed to import experiences from {resume.path}: {e}")
+                resume.error = f"Experience import failed: {e}"
+        return summaries
+
+    def _upsert(self, resumes: List[ResumeFile]) -> None:
+        pending = [resume for resume in resumes if not resume.error]
+        if not pending:
+            return
+
+        with transaction.atomic():
+            for resume in pending:
+                try:
+                    # Savepoint per file so one bad resume does not abort the batch
+                    with transaction.atomic():
+                        self._upsert_candidate(resume)
+                except Exception as e:
+                    logger.warning(f"Failed to import {resume.path}: {e}")
+                    resume.error = str(e)
+
+            imported = [resume for resume in pending if not resume.error]
+            summaries = self._import_experiences(imported)
+            imported = [resume for resume in imported if not resume.error]
+            for summary in summaries.values():
+                self.stats.experiences_created += summary['experiences_created']
+                self.stats.education_created += summary['education_created']
+
+            # Record fresh parses so later uploads of the same file are served from cache
+            now = timezone.now()
+            ResumeParseJob.objects.bulk_create([
+                ResumeParseJob(
+                    candidate=resume.candidate,
+                    file=resume.candidate.resume_url.name,
+                    file_name=resume.path.name,
+                    file_size=len(resume.content),
+                    content_type=resume.content_type,
+                    content_hash=resume.content_hash,
+                    status=ResumeParseJobStatus.COMPLETED,
+                    result=resume.parsed,
+                    started_at=now,
+                    completed_at=now,
+                )
+                for resume in imported
+                if not resume.cached
+            ])
@@ -0,0 +1,138 @@
+"""
+Local text extraction for resumes (PDF via pypdf, DOCX via python-docx).
+
+Extracted text is sent to the LLM instead of uploading the binary file, and
+stored on the candidate profile for search. Files that yield no text (e.g.
+scanned PDFs) raise ResumeExtractionError so callers can fall back to the
+Files API upload.
+"""
+import io
+import logging
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Caps keep prompts small and bound extraction time for unusually large files
+MAX_PAGES = 10
+MAX_CHARS = 40000
+
+# Below this many characters the extraction is treated as failed (scanned PDF)
+MIN_CHARS = 200
+
+PDF_CONTENT_TYPE = 'application/pdf'
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+_INLINE_WHITESPACE_RE = re.compile(r'[ \t\f\v]+')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+class ResumeExtractionError(Exception):
+    """Raised when text cannot be extracted locally from a resume file."""
+    pass
+
+
+def normalize_text(text: str, max_chars: int = MAX_CHARS) -> str:
+    """Normalize unicode and whitespace, and cap the length."""
+    text = unicodedata.normalize('NFKC', text or '')
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = [_INLINE_WHITESPACE_RE.sub(' ', line).strip() for line in text.split('\n')]
+    text = _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip()
+    return text[:max_chars]
+
+
+def _extract_pdf(file_content: bytes, max_pages: int) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(file_content))
+    pages = []
+    for page in reader.pages[:max_pages]:
+        pages.append(page.extract_text() or '')
+    return '\n\n'.join(pages)
+
+
+def _extract_docx(file_content: bytes) -> str:
+    from docx import Document
+
+    document = Document(io.BytesIO(file_content))
+    parts = [paragraph.text for paragraph in document.paragraphs]
+    # Many resume templates lay out sections in tables
+    for table in document.tables:
+        for row in table.rows:
+            parts.append(' | '.join(cell.text for cell in row.cells))
+    return '\n'.join(parts)
+
+
+def _detect_type(file_name: str, content_type: Optional[str]) -> Optional[str]:
+    if content_type in (PDF_CONTENT_TYPE, DOCX_CONTENT_TYPE):
+        return content_type
+    name = (file_name or '').lower()
+    if name.endswith('.pdf'):
+        return PDF_CONTENT_TYPE
+    if name.endswith('.docx'):
+        return DOCX_CONTENT_TYPE
+    return None
+
+
+def extract_text(
+    file_name: str,
+    file_content: bytes,
+    content_type: Optional[str] = None,
+    max_pages: int = MAX_PAGES,
+    max_chars: int = MAX_CHARS,
+) -> str:
+    """
+    Extract normalized plain text from a PDF or DOCX resume.
+
+    Raises ResumeExtractionError if the type is unsupported, the file cannot
+    be read, or too little text comes out of it.
+    """
+    file_type = _detect_type(file_name, content_type)
+    try:
+        if file_type == PDF_CONTENT_TYPE:
+            raw_text = _extract_pdf(file_content, max_pages)
+        elif file_type == DOCX_CONTENT_TYPE:
+            raw_text = _extract_docx(file_content)
+        else:
+            raise ResumeExtractionError(f"Unsupported resume type: {content_type or file_name}")
+    except ResumeExtractionError:
+        raise
+    except Exception as e:
+        raise ResumeExtractionError(f"Could not read {file_name}: {e}") from e
+
+    text = normalize_text(raw_text, max_chars)
+    if len(text) < min(MIN_CHARS, max_chars):
+        raise ResumeExtractionError(f"No usable text found in {file_name}")
+    return text
+
+
+def extract_text_or_empty(file_name: str, file_content: bytes, content_type: Optional[str] = None) -> str:
+    """extract_text(), returning an empty string instead of raising."""
+    try:
+        return extract_text(file_name, file_content, content_type)
+    except ResumeExtractionError as e:
+        logger.info(f"Local extraction unavailable, falling back to file upload: {e}")
+        return ''
+
+
+def _extract_item(item: Tuple[str, bytes, Optional[str]]) -> str:
+    file_name, file_content, content_type = item
+    return extract_text_or_empty(file_name, file_content, content_type)
+
+
+def extract_texts(
+    items: Iterable[Tuple[str, bytes, Optional[str]]],
+    max_workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Extract text from many (file_name, file_content, content_type) items in a
+    process pool, for bulk imports. Returns texts in input order ('' where
+    extraction failed).
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [_extract_item(item) for item in items]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_extract_item, items))
@@ -1,110 +1,46 @@
 import logging
-from typing import Optional, Tuple
-from rapidfuzz import fuzz, process
+from datetime import date
+from typing import Dict, List, Optional, Tuple
 from django.db import transaction
-from django.utils.text import slugify
+from django.utils.dateparse import parse_date
 from candidates.models import (
     CandidateProfile, Experience, Education,
-    Technology, Skill, TechnologyCategory, SkillCategory
+    Technology, Skill,
 )
 from companies.models import Country, City
+from .vocabulary import FUZZY_MATCH_THRESHOLD, match_or_create  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
-# Minimum similarity score for fuzzy matching (0-100)
-FUZZY_MATCH_THRESHOLD = 80
-
 
 def fuzzy_match_or_create_technology(name: str, create_if_not_found: bool = True) -> Tuple[Optional[Technology], bool]:
     """
-    Find a Technology by fuzzy matching against existing records.
+    Find a Technology by fuzzy matching against the cached vocabulary.
     If not found and create_if_not_found is True, creates a new Technology.
 
+    For more than one name, use match_or_create(Technology, names) instead.
+
     Returns: (Technology or None, was_created: bool)
     """
-    technologies = list(Technology.objects.values_list('id', 'name'))
-
-    if technologies:
-        choices = {t[0]: t[1] for t in technologies}
-        result = process.extractOne(
-            name,
-            choices,
-            scorer=fuzz.WRatio,
-            score_cutoff=FUZZY_MATCH_THRESHOLD
-        )
-
-        if result:
-            matched_name, score, tech_id = result
-            logger.debug(f"Fuzzy matched technology '{name}' -> '{matched_name}' (score: {score})")
-            return Technology.objects.get(id=tech_id), False
-
-    # Not found - create if requested
-    if create_if_not_found:
-        # Generate unique slug
-        base_slug = slugify(name)[:100]
-        slug = base_slug
-        counter = 1
-        while Technology.objects.filter(slug=slug).exists():
-            slug = f"{base_slug[:95]}-{counter}"
-            counter += 1
-
-        tech = Technology.objects.create(
-            name=name[:100],
-            slug=slug,
-            category=TechnologyCategory.OTHER,
-            is_active=True,
-            needs_review=True
-        )
-        logger.info(f"Created new technology (needs review): '{name}'")
-        return tech, True
-
-    return None, False
+    tech_id, was_created = match_or_create(Technology, [name], create_if_not_found)[name]
+    if tech_id is None:
+        return None, False
+    return Technology.objects.get(id=tech_id), was_created
 
 
 def fuzzy_match_or_create_skill(name: str, create_if_not_found: bool = True) -> Tuple[Optional[Skill], bool]:
     """
-    Find a Skill by fuzzy matching against existing records.
+    Find a Skill by fuzzy matching against the cached vocabulary.
     If not found and create_if_not_found is True, creates a new Skill.
 
+    For more than one name, use match_or_create(Skill, names) instead.
+
     Returns: (Skill or None, was_created: bool)
     """
-    skills = list(Skill.objects.values_list('id', 'name'))
-
-    if skills:
-        choices = {s[0]: s[1] for s in skills}
-        result = process.extractOne(
-            name,
-            choices,
-            scorer=fuzz.WRatio,
-            score_cutoff=FUZZY_MATCH_THRESHOLD
-        )
-
-        if result:
-            matched_name, score, skill_id = result
-            logger.debug(f"Fuzzy matched skill '{name}' -> '{matched_name}' (score: {score})")
-            return Skill.objects.get(id=skill_id), False
-
-    # Not found - create if requested
-    if create_if_not_found:
-        # Generate unique slug
-        base_slug = slugify(name)[:100]
-        slug = base_slug
-        counter = 1
-        while Skill.objects.filter(slug=slug).exists():
-            slug = f"{base_slug[:95]}-{counter}"
-            counter += 1
-
-        skill = Skill.objects.create(
-            name=name[:100],
-            slug=slug,
-            category=SkillCategory.OTHER,
-            is_active=True,
-            needs_review=True
-        )
-        logger.info(f"Created new skill (needs review): '{name}'")
-        return skill, True
-
-    return None, False
+    skill_id, was_created = match_or_create(Skill, [name], create_if_not_found)[name]
+    if skill_id is None:
+        return None, False
+    return Skill.objects.get(id=skill_id), was_created
 
 
 def find_country_by_name(name: str) -> Optional[Country]:
@@ -141,16 +77,16 @@ def find_city_by_name(name: str, country: Optional[Country] = None) -> Optional[
     return city
 
 
-@transaction.atomic
-def import_resume_data(candidate_profile: CandidateProfile, parsed_data: dict) -> dict:
-    """
-    Import parsed resume data into the candidate's profile.
+def _parse_date(value) -> Optional[date]:
+    """Parse a YYYY-MM-DD string from the parser, returning None if invalid."""
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
 
-    Returns a summary of what was imported/matched.
-    """
-    results = {
-        'profile_updated': False,
-        'user_updated': False,
+
+def _empty_results() -> dict:
+    return {
         'experiences_created': 0,
         'education_created': 0,
         'technologies_matched': [],
@@ -159,111 +95,201 @@ def import_resume_data(candidate_profile: CandidateProfile, parsed_data: dict) -
         'skills_created': [],
     }
 
-    profile_data = parsed_data.get('profile', {})
-    experiences_data = parsed_data.get('experiences', [])
-    education_data = parsed_data.get('education', [])
 
-    # Update User (first_name, last_name)
+def _record_match(results: dict, kind: str, name: str, was_created: bool) -> None:
+    key = f'{kind}_created' if was_created else f'{kind}_matched'
+    if name not in results[key]:
+        results[key].append(name)
+
+
+def import_experiences_and_education(
+    entries: List[Tuple[CandidateProfile, dict]],
+    skip_existing: bool = False,
+) -> Dict[int, dict]:
+    """
+    Create Experience and Education records for a batch of parsed resumes.
+
+    Technologies and skills for the whole batch are matched with one
+    match_or_create call per model. Experiences, education and the
+    experience technology/skill through rows are inserted with bulk_create.
+
+    entries: (candidate_profile, parsed_data) pairs.
+    skip_existing: skip experiences/education that already exist for the
+        candidate (same title/company/start date, or institution/degree/start
+        date), so re-importing a resume does not duplicate entries.
+
+    Returns per-candidate summaries keyed by candidate profile id.
+    """
+    summaries = {profile.id: _empty_results() for profile, _ in entries}
+
+    # Parse dates up front; experiences without a valid start date are skipped
+    experiences_by_entry = []
+    for profile, parsed_data in entries:
+        valid = []
+        for exp_data in parsed_data.get('experiences', []) or []:
+            start_date = _parse_date(exp_data.get('start_date'))
+            if start_date:
+                valid.append((exp_data, start_date))
+        experiences_by_entry.append(valid)
+
+    all_experiences = [exp_data for valid in experiences_by_entry for exp_data, _ in valid]
+    technology_matches = match_or_create(
+        Technology,
+        [name for exp_data in all_experiences for name in exp_data.get('technologies', []) or []],
+    )
+    skill_matches = match_or_create(
+        Skill,
+        [name for exp_data in all_experiences for name in exp_data.get('skills', []) or []],
+    )
+
+    existing_experiences = set()
+    existing_education = set()
+    if skip_existing:
+        candidate_ids = list(summaries)
+        existing_experiences = set(
+            Experience.objects.filter(candidate_id__in=candidate_ids)
+            .values_list('candidate_id', 'job_title', 'company_name', 'start_date')
+        )
+        existing_education = set(
+            Education.objects.filter(candidate_id__in=candidate_ids)
+            .values_list('candidate_id', 'institution', 'degree', 'start_date')
+        )
+
+    experiences = []
+    technology_links = []
+    skill_links = []
+    education = []
+
+    for (profile, parsed_data), valid_experiences in zip(entries, experiences_by_entry):
+        results = summaries[profile.id]
+
+        for idx, (exp_data, start_date) in enumerate(valid_experiences):
+            job_title = (exp_data.get('job_title') or '')[:200]
+            company_name = (exp_data.get('company_name') or '')[:200]
+            if (profile.id, job_title, company_name, start_date) in existing_experiences:
+                continue
+            existing_experiences.add((profile.id, job_title, company_name, start_date))
+
+            experience = Experience(
+                candidate=profile,
+                job_title=job_title,
+                company_name=company_name,
+                start_date=start_date,
+                end_date=_parse_date(exp_data.get('end_date')) if not exp_data.get('is_current') else None,
+                is_current=bool(exp_data.get('is_current', False)),
+                description=exp_data.get('description', '') or '',
+                order=idx,
+            )
+            experiences.append(experience)
+
+            # Attach matched or created technologies
+            tech_ids = set()
+            for tech_name in exp_data.get('technologies', []) or []:
+                tech_id, was_created = technology_matches.get(tech_name, (None, False))
+                if tech_id:
+                    tech_ids.add(tech_id)
+                    _record_match(results, 'technologies', tech_name, was_created)
+            technology_links.extend(
+                Experience.technologies.through(experience_id=experience.id, technology_id=tech_id)
+                for tech_id in tech_ids
+            )
+
+            # Attach matched or created skills
+            skill_ids = set()
+            for skill_name in exp_data.get('skills', []) or []:
+                skill_id, was_created = skill_matches.get(skill_name, (None, False))
+                if skill_id:
+                    skill_ids.add(skill_id)
+                    _record_match(results, 'skills', skill_name, was_created)
+            skill_links.extend(
+                Experience.skills.through(experience_id=experience.id, skill_id=skill_id)
+                for skill_id in skill_ids
+            )
+
+            results['experiences_created'] += 1
+
+        for idx, edu_data in enumerate(parsed_data.get('education', []) or []):
+            # Education might not have dates - use a default date if not provided
+            start_date = _parse_date(edu_data.get('start_date')) or date(2000, 1, 1)
+            institution = (edu_data.get('institution', '') or '')[:200]
+            degree = (edu_data.get('degree', '') or '')[:200]
+            if (profile.id, institution, degree, start_date) in existing_education:
+                continue
+            existing_education.add((profile.id, institution, degree, start_date))
+
+            education.append(Education(
+                candidate=profile,
+                institution=institution,
+                degree=degree,
+                field_of_study=(edu_data.get('field_of_study', '') or '')[:200],
+                start_date=start_date,
+                end_date=_parse_date(edu_data.get('end_date')) if not edu_data.get('is_current') else None,
+                is_current=bool(edu_data.get('is_current', False)),
+                grade=(edu_data.get('grade', '') or '')[:50],
+                order=idx,
+            ))
+            results['education_created'] += 1
+
+    Experience.objects.bulk_create(experiences)
+    Experience.technologies.through.objects.bulk_create(technology_links, ignore_conflicts=True)
+    Experience.skills.through.objects.bulk_create(skill_links, ignore_conflicts=True)
+    Education.objects.bulk_create(education)
+
+    return summaries
+
+
+def apply_profile_data(candidate_profile: CandidateProfile, profile_data: dict, only_blank: bool = False) -> None:
+    """
+    Copy parsed profile fields onto the user and candidate profile and save both.
+
+    only_blank: only fill fields that are currently empty (used when bulk
+        importing into existing profiles, to keep edits made by candidates).
+    """
+    def should_set(obj, field):
+        return profile_data.get(field) and not (only_blank and getattr(obj, field))
+
+    # Update User (first_name, last_name, phone)
     user = candidate_profile.user
-    if profile_data.get('first_name'):
-        user.first_name = profile_data['first_name']
-    if profile_data.get('last_name'):
-        user.last_name = profile_data['last_name']
+    for field in ('first_name', 'last_name'):
+        if should_set(user, field):
+            setattr(user, field, profile_data[field][:150])
+    if should_set(user, 'phone'):
+        user.phone = profile_data['phone'][:20]
     user.save()
-    results['user_updated'] = True
 
     # Update CandidateProfile
-    if profile_data.get('professional_title'):
-        candidate_profile.professional_title = profile_data['professional_title']
-    if profile_data.get('headline'):
-        candidate_profile.headline = profile_data['headline']
-    if profile_data.get('professional_summary'):
-        candidate_profile.professional_summary = profile_data['professional_summary']
+    for field in ('professional_title', 'headline', 'professional_summary'):
+        if should_set(candidate_profile, field):
+            setattr(candidate_profile, field, profile_data[field])
 
     # Match country and city
-    country = find_country_by_name(profile_data.get('country'))
-    if country:
-        candidate_profile.country_rel = country
-        city = find_city_by_name(profile_data.get('city'), country)
-        if city:
-            candidate_profile.city_rel = city
+    if not (only_blank and candidate_profile.country_rel_id):
+        country = find_country_by_name(profile_data.get('country'))
+        if country:
+            candidate_profile.country_rel = country
+            city = find_city_by_name(profile_data.get('city'), country)
+            if city:
+                candidate_profile.city_rel = city
 
     candidate_profile.save()
-    results['profile_updated'] = True
-
-    # Clear existing experiences and education (optional - could be configurable)
-    # For now, we'll add to existing rather than replace
-    # candidate_profile.experiences.all().delete()
-    # candidate_profile.education.all().delete()
-
-    # Import Experiences
-    for idx, exp_data in enumerate(experiences_data):
-        # Parse dates
-        start_date = exp_data.get('start_date')
-        end_date = exp_data.get('end_date')
-
-        if not start_date:
-            continue  # Skip experiences without start date
-
-        experience = Experience.objects.create(
-            candidate=candidate_profile,
-            job_title=exp_data.get('job_title', ''),
-            company_name=exp_data.get('company_name', ''),
-            start_date=start_date,
-            end_date=end_date if not exp_data.get('is_current') else None,
-            is_current=exp_data.get('is_current', False),
-            description=exp_data.get('description', ''),
-            order=idx,
-        )
 
-        # Match or create technologies
-        for tech_name in exp_data.get('technologies', []):
-            tech, was_created = fuzzy_match_or_create_technology(tech_name)
-            if tech:
-                experience.technologies.add(tech)
-                if was_created:
-                    if tech_name not in results['technologies_created']:
-                        results['technologies_created'].append(tech_name)
-                else:
-                    if tech_name not in results['technologies_matched']:
-                        results['technologies_matched'].append(tech_name)
-
-        # Match or create skills
-        for skill_name in exp_data.get('skills', []):
-            skill, was_created = fuzzy_match_or_create_skill(skill_name)
-            if skill:
-                experience.skills.add(skill)
-                if was_created:
-                    if skill_name not in results['skills_created']:
-                        results['skills_created'].append(skill_name)
-                else:
-                    if skill_name not in results['skills_matched']:
-                        results['skills_matched'].append(skill_name)
-
-        results['experiences_created'] += 1
-
-    # Import Education
-    for idx, edu_data in enumerate(education_data):
-        start_date = edu_data.get('start_date')
-        end_date = edu_data.get('end_date')
-
-        # Education might not have dates
-        if not start_date:
-            # Use a default date if not provided
-            start_date = '2000-01-01'
-
-        Education.objects.create(
-            candidate=candidate_profile,
-            institution=edu_data.get('institution', ''),
-            degree=edu_data.get('degree', '') or '',
-            field_of_study=edu_data.get('field_of_study', '') or '',
-            start_date=start_date,
-            end_date=end_date if not edu_data.get('is_current') else None,
-            is_current=edu_data.get('is_current', False),
-            grade=edu_data.get('grade', '') or '',
-            order=idx,
-        )
-        results['education_created'] += 1
+
+@transaction.atomic
+def import_resume_data(candidate_profile: CandidateProfile, parsed_data: dict) -> dict:
+    """
+    Import parsed resume data into the candidate's profile.
+
+    Returns a summary of what was imported/matched.
+    """
+    apply_profile_data(candidate_profile, parsed_data.get('profile', {}) or {})
+
+    # New experiences and education are added to existing ones rather than replacing them
+    summary = import_experiences_and_education([(candidate_profile, parsed_data)])[candidate_profile.id]
+    results = {
+        'profile_updated': True,
+        'user_updated': True,
+        **summary,
+    }
 
     logger.info(f"Imported resume data for candidate {candidate_profile.id}: {results}")
     return results
@@ -0,0 +1,147 @@
+"""
+Management command to bulk import a directory of resumes.
+
+Usage:
+    python manage.py import_resumes /path/to/resumes --batch-size 20 --concurrency 4
+
+Each PDF/DOCX file is parsed (or reused from an earlier parse of the same
+file), and a candidate is created or updated by the email address on the
+resume. New candidates are created as pending signups. Progress is saved to a
+checkpoint file after every batch; re-running the command skips files that
+were already imported.
+"""
+import csv
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resume_parser.bulk_import import (
+    BulkResumeImporter,
+    ImportCheckpoint,
+    discover_resumes,
+)
+
+DEFAULT_CHECKPOINT_NAME = '.import_resumes_checkpoint.json'
+
+
+class Command(BaseCommand):
+    help = 'Bulk import PDF/DOCX resumes from a directory into candidate profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'directory',
+            type=str,
+            help='Directory containing the resumes',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help='Number of resumes per batch (default: 20)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Maximum concurrent LLM parse requests (default: 4)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Processes used for text extraction (default: CPU count)',
+        )
+        parser.add_argument(
+            '--no-recursive',
+            action='store_true',
+            help='Only import files directly inside the directory',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            type=str,
+            help=f'Checkpoint file (default: <directory>/{DEFAULT_CHECKPOINT_NAME})',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore the existing checkpoint and import every file again',
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Retry files that failed in a previous run',
+        )
+        parser.add_argument(
+            '--report',
+            type=str,
+            help='Write a CSV report of every processed file to this path',
+        )
+
+    def handle(self, *args, **options):
+        directory = Path(options['directory']).expanduser()
+        if not directory.is_dir():
+            raise CommandError(f'{directory} is not a directory')
+        if options['batch_size'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--batch-size and --concurrency must be at least 1')
+
+        checkpoint_path = Path(options['checkpoint'] or directory / DEFAULT_CHECKPOINT_NAME)
+        if options['restart'] and checkpoint_path.exists():
+            checkpoint_path.unlink()
+        checkpoint = ImportCheckpoint(checkpoint_path)
+
+        paths = discover_resumes(directory, recursive=not options['no_recursive'])
+        self.stdout.write(f'Found {len(paths)} resumes in {directory}')
+        if not paths:
+            return
+
+        report_rows = []
+
+        def on_file(resume):
+            report_rows.append([
+                str(resume.path),
+                'failed' if resume.error else 'imported',
+                resume.candidate.id if resume.candidate and not resume.error else '',
+                'yes' if resume.cached else 'no',
+                resume.error,
+            ])
+            if resume.error:
+                self.stdout.write(self.style.ERROR(f'  ✗ {resume.path.name}: {resume.error}'))
+
+        def on_batch(stats):
+            self.stdout.write(
+                f'  {stats.processed + stats.skipped}/{stats.files_found} files '
+                f'({stats.files_per_minute:.1f} files/min)'
+            )
+
+        importer = BulkResumeImporter(
+            batch_size=options['batch_size'],
+            concurrency=options['concurrency'],
+            extract_workers=options['workers'],
+            checkpoint=checkpoint,
+            retry_failed=options['retry_failed'],
+            on_file=on_file,
+            on_batch=on_batch,
+        )
+        stats = importer.run(paths)
+
+        if options['report']:
+            with open(options['report'], 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['Path', 'Status', 'Candidate ID', 'Cached', 'Error'])
+                writer.writerows(report_rows)
+
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {stats.imported} resumes in {stats.elapsed:.1f}s '
+            f'({stats.files_per_minute:.1f} files/min)'
+        ))
+        self.stdout.write(f'  Candidates created: {stats.candidates_created}')
+        self.stdout.write(f'  Candidates updated: {stats.candidates_updated}')
+        self.stdout.write(f'  Experiences added: {stats.experiences_created}')
+        self.stdout.write(f'  Education added: {stats.education_created}')
+        self.stdout.write(f'  Parsed: {stats.parsed}, reused from cache: {stats.cached}')
+        self.stdout.write(f'  Skipped (already imported): {stats.skipped}')
+        if stats.failed:
+            self.stdout.write(self.style.WARNING(
+                f'  Failed: {stats.failed} (re-run with --retry-failed to try them again)'
+            ))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:15
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('candidates', '0013_candidate_export_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeParseJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file', models.FileField(max_length=255, upload_to='resumes/')),
+                ('file_name', models.CharField(max_length=255)),
+                ('file_size', models.PositiveIntegerField(default=0)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('content_hash', models.CharField(help_text='SHA-256 of the file bytes, used to reuse earlier parse results', max_length=64)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error_message', models.TextField(blank=True)),
+                ('is_cached', models.BooleanField(default=False, help_text='True if the result was reused from an earlier job with the same file hash')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_parse_jobs', to='candidates.candidateprofile')),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resume_parse_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'resume_parse_jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['content_hash', 'status'], name='resume_pars_content_cd878c_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class ResumeParseJobStatus(models.TextChoices):
+    PENDING = 'pending', 'Pending'
+    RUNNING = 'running', 'Running'
+    COMPLETED = 'completed', 'Completed'
+    FAILED = 'failed', 'Failed'
+
+
+class ResumeParseJob(models.Model):
+    """
+    A background resume parse request.
+
+    The uploaded file is hashed (SHA-256) so a re-upload of identical bytes
+    reuses the result of an earlier completed job instead of calling the LLM.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    candidate = models.ForeignKey(
+        'candidates.CandidateProfile',
+        on_delete=models.CASCADE,
+        related_name='resume_parse_jobs',
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='resume_parse_jobs',
+    )
+
+    # Uploaded file (stored on the candidate profile, referenced here)
+    file = models.FileField(upload_to='resumes/', max_length=255)
+    file_name = models.CharField(max_length=255)
+    file_size = models.PositiveIntegerField(default=0)
+    content_type = models.CharField(max_length=100, blank=True)
+    content_hash = models.CharField(
+        max_length=64,
+        help_text='SHA-256 of the file bytes, used to reuse earlier parse results',
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=ResumeParseJobStatus.choices,
+        default=ResumeParseJobStatus.PENDING,
+    )
+    result = models.JSONField(null=True, blank=True)
+    error_message = models.TextField(blank=True)
+    is_cached = models.BooleanField(
+        default=False,
+        help_text='True if the result was reused from an earlier job with the same file hash',
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'resume_parse_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['content_hash', 'status']),
+        ]
+
+    def __str__(self):
+        return f"Resume parse {self.file_name} ({self.status})"
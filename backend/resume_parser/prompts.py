@@ -5,6 +5,8 @@ Return a JSON object with this exact structure:
   "profile": {
     "first_name": "string",
     "last_name": "string",
+    "email": "string or null",
+    "phone": "string or null",
     "professional_title": "string (current or most recent job title)",
     "headline": "string (brief professional tagline, max 150 chars)",
     "professional_summary": "string (career summary/objective if present)",
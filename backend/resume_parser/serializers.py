@@ -0,0 +1,22 @@
+from rest_framework import serializers
+from .models import ResumeParseJob
+
+
+class ResumeParseJobSerializer(serializers.ModelSerializer):
+    """Read serializer for resume parse jobs. result holds the parsed data once completed."""
+
+    class Meta:
+        model = ResumeParseJob
+        fields = [
+            'id',
+            'status',
+            'file_name',
+            'file_size',
+            'is_cached',
+            'result',
+            'error_message',
+            'created_at',
+            'started_at',
+            'completed_at',
+        ]
+        read_only_fields = fields
@@ -1,8 +1,12 @@
+import hashlib
 import json
 import logging
 from openai import OpenAI
 from django.conf import settings
 from django.core.files.base import ContentFile
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .extraction import extract_text_or_empty
 from .prompts import RESUME_PARSER_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -16,40 +20,59 @@ def get_openai_client():
     return OpenAI(api_key=api_key)
 
 
-def parse_resume(file, candidate_profile) -> dict:
+def get_llm_client():
     """
-    Parse a resume file using OpenAI's Files API and GPT-5-nano.
+    Get the client used for resume parsing.
 
-    1. Save file to candidate's profile
-    2. Upload to OpenAI, parse with GPT-5-nano
-    3. Delete from OpenAI (file remains on our storage)
-    4. Return structured data
+    settings.RESUME_PARSER_CLIENT_FACTORY may be a dotted path to a callable
+    returning an OpenAI-compatible client (e.g. a local fake in tests).
+    Defaults to the OpenAI client.
     """
-    client = get_openai_client()
+    factory_path = getattr(settings, 'RESUME_PARSER_CLIENT_FACTORY', '')
+    if factory_path:
+        return import_string(factory_path)()
+    return get_openai_client()
 
-    # Read file content
-    file_content = file.read()
-    file_name = file.name
-    content_type = getattr(file, 'content_type', 'application/octet-stream')
 
-    # 1. Save file to candidate profile (overwrites existing)
-    candidate_profile.resume_url.save(
-        file_name,
-        ContentFile(file_content),
-        save=True
+def compute_content_hash(file_content: bytes) -> str:
+    """SHA-256 hex digest of the file bytes, used to dedupe parse results."""
+    return hashlib.sha256(file_content).hexdigest()
+
+
+def _parse_text(client, text: str) -> dict:
+    """Parse extracted resume text with a single chat completion."""
+    response = client.chat.completions.create(
+        model="gpt-5-nano",
+        messages=[
+            {"role": "system", "content": RESUME_PARSER_PROMPT},
+            {"role": "user", "content": (
+                "Parse this resume and extract structured data.\n\n"
+                f"<resume>\n{text}\n</resume>"
+            )}
+        ],
+        response_format={"type": "json_object"}
     )
-    logger.info(f"Saved resume for candidate {candidate_profile.id}: {file_name}")
+    return json.loads(response.choices[0].message.content)
+
+
+def _parse_file_upload(client, file_name, file_content, content_type) -> dict:
+    """
+    Parse a resume via the OpenAI Files API. Used when no text could be
+    extracted locally (e.g. scanned PDFs).
 
+    1. Upload to OpenAI, parse with GPT-5-nano
+    2. Delete from OpenAI
+    """
     uploaded_file = None
     try:
-        # 2. Upload to OpenAI Files API
+        # 1. Upload to OpenAI Files API
         uploaded_file = client.files.create(
             file=(file_name, file_content, content_type),
             purpose="assistants"
         )
         logger.info(f"Uploaded file to OpenAI: {uploaded_file.id}")
 
-        # 3. Parse with GPT-5-nano
+        # Parse with GPT-5-nano
         response = client.chat.completions.create(
             model="gpt-5-nano",
             messages=[
@@ -68,15 +91,153 @@ def parse_resume(file, candidate_profile) -> dict:
             response_format={"type": "json_object"}
         )
 
-        parsed_data = json.loads(response.choices[0].message.content)
-        logger.info(f"Successfully parsed resume for candidate {candidate_profile.id}")
-        return parsed_data
+        return json.loads(response.choices[0].message.content)
 
     finally:
-        # 4. Always delete file from OpenAI (our copy remains)
+        # 2. Always delete file from OpenAI (our copy remains)
         if uploaded_file:
             try:
                 client.files.delete(uploaded_file.id)
                 logger.info(f"Deleted file from OpenAI: {uploaded_file.id}")
             except Exception as e:
                 logger.warning(f"Failed to delete file from OpenAI: {e}")
+
+
+def parse_resume_content(file_name, file_content, content_type, client=None, text=None) -> dict:
+    """
+    Parse resume bytes with GPT-5-nano.
+
+    The text is extracted locally (or passed in as text) and sent in the
+    prompt. If no usable text is available, falls back to uploading the file
+    through the Files API.
+    """
+    client = client or get_llm_client()
+
+    if text is None:
+        text = extract_text_or_empty(file_name, file_content, content_type)
+    if text:
+        return _parse_text(client, text)
+    return _parse_file_upload(client, file_name, file_content, content_type)
+
+
+def save_resume_text(candidate_profile, text: str) -> None:
+    """
+    Store extracted resume text on the profile for search.
+
+    A resume with no extractable text clears the previous resume's text.
+    """
+    text = text or ''
+    if candidate_profile.resume_text != text:
+        candidate_profile.resume_text = text
+        type(candidate_profile).objects.filter(pk=candidate_profile.pk).update(resume_text=text)
+
+
+def parse_resume(file, candidate_profile, client=None) -> dict:
+    """
+    Save a resume file to the candidate's profile and parse it synchronously.
+
+    Prefer create_parse_job() for request handlers; this blocks on the LLM.
+    """
+    file_content = file.read()
+    file_name = file.name
+    content_type = getattr(file, 'content_type', 'application/octet-stream')
+
+    # Save file to candidate profile (overwrites existing)
+    candidate_profile.resume_url.save(
+        file_name,
+        ContentFile(file_content),
+        save=True
+    )
+    logger.info(f"Saved resume for candidate {candidate_profile.id}: {file_name}")
+
+    text = extract_text_or_empty(file_name, file_content, content_type)
+    save_resume_text(candidate_profile, text)
+
+    parsed_data = parse_resume_content(file_name, file_content, content_type, client=client, text=text)
+    logger.info(f"Successfully parsed resume for candidate {candidate_profile.id}")
+    return parsed_data
+
+
+def create_parse_job(file, candidate_profile, requested_by=None):
+    """
+    Save a resume to the candidate's profile and create a ResumeParseJob.
+
+    If a completed job already exists for the same file bytes (SHA-256), its
+    result is reused and the job is returned as completed. Otherwise the job
+    is left pending for run_resume_parse_job.
+    """
+    from .models import ResumeParseJob, ResumeParseJobStatus
+
+    file_content = file.read()
+    content_hash = compute_content_hash(file_content)
+
+    # Save file to candidate profile (overwrites existing)
+    candidate_profile.resume_url.save(
+        file.name,
+        ContentFile(file_content),
+        save=True
+    )
+    logger.info(f"Saved resume for candidate {candidate_profile.id}: {file.name}")
+
+    job = ResumeParseJob(
+        candidate=candidate_profile,
+        requested_by=requested_by,
+        file=candidate_profile.resume_url.name,
+        file_name=file.name,
+        file_size=len(file_content),
+        content_type=getattr(file, 'content_type', '') or '',
+        content_hash=content_hash,
+    )
+
+    previous = ResumeParseJob.objects.filter(
+        content_hash=content_hash,
+        status=ResumeParseJobStatus.COMPLETED,
+        result__isnull=False,
+    ).order_by('-completed_at').first()
+
+    if previous:
+        # Local extraction is cheap; keep the profile's search text current
+        save_resume_text(
+            candidate_profile,
+            extract_text_or_empty(file.name, file_content, job.content_type),
+        )
+        job.status = ResumeParseJobStatus.COMPLETED
+        job.result = previous.result
+        job.is_cached = True
+        job.completed_at = timezone.now()
+        logger.info(f"Reused parse result of job {previous.id} for candidate {candidate_profile.id}")
+
+    job.save()
+    return job
+
+
+def run_parse_job(job, client=None):
+    """Parse the job's stored file and record the result or error on the job."""
+    from .models import ResumeParseJobStatus
+
+    job.status = ResumeParseJobStatus.RUNNING
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+
+    try:
+        with job.file.open('rb') as f:
+            file_content = f.read()
+        text = extract_text_or_empty(job.file_name, file_content, job.content_type)
+        save_resume_text(job.candidate, text)
+        job.result = parse_resume_content(
+            job.file_name,
+            file_content,
+            job.content_type or 'application/octet-stream',
+            client=client,
+            text=text,
+        )
+        job.status = ResumeParseJobStatus.COMPLETED
+        logger.info(f"Successfully parsed resume for candidate {job.candidate_id} (job {job.id})")
+    except Exception as e:
+        logger.exception(f"Error parsing resume (job {job.id})")
+        job.status = ResumeParseJobStatus.FAILED
+        job.error_message = str(e)
+
+    job.completed_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'error_message', 'completed_at'])
+    return job
@@ -0,0 +1,18 @@
+"""Signals for Resume Parser app."""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from candidates.models import Skill, Technology
+from .vocabulary import invalidate_vocabulary
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Technology)
+@receiver(post_delete, sender=Technology)
+def invalidate_vocabulary_cache(sender, **kwargs):
+    """
+    Reload the fuzzy-match vocabulary when a Skill or Technology changes.
+    Merges are covered by the delete of the source record.
+    """
+    invalidate_vocabulary(sender)
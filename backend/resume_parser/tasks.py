@@ -0,0 +1,41 @@
+"""
+Celery tasks for the resume_parser app.
+
+These tasks handle:
+- Parsing uploaded resumes in the background (ResumeParseJob)
+"""
+
+import logging
+
+# Try to import Celery, but make it optional
+try:
+    from celery import shared_task
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+    def shared_task(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="resume_parser.run_resume_parse_job")
+def run_resume_parse_job(job_id):
+    """Parse the resume for a pending ResumeParseJob."""
+    from resume_parser.models import ResumeParseJob, ResumeParseJobStatus
+    from resume_parser.services import run_parse_job
+
+    try:
+        job = ResumeParseJob.objects.select_related('candidate').get(id=job_id)
+    except ResumeParseJob.DoesNotExist:
+        logger.warning(f"Resume parse job {job_id} not found")
+        return f"Resume parse job {job_id} not found"
+
+    if job.status != ResumeParseJobStatus.PENDING:
+        return f"Resume parse job {job_id} already {job.status}"
+
+    job = run_parse_job(job)
+    return f"Resume parse job {job_id} {job.status}"
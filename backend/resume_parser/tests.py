@@ -0,0 +1,394 @@
+import io
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from docx import Document
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from candidates.models import CandidateProfile, Experience, Skill
+from users.models import User, UserRole
+from .bulk_import import BulkResumeImporter, CheckpointStatus, ImportCheckpoint, compute_content_hash
+from .extraction import DOCX_CONTENT_TYPE, ResumeExtractionError, extract_text, normalize_text
+from .models import ResumeParseJob, ResumeParseJobStatus
+from .services import run_parse_job
+from . import vocabulary
+from .vocabulary import match_or_create
+
+PARSED_RESUME = {
+    'profile': {'first_name': 'Jane', 'last_name': 'Doe', 'professional_title': 'Engineer'},
+    'experiences': [],
+    'education': [],
+    'all_technologies': [],
+    'all_skills': [],
+}
+
+TEST_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+class FakeLLMClient:
+    """Local stand-in for the OpenAI client used by resume parsing."""
+
+    calls = []
+
+    def __init__(self, response=None):
+        self.response = response if response is not None else PARSED_RESUME
+        self.files = SimpleNamespace(create=self._create_file, delete=self._delete_file)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._complete))
+
+    def _create_file(self, file, purpose):
+        FakeLLMClient.calls.append(('files.create', file[0]))
+        return SimpleNamespace(id='file-fake')
+
+    def _delete_file(self, file_id):
+        FakeLLMClient.calls.append(('files.delete', file_id))
+
+    def _complete(self, **kwargs):
+        FakeLLMClient.calls.append(('chat.completions.create', kwargs['messages'][1]['content']))
+        message = SimpleNamespace(content=json.dumps(self.response))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def fake_client_factory():
+    return FakeLLMClient()
+
+
+def make_docx(paragraphs):
+    document = Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+RESUME_PARAGRAPHS = [
+    'Jane Doe',
+    'Senior Software Engineer    Cape Town',
+    'Experience',
+    'Acme Corp - Senior Engineer (2020 - present). Built the payments platform in Python and Django.',
+    'Globex - Engineer (2016 - 2020). Maintained React front-ends and PostgreSQL reporting.',
+    'Education',
+    'University of Cape Town - BSc Computer Science (2012 - 2015)',
+]
+
+
+@override_settings(
+    MEDIA_ROOT=TEST_MEDIA_ROOT,
+    RESUME_PARSER_CLIENT_FACTORY='resume_parser.tests.fake_client_factory',
+)
+class ResumeParseJobTests(APITestCase):
+    """Tests for background resume parsing with content-hash dedupe."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        FakeLLMClient.calls = []
+        self.user = User.objects.create_user(
+            username='candidate',
+            email='candidate@example.com',
+            password='password123',
+            role=UserRole.CANDIDATE,
+        )
+        self.profile = CandidateProfile.objects.create(user=self.user)
+        self.client.force_authenticate(self.user)
+        self.url = reverse('resume-parse')
+
+    def _upload(self, content=b'%PDF-1.4 resume bytes'):
+        file = SimpleUploadedFile('resume.pdf', content, content_type='application/pdf')
+        return self.client.post(self.url, {'file': file}, format='multipart')
+
+    def test_extracted_text_is_sent_instead_of_file(self):
+        """Test a readable DOCX is parsed from local text without a Files API upload."""
+        file = SimpleUploadedFile('resume.docx', make_docx(RESUME_PARAGRAPHS), content_type=DOCX_CONTENT_TYPE)
+        self.client.post(self.url, {'file': file}, format='multipart')
+
+        self.assertEqual([call[0] for call in FakeLLMClient.calls], ['chat.completions.create'])
+        self.assertIn('Acme Corp', FakeLLMClient.calls[0][1])
+        self.profile.refresh_from_db()
+        self.assertIn('Senior Software Engineer Cape Town', self.profile.resume_text)
+
+    def test_unreadable_upload_clears_previous_resume_text(self):
+        """Test replacing a readable resume with one that has no text drops the old search text."""
+        file = SimpleUploadedFile('resume.docx', make_docx(RESUME_PARAGRAPHS), content_type=DOCX_CONTENT_TYPE)
+        self.client.post(self.url, {'file': file}, format='multipart')
+        # The authenticated user caches self.profile; load the saved text as a new request would
+        self.profile.refresh_from_db()
+
+        self._upload()
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.resume_text, '')
+
+    def test_parse_creates_job_and_returns_result(self):
+        """Test an unreadable file falls back to the Files API upload."""
+        response = self._upload()
+
+        self.assertIn(response.status_code, [status.HTTP_200_OK, status.HTTP_202_ACCEPTED])
+        job = ResumeParseJob.objects.get(id=response.data['id'])
+        self.assertEqual(job.status, ResumeParseJobStatus.COMPLETED)
+        self.assertEqual(job.result, PARSED_RESUME)
+        self.assertFalse(job.is_cached)
+        self.assertEqual(
+            [call[0] for call in FakeLLMClient.calls],
+            ['files.create', 'chat.completions.create', 'files.delete'],
+        )
+
+    def test_identical_upload_reuses_result(self):
+        """Test re-uploading the same bytes is served from the hash cache without the LLM."""
+        self._upload()
+        FakeLLMClient.calls = []
+
+        response = self._upload()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_cached'])
+        self.assertEqual(response.data['result'], PARSED_RESUME)
+        self.assertEqual(FakeLLMClient.calls, [])
+
+    def test_different_upload_is_parsed_again(self):
+        """Test a file with different bytes is not served from the cache."""
+        self._upload(b'first resume')
+        response = self._upload(b'second resume')
+
+        self.assertFalse(response.data['is_cached'])
+        self.assertEqual(ResumeParseJob.objects.values('content_hash').distinct().count(), 2)
+
+    def test_get_job_status(self):
+        """Test polling a job returns its status and result."""
+        job_id = self._upload().data['id']
+
+        response = self.client.get(reverse('resume-parse-job', args=[job_id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], ResumeParseJobStatus.COMPLETED)
+
+    def test_get_job_of_other_candidate_forbidden(self):
+        """Test candidates cannot read another candidate's parse job."""
+        job_id = self._upload().data['id']
+        other = User.objects.create_user(
+            username='other',
+            email='other@example.com',
+            password='password123',
+            role=UserRole.CANDIDATE,
+        )
+        self.client.force_authenticate(other)
+
+        response = self.client.get(reverse('resume-parse-job', args=[job_id]))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_failed_parse_records_error(self):
+        """Test a client error marks the job as failed."""
+        job_id = self._upload().data['id']
+        job = ResumeParseJob.objects.get(id=job_id)
+        job.status = ResumeParseJobStatus.PENDING
+
+        class BrokenClient(FakeLLMClient):
+            def _complete(self, **kwargs):
+                raise RuntimeError('LLM unavailable')
+
+        run_parse_job(job, client=BrokenClient())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ResumeParseJobStatus.FAILED)
+        self.assertIn('LLM unavailable', job.error_message)
+
+
+class ResumeExtractionTests(SimpleTestCase):
+    """Tests for local resume text extraction."""
+
+    def test_extract_docx(self):
+        text = extract_text('resume.docx', make_docx(RESUME_PARAGRAPHS), DOCX_CONTENT_TYPE)
+        self.assertTrue(text.startswith('Jane Doe\nSenior Software Engineer Cape Town'))
+
+    def test_extract_caps_length(self):
+        text = extract_text('resume.docx', make_docx(RESUME_PARAGRAPHS), DOCX_CONTENT_TYPE, max_chars=50)
+        self.assertEqual(len(text), 50)
+
+    def test_unreadable_file_raises(self):
+        with self.assertRaises(ResumeExtractionError):
+            extract_text('resume.pdf', b'not a pdf', 'application/pdf')
+
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text('  a \t b \r\n\n\n\n c  '), 'a b\n\nc')
+
+
+class MatchOrCreateTests(TestCase):
+    """Names are matched against the cached vocabulary in batches."""
+
+    def setUp(self):
+        cache.clear()
+        vocabulary._vocabularies.clear()
+        self.python = Skill.objects.create(name='Python')
+        self.leadership = Skill.objects.create(name='Team Leadership')
+
+    def test_exact_and_fuzzy_matches(self):
+        results = match_or_create(Skill, ['python', '  Team   leadership ', 'Pythn', ''])
+
+        self.assertEqual(results['python'], (self.python.id, False))
+        self.assertEqual(results['  Team   leadership '], (self.leadership.id, False))
+        self.assertEqual(results['Pythn'], (self.python.id, False))
+        self.assertNotIn('', results)
+
+    def test_unmatched_names_are_created_once(self):
+        results = match_or_create(Skill, ['Kubernetes', 'kubernetes', 'Terraform'])
+
+        kubernetes_id, created = results['Kubernetes']
+        self.assertTrue(created)
+        self.assertEqual(results['kubernetes'], (kubernetes_id, True))
+        self.assertTrue(Skill.objects.get(id=kubernetes_id).needs_review)
+        self.assertEqual(Skill.objects.filter(name__in=['Kubernetes', 'Terraform']).count(), 2)
+
+        # The new entries are matched directly next time
+        self.assertEqual(match_or_create(Skill, ['Kubernetes'])['Kubernetes'], (kubernetes_id, False))
+
+    def test_no_create(self):
+        self.assertEqual(match_or_create(Skill, ['Kubernetes'], create_if_not_found=False), {'Kubernetes': (None, False)})
+        self.assertFalse(Skill.objects.filter(name='Kubernetes').exists())
+
+    def test_entries_deleted_elsewhere_are_not_returned(self):
+        # This process's vocabulary predates a merge made by another worker
+        stale = vocabulary.get_vocabulary(Skill)
+        self.python.delete()
+        vocabulary._vocabularies[Skill] = stale
+        cache.set(vocabulary._version_key(Skill), stale.version, None)
+
+        python_id, created = match_or_create(Skill, ['Python'])['Python']
+
+        self.assertTrue(created)
+        self.assertNotEqual(python_id, self.python.id)
+        self.assertTrue(Skill.objects.filter(id=python_id).exists())
+
+    def test_vocabulary_expires(self):
+        loaded = vocabulary.get_vocabulary(Skill)
+        self.assertIs(vocabulary.get_vocabulary(Skill), loaded)
+
+        loaded.loaded_at -= vocabulary.VOCABULARY_MAX_AGE
+
+        self.assertIsNot(vocabulary.get_vocabulary(Skill), loaded)
+
+
+def parsed_resume(email, experiences=()):
+    return {**PARSED_RESUME, 'profile': {**PARSED_RESUME['profile'], 'email': email}, 'experiences': list(experiences)}
+
+
+class ResumesByEmailClient(FakeLLMClient):
+    """Answers with the parsed resume whose email appears in the prompt."""
+
+    def __init__(self, *responses):
+        super().__init__()
+        self.responses = responses
+
+    def _complete(self, **kwargs):
+        content = kwargs['messages'][1]['content']
+        FakeLLMClient.calls.append(('chat.completions.create', content))
+        response = next(r for r in self.responses if r['profile']['email'] in content)
+        message = SimpleNamespace(content=json.dumps(response))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+EXPERIENCE = {
+    'job_title': 'Senior Engineer',
+    'company_name': 'Acme Corp',
+    'start_date': '2020-01-01',
+    'is_current': True,
+    'technologies': ['Python'],
+}
+
+
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
+class BulkResumeImporterTests(TestCase):
+    """Tests for batched resume imports and checkpoint resume."""
+
+    def setUp(self):
+        FakeLLMClient.calls = []
+        cache.clear()
+        vocabulary._vocabularies.clear()
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.checkpoint_path = self.directory / 'checkpoint.json'
+
+    def write_resume(self, name, email):
+        path = self.directory / f'{name}.docx'
+        path.write_bytes(make_docx(RESUME_PARAGRAPHS + [email]))
+        return path
+
+    def run_import(self, paths, *responses, **kwargs):
+        importer = BulkResumeImporter(
+            checkpoint=ImportCheckpoint(self.checkpoint_path),
+            client=ResumesByEmailClient(*responses),
+            **kwargs,
+        )
+        return importer.run(paths)
+
+    def test_imports_candidates_with_experiences(self):
+        paths = [self.write_resume('jane', 'jane@example.com'), self.write_resume('john', 'john@example.com')]
+
+        stats = self.run_import(
+            paths,
+            parsed_resume('jane@example.com', [EXPERIENCE]),
+            parsed_resume('john@example.com'),
+        )
+
+        self.assertEqual((stats.imported, stats.failed, stats.candidates_created), (2, 0, 2))
+        self.assertEqual(stats.experiences_created, 1)
+        jane = CandidateProfile.objects.get(user__email='jane@example.com')
+        experience = Experience.objects.get(candidate=jane)
+        self.assertEqual(list(experience.technologies.values_list('name', flat=True)), ['Python'])
+        self.assertIn('jane@example.com', jane.resume_text)
+        self.assertEqual(ResumeParseJob.objects.filter(status=ResumeParseJobStatus.COMPLETED).count(), 2)
+
+    def test_bad_experience_fails_only_its_resume(self):
+        paths = [self.write_resume('jane', 'jane@example.com'), self.write_resume('john', 'john@example.com')]
+
+        stats = self.run_import(
+            paths,
+            parsed_resume('jane@example.com', [EXPERIENCE]),
+            parsed_resume('john@example.com', [{**EXPERIENCE, 'technologies': 7}]),
+        )
+
+        self.assertEqual((stats.imported, stats.failed, stats.experiences_created), (1, 1, 1))
+        self.assertTrue(Experience.objects.filter(candidate__user__email='jane@example.com').exists())
+        self.assertFalse(Experience.objects.filter(candidate__user__email='john@example.com').exists())
+        entry = ImportCheckpoint(self.checkpoint_path).entries[compute_content_hash(paths[1].read_bytes())]
+        self.assertEqual(entry['status'], CheckpointStatus.FAILED)
+        self.assertIn('Experience import failed', entry['error'])
+        self.assertEqual(ResumeParseJob.objects.count(), 1)
+
+    def test_resumed_import_skips_files_in_the_checkpoint(self):
+        jane = self.write_resume('jane', 'jane@example.com')
+        self.run_import([jane], parsed_resume('jane@example.com'))
+        john = self.write_resume('john', 'john@example.com')
+        FakeLLMClient.calls = []
+
+        stats = self.run_import([jane, john], parsed_resume('john@example.com'))
+
+        self.assertEqual((stats.skipped, stats.imported), (1, 1))
+        self.assertEqual(len(FakeLLMClient.calls), 1)
+        self.assertEqual(CandidateProfile.objects.filter(user__email__in=['jane@example.com', 'john@example.com']).count(), 2)
+
+    def test_failed_files_are_retried_only_when_asked(self):
+        john = self.write_resume('john', 'john@example.com')
+        self.run_import([john], parsed_resume('john@example.com', [{**EXPERIENCE, 'technologies': 7}]))
+
+        stats = self.run_import([john], parsed_resume('john@example.com', [EXPERIENCE]))
+        self.assertEqual((stats.skipped, stats.imported), (1, 0))
+
+        stats = self.run_import([john], parsed_resume('john@example.com', [EXPERIENCE]), retry_failed=True)
+        self.assertEqual((stats.imported, stats.failed, stats.experiences_created), (1, 0, 1))
+        self.assertEqual(
+            ImportCheckpoint(self.checkpoint_path).entries[compute_content_hash(john.read_bytes())]['status'],
+            CheckpointStatus.IMPORTED,
+        )
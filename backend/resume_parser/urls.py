@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import ResumeParseView, ResumeImportView
+from .views import ResumeParseView, ResumeParseJobView, ResumeImportView
 
 urlpatterns = [
     path('parse/', ResumeParseView.as_view(), name='resume-parse'),
+    path('parse/jobs/<uuid:job_id>/', ResumeParseJobView.as_view(), name='resume-parse-job'),
     path('import/', ResumeImportView.as_view(), name='resume-import'),
 ]
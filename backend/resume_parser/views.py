@@ -1,9 +1,13 @@
 import logging
+from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, JSONParser
 from rest_framework.permissions import IsAuthenticated
-from .services import parse_resume
+from users.models import UserRole
+from .models import ResumeParseJob, ResumeParseJobStatus
+from .serializers import ResumeParseJobSerializer
+from .services import create_parse_job
 from .import_service import import_resume_data
 from candidates.services import log_resume_uploaded, log_resume_parsed
 
@@ -12,14 +16,18 @@ logger = logging.getLogger(__name__)
 
 class ResumeParseView(APIView):
     """
-    Parse an uploaded resume (PDF/DOCX) and return structured profile data.
+    Upload a resume (PDF/DOCX) and start parsing it into structured profile data.
 
-    The resume file is saved to the candidate's profile and then parsed
-    using OpenAI's GPT-5-nano model to extract:
+    The resume file is saved to the candidate's profile and a ResumeParseJob is
+    created. Parsing runs in the background using OpenAI's GPT-5-nano model to
+    extract:
     - Profile information (name, title, summary, location)
     - Work experiences with technologies and skills
     - Education history
     - Aggregated technologies and skills lists
+
+    Returns 202 with the job (poll ResumeParseJobView for the result), or 200
+    with a completed job when the same file was parsed before.
     """
     parser_classes = [MultiPartParser]
     permission_classes = [IsAuthenticated]
@@ -58,7 +66,7 @@ class ResumeParseView(APIView):
             )
 
         try:
-            parsed_data = parse_resume(file, candidate_profile)
+            job = create_parse_job(file, candidate_profile, requested_by=request.user)
 
             # Log resume upload activity
             log_resume_uploaded(
@@ -66,21 +74,44 @@ class ResumeParseView(APIView):
                 filename=file.name,
                 file_size=file.size,
             )
-
-            return Response(parsed_data)
-        except ValueError as e:
-            logger.error(f"Configuration error parsing resume: {e}")
-            return Response(
-                {"error": "Resume parsing is not configured. Please contact support."},
-                status=500
-            )
         except Exception as e:
-            logger.exception(f"Error parsing resume for user {request.user.id}")
+            logger.exception(f"Error saving resume for user {request.user.id}")
             return Response(
-                {"error": "Failed to parse resume. Please try again."},
+                {"error": "Failed to upload resume. Please try again."},
                 status=500
             )
 
+        if job.status == ResumeParseJobStatus.COMPLETED:
+            return Response(ResumeParseJobSerializer(job).data)
+
+        from .tasks import run_resume_parse_job
+
+        try:
+            run_resume_parse_job.delay(str(job.id))
+        except Exception:
+            # Celery not installed or broker unavailable - run synchronously
+            run_resume_parse_job(str(job.id))
+            job.refresh_from_db()
+
+        return Response(ResumeParseJobSerializer(job).data, status=202)
+
+
+class ResumeParseJobView(APIView):
+    """
+    Get the status of a resume parse job. Once completed, result holds the
+    parsed data to review and send to ResumeImportView.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(ResumeParseJob.objects.select_related('candidate'), id=job_id)
+
+        if request.user.role not in [UserRole.ADMIN, UserRole.RECRUITER] \
+                and job.candidate.user_id != request.user.id:
+            return Response({"error": "Permission denied"}, status=403)
+
+        return Response(ResumeParseJobSerializer(job).data)
+
 
 class ResumeImportView(APIView):
     """
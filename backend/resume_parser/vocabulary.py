@@ -0,0 +1,280 @@
+"""
+Cached Skill/Technology vocabulary and batched fuzzy matching for resume import.
+
+The vocabulary (id, name, normalized name) for each model is kept in process
+memory and rebuilt when its version in the shared cache changes, or once it is
+VOCABULARY_MAX_AGE old. Versions are bumped by signals on Skill/Technology
+save and delete (merges delete the source record), and after new entries are
+bulk-created here. A bump only reaches other processes through a shared
+cache, so matched ids are also checked against the table before they are
+returned: if any were deleted (e.g. merged away), the vocabulary is reloaded
+and the batch matched again.
+"""
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.text import slugify
+from rapidfuzz import fuzz, process
+
+from candidates.models import Skill, SkillCategory, Technology, TechnologyCategory
+
+logger = logging.getLogger(__name__)
+
+# Minimum similarity score for fuzzy matching (0-100)
+FUZZY_MATCH_THRESHOLD = 80
+
+VERSION_CACHE_KEY = 'resume_parser:vocabulary_version:{model}'
+VOCABULARY_MAX_AGE = 300  # 5 minutes
+
+# Defaults for entries auto-created from resumes, per vocabulary model
+NEW_ENTRY_DEFAULTS = {
+    Technology: {'category': TechnologyCategory.OTHER, 'slug_fallback': 'tech'},
+    Skill: {'category': SkillCategory.OTHER, 'slug_fallback': 'skill'},
+}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a skill/technology name for comparison."""
+    return _WHITESPACE_RE.sub(' ', (name or '').strip()).casefold()
+
+
+@dataclass
+class Vocabulary:
+    """Snapshot of one model's names, ready for matching."""
+    version: int
+    loaded_at: float = field(default_factory=time.monotonic)
+    ids: List[int] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    normalized: List[str] = field(default_factory=list)
+    exact: Dict[str, int] = field(default_factory=dict)
+
+
+# Process-level vocabularies, keyed by model
+_vocabularies: Dict[type, Vocabulary] = {}
+
+
+def _version_key(model) -> str:
+    return VERSION_CACHE_KEY.format(model=model._meta.label_lower)
+
+
+def get_vocabulary_version(model) -> int:
+    version = cache.get(_version_key(model))
+    if version is None:
+        version = 1
+        cache.add(_version_key(model), version, None)
+    return version
+
+
+def invalidate_vocabulary(model) -> None:
+    """Bump the vocabulary version so every process reloads it on next use."""
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+    _vocabularies.pop(model, None)
+
+
+def get_vocabulary(model) -> Vocabulary:
+    """Return the cached vocabulary for a model, reloading it if stale."""
+    version = get_vocabulary_version(model)
+    vocabulary = _vocabularies.get(model)
+    if (
+        vocabulary is not None
+        and vocabulary.version == version
+        and time.monotonic() - vocabulary.loaded_at < VOCABULARY_MAX_AGE
+    ):
+        return vocabulary
+
+    vocabulary = Vocabulary(version=version)
+    for entry_id, name in model.objects.values_list('id', 'name'):
+        normalized = normalize_name(name)
+        vocabulary.ids.append(entry_id)
+        vocabulary.names.append(name)
+        vocabulary.normalized.append(normalized)
+        vocabulary.exact.setdefault(normalized, entry_id)
+
+    _vocabularies[model] = vocabulary
+    return vocabulary
+
+
+def _base_slug(name: str, fallback: str) -> str:
+    # Handle special characters like C#, C++, .NET (same as the model save())
+    name_for_slug = name.replace('#', '-sharp').replace('++', '-plus-plus').replace('.', '-')
+    return slugify(name_for_slug)[:95] or fallback
+
+
+def _allocate_slugs(model, names: List[str], fallback: str) -> List[str]:
+    """Generate unique slugs for new entries with a single lookup query."""
+    bases = [_base_slug(name, fallback) for name in names]
+    lookup = Q()
+    for base in set(bases):
+        lookup |= Q(slug__startswith=base)
+    taken = set(model.objects.filter(lookup).values_list('slug', flat=True))
+
+    slugs = []
+    for base in bases:
+        slug = base
+        counter = 1
+        while slug in taken:
+            slug = f"{base}-{counter}"
+            counter += 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def _create_entries(model, names: List[str]) -> Dict[str, int]:
+    """
+    Bulk-create new vocabulary entries (flagged for review).
+
+    Returns {normalized name: id}. Entries created concurrently by another
+    import are picked up instead of failing.
+    """
+    defaults = NEW_ENTRY_DEFAULTS[model]
+    slugs = _allocate_slugs(model, names, defaults['slug_fallback'])
+    model.objects.bulk_create(
+        [
+            model(
+                name=name,
+                slug=slug,
+                category=defaults['category'],
+                is_active=True,
+                needs_review=True,
+            )
+            for name, slug in zip(names, slugs)
+        ],
+        ignore_conflicts=True,
+    )
+
+    created = {
+        normalize_name(name): entry_id
+        for entry_id, name in model.objects.filter(name__in=names).values_list('id', 'name')
+    }
+    # Anything skipped by a slug conflict falls back to save(), which retries slugs
+    for name in names:
+        if normalize_name(name) not in created:
+            entry, _ = model.objects.get_or_create(
+                name=name,
+                defaults={'category': defaults['category'], 'needs_review': True},
+            )
+            created[normalize_name(name)] = entry.id
+
+    invalidate_vocabulary(model)
+    logger.info(f"Created {len(names)} new {model._meta.verbose_name_plural} (needs review): {names}")
+    return created
+
+
+def match_or_create(
+    model,
+    names: Iterable[str],
+    create_if_not_found: bool = True,
+) -> Dict[str, Tuple[Optional[int], bool]]:
+    """
+    Match a batch of names against the Skill or Technology vocabulary.
+
+    Exact (normalized) matches are resolved from a dict; the rest go through
+    a single rapidfuzz cdist call. Unmatched names are deduplicated among
+    themselves and bulk-created when create_if_not_found is True.
+
+    Returns {name: (id or None, was_created)} for every input name.
+    """
+    names = list(names)
+    results = _match(model, names, create_if_not_found, get_vocabulary(model))
+
+    # Another process may have deleted a matched entry since our vocabulary loaded
+    matched_ids = {entry_id for entry_id, was_created in results.values() if entry_id and not was_created}
+    if matched_ids:
+        existing = set(model.objects.filter(id__in=matched_ids).values_list('id', flat=True))
+        if existing != matched_ids:
+            logger.info(f"{model._meta.verbose_name} vocabulary is stale, reloading")
+            invalidate_vocabulary(model)
+            results = _match(model, names, create_if_not_found, get_vocabulary(model))
+    return results
+
+
+def _match(
+    model,
+    names: List[str],
+    create_if_not_found: bool,
+    vocabulary: Vocabulary,
+) -> Dict[str, Tuple[Optional[int], bool]]:
+    results: Dict[str, Tuple[Optional[int], bool]] = {}
+
+    # Deduplicate by normalized name, keeping the first spelling seen
+    pending: Dict[str, str] = {}
+    for name in names:
+        if not name or not name.strip():
+            continue
+        normalized = normalize_name(name)
+        if normalized in vocabulary.exact:
+            results[name] = (vocabulary.exact[normalized], False)
+        else:
+            pending.setdefault(normalized, name[:100])
+
+    queries = list(pending)
+    matched: Dict[str, int] = {}
+    if queries and vocabulary.normalized:
+        scores = process.cdist(
+            queries,
+            vocabulary.normalized,
+            scorer=fuzz.WRatio,
+            score_cutoff=FUZZY_MATCH_THRESHOLD,
+            workers=-1,
+        )
+        for row, query in enumerate(queries):
+            best = int(scores[row].argmax())
+            if scores[row][best] >= FUZZY_MATCH_THRESHOLD:
+                matched[query] = vocabulary.ids[best]
+                logger.debug(
+                    f"Fuzzy matched '{query}' -> '{vocabulary.names[best]}' "
+                    f"(score: {scores[row][best]:.1f})"
+                )
+
+    unmatched = [query for query in queries if query not in matched]
+    created: Dict[str, int] = {}
+    if unmatched and create_if_not_found:
+        # Collapse near-duplicates within the batch (e.g. "ReactJS" / "React.js")
+        canonical: Dict[str, str] = {}
+        new_queries: List[str] = []
+        self_scores = None
+        if len(unmatched) > 1:
+            self_scores = process.cdist(
+                unmatched,
+                unmatched,
+                scorer=fuzz.WRatio,
+                score_cutoff=FUZZY_MATCH_THRESHOLD,
+                workers=-1,
+            )
+        for i, query in enumerate(unmatched):
+            for j, earlier in enumerate(unmatched[:i]):
+                if canonical[earlier] == earlier and self_scores[i][j] >= FUZZY_MATCH_THRESHOLD:
+                    canonical[query] = earlier
+                    break
+            else:
+                canonical[query] = query
+                new_queries.append(query)
+
+        created_ids = _create_entries(model, [pending[query] for query in new_queries])
+        for query in unmatched:
+            created[query] = created_ids[normalize_name(pending[canonical[query]])]
+
+    for name in names:
+        if name in results or not name or not name.strip():
+            continue
+        normalized = normalize_name(name)
+        if normalized in matched:
+            results[name] = (matched[normalized], False)
+        elif normalized in created:
+            results[name] = (created[normalized], True)
+        else:
+            results[name] = (None, False)
+
+    return results
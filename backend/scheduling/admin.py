@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import UserCalendarConnection
+from .models import BookingHold, CalendarBusyCache, UserCalendarConnection
 
 
 @admin.register(UserCalendarConnection)
@@ -8,3 +8,20 @@ class UserCalendarConnectionAdmin(admin.ModelAdmin):
     list_filter = ['provider', 'is_active']
     search_fields = ['user__email', 'provider_email']
     readonly_fields = ['id', 'created_at', 'updated_at']
+
+
+@admin.register(CalendarBusyCache)
+class CalendarBusyCacheAdmin(admin.ModelAdmin):
+    list_display = ['connection', 'calendar_id', 'synced_at', 'window_start', 'window_end']
+    search_fields = ['connection__user__email']
+    readonly_fields = [
+        'id', 'connection', 'calendar_id', 'window_start', 'window_end', 'events',
+        'sync_token', 'synced_at', 'generation', 'synced_generation', 'updated_at',
+    ]
+
+
+@admin.register(BookingHold)
+class BookingHoldAdmin(admin.ModelAdmin):
+    list_display = ['organizer', 'starts_at', 'ends_at', 'expires_at']
+    search_fields = ['organizer__email']
+    readonly_fields = ['id', 'created_at']
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:25
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0014_backfill_booking_leads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarBusyCache',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('calendar_id', models.CharField(blank=True, help_text='Calendar the cached events were synced from', max_length=255)),
+                ('window_start', models.DateTimeField(blank=True, null=True)),
+                ('window_end', models.DateTimeField(blank=True, null=True)),
+                ('events', models.JSONField(blank=True, default=dict, help_text='Busy intervals keyed by provider event ID: {event_id: [start_ts, end_ts]}')),
+                ('sync_token', models.TextField(blank=True, help_text='Google nextSyncToken or Microsoft Graph deltaLink')),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+                ('generation', models.PositiveIntegerField(default=0)),
+                ('synced_generation', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('connection', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='busy_cache', to='scheduling.usercalendarconnection')),
+            ],
+            options={
+                'db_table': 'calendar_busy_caches',
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:31
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0015_calendar_busy_cache'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingHold',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('meeting_type', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='holds', to='scheduling.meetingtype')),
+                ('organizer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_holds', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'booking_holds',
+                'indexes': [models.Index(fields=['organizer', 'starts_at'], name='booking_hol_organiz_105e13_idx'), models.Index(fields=['expires_at'], name='booking_hol_expires_ebfcc7_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0016_booking_hold'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='co_hosts',
+            field=models.ManyToManyField(blank=True, help_text='Other panel members attending a collective meeting', related_name='co_hosted_bookings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='meetingtype',
+            name='scheduling_mode',
+            field=models.CharField(choices=[('single', 'Booking page owner only'), ('collective', 'Collective (all members must be free)'), ('round_robin', 'Round robin (any free member, least busy first)')], default='single', help_text='Whether slots come from the page owner or are pooled across allowed users', max_length=20),
+        ),
+    ]
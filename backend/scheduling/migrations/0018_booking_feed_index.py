@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0017_meeting_type_scheduling_mode'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['scheduled_at', 'id'], name='bookings_schedul_46df9e_idx'),
+        ),
+    ]
@@ -123,6 +123,55 @@ class UserCalendarConnection(models.Model):
         return True
 
 
+class CalendarBusyCache(models.Model):
+    """
+    Locally cached busy intervals for a calendar connection.
+
+    Intervals are stored per provider event ID so the cache can be refreshed
+    incrementally with Google sync tokens / Microsoft Graph delta links.
+    The cache is stale when generation (bumped on invalidation) differs from
+    the generation it was last synced at.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    connection = models.OneToOneField(
+        UserCalendarConnection,
+        on_delete=models.CASCADE,
+        related_name='busy_cache',
+    )
+    calendar_id = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text='Calendar the cached events were synced from',
+    )
+    window_start = models.DateTimeField(null=True, blank=True)
+    window_end = models.DateTimeField(null=True, blank=True)
+    events = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Busy intervals keyed by provider event ID: {event_id: [start_ts, end_ts]}',
+    )
+    sync_token = models.TextField(
+        blank=True,
+        help_text='Google nextSyncToken or Microsoft Graph deltaLink',
+    )
+    synced_at = models.DateTimeField(null=True, blank=True)
+    generation = models.PositiveIntegerField(default=0)
+    synced_generation = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'calendar_busy_caches'
+
+    def __str__(self):
+        return f"Busy cache for {self.connection}"
+
+    @property
+    def is_stale(self):
+        return self.generation != self.synced_generation
+
+
 class BookingToken(models.Model):
     """
     Token for candidate self-booking (like Calendly public links).
@@ -193,6 +242,13 @@ class StageChangeBehavior(models.TextChoices):
     ONLY_IF_NOT_SET = 'only_if_not_set', 'Only if no stage is currently set'
 
 
+class SchedulingMode(models.TextChoices):
+    """Whose calendars a meeting type's availability is computed from."""
+    SINGLE = 'single', 'Booking page owner only'
+    COLLECTIVE = 'collective', 'Collective (all members must be free)'
+    ROUND_ROBIN = 'round_robin', 'Round robin (any free member, least busy first)'
+
+
 class MeetingType(models.Model):
     """
     Configurable meeting types for recruiter/admin booking pages.
@@ -234,6 +290,13 @@ class MeetingType(models.Model):
         help_text='Description shown on the booking page',
     )
 
+    scheduling_mode = models.CharField(
+        max_length=20,
+        choices=SchedulingMode.choices,
+        default=SchedulingMode.SINGLE,
+        help_text='Whether slots come from the page owner or are pooled across allowed users',
+    )
+
     # Duration and buffer settings
     duration_minutes = models.PositiveIntegerField(
         default=30,
@@ -372,6 +435,12 @@ class Booking(models.Model):
         related_name='organized_bookings',
         help_text='The recruiter/admin hosting the meeting',
     )
+    co_hosts = models.ManyToManyField(
+        settings.AUTH_USER_MODEL,
+        blank=True,
+        related_name='co_hosted_bookings',
+        help_text='Other panel members attending a collective meeting',
+    )
 
     # Attendee info (can be an existing user or external person)
     attendee_user = models.ForeignKey(
@@ -517,6 +586,8 @@ class Booking(models.Model):
             models.Index(fields=['organizer', 'scheduled_at']),
             models.Index(fields=['status', 'scheduled_at']),
             models.Index(fields=['attendee_email']),
+            # Keyset pagination of the calendar feed
+            models.Index(fields=['scheduled_at', 'id']),
         ]
 
     def __str__(self):
@@ -555,3 +626,42 @@ class Booking(models.Model):
         """Mark the attendee as a no-show."""
         self.status = BookingStatus.NO_SHOW
         self.save(update_fields=['status'])
+
+
+class BookingHold(models.Model):
+    """
+    Short-lived reservation of an organizer's time slot.
+
+    Taken while a public booking is being created so concurrent bookers
+    cannot grab the same slot; expired holds are ignored and cleaned up on
+    the next reservation.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    organizer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='booking_holds',
+    )
+    meeting_type = models.ForeignKey(
+        MeetingType,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='holds',
+    )
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    expires_at = models.DateTimeField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'booking_holds'
+        indexes = [
+            models.Index(fields=['organizer', 'starts_at']),
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f"Hold for {self.organizer} at {self.starts_at}"
@@ -6,6 +6,7 @@ from .models import (
     MeetingType,
     MeetingCategory,
     StageChangeBehavior,
+    SchedulingMode,
     Booking,
     BookingStatus,
 )
@@ -114,6 +115,7 @@ class MeetingTypeSerializer(serializers.ModelSerializer):
     stage_change_behavior_display = serializers.CharField(
         source='get_stage_change_behavior_display', read_only=True
     )
+    scheduling_mode_display = serializers.CharField(source='get_scheduling_mode_display', read_only=True)
     allowed_users_details = serializers.SerializerMethodField()
 
     target_onboarding_stage_authenticated_details = serializers.SerializerMethodField()
@@ -152,6 +154,8 @@ class MeetingTypeSerializer(serializers.ModelSerializer):
             'stage_change_behavior',
             'stage_change_behavior_display',
             # Allowed users
+            'scheduling_mode',
+            'scheduling_mode_display',
             'allowed_users_details',
             'created_at',
             'updated_at',
@@ -228,6 +232,7 @@ class MeetingTypeCreateUpdateSerializer(serializers.ModelSerializer):
             'target_onboarding_stage_authenticated',
             'stage_change_behavior',
             # Allowed users
+            'scheduling_mode',
             'allowed_user_ids',
         ]
 
@@ -250,6 +255,10 @@ class MeetingTypeCreateUpdateSerializer(serializers.ModelSerializer):
             choices=StageChangeBehavior.choices,
             required=False,
         )
+        self.fields['scheduling_mode'] = serializers.ChoiceField(
+            choices=SchedulingMode.choices,
+            required=False,
+        )
 
     def validate(self, data):
         # Auto-generate slug from name if not provided
@@ -506,8 +515,10 @@ class BookingCreateSerializer(serializers.ModelSerializer):
                 if candidate_profile and candidate_profile.phone:
                     validated_data['attendee_phone'] = candidate_profile.phone
 
-        # Set fields from meeting type
-        validated_data['organizer'] = meeting_type.owner
+        # Set fields from meeting type; public_create_booking passes the booking
+        # page owner (or pooled host) as organizer, so meeting_type.owner is
+        # only the fallback
+        validated_data.setdefault('organizer', meeting_type.owner)
         validated_data['duration_minutes'] = meeting_type.duration_minutes
         validated_data['location_type'] = meeting_type.location_type
         validated_data['location'] = meeting_type.custom_location
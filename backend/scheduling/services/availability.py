@@ -0,0 +1,243 @@
+"""
+Internal busy intervals and slot reservation for availability.
+
+The external calendar only knows about events that were synced to it, so
+confirmed/pending Bookings, scheduled interview stages and active booking
+holds are read from the database and merged with the provider intervals in
+the slot engine. reserve_slot() takes a short-lived BookingHold under a lock
+on the organizer so concurrent bookers cannot grab the same slot.
+
+For pooled meeting types, reserve_slot_for_members() holds the slot for every
+member of a collective meeting, and get_booking_loads() orders round-robin
+members so the least-loaded free member is assigned.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from jobs.models import ApplicationStageInstance, StageInstanceStatus
+from scheduling.models import Booking, BookingHold, BookingStatus
+from .slots import Interval
+
+# How long a hold blocks a slot if the booking is never completed
+HOLD_TTL = timedelta(minutes=2)
+
+# Longest meeting considered when looking back for rows overlapping the range start
+MAX_MEETING_LENGTH = timedelta(hours=12)
+
+ACTIVE_BOOKING_STATUSES = [BookingStatus.PENDING, BookingStatus.CONFIRMED]
+ACTIVE_STAGE_STATUSES = [StageInstanceStatus.SCHEDULED, StageInstanceStatus.IN_PROGRESS]
+
+DEFAULT_STAGE_DURATION_MINUTES = 60
+
+
+class SlotUnavailable(Exception):
+    """Raised when a requested slot overlaps an existing booking, interview or hold."""
+    pass
+
+
+def _overlaps(start: int, end: int, range_start: int, range_end: int) -> bool:
+    return start < range_end and end > range_start
+
+
+def get_internal_busy_by_user(
+    user_ids: Iterable,
+    start_date: datetime,
+    end_date: datetime,
+    exclude_booking_id=None,
+    exclude_stage_instance_id=None,
+) -> Dict[object, List[Interval]]:
+    """
+    Busy (start_ts, end_ts) intervals per user from Bookings they organize or
+    co-host, interview stages they conduct and unexpired holds, overlapping
+    the range.
+
+    Runs four queries regardless of the number of users.
+    """
+    user_ids = list(user_ids)
+    busy: Dict[object, List[Interval]] = defaultdict(list)
+    if not user_ids:
+        return busy
+
+    range_start, range_end = int(start_date.timestamp()), int(end_date.timestamp())
+    lookback = start_date - MAX_MEETING_LENGTH
+
+    bookings = Booking.objects.filter(
+        organizer_id__in=user_ids,
+        status__in=ACTIVE_BOOKING_STATUSES,
+        scheduled_at__gte=lookback,
+        scheduled_at__lt=end_date,
+    )
+    if exclude_booking_id:
+        bookings = bookings.exclude(id=exclude_booking_id)
+    for user_id, scheduled_at, duration in bookings.values_list('organizer_id', 'scheduled_at', 'duration_minutes'):
+        start = int(scheduled_at.timestamp())
+        end = start + duration * 60
+        if _overlaps(start, end, range_start, range_end):
+            busy[user_id].append((start, end))
+
+    co_hosted = Booking.co_hosts.through.objects.filter(
+        user_id__in=user_ids,
+        booking__status__in=ACTIVE_BOOKING_STATUSES,
+        booking__scheduled_at__gte=lookback,
+        booking__scheduled_at__lt=end_date,
+    )
+    if exclude_booking_id:
+        co_hosted = co_hosted.exclude(booking_id=exclude_booking_id)
+    for user_id, scheduled_at, duration in co_hosted.values_list(
+        'user_id', 'booking__scheduled_at', 'booking__duration_minutes'
+    ):
+        start = int(scheduled_at.timestamp())
+        end = start + duration * 60
+        if _overlaps(start, end, range_start, range_end):
+            busy[user_id].append((start, end))
+
+    stages = ApplicationStageInstance.objects.filter(
+        interviewer_id__in=user_ids,
+        status__in=ACTIVE_STAGE_STATUSES,
+        scheduled_at__gte=lookback,
+        scheduled_at__lt=end_date,
+    )
+    if exclude_stage_instance_id:
+        stages = stages.exclude(id=exclude_stage_instance_id)
+    for user_id, scheduled_at, duration in stages.values_list('interviewer_id', 'scheduled_at', 'duration_minutes'):
+        start = int(scheduled_at.timestamp())
+        end = start + (duration or DEFAULT_STAGE_DURATION_MINUTES) * 60
+        if _overlaps(start, end, range_start, range_end):
+            busy[user_id].append((start, end))
+
+    holds = BookingHold.objects.filter(
+        organizer_id__in=user_ids,
+        expires_at__gt=timezone.now(),
+        starts_at__lt=end_date,
+        ends_at__gt=start_date,
+    )
+    for user_id, starts_at, ends_at in holds.values_list('organizer_id', 'starts_at', 'ends_at'):
+        busy[user_id].append((int(starts_at.timestamp()), int(ends_at.timestamp())))
+
+    return busy
+
+
+def get_internal_busy_intervals(user, start_date: datetime, end_date: datetime, **kwargs) -> List[Interval]:
+    """Internal busy intervals for a single user."""
+    return get_internal_busy_by_user([user.pk], start_date, end_date, **kwargs).get(user.pk, [])
+
+
+def reserve_slot(
+    organizer,
+    start: datetime,
+    duration_minutes: int,
+    meeting_type=None,
+    buffer_minutes: int = 0,
+    exclude_stage_instance_id=None,
+) -> BookingHold:
+    """
+    Hold an organizer's slot while a booking is created.
+
+    Bookings for the same organizer are serialized by locking the user row, so
+    a second booker for an overlapping slot sees the first booker's hold (or
+    their booking, once it is saved) and gets SlotUnavailable. The caller
+    should release() the hold once the booking row exists; otherwise it
+    expires after HOLD_TTL.
+    """
+    end = start + timedelta(minutes=duration_minutes)
+    buffer = timedelta(minutes=buffer_minutes)
+
+    with transaction.atomic():
+        get_user_model().objects.select_for_update().only('pk').get(pk=organizer.pk)
+
+        now = timezone.now()
+        BookingHold.objects.filter(organizer=organizer, expires_at__lte=now).delete()
+
+        if get_internal_busy_intervals(
+            organizer,
+            start - buffer,
+            end + buffer,
+            exclude_stage_instance_id=exclude_stage_instance_id,
+        ):
+            raise SlotUnavailable('This time slot is no longer available')
+
+        return BookingHold.objects.create(
+            organizer=organizer,
+            meeting_type=meeting_type,
+            starts_at=start,
+            ends_at=end,
+            expires_at=now + HOLD_TTL,
+        )
+
+
+def reserve_slot_for_members(
+    members: Sequence,
+    start: datetime,
+    duration_minutes: int,
+    meeting_type=None,
+    buffer_minutes: int = 0,
+) -> List[BookingHold]:
+    """
+    Hold the same slot for every member of a collective meeting.
+
+    Members are locked in primary key order so two collective bookings with
+    overlapping panels cannot deadlock. If any member is busy, holds already
+    taken are released and SlotUnavailable is raised.
+    """
+    holds: List[BookingHold] = []
+    try:
+        for member in sorted(members, key=lambda member: str(member.pk)):
+            holds.append(reserve_slot(member, start, duration_minutes, meeting_type, buffer_minutes))
+    except SlotUnavailable:
+        release_all(holds)
+        raise
+    return holds
+
+
+def get_booking_loads(user_ids: Iterable) -> Dict[object, int]:
+    """Upcoming pending/confirmed bookings each user organizes or co-hosts."""
+    user_ids = list(user_ids)
+    now = timezone.now()
+    loads = dict.fromkeys(user_ids, 0)
+
+    organized = (
+        Booking.objects.filter(organizer_id__in=user_ids, status__in=ACTIVE_BOOKING_STATUSES, scheduled_at__gte=now)
+        .values('organizer_id')
+        .annotate(count=Count('id'))
+    )
+    for row in organized:
+        loads[row['organizer_id']] += row['count']
+
+    co_hosted = (
+        Booking.co_hosts.through.objects.filter(
+            user_id__in=user_ids,
+            booking__status__in=ACTIVE_BOOKING_STATUSES,
+            booking__scheduled_at__gte=now,
+        )
+        .values('user_id')
+        .annotate(count=Count('id'))
+    )
+    for row in co_hosted:
+        loads[row['user_id']] += row['count']
+
+    return loads
+
+
+def order_by_load(members: Iterable) -> List:
+    """Members sorted least-loaded first, ties broken by primary key."""
+    members = list(members)
+    loads = get_booking_loads(member.pk for member in members)
+    return sorted(members, key=lambda member: (loads[member.pk], str(member.pk)))
+
+
+def release(hold: Optional[BookingHold]) -> None:
+    """Release a hold once the booking it protected has been saved."""
+    if hold is not None:
+        BookingHold.objects.filter(pk=hold.pk).delete()
+
+
+def release_all(holds: Iterable[BookingHold]) -> None:
+    """Release several holds in one query."""
+    BookingHold.objects.filter(pk__in=[hold.pk for hold in holds]).delete()
@@ -0,0 +1,374 @@
+"""
+Unified calendar feed of Bookings and interview stages.
+
+Bookings and scheduled ApplicationStageInstances are merged with a SQL UNION
+ordered by (scheduled_at, id), so the database returns one page of keys at a
+time instead of the view loading and sorting both tables in Python. Pages are
+addressed with an opaque keyset cursor: the (scheduled_at, id) of the last
+item, which stays stable while rows are inserted before it.
+
+The same query backs the iCalendar export, which walks the window page by
+page and streams one VEVENT per item.
+"""
+
+import base64
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Iterator, List, Optional, Tuple
+
+from django.db.models import CharField, Q, QuerySet, Value
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from jobs.models import ApplicationStageInstance
+from scheduling.models import Booking, BookingStatus
+
+BOOKING = 'booking'
+INTERVIEW = 'interview'
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Window used when the request does not give one
+DEFAULT_WINDOW_PAST = timedelta(days=30)
+DEFAULT_WINDOW_LENGTH = timedelta(days=90)
+MAX_WINDOW_LENGTH = timedelta(days=366)
+
+# Items fetched per query when streaming the ICS export
+EXPORT_CHUNK_SIZE = 500
+
+UPCOMING_STAGE_STATUSES = ['scheduled', 'pending_booking', 'not_started']
+
+ItemKey = Tuple[datetime, uuid.UUID, str]
+
+
+class CalendarFeedError(ValueError):
+    """Raised for an invalid window, cursor or page size."""
+    pass
+
+
+def _parse_when(value: str, end_of_day: bool = False) -> datetime:
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise CalendarFeedError(f"Invalid date: {value}")
+        parsed = datetime.combine(day, datetime.max.time() if end_of_day else datetime.min.time())
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_window(
+    params,
+    require: bool = True,
+    default_start: Optional[datetime] = None,
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    The (start, end) window from start_date/end_date query params.
+
+    Missing bounds default to default_start (DEFAULT_WINDOW_PAST before now
+    if not given) and DEFAULT_WINDOW_LENGTH after the start. With require=False a request
+    without either bound is left unbounded (used when filtering by a lead or
+    attendee, which already limits the rows).
+    """
+    start_param = params.get('start_date')
+    end_param = params.get('end_date')
+    start = _parse_when(start_param) if start_param else None
+    end = _parse_when(end_param, end_of_day=True) if end_param else None
+
+    if start is None and end is None and not require:
+        return None, None
+
+    if start is None:
+        if end is not None:
+            start = end - DEFAULT_WINDOW_LENGTH
+        else:
+            start = default_start or timezone.now() - DEFAULT_WINDOW_PAST
+    if end is None:
+        end = start + DEFAULT_WINDOW_LENGTH
+
+    if end < start:
+        raise CalendarFeedError("end_date must be after start_date")
+    if end - start > MAX_WINDOW_LENGTH:
+        raise CalendarFeedError(f"Date window cannot exceed {MAX_WINDOW_LENGTH.days} days")
+    return start, end
+
+
+def parse_page_size(value: Optional[str]) -> int:
+    if not value:
+        return DEFAULT_PAGE_SIZE
+    try:
+        size = int(value)
+    except ValueError:
+        raise CalendarFeedError("limit must be a number")
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def encode_cursor(scheduled_at: datetime, item_id) -> str:
+    raw = f"{scheduled_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        scheduled_at, item_id = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        parsed = parse_datetime(scheduled_at)
+        if parsed is None:
+            raise ValueError(scheduled_at)
+        return parsed, uuid.UUID(item_id)
+    except (ValueError, UnicodeDecodeError):
+        raise CalendarFeedError("Invalid cursor")
+
+
+def visible_bookings(user) -> QuerySet:
+    """Bookings a user may see: all for admins, hosted for recruiters, attended otherwise."""
+    if user.role == 'admin':
+        return Booking.objects.all()
+    if user.role == 'recruiter':
+        co_hosted = Booking.co_hosts.through.objects.filter(user=user).values('booking_id')
+        return Booking.objects.filter(Q(organizer=user) | Q(id__in=co_hosted))
+
+    q_filter = Q(attendee_user=user)
+    if hasattr(user, 'candidate_profile') and user.candidate_profile:
+        q_filter |= Q(candidate_profile=user.candidate_profile)
+    return Booking.objects.filter(q_filter)
+
+
+def visible_stages(user) -> QuerySet:
+    """Interview stages a user may see, without joins that need DISTINCT."""
+    stages = ApplicationStageInstance.objects.all()
+    if user.role == 'admin':
+        return stages
+    if user.role == 'recruiter':
+        # Interviewer or participant in the interview
+        participating = ApplicationStageInstance.participants.through.objects.filter(
+            user=user,
+        ).values('applicationstageinstance_id')
+        return stages.filter(Q(interviewer=user) | Q(id__in=participating))
+    if user.role == 'client':
+        if hasattr(user, 'company_memberships'):
+            company_ids = user.company_memberships.values_list('company_id', flat=True)
+            return stages.filter(application__job__company_id__in=company_ids)
+        return stages.none()
+
+    # Candidates see stages from their own applications
+    if hasattr(user, 'candidate_profile') and user.candidate_profile:
+        return stages.filter(application__candidate=user.candidate_profile)
+    return stages.none()
+
+
+def filtered_sources(user, params) -> Tuple[QuerySet, Optional[QuerySet]]:
+    """
+    Booking and stage querysets for the feed filters. Stages are None when a
+    Booking-only filter (category, attendee_email, lead_id) is applied.
+
+    Raises CalendarFeedError for an invalid window.
+    """
+    status_filter = params.get('status')
+    category = params.get('category')
+    upcoming = params.get('upcoming') == 'true'
+    attendee_email = params.get('attendee_email')
+    lead_id = params.get('lead_id')
+
+    now = timezone.now()
+    start, end = parse_window(
+        params,
+        require=not (attendee_email or lead_id),
+        default_start=now if upcoming else None,
+    )
+
+    bookings = visible_bookings(user).filter(scheduled_at__isnull=False)
+    if start is not None:
+        bookings = bookings.filter(scheduled_at__gte=start, scheduled_at__lte=end)
+    if status_filter:
+        bookings = bookings.filter(status=status_filter)
+    if category:
+        bookings = bookings.filter(meeting_type__category=category)
+    if upcoming:
+        bookings = bookings.filter(scheduled_at__gte=now, status=BookingStatus.CONFIRMED)
+    if attendee_email:
+        bookings = bookings.filter(attendee_email__iexact=attendee_email)
+    if lead_id:
+        bookings = bookings.filter(lead_id=lead_id)
+
+    # Category, attendee and lead filters are specific to Booking objects
+    if category or attendee_email or lead_id:
+        return bookings, None
+
+    stages = visible_stages(user).filter(scheduled_at__isnull=False)
+    if start is not None:
+        stages = stages.filter(scheduled_at__gte=start, scheduled_at__lte=end)
+    if upcoming:
+        stages = stages.filter(scheduled_at__gte=now, status__in=UPCOMING_STAGE_STATUSES)
+    return bookings, stages
+
+
+def _keys(queryset: QuerySet, kind: str, after: Optional[Tuple[datetime, uuid.UUID]], limit: int) -> QuerySet:
+    if after is not None:
+        scheduled_at, item_id = after
+        queryset = queryset.filter(
+            Q(scheduled_at__gt=scheduled_at) | Q(scheduled_at=scheduled_at, id__gt=item_id)
+        )
+    return (
+        queryset
+        .annotate(kind=Value(kind, output_field=CharField()))
+        .order_by('scheduled_at', 'id')
+        .values_list('scheduled_at', 'id', 'kind')[:limit]
+    )
+
+
+def page_keys(
+    bookings: QuerySet,
+    stages: Optional[QuerySet],
+    after: Optional[Tuple[datetime, uuid.UUID]] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> List[ItemKey]:
+    """
+    The next `limit` (scheduled_at, id, kind) keys after the cursor position,
+    in one UNION ALL query. Each branch is limited too, so only 2 * limit
+    index entries are read regardless of the window size.
+    """
+    query = _keys(bookings, BOOKING, after, limit)
+    if stages is not None:
+        query = query.union(_keys(stages, INTERVIEW, after, limit), all=True).order_by('scheduled_at', 'id')
+    return list(query[:limit])
+
+
+def load_items(keys: List[ItemKey]) -> List[Tuple[str, object]]:
+    """Fetch the objects for a page of keys (one query per kind), in key order."""
+    booking_ids = [item_id for _, item_id, kind in keys if kind == BOOKING]
+    stage_ids = [item_id for _, item_id, kind in keys if kind == INTERVIEW]
+
+    objects = {}
+    if booking_ids:
+        for booking in Booking.objects.filter(id__in=booking_ids).select_related(
+            'meeting_type', 'organizer', 'candidate_profile', 'lead',
+        ):
+            objects[(BOOKING, booking.id)] = booking
+    if stage_ids:
+        for stage in ApplicationStageInstance.objects.filter(id__in=stage_ids).select_related(
+            'application__candidate__user',
+            'application__job__company',
+            'stage_template',
+            'interviewer',
+        ).prefetch_related('participants'):
+            objects[(INTERVIEW, stage.id)] = stage
+
+    return [
+        (kind, objects[(kind, item_id)])
+        for _, item_id, kind in keys
+        if (kind, item_id) in objects
+    ]
+
+
+def iter_items(bookings: QuerySet, stages: Optional[QuerySet], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Tuple[str, object]]:
+    """Every item in the feed, fetched page by page with the keyset cursor."""
+    after = None
+    while True:
+        keys = page_keys(bookings, stages, after=after, limit=chunk_size)
+        yield from load_items(keys)
+        if len(keys) < chunk_size:
+            return
+        after = keys[-1][:2]
+
+
+# =============================================================================
+# iCalendar export
+# =============================================================================
+
+def _ics_escape(text: str) -> str:
+    return (
+        (text or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def _ics_line(name: str, value: str) -> str:
+    """A content line folded at 75 octets, as RFC 5545 requires."""
+    data = f"{name}:{value}".encode()
+    chunks = []
+    limit = 75
+    while len(data) > limit:
+        cut = limit
+        # Don't split a multi-byte UTF-8 character
+        while (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        chunks.append(data[:cut])
+        data = data[cut:]
+        # Continuation lines start with a space
+        limit = 74
+    chunks.append(data)
+    return '\r\n '.join(chunk.decode() for chunk in chunks) + '\r\n'
+
+
+def _ics_time(value: datetime) -> str:
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _event_fields(kind: str, item) -> dict:
+    if kind == BOOKING:
+        return {
+            'uid': f"booking-{item.id}",
+            'start': item.scheduled_at,
+            'end': item.scheduled_at + timedelta(minutes=item.duration_minutes),
+            'summary': item.title,
+            'description': item.description or '',
+            'location': item.meeting_url or item.location or '',
+            'cancelled': item.status == BookingStatus.CANCELLED,
+            'updated': item.updated_at,
+        }
+
+    template = item.stage_template
+    job = item.application.job if item.application else None
+    duration = item.duration_minutes or (template.default_duration_minutes if template else 30)
+    return {
+        'uid': f"interview-{item.id}",
+        'start': item.scheduled_at,
+        'end': item.scheduled_at + timedelta(minutes=duration),
+        'summary': f"{template.name if template else 'Interview'} - {job.title if job else 'Application'}",
+        'description': f"Interview for {job.title}" if job else 'Application Interview',
+        'location': item.meeting_link or item.location or '',
+        'cancelled': item.status in ('cancelled', 'skipped'),
+        'updated': item.updated_at,
+    }
+
+
+def iter_ics(items: Iterator[Tuple[str, object]], calendar_name: str = 'Oneo Meetings') -> Iterator[str]:
+    """Stream an iCalendar document, one chunk per event."""
+    yield (
+        'BEGIN:VCALENDAR\r\n'
+        'VERSION:2.0\r\n'
+        'PRODID:-//Oneo//Scheduling//EN\r\n'
+        'CALSCALE:GREGORIAN\r\n'
+        'METHOD:PUBLISH\r\n'
+        + _ics_line('X-WR-CALNAME', _ics_escape(calendar_name))
+    )
+
+    stamp = _ics_time(timezone.now())
+    for kind, item in items:
+        event = _event_fields(kind, item)
+        lines = [
+            'BEGIN:VEVENT\r\n',
+            _ics_line('UID', f"{event['uid']}@oneo"),
+            _ics_line('DTSTAMP', stamp),
+            _ics_line('DTSTART', _ics_time(event['start'])),
+            _ics_line('DTEND', _ics_time(event['end'])),
+            _ics_line('SUMMARY', _ics_escape(event['summary'])),
+        ]
+        if event['description']:
+            lines.append(_ics_line('DESCRIPTION', _ics_escape(event['description'])))
+        if event['location']:
+            lines.append(_ics_line('LOCATION', _ics_escape(event['location'])))
+        if event['updated']:
+            lines.append(_ics_line('LAST-MODIFIED', _ics_time(event['updated'])))
+        lines.append(_ics_line('STATUS', 'CANCELLED' if event['cancelled'] else 'CONFIRMED'))
+        lines.append('END:VEVENT\r\n')
+        yield ''.join(lines)
+
+    yield 'END:VCALENDAR\r\n'
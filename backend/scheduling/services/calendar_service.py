@@ -5,25 +5,38 @@ This service handles:
 - OAuth flows for calendar providers
 - Creating/updating/deleting calendar events
 - Token refresh management
+- Availability from cached free/busy data (see free_busy.py)
 """
 
 from django.conf import settings
 from django.utils import timezone
-from datetime import datetime, timedelta, time
+from datetime import datetime, timedelta, timezone as dt_timezone
 from typing import Optional, Dict, Any, Tuple, List
 from urllib.parse import urlencode
-import requests
 import json
 import uuid
 
+from core.utils import http_client
+
 # Import models from scheduling app
 from scheduling.models import (
     UserCalendarConnection,
     CalendarProvider,
     Booking,
+    SchedulingMode,
 )
 # ApplicationStageInstance stays in jobs app
 from jobs.models import ApplicationStageInstance
+from .availability import (
+    SlotUnavailable,
+    get_internal_busy_by_user,
+    get_internal_busy_intervals,
+    order_by_load,
+    reserve_slot,
+    reserve_slot_for_members,
+)
+from .free_busy import get_busy_intervals, get_busy_intervals_for_connections, invalidate_free_busy
+from .slots import DEFAULT_SLOT_INTERVAL_MINUTES, compute_slots, format_slots, intersect_slots, union_slots
 
 
 class CalendarServiceError(Exception):
@@ -102,7 +115,7 @@ class CalendarService:
             UserCalendarConnection object
         """
         # Exchange code for tokens
-        response = requests.post(
+        response = http_client.post(
             cls.GOOGLE_TOKEN_URL,
             data={
                 "client_id": settings.GOOGLE_CLIENT_ID,
@@ -119,7 +132,7 @@ class CalendarService:
         token_data = response.json()
 
         # Get user email
-        user_info_response = requests.get(
+        user_info_response = http_client.get(
             "https://www.googleapis.com/oauth2/v2/userinfo",
             headers={"Authorization": f"Bearer {token_data['access_token']}"},
         )
@@ -167,7 +180,7 @@ class CalendarService:
             UserCalendarConnection object
         """
         # Exchange code for tokens
-        response = requests.post(
+        response = http_client.post(
             cls.MICROSOFT_TOKEN_URL,
             data={
                 "client_id": settings.MICROSOFT_CLIENT_ID,
@@ -185,7 +198,7 @@ class CalendarService:
         token_data = response.json()
 
         # Get user email from Microsoft Graph
-        user_info_response = requests.get(
+        user_info_response = http_client.get(
             f"{cls.MICROSOFT_GRAPH_API}/me",
             headers={"Authorization": f"Bearer {token_data['access_token']}"},
         )
@@ -229,7 +242,7 @@ class CalendarService:
             return False
 
         if connection.provider == CalendarProvider.GOOGLE:
-            response = requests.post(
+            response = http_client.post(
                 cls.GOOGLE_TOKEN_URL,
                 data={
                     "client_id": settings.GOOGLE_CLIENT_ID,
@@ -239,7 +252,7 @@ class CalendarService:
                 },
             )
         else:
-            response = requests.post(
+            response = http_client.post(
                 cls.MICROSOFT_TOKEN_URL,
                 data={
                     "client_id": settings.MICROSOFT_CLIENT_ID,
@@ -268,6 +281,14 @@ class CalendarService:
         connection.save(update_fields=["access_token", "refresh_token", "token_expires_at"])
         return True
 
+    @staticmethod
+    def _token_expiring(connection: UserCalendarConnection) -> bool:
+        """Whether the access token expires within 5 minutes."""
+        return bool(
+            connection.token_expires_at
+            and connection.token_expires_at <= timezone.now() + timedelta(minutes=5)
+        )
+
     @classmethod
     def _get_valid_token(cls, connection: UserCalendarConnection) -> str:
         """
@@ -282,11 +303,11 @@ class CalendarService:
         Raises:
             CalendarServiceError: If unable to get a valid token
         """
-        # Check if token is expired (with 5 minute buffer)
-        if connection.token_expires_at and connection.token_expires_at <= timezone.now() + timedelta(minutes=5):
-            if not cls.refresh_token(connection):
+        if cls._token_expiring(connection):
+            # Only one worker refreshes; the others wait on the row lock and reuse its token
+            http_client.single_flight_refresh(connection, cls._token_expiring, cls.refresh_token)
+            if cls._token_expiring(connection):
                 raise CalendarServiceError("Unable to refresh expired token")
-            connection.refresh_from_db()
 
         return connection.access_token
 
@@ -312,7 +333,7 @@ class CalendarService:
         """List calendars from Google Calendar."""
         access_token = cls._get_valid_token(connection)
 
-        response = requests.get(
+        response = http_client.get(
             f"{cls.GOOGLE_CALENDAR_API}/users/me/calendarList",
             headers={"Authorization": f"Bearer {access_token}"},
             params={"minAccessRole": "owner"},  # Only calendars user owns
@@ -337,7 +358,7 @@ class CalendarService:
         """List calendars from Microsoft 365."""
         access_token = cls._get_valid_token(connection)
 
-        response = requests.get(
+        response = http_client.get(
             f"{cls.MICROSOFT_GRAPH_API}/me/calendars",
             headers={"Authorization": f"Bearer {access_token}"},
         )
@@ -432,6 +453,7 @@ Interview Details:
             "microsoft_calendar_event_id",
             "calendar_invite_sent",
         ])
+        invalidate_free_busy(connection)
 
         return event_id
 
@@ -479,7 +501,7 @@ Interview Details:
             event_data["attendees"] = [{"email": email} for email in attendees]
             event_data["guestsCanSeeOtherGuests"] = True
 
-        response = requests.post(
+        response = http_client.post(
             f"{cls.GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events",
             headers={
                 "Authorization": f"Bearer {access_token}",
@@ -533,7 +555,7 @@ Interview Details:
                 for email in attendees
             ]
 
-        response = requests.post(
+        response = http_client.post(
             f"{cls.MICROSOFT_GRAPH_API}/me/events",
             headers={
                 "Authorization": f"Bearer {access_token}",
@@ -590,7 +612,7 @@ Interview Details:
             event_id = stage_instance.google_calendar_event_id
             if not event_id:
                 return False
-            return cls._update_google_event(
+            updated = cls._update_google_event(
                 access_token=access_token,
                 calendar_id=connection.calendar_id or "primary",
                 event_id=event_id,
@@ -606,7 +628,7 @@ Interview Details:
             event_id = stage_instance.microsoft_calendar_event_id
             if not event_id:
                 return False
-            return cls._update_microsoft_event(
+            updated = cls._update_microsoft_event(
                 access_token=access_token,
                 event_id=event_id,
                 title=title,
@@ -618,6 +640,9 @@ Interview Details:
                 attendees=attendees or [],
             )
 
+        invalidate_free_busy(connection)
+        return updated
+
     @classmethod
     def _update_google_event(
         cls,
@@ -652,7 +677,7 @@ Interview Details:
         if attendees:
             event_data["attendees"] = [{"email": email} for email in attendees]
 
-        response = requests.patch(
+        response = http_client.patch(
             f"{cls.GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events/{event_id}",
             headers={
                 "Authorization": f"Bearer {access_token}",
@@ -703,7 +728,7 @@ Interview Details:
                 for email in attendees
             ]
 
-        response = requests.patch(
+        response = http_client.patch(
             f"{cls.MICROSOFT_GRAPH_API}/me/events/{event_id}",
             headers={
                 "Authorization": f"Bearer {access_token}",
@@ -737,7 +762,7 @@ Interview Details:
             if not event_id:
                 return True
 
-            response = requests.delete(
+            response = http_client.delete(
                 f"{cls.GOOGLE_CALENDAR_API}/calendars/{connection.calendar_id or 'primary'}/events/{event_id}",
                 headers={"Authorization": f"Bearer {access_token}"},
                 params={"sendUpdates": "all"},
@@ -746,6 +771,7 @@ Interview Details:
             if response.status_code in (200, 204, 404):
                 stage_instance.google_calendar_event_id = ""
                 stage_instance.save(update_fields=["google_calendar_event_id"])
+                invalidate_free_busy(connection)
                 return True
 
         else:
@@ -753,7 +779,7 @@ Interview Details:
             if not event_id:
                 return True
 
-            response = requests.delete(
+            response = http_client.delete(
                 f"{cls.MICROSOFT_GRAPH_API}/me/events/{event_id}",
                 headers={"Authorization": f"Bearer {access_token}"},
             )
@@ -761,6 +787,7 @@ Interview Details:
             if response.status_code in (200, 204, 404):
                 stage_instance.microsoft_calendar_event_id = ""
                 stage_instance.save(update_fields=["microsoft_calendar_event_id"])
+                invalidate_free_busy(connection)
                 return True
 
         return False
@@ -794,6 +821,7 @@ Interview Details:
     # Default business hours for availability
     BUSINESS_HOURS_START = 9  # 9 AM
     BUSINESS_HOURS_END = 18   # 6 PM
+    SLOT_INTERVAL_MINUTES = DEFAULT_SLOT_INTERVAL_MINUTES
 
     @classmethod
     def get_free_busy(
@@ -804,6 +832,7 @@ Interview Details:
         duration_minutes: int,
         business_hours_start: int = None,
         business_hours_end: int = None,
+        slot_interval_minutes: int = None,
     ) -> List[Dict[str, str]]:
         """
         Get available time slots for a user based on their calendar availability.
@@ -816,6 +845,7 @@ Interview Details:
             duration_minutes: Length of the meeting slot needed
             business_hours_start: Override start hour (uses connection settings if None)
             business_hours_end: Override end hour (uses connection settings if None)
+            slot_interval_minutes: Step between slot start times (default 30)
 
         Returns:
             List of available time slots: [{"start": "ISO datetime", "end": "ISO datetime"}, ...]
@@ -829,24 +859,10 @@ Interview Details:
             # No calendar connected, return empty (or could return all business hours)
             return []
 
-        # Use connection settings, falling back to defaults
-        business_start = business_hours_start or connection.business_hours_start or cls.BUSINESS_HOURS_START
-        business_end = business_hours_end or connection.business_hours_end or cls.BUSINESS_HOURS_END
-        buffer_minutes = connection.buffer_minutes or 0
-        min_notice_hours = connection.min_notice_hours or 0
-
-        # Parse available days from connection (comma-separated day numbers)
-        available_days = None
-        if connection.available_days:
-            try:
-                available_days = [int(d) for d in connection.available_days.split(',') if d.strip()]
-            except ValueError:
-                available_days = None
-
-        if connection.provider == CalendarProvider.GOOGLE:
-            busy_periods = cls._google_free_busy(connection, start_date, end_date)
-        else:
-            busy_periods = cls._microsoft_free_busy(connection, start_date, end_date)
+        # Served from the local busy cache, refreshed incrementally from the provider
+        busy_periods = get_busy_intervals(connection, start_date, end_date)
+        # Bookings, interviews and holds that may not be on the external calendar yet
+        busy_periods += get_internal_busy_intervals(user, start_date, end_date)
 
         # Convert busy periods to available slots
         return cls._calculate_available_slots(
@@ -854,100 +870,147 @@ Interview Details:
             start_date=start_date,
             end_date=end_date,
             duration_minutes=duration_minutes,
-            business_hours_start=business_start,
-            business_hours_end=business_end,
-            buffer_minutes=buffer_minutes,
-            min_notice_hours=min_notice_hours,
-            available_days=available_days,
+            slot_interval_minutes=slot_interval_minutes,
+            **cls._slot_settings(connection, business_hours_start, business_hours_end),
         )
 
     @classmethod
-    def _google_free_busy(
+    def _slot_settings(
         cls,
         connection: UserCalendarConnection,
+        business_hours_start: int = None,
+        business_hours_end: int = None,
+    ) -> Dict[str, Any]:
+        """Booking settings from a calendar connection, falling back to defaults."""
+        # Parse available days from connection (comma-separated day numbers)
+        available_days = None
+        if connection.available_days:
+            try:
+                available_days = [int(d) for d in connection.available_days.split(',') if d.strip()]
+            except ValueError:
+                available_days = None
+
+        return {
+            'business_hours_start': business_hours_start or connection.business_hours_start or cls.BUSINESS_HOURS_START,
+            'business_hours_end': business_hours_end or connection.business_hours_end or cls.BUSINESS_HOURS_END,
+            'buffer_minutes': connection.buffer_minutes or 0,
+            'min_notice_hours': connection.min_notice_hours or 0,
+            'available_days': available_days,
+        }
+
+    @classmethod
+    def get_member_slots(
+        cls,
+        users,
         start_date: datetime,
         end_date: datetime,
-    ) -> List[Tuple[datetime, datetime]]:
+        duration_minutes: int,
+        slot_interval_minutes: int = None,
+    ) -> Dict[Any, List[Tuple[int, int]]]:
         """
-        Query Google Calendar for busy periods.
+        Free (start_ts, end_ts) slots per user ID for a pool of users, each
+        computed with that user's own booking settings.
 
-        Returns list of (start, end) tuples for busy times.
+        Stale busy caches are synced concurrently and internal bookings are
+        read for all users at once. Users without an active calendar
+        connection, or whose calendar could not be synced, are left out.
         """
-        access_token = cls._get_valid_token(connection)
-
-        request_body = {
-            "timeMin": start_date.isoformat(),
-            "timeMax": end_date.isoformat(),
-            "items": [{"id": connection.calendar_id or "primary"}],
-        }
-
-        response = requests.post(
-            f"{cls.GOOGLE_CALENDAR_API}/freeBusy",
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json",
-            },
-            json=request_body,
-        )
+        connections = {}
+        for connection in UserCalendarConnection.objects.filter(user__in=users, is_active=True):
+            connections.setdefault(connection.user_id, connection)
 
-        if response.status_code != 200:
-            raise CalendarServiceError(f"Failed to get free/busy: {response.text}")
+        external = get_busy_intervals_for_connections(connections.values(), start_date, end_date)
+        internal = get_internal_busy_by_user(connections.keys(), start_date, end_date)
 
-        result = response.json()
-        calendar_id = connection.calendar_id or "primary"
-        busy_list = result.get("calendars", {}).get(calendar_id, {}).get("busy", [])
-
-        return [
-            (
-                datetime.fromisoformat(period["start"].replace("Z", "+00:00")),
-                datetime.fromisoformat(period["end"].replace("Z", "+00:00")),
+        return {
+            user_id: cls._available_slot_intervals(
+                busy_periods=external[connection.id] + internal.get(user_id, []),
+                start_date=start_date,
+                end_date=end_date,
+                duration_minutes=duration_minutes,
+                slot_interval_minutes=slot_interval_minutes,
+                **cls._slot_settings(connection),
             )
-            for period in busy_list
-        ]
+            for user_id, connection in connections.items()
+            if connection.id in external
+        }
 
     @classmethod
-    def _microsoft_free_busy(
+    def get_pooled_free_busy(
         cls,
-        connection: UserCalendarConnection,
+        users,
+        scheduling_mode: str,
         start_date: datetime,
         end_date: datetime,
-    ) -> List[Tuple[datetime, datetime]]:
+        duration_minutes: int,
+        slot_interval_minutes: int = None,
+    ) -> List[Dict[str, str]]:
         """
-        Query Microsoft Graph for busy periods.
+        Available slots for a pooled meeting type.
 
-        Returns list of (start, end) tuples for busy times.
+        Collective: slots where every user is free. A user without a calendar
+        connection, or whose calendar can't be synced, cannot be checked, so
+        no slots are offered.
+        Round robin: slots where at least one user is free.
         """
-        access_token = cls._get_valid_token(connection)
-
-        # Microsoft uses calendar view endpoint for free/busy
-        response = requests.get(
-            f"{cls.MICROSOFT_GRAPH_API}/me/calendar/calendarView",
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "Prefer": 'outlook.timezone="UTC"',
-            },
-            params={
-                "startDateTime": start_date.isoformat(),
-                "endDateTime": end_date.isoformat(),
-                "$select": "start,end,showAs",
-            },
+        users = list(users)
+        member_slots = cls.get_member_slots(
+            users, start_date, end_date, duration_minutes, slot_interval_minutes,
         )
 
-        if response.status_code != 200:
-            raise CalendarServiceError(f"Failed to get calendar view: {response.text}")
+        if scheduling_mode == SchedulingMode.COLLECTIVE:
+            if len(member_slots) < len(users):
+                return []
+            slots = intersect_slots(list(member_slots.values()))
+        else:
+            slots = [slot for slot, _ in union_slots(member_slots)]
+
+        return format_slots(slots, start_date.tzinfo or dt_timezone.utc)
+
+    @classmethod
+    def reserve_pooled_slot(
+        cls,
+        users,
+        scheduling_mode: str,
+        start: datetime,
+        duration_minutes: int,
+        meeting_type=None,
+    ) -> Tuple[list, list]:
+        """
+        Choose the hosts for a pooled booking at `start` and hold the slot for them.
 
-        events = response.json().get("value", [])
+        Collective: every user hosts, the first one organizes.
+        Round robin: the least-loaded user who is free hosts alone.
 
-        # Only include events that show as busy or tentative
-        busy_periods = []
-        for event in events:
-            show_as = event.get("showAs", "busy")
-            if show_as in ["busy", "tentative", "oof"]:
-                start = datetime.fromisoformat(event["start"]["dateTime"].replace("Z", "+00:00"))
-                end = datetime.fromisoformat(event["end"]["dateTime"].replace("Z", "+00:00"))
-                busy_periods.append((start, end))
+        Returns (hosts, holds) with the organizer first in hosts. Raises
+        SlotUnavailable if the slot cannot be booked; the caller should
+        release_all(holds) once the booking is saved.
+        """
+        users = list(users)
+        end = start + timedelta(minutes=duration_minutes)
+        slot = (int(start.timestamp()), int(end.timestamp()))
+        member_slots = cls.get_member_slots(users, start, end, duration_minutes)
+        free = [user for user in users if slot in member_slots.get(user.pk, ())]
+        buffers = dict(
+            UserCalendarConnection.objects.filter(user__in=free, is_active=True)
+            .values_list('user_id', 'buffer_minutes')
+        )
 
-        return busy_periods
+        if scheduling_mode == SchedulingMode.COLLECTIVE:
+            if len(free) < len(users):
+                raise SlotUnavailable('This time slot is no longer available')
+            holds = reserve_slot_for_members(
+                users, start, duration_minutes, meeting_type, max(buffers.values(), default=0) or 0,
+            )
+            return users, holds
+
+        for user in order_by_load(free):
+            try:
+                hold = reserve_slot(user, start, duration_minutes, meeting_type, buffers.get(user.pk) or 0)
+            except SlotUnavailable:
+                continue
+            return [user], [hold]
+        raise SlotUnavailable('This time slot is no longer available')
 
     @classmethod
     def _calculate_available_slots(
@@ -961,12 +1024,13 @@ Interview Details:
         buffer_minutes: int = 0,
         min_notice_hours: int = 0,
         available_days: List[int] = None,
+        slot_interval_minutes: int = None,
     ) -> List[Dict[str, str]]:
         """
         Calculate available time slots given busy periods.
 
         Args:
-            busy_periods: List of (start, end) datetime tuples for busy times
+            busy_periods: List of (start, end) busy times, as datetimes or UNIX timestamps
             start_date: Start of the range to check
             end_date: End of the range to check
             duration_minutes: Required meeting duration
@@ -975,105 +1039,54 @@ Interview Details:
             buffer_minutes: Buffer time between meetings
             min_notice_hours: Minimum hours notice required
             available_days: List of available weekdays (0=Mon, 6=Sun). None means Mon-Fri.
+            slot_interval_minutes: Step between slot start times (default 30)
 
         Returns:
             List of available slots as {"start": ISO, "end": ISO} dicts
         """
-        available_slots = []
-        slot_duration = timedelta(minutes=duration_minutes)
-        buffer_duration = timedelta(minutes=buffer_minutes) if buffer_minutes > 0 else timedelta(0)
-
-        # Default to Monday-Friday if no available_days specified
-        if available_days is None:
-            available_days = [0, 1, 2, 3, 4]
-
-        # Sort busy periods by start time
-        busy_periods = sorted(busy_periods, key=lambda x: x[0])
-
-        # Calculate minimum booking time (now + min_notice_hours)
-        now = timezone.now()
-        min_booking_time = now + timedelta(hours=min_notice_hours)
-
-        # Iterate through each day in the range
-        current_date = start_date.date()
-        end_date_only = end_date.date()
-
-        while current_date <= end_date_only:
-            # Skip days not in available_days
-            if current_date.weekday() not in available_days:
-                current_date += timedelta(days=1)
-                continue
-
-            # Business hours for this day
-            day_start = datetime.combine(
-                current_date,
-                time(hour=business_hours_start),
-                tzinfo=start_date.tzinfo or timezone.utc,
-            )
-            day_end = datetime.combine(
-                current_date,
-                time(hour=business_hours_end),
-                tzinfo=start_date.tzinfo or timezone.utc,
-            )
-
-            # Apply minimum notice requirement
-            if day_start < min_booking_time:
-                # Round up to next 30min after min_booking_time
-                day_start = min_booking_time + timedelta(minutes=30 - min_booking_time.minute % 30)
-                if day_start.minute == 0 and min_booking_time.minute > 0:
-                    pass  # Already on the hour
-                elif day_start < min_booking_time:
-                    day_start += timedelta(minutes=30)
-
-            # Skip if day is entirely in the past or before min notice
-            if day_end <= min_booking_time:
-                current_date += timedelta(days=1)
-                continue
+        tz = start_date.tzinfo or dt_timezone.utc
+        slots = cls._available_slot_intervals(
+            busy_periods=busy_periods,
+            start_date=start_date,
+            end_date=end_date,
+            duration_minutes=duration_minutes,
+            business_hours_start=business_hours_start,
+            business_hours_end=business_hours_end,
+            buffer_minutes=buffer_minutes,
+            min_notice_hours=min_notice_hours,
+            available_days=available_days,
+            slot_interval_minutes=slot_interval_minutes,
+        )
+        return format_slots(slots, tz)
 
-            # Get busy periods for this day (with buffer added)
-            day_busy = []
-            for start, end in busy_periods:
-                if start < day_end and end > day_start:
-                    # Add buffer before and after busy periods
-                    buffered_start = max(start - buffer_duration, day_start)
-                    buffered_end = min(end + buffer_duration, day_end)
-                    day_busy.append((buffered_start, buffered_end))
-
-            # Find free slots
-            current_time = day_start
-            for busy_start, busy_end in sorted(day_busy):
-                # Add slots before this busy period
-                while current_time + slot_duration <= busy_start:
-                    available_slots.append({
-                        "start": current_time.isoformat(),
-                        "end": (current_time + slot_duration).isoformat(),
-                    })
-                    current_time += timedelta(minutes=30)  # 30-minute increments
-
-                # Move past the busy period
-                if busy_end > current_time:
-                    current_time = busy_end
-                    # Round up to next 30-minute boundary
-                    if current_time.minute % 30 != 0:
-                        current_time = current_time.replace(
-                            minute=(current_time.minute // 30 + 1) * 30 % 60,
-                            second=0,
-                            microsecond=0,
-                        )
-                        if current_time.minute == 0:
-                            current_time += timedelta(hours=1)
-
-            # Add remaining slots until end of business hours
-            while current_time + slot_duration <= day_end:
-                available_slots.append({
-                    "start": current_time.isoformat(),
-                    "end": (current_time + slot_duration).isoformat(),
-                })
-                current_time += timedelta(minutes=30)
-
-            current_date += timedelta(days=1)
-
-        return available_slots
+    @classmethod
+    def _available_slot_intervals(
+        cls,
+        busy_periods,
+        start_date: datetime,
+        end_date: datetime,
+        duration_minutes: int,
+        business_hours_start: int,
+        business_hours_end: int,
+        buffer_minutes: int = 0,
+        min_notice_hours: int = 0,
+        available_days: List[int] = None,
+        slot_interval_minutes: int = None,
+    ) -> List[Tuple[int, int]]:
+        """Same as _calculate_available_slots, returning unformatted (start_ts, end_ts) slots."""
+        return compute_slots(
+            busy_periods,
+            start_date=start_date,
+            end_date=end_date,
+            duration_minutes=duration_minutes,
+            business_hours_start=business_hours_start,
+            business_hours_end=business_hours_end,
+            buffer_minutes=buffer_minutes,
+            earliest_start=timezone.now() + timedelta(hours=min_notice_hours),
+            available_days=available_days,
+            slot_interval_minutes=slot_interval_minutes or cls.SLOT_INTERVAL_MINUTES,
+            tz=start_date.tzinfo or dt_timezone.utc,
+        )
 
     # =========================================================================
     # Auto-generated Meeting Links
@@ -1197,6 +1210,7 @@ Interview Details:
             "meeting_link",
             "calendar_invite_sent",
         ])
+        invalidate_free_busy(connection)
 
         return {
             "event_id": result["event_id"],
@@ -1253,7 +1267,7 @@ Interview Details:
             event_data["attendees"] = [{"email": email} for email in attendees]
             event_data["guestsCanSeeOtherGuests"] = True
 
-        response = requests.post(
+        response = http_client.post(
             f"{cls.GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events",
             headers={
                 "Authorization": f"Bearer {access_token}",
@@ -1320,7 +1334,7 @@ Interview Details:
                 for email in attendees
             ]
 
-        response = requests.post(
+        response = http_client.post(
             f"{cls.MICROSOFT_GRAPH_API}/me/events",
             headers={
                 "Authorization": f"Bearer {access_token}",
@@ -1396,6 +1410,8 @@ Booking Details:
 """.strip()
 
         attendees = [attendee_email] if attendee_email else []
+        # Collective meetings invite the rest of the panel
+        attendees += [host.email for host in booking.co_hosts.all() if host.email]
 
         # Create event with auto-generated video link
         if connection.provider == CalendarProvider.GOOGLE:
@@ -1423,6 +1439,7 @@ Booking Details:
         booking.calendar_provider = connection.provider
         booking.meeting_url = result["meeting_link"]
         booking.save(update_fields=["calendar_event_id", "calendar_provider", "meeting_url"])
+        invalidate_free_busy(connection)
 
         return {
             "event_id": result["event_id"],
@@ -1480,9 +1497,11 @@ Booking Details:
 """.strip()
 
         attendees = [attendee_email] if attendee_email else []
+        # Collective meetings invite the rest of the panel
+        attendees += [host.email for host in booking.co_hosts.all() if host.email]
 
         if connection.provider == CalendarProvider.GOOGLE:
-            return cls._update_google_event(
+            updated = cls._update_google_event(
                 access_token=access_token,
                 calendar_id=connection.calendar_id or "primary",
                 event_id=booking.calendar_event_id,
@@ -1494,7 +1513,7 @@ Booking Details:
                 attendees=attendees,
             )
         else:
-            return cls._update_microsoft_event(
+            updated = cls._update_microsoft_event(
                 access_token=access_token,
                 event_id=booking.calendar_event_id,
                 title=title,
@@ -1505,6 +1524,9 @@ Booking Details:
                 attendees=attendees,
             )
 
+        invalidate_free_busy(connection)
+        return updated
+
     @classmethod
     def delete_booking_event(cls, booking: Booking) -> bool:
         """
@@ -1532,7 +1554,7 @@ Booking Details:
         access_token = cls._get_valid_token(connection)
 
         if connection.provider == CalendarProvider.GOOGLE:
-            response = requests.delete(
+            response = http_client.delete(
                 f"{cls.GOOGLE_CALENDAR_API}/calendars/{connection.calendar_id or 'primary'}/events/{booking.calendar_event_id}",
                 headers={"Authorization": f"Bearer {access_token}"},
                 params={"sendUpdates": "all"},
@@ -1542,9 +1564,10 @@ Booking Details:
                 booking.calendar_event_id = ""
                 booking.calendar_provider = ""
                 booking.save(update_fields=["calendar_event_id", "calendar_provider"])
+                invalidate_free_busy(connection)
                 return True
         else:
-            response = requests.delete(
+            response = http_client.delete(
                 f"{cls.MICROSOFT_GRAPH_API}/me/events/{booking.calendar_event_id}",
                 headers={"Authorization": f"Bearer {access_token}"},
             )
@@ -1553,6 +1576,7 @@ Booking Details:
                 booking.calendar_event_id = ""
                 booking.calendar_provider = ""
                 booking.save(update_fields=["calendar_event_id", "calendar_provider"])
+                invalidate_free_busy(connection)
                 return True
 
         return False
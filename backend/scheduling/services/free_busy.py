@@ -0,0 +1,514 @@
+"""
+Cached free/busy intervals for calendar connections.
+
+Availability pages read busy intervals from CalendarBusyCache instead of
+calling the provider on every request. A cache older than
+CALENDAR_FREE_BUSY_CACHE_TTL seconds (or invalidated by an event change made
+through CalendarService) is refreshed incrementally: Google events.list with
+a syncToken, or a Microsoft Graph calendarView delta link. A full sync is only
+needed on first use, when the requested range falls outside the synced window,
+or when the provider expires the token.
+
+Provider backends implement sync(connection, window_start, window_end,
+sync_token) -> SyncResult. settings.CALENDAR_FREE_BUSY_BACKEND may be a dotted
+path to a backend class used for every connection (e.g. FakeFreeBusyProvider
+in tests).
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+from zoneinfo import ZoneInfo
+
+from django import db
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.utils import http_client
+from scheduling.models import CalendarBusyCache, CalendarProvider, UserCalendarConnection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTL_SECONDS = 60
+
+# Concurrent provider calls when refreshing several connections at once
+DEFAULT_MAX_WORKERS = 8
+
+# Synced windows extend past the requested range so nearby requests reuse them
+WINDOW_PADDING = timedelta(days=7)
+
+# Busy intervals ending this long ago are dropped from the cache
+PRUNE_AFTER = timedelta(days=1)
+
+Interval = Tuple[int, int]
+
+
+class SyncTokenExpired(Exception):
+    """Raised by a provider when the sync token is no longer valid."""
+    pass
+
+
+@dataclass
+class SyncResult:
+    """
+    Events changed since the last sync.
+
+    changes maps provider event IDs to a (start_ts, end_ts) busy interval, or
+    None if the event was removed or no longer blocks time. For a full sync
+    (full=True) changes contains every busy event in the window.
+    """
+    changes: Dict[str, Optional[Interval]]
+    sync_token: str
+    full: bool
+
+
+def _to_interval(start: datetime, end: datetime) -> Interval:
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def _connection_tz(connection: UserCalendarConnection):
+    try:
+        return ZoneInfo(connection.timezone or settings.TIME_ZONE)
+    except (KeyError, ValueError):
+        return dt_timezone.utc
+
+
+class GoogleFreeBusyProvider:
+    """Syncs busy events from Google Calendar events.list with sync tokens."""
+
+    PAGE_SIZE = 2500
+
+    def sync(self, connection, window_start, window_end, sync_token='') -> SyncResult:
+        from .calendar_service import CalendarService, CalendarServiceError
+
+        access_token = CalendarService._get_valid_token(connection)
+        calendar_id = quote(connection.calendar_id or 'primary', safe='')
+        tz = _connection_tz(connection)
+
+        params = {
+            'singleEvents': 'true',
+            'showDeleted': 'true',
+            'maxResults': self.PAGE_SIZE,
+        }
+        if sync_token:
+            params['syncToken'] = sync_token
+        else:
+            params['timeMin'] = window_start.isoformat()
+            params['timeMax'] = window_end.isoformat()
+
+        changes = {}
+        while True:
+            response = http_client.get(
+                f"{CalendarService.GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events",
+                headers={"Authorization": f"Bearer {access_token}"},
+                params=params,
+            )
+            if response.status_code == 410:
+                raise SyncTokenExpired(response.text)
+            if response.status_code != 200:
+                raise CalendarServiceError(f"Failed to sync Google events: {response.text}")
+
+            data = response.json()
+            for event in data.get('items', []):
+                changes[event['id']] = self._busy_interval(event, tz)
+
+            page_token = data.get('nextPageToken')
+            if not page_token:
+                break
+            params['pageToken'] = page_token
+
+        return SyncResult(changes=changes, sync_token=data.get('nextSyncToken', ''), full=not sync_token)
+
+    @staticmethod
+    def _busy_interval(event: dict, tz) -> Optional[Interval]:
+        if event.get('status') == 'cancelled' or event.get('transparency') == 'transparent':
+            return None
+        for attendee in event.get('attendees', []):
+            if attendee.get('self') and attendee.get('responseStatus') == 'declined':
+                return None
+
+        start, end = event.get('start', {}), event.get('end', {})
+        if 'dateTime' in start:
+            return _to_interval(
+                datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00')),
+                datetime.fromisoformat(end['dateTime'].replace('Z', '+00:00')),
+            )
+        if 'date' in start:
+            # All-day event, in the connection's timezone
+            return _to_interval(
+                datetime.fromisoformat(start['date']).replace(tzinfo=tz),
+                datetime.fromisoformat(end['date']).replace(tzinfo=tz),
+            )
+        return None
+
+
+class MicrosoftFreeBusyProvider:
+    """Syncs busy events from a Microsoft Graph calendarView delta query."""
+
+    PAGE_SIZE = 200
+    BUSY_STATUSES = ('busy', 'tentative', 'oof')
+
+    def sync(self, connection, window_start, window_end, sync_token='') -> SyncResult:
+        from .calendar_service import CalendarService, CalendarServiceError
+
+        access_token = CalendarService._get_valid_token(connection)
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Prefer": f'outlook.timezone="UTC", odata.maxpagesize={self.PAGE_SIZE}',
+        }
+
+        if sync_token:
+            # The delta link carries the window and state of the previous sync
+            url, params = sync_token, None
+        else:
+            calendar_id = connection.calendar_id
+            if calendar_id and calendar_id != 'primary':
+                url = f"{CalendarService.MICROSOFT_GRAPH_API}/me/calendars/{quote(calendar_id, safe='')}/calendarView/delta"
+            else:
+                url = f"{CalendarService.MICROSOFT_GRAPH_API}/me/calendarView/delta"
+            params = {
+                "startDateTime": window_start.isoformat(),
+                "endDateTime": window_end.isoformat(),
+            }
+
+        changes = {}
+        while True:
+            response = http_client.get(url, headers=headers, params=params)
+            if response.status_code == 410 or (
+                sync_token and response.status_code == 400 and 'syncStateNotFound' in response.text
+            ):
+                raise SyncTokenExpired(response.text)
+            if response.status_code != 200:
+                raise CalendarServiceError(f"Failed to sync calendar view: {response.text}")
+
+            data = response.json()
+            for event in data.get('value', []):
+                changes[event['id']] = None if '@removed' in event else self._busy_interval(event)
+
+            url = data.get('@odata.nextLink')
+            if not url:
+                break
+            params = None
+
+        return SyncResult(changes=changes, sync_token=data.get('@odata.deltaLink', ''), full=not sync_token)
+
+    @classmethod
+    def _busy_interval(cls, event: dict) -> Optional[Interval]:
+        if event.get('isCancelled') or event.get('showAs', 'busy') not in cls.BUSY_STATUSES:
+            return None
+        # Times are UTC (see Prefer header); drop the 7-digit fractional seconds
+        return _to_interval(
+            datetime.fromisoformat(event['start']['dateTime'].split('.')[0]).replace(tzinfo=dt_timezone.utc),
+            datetime.fromisoformat(event['end']['dateTime'].split('.')[0]).replace(tzinfo=dt_timezone.utc),
+        )
+
+
+class FakeFreeBusyProvider:
+    """
+    In-memory provider backend for tests.
+
+    Events are kept per connection with a change log; sync tokens are
+    positions in the log. Every sync is recorded in `calls`.
+    """
+
+    events: Dict[str, Dict[str, Interval]] = {}
+    change_log: Dict[str, List[str]] = {}
+    calls: List[Tuple[str, str]] = []
+    failing: Dict[str, Exception] = {}
+
+    @classmethod
+    def reset(cls):
+        cls.events = {}
+        cls.change_log = {}
+        cls.calls = []
+        cls.failing = {}
+
+    @classmethod
+    def fail(cls, connection, error: Exception):
+        """Make every sync of the connection raise error, e.g. after its token is revoked."""
+        cls.failing[str(connection.id)] = error
+
+    @classmethod
+    def add_event(cls, connection, event_id: str, start: datetime, end: datetime):
+        key = str(connection.id)
+        cls.events.setdefault(key, {})[event_id] = _to_interval(start, end)
+        cls.change_log.setdefault(key, []).append(event_id)
+
+    @classmethod
+    def remove_event(cls, connection, event_id: str):
+        key = str(connection.id)
+        cls.events.setdefault(key, {}).pop(event_id, None)
+        cls.change_log.setdefault(key, []).append(event_id)
+
+    @classmethod
+    def expire_tokens(cls, connection):
+        """Make the current sync token invalid, as providers do after a while."""
+        cls.change_log[str(connection.id)] = []
+
+    def sync(self, connection, window_start, window_end, sync_token='') -> SyncResult:
+        key = str(connection.id)
+        if key in self.failing:
+            raise self.failing[key]
+        events = self.events.get(key, {})
+        log = self.change_log.get(key, [])
+
+        if sync_token:
+            position = int(sync_token)
+            if position > len(log):
+                raise SyncTokenExpired(sync_token)
+            self.calls.append((key, 'incremental'))
+            changes = {event_id: events.get(event_id) for event_id in log[position:]}
+        else:
+            self.calls.append((key, 'full'))
+            start_ts, end_ts = _to_interval(window_start, window_end)
+            changes = {
+                event_id: interval
+                for event_id, interval in events.items()
+                if interval[0] < end_ts and interval[1] > start_ts
+            }
+
+        return SyncResult(changes=changes, sync_token=str(len(log)), full=not sync_token)
+
+
+def get_provider(connection: UserCalendarConnection):
+    """Return the free/busy backend for a connection."""
+    backend_path = getattr(settings, 'CALENDAR_FREE_BUSY_BACKEND', '')
+    if backend_path:
+        return import_string(backend_path)()
+    if connection.provider == CalendarProvider.GOOGLE:
+        return GoogleFreeBusyProvider()
+    return MicrosoftFreeBusyProvider()
+
+
+def _cache_ttl() -> timedelta:
+    return timedelta(seconds=getattr(settings, 'CALENDAR_FREE_BUSY_CACHE_TTL', DEFAULT_CACHE_TTL_SECONDS))
+
+
+def _covers_range(entry: CalendarBusyCache, calendar_id: str, start_date: datetime, end_date: datetime) -> bool:
+    return (
+        entry.synced_at is not None
+        and entry.calendar_id == calendar_id
+        and entry.window_start <= start_date
+        and entry.window_end >= end_date
+    )
+
+
+def _fetch_changes(
+    connection: UserCalendarConnection,
+    entry: CalendarBusyCache,
+    start_date: datetime,
+    end_date: datetime,
+    now: datetime,
+    incremental: bool,
+) -> Tuple[SyncResult, Optional[Tuple[datetime, datetime]]]:
+    """
+    Call the provider for a connection. Returns the sync result and, for a
+    full sync, the new window. Does not write the cache, so it can run in a
+    worker thread.
+    """
+    provider = get_provider(connection)
+
+    if incremental:
+        try:
+            return provider.sync(connection, entry.window_start, entry.window_end, entry.sync_token), None
+        except SyncTokenExpired:
+            logger.info(f"Sync token expired for calendar connection {connection.id}, running full sync")
+
+    window = (min(start_date, now), end_date + WINDOW_PADDING)
+    return provider.sync(connection, window[0], window[1], ''), window
+
+
+def _fetch_changes_in_thread(*args):
+    try:
+        return _fetch_changes(*args)
+    finally:
+        # Token refreshes write the connection from this thread
+        db.connection.close()
+
+
+def _apply_changes(
+    entry: CalendarBusyCache,
+    calendar_id: str,
+    generation: int,
+    result: SyncResult,
+    window: Optional[Tuple[datetime, datetime]],
+    now: datetime,
+) -> None:
+    if window is not None:
+        entry.events = {}
+        entry.calendar_id = calendar_id
+        entry.window_start, entry.window_end = window
+
+    events = entry.events
+    for event_id, interval in result.changes.items():
+        if interval is None:
+            events.pop(event_id, None)
+        else:
+            events[event_id] = list(interval)
+
+    prune_before = (now - PRUNE_AFTER).timestamp()
+    entry.events = {event_id: interval for event_id, interval in events.items() if interval[1] > prune_before}
+    entry.sync_token = result.sync_token
+    entry.synced_at = now
+    entry.synced_generation = generation
+
+    CalendarBusyCache.objects.filter(pk=entry.pk).update(
+        calendar_id=entry.calendar_id,
+        window_start=entry.window_start,
+        window_end=entry.window_end,
+        events=entry.events,
+        sync_token=entry.sync_token,
+        synced_at=entry.synced_at,
+        synced_generation=generation,
+        updated_at=now,
+    )
+
+
+def refresh_busy_caches(
+    connections: Iterable[UserCalendarConnection],
+    start_date: datetime,
+    end_date: datetime,
+    force: bool = False,
+    raise_errors: bool = True,
+) -> Dict[object, CalendarBusyCache]:
+    """
+    Return busy caches covering [start_date, end_date] keyed by connection ID,
+    syncing any that are missing, stale or expired.
+
+    Provider calls for several connections run concurrently in a thread pool
+    of up to CALENDAR_FREE_BUSY_MAX_WORKERS; cache reads and writes stay on
+    the calling thread.
+
+    With raise_errors=False a provider error (e.g. a revoked token) is logged
+    and that connection is left out of the result, so one member can't fail
+    the whole pool.
+    """
+    connections = list(connections)
+    now = timezone.now()
+    ttl = _cache_ttl()
+
+    entries = {
+        entry.connection_id: entry
+        for entry in CalendarBusyCache.objects.filter(connection__in=connections)
+    }
+
+    pending = []
+    for connection in connections:
+        entry = entries.get(connection.id)
+        if entry is None:
+            entry, _ = CalendarBusyCache.objects.get_or_create(connection=connection)
+            entries[connection.id] = entry
+
+        calendar_id = connection.calendar_id or 'primary'
+        covers_range = _covers_range(entry, calendar_id, start_date, end_date)
+        if covers_range and not force and not entry.is_stale and entry.synced_at > now - ttl:
+            continue
+
+        # Changes made after this point leave the cache stale for the next read
+        incremental = covers_range and bool(entry.sync_token)
+        pending.append((connection, entry, calendar_id, entry.generation, incremental))
+
+    def apply(connection, entry, calendar_id, generation, fetch):
+        try:
+            result, window = fetch()
+        except Exception:
+            if raise_errors:
+                raise
+            logger.warning(f"Free/busy sync failed for calendar connection {connection.id}", exc_info=True)
+            del entries[connection.id]
+            return
+        _apply_changes(entry, calendar_id, generation, result, window, now)
+
+    if len(pending) == 1:
+        connection, entry, calendar_id, generation, incremental = pending[0]
+        apply(connection, entry, calendar_id, generation, lambda: _fetch_changes(
+            connection, entry, start_date, end_date, now, incremental,
+        ))
+    elif pending:
+        max_workers = min(len(pending), getattr(settings, 'CALENDAR_FREE_BUSY_MAX_WORKERS', DEFAULT_MAX_WORKERS))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _fetch_changes_in_thread, connection, entry, start_date, end_date, now, incremental
+                )
+                for connection, entry, _, _, incremental in pending
+            ]
+            for (connection, entry, calendar_id, generation, _), future in zip(pending, futures):
+                apply(connection, entry, calendar_id, generation, future.result)
+
+    return entries
+
+
+def refresh_busy_cache(
+    connection: UserCalendarConnection,
+    start_date: datetime,
+    end_date: datetime,
+    force: bool = False,
+) -> CalendarBusyCache:
+    """
+    Return the busy cache for a connection covering [start_date, end_date],
+    syncing it from the provider if it is missing, stale or expired.
+    """
+    return refresh_busy_caches([connection], start_date, end_date, force=force)[connection.id]
+
+
+def _intervals_in_range(entry: CalendarBusyCache, start_date: datetime, end_date: datetime) -> List[Interval]:
+    start_ts, end_ts = start_date.timestamp(), end_date.timestamp()
+    return [
+        (start, end)
+        for start, end in entry.events.values()
+        if start < end_ts and end > start_ts
+    ]
+
+
+def get_busy_intervals(
+    connection: UserCalendarConnection,
+    start_date: datetime,
+    end_date: datetime,
+) -> List[Interval]:
+    """Busy (start_ts, end_ts) intervals overlapping the range, unsorted."""
+    return _intervals_in_range(refresh_busy_cache(connection, start_date, end_date), start_date, end_date)
+
+
+def get_busy_intervals_for_connections(
+    connections: Iterable[UserCalendarConnection],
+    start_date: datetime,
+    end_date: datetime,
+) -> Dict[object, List[Interval]]:
+    """
+    Busy intervals per connection ID, syncing stale caches concurrently.
+
+    Connections whose provider sync failed are left out.
+    """
+    entries = refresh_busy_caches(connections, start_date, end_date, raise_errors=False)
+    return {
+        connection_id: _intervals_in_range(entry, start_date, end_date)
+        for connection_id, entry in entries.items()
+    }
+
+
+def get_busy_periods(
+    connection: UserCalendarConnection,
+    start_date: datetime,
+    end_date: datetime,
+) -> List[Tuple[datetime, datetime]]:
+    """Busy (start, end) periods overlapping the range, sorted by start."""
+    return [
+        (
+            datetime.fromtimestamp(start, tz=dt_timezone.utc),
+            datetime.fromtimestamp(end, tz=dt_timezone.utc),
+        )
+        for start, end in sorted(get_busy_intervals(connection, start_date, end_date))
+    ]
+
+
+def invalidate_free_busy(connection: Optional[UserCalendarConnection]) -> None:
+    """Mark a connection's busy cache stale after an event change."""
+    if connection is None:
+        return
+    CalendarBusyCache.objects.filter(connection=connection).update(generation=F('generation') + 1)
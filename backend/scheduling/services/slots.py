@@ -0,0 +1,169 @@
+"""
+Slot engine for booking availability.
+
+Busy intervals are sorted and coalesced once (with buffers applied) and then
+swept against the per-day business windows in a single pass, so the cost is
+O(events log events + days + slots) rather than rescanning every busy period
+for each day. All arithmetic is done on UNIX timestamps; slots are returned as
+compact (start, end) pairs and formatted for the API in one pass at the end.
+
+Pooled meeting types combine per-member slot lists: intersect_slots() for
+collective meetings (every member free) and union_slots() for round robin
+(any member free).
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone, tzinfo
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+Interval = Tuple[int, int]
+
+DEFAULT_SLOT_INTERVAL_MINUTES = 30
+
+# Monday-Friday
+DEFAULT_AVAILABLE_DAYS = (0, 1, 2, 3, 4)
+
+
+def to_timestamp(value: Union[datetime, int, float]) -> int:
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+
+def merge_intervals(
+    intervals: Iterable[Tuple[Union[datetime, int], Union[datetime, int]]],
+    buffer_seconds: int = 0,
+) -> List[Interval]:
+    """Sort intervals, widen each by the buffer, and coalesce overlaps."""
+    expanded = sorted(
+        (to_timestamp(start) - buffer_seconds, to_timestamp(end) + buffer_seconds)
+        for start, end in intervals
+    )
+    merged: List[Interval] = []
+    for start, end in expanded:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        elif end > start:
+            merged.append((start, end))
+    return merged
+
+
+def business_windows(
+    start_date: datetime,
+    end_date: datetime,
+    business_hours_start: int,
+    business_hours_end: int,
+    available_days: Iterable[int],
+    tz: tzinfo,
+) -> Iterator[Interval]:
+    """Yield (start, end) business hours for each available day in the range."""
+    available_days = set(available_days)
+    day = start_date.astimezone(tz).date()
+    last_day = end_date.astimezone(tz).date()
+    while day <= last_day:
+        if day.weekday() in available_days:
+            midnight = datetime.combine(day, time(0), tzinfo=tz)
+            window_start = to_timestamp(midnight + timedelta(hours=business_hours_start))
+            window_end = to_timestamp(midnight + timedelta(hours=business_hours_end))
+            if window_end > window_start:
+                yield window_start, window_end
+        day += timedelta(days=1)
+
+
+def compute_slots(
+    busy_periods: Iterable[Tuple[Union[datetime, int], Union[datetime, int]]],
+    start_date: datetime,
+    end_date: datetime,
+    duration_minutes: int,
+    business_hours_start: int,
+    business_hours_end: int,
+    buffer_minutes: int = 0,
+    earliest_start: Optional[datetime] = None,
+    available_days: Optional[Iterable[int]] = None,
+    slot_interval_minutes: int = DEFAULT_SLOT_INTERVAL_MINUTES,
+    tz: Optional[tzinfo] = None,
+) -> List[Interval]:
+    """
+    Free slots of duration_minutes within business hours, as (start, end)
+    timestamps.
+
+    Slot starts fall on a grid of slot_interval_minutes anchored at the start
+    of each day's business hours; a slot is free if it does not overlap any
+    busy period widened by buffer_minutes on both sides and does not start
+    before earliest_start.
+    """
+    tz = tz or start_date.tzinfo or dt_timezone.utc
+    duration = duration_minutes * 60
+    step = max(slot_interval_minutes, 1) * 60
+    earliest = to_timestamp(earliest_start) if earliest_start is not None else None
+    busy = merge_intervals(busy_periods, buffer_minutes * 60)
+
+    slots: List[Interval] = []
+    first_busy = 0
+    for grid_origin, window_end in business_windows(
+        start_date,
+        end_date,
+        business_hours_start,
+        business_hours_end,
+        DEFAULT_AVAILABLE_DAYS if available_days is None else available_days,
+        tz,
+    ):
+        window_start = grid_origin if earliest is None else max(grid_origin, earliest)
+        if window_end - window_start < duration:
+            continue
+
+        # Busy periods are sorted, so those ending before this window never matter again
+        while first_busy < len(busy) and busy[first_busy][1] <= window_start:
+            first_busy += 1
+
+        cursor = window_start
+        index = first_busy
+        while cursor < window_end:
+            if index < len(busy) and busy[index][0] < window_end:
+                gap_end, next_cursor = busy[index]
+                index += 1
+            else:
+                gap_end = next_cursor = window_end
+
+            # Round up onto the slot grid
+            slot_start = grid_origin + -(-(cursor - grid_origin) // step) * step
+            while slot_start + duration <= gap_end:
+                slots.append((slot_start, slot_start + duration))
+                slot_start += step
+            cursor = max(cursor, next_cursor)
+
+    return slots
+
+
+def intersect_slots(slot_lists: Sequence[List[Interval]]) -> List[Interval]:
+    """Slots present in every list, in order. Used for collective availability."""
+    if not slot_lists:
+        return []
+    shortest = min(slot_lists, key=len)
+    others = [set(slots) for slots in slot_lists if slots is not shortest]
+    return [slot for slot in shortest if all(slot in other for other in others)]
+
+
+def union_slots(slots_by_member: Dict[Hashable, List[Interval]]) -> List[Tuple[Interval, List[Hashable]]]:
+    """
+    Every slot offered by at least one member, in order, paired with the
+    members free for it (in the dict's iteration order, so callers can pass
+    members least-loaded first). Used for round-robin availability.
+    """
+    free: Dict[Interval, List[Hashable]] = defaultdict(list)
+    for member, slots in slots_by_member.items():
+        for slot in slots:
+            free[slot].append(member)
+    return sorted(free.items())
+
+
+def format_slots(slots: Iterable[Interval], tz: tzinfo) -> List[Dict[str, str]]:
+    """Format (start, end) timestamps as the API's [{"start": ISO, "end": ISO}] list."""
+    return [
+        {
+            "start": datetime.fromtimestamp(start, tz=tz).isoformat(),
+            "end": datetime.fromtimestamp(end, tz=tz).isoformat(),
+        }
+        for start, end in slots
+    ]
@@ -0,0 +1,690 @@
+import random
+import time as time_module
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from candidates.models import CandidateProfile
+from companies.models import Company
+from jobs.models import Application, ApplicationStageInstance, InterviewStageTemplate, Job
+from users.models import RecruiterProfile, User, UserRole
+from .models import (
+    Booking,
+    BookingHold,
+    BookingStatus,
+    CalendarBusyCache,
+    CalendarProvider,
+    MeetingType,
+    SchedulingMode,
+    UserCalendarConnection,
+)
+from .services import CalendarService
+from .services.availability import SlotUnavailable, get_internal_busy_intervals, reserve_slot
+from .services.free_busy import FakeFreeBusyProvider, get_busy_periods, invalidate_free_busy
+from .services.slots import compute_slots, format_slots, intersect_slots, merge_intervals, union_slots
+
+FAKE_BACKEND = 'scheduling.services.free_busy.FakeFreeBusyProvider'
+
+
+def next_weekday(days_ahead=7, hour=10):
+    """A timezone-aware datetime on a weekday at least days_ahead from now."""
+    day = timezone.now().date() + timedelta(days=days_ahead)
+    while day.weekday() > 4:
+        day += timedelta(days=1)
+    return datetime.combine(day, time(hour=hour), tzinfo=timezone.get_current_timezone())
+
+
+def create_connection(user, **kwargs):
+    return UserCalendarConnection.objects.create(
+        user=user,
+        provider=CalendarProvider.GOOGLE,
+        access_token='token',
+        **kwargs,
+    )
+
+
+@override_settings(CALENDAR_FREE_BUSY_BACKEND=FAKE_BACKEND, CALENDAR_FREE_BUSY_CACHE_TTL=60)
+class FreeBusyCacheTests(TestCase):
+    """Tests for the cached free/busy intervals."""
+
+    def setUp(self):
+        FakeFreeBusyProvider.reset()
+        self.user = User.objects.create_user(
+            username='recruiter',
+            email='recruiter@example.com',
+            password='password123',
+            role=UserRole.RECRUITER,
+        )
+        self.connection = create_connection(self.user)
+        self.start = timezone.now()
+        self.end = self.start + timedelta(days=14)
+        self.meeting = next_weekday()
+        FakeFreeBusyProvider.add_event(self.connection, 'evt-1', self.meeting, self.meeting + timedelta(hours=1))
+
+    def _sync_kinds(self):
+        return [kind for _, kind in FakeFreeBusyProvider.calls]
+
+    def test_busy_periods_served_from_cache_within_ttl(self):
+        """Test repeated reads within the TTL do not call the provider again."""
+        first = get_busy_periods(self.connection, self.start, self.end)
+        second = get_busy_periods(self.connection, self.start, self.end)
+
+        self.assertEqual(first, [(self.meeting, self.meeting + timedelta(hours=1))])
+        self.assertEqual(second, first)
+        self.assertEqual(self._sync_kinds(), ['full'])
+
+    @override_settings(CALENDAR_FREE_BUSY_CACHE_TTL=0)
+    def test_expired_cache_is_refreshed_incrementally(self):
+        """Test an expired cache is refreshed with the sync token."""
+        get_busy_periods(self.connection, self.start, self.end)
+        later = self.meeting + timedelta(hours=3)
+        FakeFreeBusyProvider.add_event(self.connection, 'evt-2', later, later + timedelta(minutes=30))
+
+        periods = get_busy_periods(self.connection, self.start, self.end)
+
+        self.assertEqual(len(periods), 2)
+        self.assertEqual(self._sync_kinds(), ['full', 'incremental'])
+
+    def test_invalidation_forces_refresh(self):
+        """Test an event change through CalendarService makes the next read refresh."""
+        get_busy_periods(self.connection, self.start, self.end)
+        FakeFreeBusyProvider.remove_event(self.connection, 'evt-1')
+
+        invalidate_free_busy(self.connection)
+        periods = get_busy_periods(self.connection, self.start, self.end)
+
+        self.assertEqual(periods, [])
+        self.assertEqual(self._sync_kinds(), ['full', 'incremental'])
+        self.assertFalse(CalendarBusyCache.objects.get(connection=self.connection).is_stale)
+
+    def test_expired_sync_token_falls_back_to_full_sync(self):
+        """Test a rejected sync token triggers a full resync."""
+        get_busy_periods(self.connection, self.start, self.end)
+        FakeFreeBusyProvider.add_event(self.connection, 'evt-2', self.meeting, self.meeting + timedelta(hours=2))
+        FakeFreeBusyProvider.expire_tokens(self.connection)
+
+        invalidate_free_busy(self.connection)
+        periods = get_busy_periods(self.connection, self.start, self.end)
+
+        self.assertEqual(len(periods), 2)
+        self.assertEqual(self._sync_kinds(), ['full', 'full'])
+
+    def test_range_outside_synced_window_resyncs(self):
+        """Test requesting beyond the synced window runs a full sync."""
+        get_busy_periods(self.connection, self.start, self.end)
+        get_busy_periods(self.connection, self.start, self.end + timedelta(days=60))
+
+        self.assertEqual(self._sync_kinds(), ['full', 'full'])
+
+    def test_changing_calendar_resyncs(self):
+        """Test selecting a different calendar discards the cached events."""
+        get_busy_periods(self.connection, self.start, self.end)
+        self.connection.calendar_id = 'team@example.com'
+        self.connection.save()
+
+        get_busy_periods(self.connection, self.start, self.end)
+
+        self.assertEqual(self._sync_kinds(), ['full', 'full'])
+
+    def test_free_busy_excludes_busy_event(self):
+        """Test computed slots do not overlap a cached busy event."""
+        slots = CalendarService.get_free_busy(self.user, self.start, self.end, duration_minutes=30)
+
+        busy_start, busy_end = self.meeting, self.meeting + timedelta(hours=1)
+        self.assertTrue(slots)
+        for slot in slots:
+            slot_start = datetime.fromisoformat(slot['start'])
+            slot_end = datetime.fromisoformat(slot['end'])
+            self.assertFalse(slot_start < busy_end and slot_end > busy_start)
+
+
+@override_settings(CALENDAR_FREE_BUSY_BACKEND=FAKE_BACKEND, CALENDAR_FREE_BUSY_CACHE_TTL=60)
+class PublicAvailabilityTests(APITestCase):
+    """Tests for the public booking availability endpoint."""
+
+    def setUp(self):
+        FakeFreeBusyProvider.reset()
+        self.user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='password123',
+            role=UserRole.ADMIN,
+            first_name='Ada',
+            last_name='Admin',
+        )
+        self.profile = RecruiterProfile.objects.create(user=self.user)
+        self.connection = create_connection(self.user)
+        MeetingType.objects.create(name='Intro', slug='intro', category='recruitment', owner=self.user)
+        self.url = reverse('public_meeting_type_availability', args=[self.profile.booking_slug, 'intro'])
+
+    def test_availability_uses_cached_busy_intervals(self):
+        """Test repeated page loads reuse the cached busy intervals."""
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data['available_slots'], first.data['available_slots'])
+        self.assertEqual(len(FakeFreeBusyProvider.calls), 1)
+
+
+@override_settings(CALENDAR_FREE_BUSY_BACKEND=FAKE_BACKEND)
+class InternalAvailabilityTests(APITestCase):
+    """Tests for internal busy intervals and booking holds."""
+
+    def setUp(self):
+        FakeFreeBusyProvider.reset()
+        self.user = User.objects.create_user(
+            username='recruiter',
+            email='recruiter@example.com',
+            password='password123',
+            role=UserRole.RECRUITER,
+            first_name='Rita',
+            last_name='Recruiter',
+        )
+        self.profile = RecruiterProfile.objects.create(user=self.user)
+        self.meeting_type = MeetingType.objects.create(
+            name='Intro', slug='intro', category='leads', owner=self.user, duration_minutes=30,
+        )
+        self.meeting_type.allowed_users.add(self.user)
+        self.slot = next_weekday()
+
+    def _create_booking(self, scheduled_at, booking_status=BookingStatus.CONFIRMED):
+        return Booking.objects.create(
+            meeting_type=self.meeting_type,
+            organizer=self.user,
+            attendee_name='Guest',
+            attendee_email='guest@example.com',
+            title='Intro with Guest',
+            scheduled_at=scheduled_at,
+            duration_minutes=30,
+            status=booking_status,
+        )
+
+    def test_unsynced_booking_blocks_slot(self):
+        """Test a confirmed booking without a calendar event is treated as busy."""
+        create_connection(self.user)
+        self._create_booking(self.slot)
+
+        slots = CalendarService.get_free_busy(
+            self.user, timezone.now(), timezone.now() + timedelta(days=14), duration_minutes=30,
+        )
+
+        starts = {datetime.fromisoformat(slot['start']) for slot in slots}
+        self.assertNotIn(self.slot, starts)
+        self.assertIn(self.slot + timedelta(minutes=30), starts)
+
+    def test_cancelled_booking_is_not_busy(self):
+        self._create_booking(self.slot, BookingStatus.CANCELLED)
+
+        busy = get_internal_busy_intervals(self.user, self.slot - timedelta(hours=1), self.slot + timedelta(hours=1))
+
+        self.assertEqual(busy, [])
+
+    def test_reserve_slot_conflicts_with_active_hold(self):
+        """Test a second reservation for an overlapping slot is refused until the hold expires."""
+        hold = reserve_slot(self.user, self.slot, 30)
+
+        with self.assertRaises(SlotUnavailable):
+            reserve_slot(self.user, self.slot + timedelta(minutes=15), 30)
+
+        BookingHold.objects.filter(pk=hold.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        reserve_slot(self.user, self.slot + timedelta(minutes=15), 30)
+        self.assertEqual(BookingHold.objects.count(), 1)
+
+    def test_public_booking_rejects_taken_slot(self):
+        """Test booking an already booked slot returns 409 and releases the hold."""
+        url = reverse('public_create_booking', args=[self.profile.booking_slug, 'intro'])
+        data = {
+            'attendee_name': 'Guest One',
+            'attendee_email': 'one@example.com',
+            'scheduled_at': self.slot.isoformat(),
+        }
+
+        first = self.client.post(url, data, format='json')
+        second = self.client.post(url, {**data, 'attendee_email': 'two@example.com'}, format='json')
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Booking.objects.get().organizer, self.user)
+        self.assertFalse(BookingHold.objects.exists())
+
+    def test_public_booking_is_organized_by_booking_page_owner(self):
+        """Test the page owner, whose calendar offered the slot, organizes it rather than the meeting type owner."""
+        owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='password123', role=UserRole.ADMIN,
+        )
+        MeetingType.objects.filter(pk=self.meeting_type.pk).update(owner=owner)
+        url = reverse('public_create_booking', args=[self.profile.booking_slug, 'intro'])
+        data = {'attendee_name': 'Guest', 'attendee_email': 'guest@example.com'}
+
+        response = self.client.post(url, {**data, 'scheduled_at': self.slot.isoformat()}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Booking.objects.get().organizer, self.user)
+
+        # The meeting type owner's bookings don't block the page owner's calendar
+        Booking.objects.update(organizer=owner)
+        response = self.client.post(url, {**data, 'scheduled_at': self.slot.isoformat()}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+@override_settings(CALENDAR_FREE_BUSY_BACKEND=FAKE_BACKEND, CALENDAR_FREE_BUSY_CACHE_TTL=60)
+class PooledAvailabilityTests(APITestCase):
+    """Tests for collective and round-robin meeting types."""
+
+    def setUp(self):
+        FakeFreeBusyProvider.reset()
+        self.owner = self._create_recruiter('owner')
+        self.member = self._create_recruiter('member')
+        self.profile = RecruiterProfile.objects.create(user=self.owner)
+        self.owner_connection = create_connection(self.owner)
+        self.member_connection = create_connection(self.member)
+        self.meeting_type = MeetingType.objects.create(
+            name='Panel', slug='panel', category='leads', owner=self.owner, duration_minutes=30,
+        )
+        self.meeting_type.allowed_users.add(self.owner, self.member)
+        self.slot = next_weekday()
+        self.availability_url = reverse('public_meeting_type_availability', args=[self.profile.booking_slug, 'panel'])
+        self.booking_url = reverse('public_create_booking', args=[self.profile.booking_slug, 'panel'])
+
+    def _create_recruiter(self, name):
+        return User.objects.create_user(
+            username=name,
+            email=f'{name}@example.com',
+            password='password123',
+            role=UserRole.RECRUITER,
+            first_name=name.title(),
+        )
+
+    def _set_mode(self, mode):
+        self.meeting_type.scheduling_mode = mode
+        self.meeting_type.save(update_fields=['scheduling_mode'])
+
+    def _slot_starts(self):
+        response = self.client.get(self.availability_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {datetime.fromisoformat(slot['start']) for slot in response.data['available_slots']}
+
+    def _book(self, email='guest@example.com'):
+        return self.client.post(self.booking_url, {
+            'attendee_name': 'Guest',
+            'attendee_email': email,
+            'scheduled_at': self.slot.isoformat(),
+        }, format='json')
+
+    def test_collective_requires_every_member_free(self):
+        """Test a slot where one panel member is busy is not offered."""
+        self._set_mode(SchedulingMode.COLLECTIVE)
+        FakeFreeBusyProvider.add_event(self.member_connection, 'evt-1', self.slot, self.slot + timedelta(minutes=30))
+
+        starts = self._slot_starts()
+
+        self.assertNotIn(self.slot, starts)
+        self.assertIn(self.slot + timedelta(minutes=30), starts)
+        self.assertEqual(sorted(kind for _, kind in FakeFreeBusyProvider.calls), ['full', 'full'])
+
+    def test_round_robin_offers_slot_if_any_member_free(self):
+        self._set_mode(SchedulingMode.ROUND_ROBIN)
+        FakeFreeBusyProvider.add_event(self.member_connection, 'evt-1', self.slot, self.slot + timedelta(minutes=30))
+
+        self.assertIn(self.slot, self._slot_starts())
+
+    def test_collective_without_member_calendar_offers_nothing(self):
+        self._set_mode(SchedulingMode.COLLECTIVE)
+        self.member_connection.delete()
+
+        self.assertEqual(self._slot_starts(), set())
+
+    def test_round_robin_assigns_least_loaded_free_member(self):
+        """Test bookings go to the free member with the fewest upcoming bookings."""
+        self._set_mode(SchedulingMode.ROUND_ROBIN)
+        Booking.objects.create(
+            meeting_type=self.meeting_type,
+            organizer=self.owner,
+            attendee_name='Earlier',
+            attendee_email='earlier@example.com',
+            title='Earlier',
+            scheduled_at=self.slot + timedelta(days=1),
+            duration_minutes=30,
+        )
+
+        first = self._book('one@example.com')
+        second = self._book('two@example.com')
+        third = self._book('three@example.com')
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(first.data['organizer'], self.member.pk)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data['organizer'], self.owner.pk)
+        self.assertEqual(third.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(BookingHold.objects.exists())
+
+    def test_round_robin_skips_member_busy_on_calendar(self):
+        self._set_mode(SchedulingMode.ROUND_ROBIN)
+        Booking.objects.create(
+            meeting_type=self.meeting_type,
+            organizer=self.owner,
+            attendee_name='Earlier',
+            attendee_email='earlier@example.com',
+            title='Earlier',
+            scheduled_at=self.slot + timedelta(days=1),
+            duration_minutes=30,
+        )
+        FakeFreeBusyProvider.add_event(self.member_connection, 'evt-1', self.slot, self.slot + timedelta(minutes=30))
+
+        response = self._book()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['organizer'], self.owner.pk)
+
+    def test_round_robin_leaves_out_member_whose_calendar_fails(self):
+        """Test a revoked calendar token only removes that member from the pool."""
+        self._set_mode(SchedulingMode.ROUND_ROBIN)
+        FakeFreeBusyProvider.fail(self.member_connection, RuntimeError('Token has been revoked'))
+
+        self.assertIn(self.slot, self._slot_starts())
+        response = self._book()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['organizer'], self.owner.pk)
+
+    def test_collective_unavailable_when_member_calendar_fails(self):
+        self._set_mode(SchedulingMode.COLLECTIVE)
+        FakeFreeBusyProvider.fail(self.member_connection, RuntimeError('Token has been revoked'))
+
+        self.assertEqual(self._slot_starts(), set())
+        self.assertEqual(self._book().status_code, status.HTTP_409_CONFLICT)
+
+    def test_collective_booking_blocks_every_member(self):
+        """Test a collective booking adds co-hosts whose time is then busy."""
+        self._set_mode(SchedulingMode.COLLECTIVE)
+
+        first = self._book('one@example.com')
+        second = self._book('two@example.com')
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_409_CONFLICT)
+        booking = Booking.objects.get()
+        self.assertEqual(booking.organizer, self.owner)
+        self.assertEqual(list(booking.co_hosts.all()), [self.member])
+        self.assertEqual(
+            get_internal_busy_intervals(self.member, self.slot, self.slot + timedelta(minutes=30)),
+            [(int(self.slot.timestamp()), int(self.slot.timestamp()) + 1800)],
+        )
+        self.assertFalse(BookingHold.objects.exists())
+
+
+class CalendarTokenRefreshTests(TestCase):
+    """Tests for refreshing calendar access tokens once across workers."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='recruiter',
+            email='recruiter@example.com',
+            password='password123',
+            role=UserRole.RECRUITER,
+        )
+        self.connection = create_connection(
+            self.user, refresh_token='refresh', token_expires_at=timezone.now() - timedelta(minutes=1),
+        )
+
+    @staticmethod
+    def _refresh(connection):
+        connection.access_token = 'new-token'
+        connection.token_expires_at = timezone.now() + timedelta(hours=1)
+        connection.save(update_fields=['access_token', 'token_expires_at'])
+        return True
+
+    def test_expired_token_is_refreshed(self):
+        with mock.patch.object(CalendarService, 'refresh_token', side_effect=self._refresh) as refresh:
+            token = CalendarService._get_valid_token(self.connection)
+
+        refresh.assert_called_once()
+        self.assertEqual(token, 'new-token')
+
+    def test_token_refreshed_by_another_worker_is_reused(self):
+        """Test a stale connection picks up the token saved by the worker that refreshed first."""
+        UserCalendarConnection.objects.filter(pk=self.connection.pk).update(
+            access_token='new-token', token_expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+        with mock.patch.object(CalendarService, 'refresh_token', side_effect=self._refresh) as refresh:
+            token = CalendarService._get_valid_token(self.connection)
+
+        refresh.assert_not_called()
+        self.assertEqual(token, 'new-token')
+
+
+class CalendarFeedTests(APITestCase):
+    """Tests for the unified bookings/interviews calendar feed."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='recruiter',
+            email='recruiter@example.com',
+            password='password123',
+            role=UserRole.RECRUITER,
+        )
+        self.client.force_authenticate(self.user)
+        self.meeting_type = MeetingType.objects.create(name='Intro', slug='intro', category='leads', owner=self.user)
+
+        candidate_user = User.objects.create_user(
+            username='candidate', email='candidate@example.com', password='password123', role=UserRole.CANDIDATE,
+        )
+        self.job = Job.objects.create(company=Company.objects.create(name='Acme'), title='Engineer')
+        self.application = Application.objects.create(
+            job=self.job, candidate=CandidateProfile.objects.create(user=candidate_user),
+        )
+        self.start = next_weekday()
+        self.url = reverse('bookings_list')
+
+    def _booking(self, scheduled_at, organizer=None):
+        return Booking.objects.create(
+            meeting_type=self.meeting_type,
+            organizer=organizer or self.user,
+            attendee_name='Guest',
+            attendee_email='guest@example.com',
+            title='Intro with Guest',
+            scheduled_at=scheduled_at,
+            duration_minutes=30,
+        )
+
+    def _interview(self, scheduled_at, order):
+        template = InterviewStageTemplate.objects.create(job=self.job, name=f'Round {order}', order=order)
+        return ApplicationStageInstance.objects.create(
+            application=self.application,
+            stage_template=template,
+            scheduled_at=scheduled_at,
+            duration_minutes=45,
+            interviewer=self.user,
+            status='scheduled',
+        )
+
+    def test_pages_merge_bookings_and_interviews_in_order(self):
+        """Test keyset pages interleave both sources by scheduled_at without gaps or repeats."""
+        expected = []
+        for index in range(5):
+            expected.append(str(self._booking(self.start + timedelta(hours=index * 2)).id))
+            expected.append(str(self._interview(self.start + timedelta(hours=index * 2 + 1), index).id))
+        self._booking(self.start, organizer=User.objects.create_user(username='other', email='other@example.com'))
+
+        seen, kinds, cursor = [], [], None
+        while True:
+            params = {'limit': 3, **({'cursor': cursor} if cursor else {})}
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen += [item['id'] for item in response.data['results']]
+            kinds += [item['booking_type'] for item in response.data['results']]
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(kinds, ['booking', 'interview'] * 5)
+
+    def test_default_window_excludes_distant_meetings(self):
+        self._booking(timezone.now() + timedelta(days=200))
+        nearby = self._booking(self.start)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual([item['id'] for item in response.data['results']], [str(nearby.id)])
+
+    def test_rejects_oversized_window_and_bad_cursor(self):
+        too_wide = self.client.get(self.url, {'start_date': '2025-01-01', 'end_date': '2026-06-01'})
+        bad_cursor = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(too_wide.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(bad_cursor.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ics_export_streams_window(self):
+        booking = self._booking(self.start)
+        interview = self._interview(self.start + timedelta(hours=1), 1)
+
+        response = self.client.get(reverse('bookings_ics'))
+        body = b''.join(response.streaming_content).decode()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(body.endswith('END:VCALENDAR\r\n'))
+        self.assertIn(f'UID:booking-{booking.id}@oneo', body)
+        self.assertIn(f'UID:interview-{interview.id}@oneo', body)
+        self.assertIn(f"DTSTART:{self.start.astimezone(dt_timezone.utc):%Y%m%dT%H%M%SZ}", body)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.split('\r\n')))
+
+
+def reference_slots(busy, start_date, end_date, duration, hours_start, hours_end, buffer, earliest, days, step, tz):
+    """Brute-force slot calculation used to check the slot engine."""
+    buffered = [(int(s.timestamp()) - buffer * 60, int(e.timestamp()) + buffer * 60) for s, e in busy]
+    earliest_ts = int(earliest.timestamp())
+    slots = []
+    day = start_date.astimezone(tz).date()
+    while day <= end_date.astimezone(tz).date():
+        if day.weekday() in days:
+            midnight = datetime.combine(day, time(0), tzinfo=tz)
+            origin = int((midnight + timedelta(hours=hours_start)).timestamp())
+            window_end = int((midnight + timedelta(hours=hours_end)).timestamp())
+            slot_start = origin
+            while slot_start + duration * 60 <= window_end:
+                slot_end = slot_start + duration * 60
+                if slot_start >= earliest_ts and not any(s < slot_end and e > slot_start for s, e in buffered):
+                    slots.append((slot_start, slot_end))
+                slot_start += step * 60
+        day += timedelta(days=1)
+    return slots
+
+
+def random_busy_periods(rng, start, days, count):
+    periods = []
+    for _ in range(count):
+        busy_start = start + timedelta(minutes=rng.randrange(0, days * 24 * 60, 5))
+        periods.append((busy_start, busy_start + timedelta(minutes=rng.choice([15, 30, 45, 60, 90, 240]))))
+    return periods
+
+
+class SlotEngineTests(SimpleTestCase):
+    """Property tests for the availability slot engine."""
+
+    def test_merge_intervals_coalesces_overlaps(self):
+        merged = merge_intervals([(50, 60), (0, 10), (5, 20), (20, 30), (70, 70)], buffer_seconds=0)
+        self.assertEqual(merged, [(0, 30), (50, 60)])
+
+    def test_merge_intervals_applies_buffer(self):
+        self.assertEqual(merge_intervals([(100, 200), (260, 300)], buffer_seconds=30), [(70, 330)])
+
+    def test_intersect_and_union_slots(self):
+        a = [(0, 30), (30, 60), (60, 90)]
+        b = [(30, 60), (60, 90), (90, 120)]
+
+        self.assertEqual(intersect_slots([a, b]), [(30, 60), (60, 90)])
+        self.assertEqual(intersect_slots([]), [])
+        self.assertEqual(
+            union_slots({'b': b, 'a': a}),
+            [((0, 30), ['a']), ((30, 60), ['b', 'a']), ((60, 90), ['b', 'a']), ((90, 120), ['b'])],
+        )
+
+    def test_matches_reference_on_random_calendars(self):
+        """Test the sweep agrees with a brute-force scan for random inputs."""
+        rng = random.Random(2024)
+        timezones = [dt_timezone.utc, ZoneInfo('Africa/Johannesburg'), ZoneInfo('America/New_York')]
+        for _ in range(200):
+            tz = rng.choice(timezones)
+            start = datetime(2025, rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23), tzinfo=tz)
+            days = rng.randint(1, 10)
+            end = start + timedelta(days=days)
+            busy = random_busy_periods(rng, start - timedelta(days=1), days + 2, rng.randint(0, 40))
+            hours_start = rng.randint(0, 12)
+            hours_end = rng.randint(hours_start, 24)
+            params = dict(
+                duration=rng.choice([15, 30, 45, 60, 90]),
+                hours_start=hours_start,
+                hours_end=hours_end,
+                buffer=rng.choice([0, 0, 5, 15]),
+                earliest=start + timedelta(hours=rng.randint(0, 48)),
+                days=set(rng.sample(range(7), rng.randint(1, 7))),
+                step=rng.choice([15, 30, 45, 60]),
+            )
+
+            slots = compute_slots(
+                busy,
+                start_date=start,
+                end_date=end,
+                duration_minutes=params['duration'],
+                business_hours_start=params['hours_start'],
+                business_hours_end=params['hours_end'],
+                buffer_minutes=params['buffer'],
+                earliest_start=params['earliest'],
+                available_days=params['days'],
+                slot_interval_minutes=params['step'],
+                tz=tz,
+            )
+
+            expected = reference_slots(busy, start, end, tz=tz, **params)
+            self.assertEqual(slots, expected, params)
+
+    def test_slots_never_overlap_buffered_busy_periods(self):
+        rng = random.Random(7)
+        start = datetime(2025, 3, 3, tzinfo=dt_timezone.utc)
+        busy = random_busy_periods(rng, start, 14, 60)
+        slots = compute_slots(
+            busy, start, start + timedelta(days=14), 30, 8, 18,
+            buffer_minutes=10, earliest_start=start, available_days=range(7),
+        )
+        buffered = merge_intervals(busy, buffer_seconds=600)
+        self.assertTrue(slots)
+        for slot_start, slot_end in slots:
+            self.assertFalse(any(s < slot_end and e > slot_start for s, e in buffered))
+        self.assertEqual(slots, sorted(set(slots)))
+
+    def test_slots_resume_on_grid_after_busy_period(self):
+        """Test a busy period ending off-grid resumes on the next grid point."""
+        tz = dt_timezone.utc
+        start = datetime(2025, 3, 3, tzinfo=tz)  # Monday
+        busy = [(start.replace(hour=9), start.replace(hour=9, minute=40))]
+        slots = format_slots(compute_slots(busy, start, start, 30, 9, 11, earliest_start=start), tz)
+        self.assertEqual([slot['start'][11:16] for slot in slots], ['10:00', '10:30'])
+
+    @pytest.mark.slow
+    def test_benchmark_sixty_days_thousand_events(self):
+        """Benchmark: 60-day window with 1,000 busy events."""
+        rng = random.Random(60)
+        start = datetime(2025, 1, 6, tzinfo=dt_timezone.utc)
+        busy = random_busy_periods(rng, start, 60, 1000)
+
+        started = time_module.perf_counter()
+        for _ in range(10):
+            slots = compute_slots(
+                busy, start, start + timedelta(days=60), 30, 9, 18,
+                buffer_minutes=15, earliest_start=start,
+            )
+            format_slots(slots, dt_timezone.utc)
+        elapsed = (time_module.perf_counter() - started) / 10
+
+        self.assertTrue(slots)
+        self.assertLess(elapsed, 0.5)
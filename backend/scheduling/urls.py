@@ -27,6 +27,7 @@ urlpatterns = [
 
     # Booking Management (for recruiters/admins)
     path('bookings/', views.bookings_list, name='bookings_list'),
+    path('bookings/calendar.ics', views.bookings_ics, name='bookings_ics'),
     path('bookings/<uuid:booking_id>/', views.booking_detail, name='booking_detail'),
     path('bookings/<uuid:booking_id>/cancel/', views.booking_cancel, name='booking_cancel'),
     path('bookings/<uuid:booking_id>/complete/', views.booking_complete, name='booking_complete'),
@@ -6,7 +6,7 @@ from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 
-from .models import UserCalendarConnection, MeetingType, Booking, BookingStatus, MeetingCategory, StageChangeBehavior
+from .models import UserCalendarConnection, MeetingType, Booking, BookingStatus, MeetingCategory, SchedulingMode, StageChangeBehavior
 from .serializers import (
     UserCalendarConnectionSerializer,
     CalendarConnectionUpdateSerializer,
@@ -451,8 +451,9 @@ def public_meeting_type_availability(request, booking_slug, meeting_type_slug):
             user=user,
             is_active=True
         ).first()
+        pooled = meeting_type.scheduling_mode != SchedulingMode.SINGLE
 
-        if not connection:
+        if not connection and not pooled:
             return Response({
                 'error': 'Organizer has no calendar connected'
             }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -460,15 +461,25 @@ def public_meeting_type_availability(request, booking_slug, meeting_type_slug):
         # Calculate date range based on booking_days_ahead setting
         now = dj_timezone.now()
         start_date = now
-        end_date = now + timedelta(days=connection.booking_days_ahead or 14)
+        booking_days_ahead = connection.booking_days_ahead if connection else None
+        end_date = now + timedelta(days=booking_days_ahead or 14)
 
         # Calculate availability
-        slots = CalendarService.get_free_busy(
-            user=user,
-            start_date=start_date,
-            end_date=end_date,
-            duration_minutes=meeting_type.duration_minutes,
-        )
+        if pooled:
+            slots = CalendarService.get_pooled_free_busy(
+                users=_pool_members(meeting_type, user),
+                scheduling_mode=meeting_type.scheduling_mode,
+                start_date=start_date,
+                end_date=end_date,
+                duration_minutes=meeting_type.duration_minutes,
+            )
+        else:
+            slots = CalendarService.get_free_busy(
+                user=user,
+                start_date=start_date,
+                end_date=end_date,
+                duration_minutes=meeting_type.duration_minutes,
+            )
 
         # Build the response with booking page owner info
         meeting_type_data = MeetingTypePublicSerializer(meeting_type).data
@@ -480,7 +491,7 @@ def public_meeting_type_availability(request, booking_slug, meeting_type_slug):
         return Response({
             'meeting_type': meeting_type_data,
             'available_slots': slots,
-            'timezone': connection.timezone,
+            'timezone': connection.timezone if connection else 'Africa/Johannesburg',
         })
 
     except Exception as e:
@@ -489,6 +500,16 @@ def public_meeting_type_availability(request, booking_slug, meeting_type_slug):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _pool_members(meeting_type, page_owner):
+    """
+    Users whose calendars a pooled meeting type books against: the booking
+    page owner plus the meeting type's active allowed users.
+    """
+    members = [page_owner]
+    members += meeting_type.allowed_users.filter(is_active=True).exclude(pk=page_owner.pk)
+    return members
+
+
 def _handle_booking_assignment_and_stage(booking, meeting_type, organizer, candidate_profile=None, company=None, lead=None, is_authenticated=False):
     """
     Handle auto-assignment of organizer and onboarding stage changes.
@@ -584,10 +605,14 @@ def public_create_booking(request, booking_slug, meeting_type_slug):
     - Updates lead's onboarding stage if configured
 
     All types:
+    - Organized by the booking page owner, whose calendar the availability
+      endpoint offered the slot from, rather than meeting_type.owner; pooled
+      meeting types are organized by the host(s) the pool assigns
     - Auto-assigns the organizer to the entity (candidate/company/lead)
     - Changes onboarding stage based on meeting type configuration
     """
     from .services.calendar_service import CalendarService
+    from .services.availability import SlotUnavailable, release_all, reserve_slot
     from authentication.models import CandidateInvitation
     from candidates.models import CandidateProfile
     from companies.models import Company
@@ -621,7 +646,39 @@ def public_create_booking(request, booking_slug, meeting_type_slug):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    booking = serializer.save()
+    # Hold the slot so concurrent bookers can't take it while the booking is created
+    co_hosts = []
+    try:
+        if meeting_type.scheduling_mode == SchedulingMode.SINGLE:
+            connection = UserCalendarConnection.objects.filter(user=organizer, is_active=True).first()
+            holds = [reserve_slot(
+                organizer,
+                serializer.validated_data['scheduled_at'],
+                meeting_type.duration_minutes,
+                meeting_type=meeting_type,
+                buffer_minutes=connection.buffer_minutes if connection else 0,
+            )]
+        else:
+            # Collective meetings are hosted by the whole pool; round robin
+            # assigns the least-loaded member who is free
+            hosts, holds = CalendarService.reserve_pooled_slot(
+                _pool_members(meeting_type, organizer),
+                meeting_type.scheduling_mode,
+                serializer.validated_data['scheduled_at'],
+                meeting_type.duration_minutes,
+                meeting_type=meeting_type,
+            )
+            organizer, co_hosts = hosts[0], hosts[1:]
+    except SlotUnavailable as e:
+        return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+    try:
+        # The user whose calendar was used for availability organizes it
+        booking = serializer.save(organizer=organizer)
+        if co_hosts:
+            booking.co_hosts.set(co_hosts)
+    finally:
+        release_all(holds)
 
     # Track state for response
     attendee_email = booking.attendee_email.lower()
@@ -812,255 +869,182 @@ def public_create_booking(request, booking_slug, meeting_type_slug):
 # Booking Management Views (for recruiters/admins)
 # ============================================================================
 
+def _map_stage_status(stage_status):
+    """Map an interview stage status to the closest booking status."""
+    status_map = {
+        'not_started': 'pending',
+        'pending_booking': 'pending',
+        'scheduled': 'confirmed',
+        'in_progress': 'confirmed',
+        'completed': 'completed',
+        'cancelled': 'cancelled',
+        'skipped': 'cancelled',
+        'passed': 'completed',
+        'failed': 'completed',
+    }
+    return status_map.get(stage_status, 'pending')
+
+
+def _stage_calendar_item(stage, now):
+    """Booking-like representation of an interview stage for the calendar feed."""
+    from datetime import timedelta
+
+    app = stage.application
+    candidate = app.candidate
+    job = app.job
+    company = job.company if job else None
+    template = stage.stage_template
+    end_time = None
+    if stage.scheduled_at and stage.duration_minutes:
+        end_time = stage.scheduled_at + timedelta(minutes=stage.duration_minutes)
+
+    # Build participants list (interviewer + additional participants)
+    participants_list = []
+    if stage.interviewer:
+        participants_list.append({
+            'id': str(stage.interviewer.id),
+            'name': stage.interviewer.full_name,
+            'email': stage.interviewer.email,
+            'role': 'interviewer',
+        })
+    for participant in stage.participants.all():
+        participants_list.append({
+            'id': str(participant.id),
+            'name': participant.full_name,
+            'email': participant.email,
+            'role': 'participant',
+        })
+
+    return {
+        'id': str(stage.id),
+        'booking_type': 'interview',
+        'meeting_type': str(template.id) if template else None,
+        'meeting_type_name': template.name if template else 'Interview',
+        'meeting_type_category': 'recruitment',
+        'organizer': str(stage.interviewer.id) if stage.interviewer else None,
+        'organizer_name': stage.interviewer.full_name if stage.interviewer else 'TBD',
+        'organizer_email': stage.interviewer.email if stage.interviewer else '',
+        'attendee_user': str(candidate.user.id) if candidate and candidate.user else None,
+        'attendee_name': candidate.user.full_name if candidate and candidate.user else candidate.full_name if candidate else '',
+        'attendee_email': candidate.user.email if candidate and candidate.user else candidate.email if candidate else '',
+        'attendee_phone': candidate.user.phone if candidate and candidate.user else '',
+        'attendee_company': '',
+        'candidate_profile': str(candidate.id) if candidate else None,
+        'candidate_info': {
+            'name': candidate.full_name if candidate else '',
+            'slug': candidate.slug if candidate else '',
+            'professional_title': candidate.professional_title if candidate else '',
+        } if candidate else None,
+        'title': f"{template.name if template else 'Interview'} - {job.title if job else 'Application'}",
+        'description': f"Interview for {job.title}" if job else 'Application Interview',
+        'scheduled_at': stage.scheduled_at.isoformat() if stage.scheduled_at else None,
+        'end_time': end_time.isoformat() if end_time else None,
+        'duration_minutes': stage.duration_minutes or (template.default_duration_minutes if template else 30),
+        'timezone': 'Africa/Johannesburg',
+        'location_type': 'video' if stage.meeting_link else 'in_person',
+        'location_type_display': 'Video Call' if stage.meeting_link else 'In Person',
+        'meeting_url': stage.meeting_link or '',
+        'location': stage.location or '',
+        'status': _map_stage_status(stage.status),
+        'status_display': stage.get_status_display(),
+        'is_upcoming': stage.scheduled_at > now if stage.scheduled_at else False,
+        'is_past': stage.scheduled_at < now if stage.scheduled_at else False,
+        'notes': stage.meeting_notes or '',
+        'source': 'application',
+        'created_at': stage.created_at.isoformat() if hasattr(stage, 'created_at') and stage.created_at else None,
+        'updated_at': stage.updated_at.isoformat() if hasattr(stage, 'updated_at') and stage.updated_at else None,
+        # Extra fields for application context
+        'job_title': job.title if job else '',
+        'job_id': str(job.id) if job else None,
+        'application_id': str(app.id) if app else None,
+        'stage_id': str(stage.id),
+        # Company info
+        'company_name': company.name if company else '',
+        'company_id': str(company.id) if company else None,
+        # Participants info
+        'participants': participants_list,
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def bookings_list(request):
     """
-    List all meetings for the current user including:
+    List meetings for the current user including:
     - Booking objects (recruiter booking system)
     - ApplicationStageInstance objects (application interviews/meetings)
 
-    Returns a unified format for both types.
+    Both are merged in one SQL UNION ordered by (scheduled_at, id) and returned
+    in a unified format, one page at a time:
+
+        {"results": [...], "next_cursor": "..." | null, "next": URL | null}
+
+    Query params: start_date/end_date (defaults to a 90-day window starting 30
+    days ago, at most 366 days; not defaulted when filtering by attendee_email
+    or lead_id), status, category, upcoming, attendee_email, lead_id,
+    limit (default 100, max 500) and cursor.
     """
-    from django.db.models import Q
     from django.utils import timezone
-    from jobs.models import ApplicationStageInstance
+    from .services import calendar_feed
 
-    user = request.user
-    results = []
+    try:
+        bookings, stages = calendar_feed.filtered_sources(request.user, request.query_params)
+        limit = calendar_feed.parse_page_size(request.query_params.get('limit'))
+        cursor = request.query_params.get('cursor')
+        after = calendar_feed.decode_cursor(cursor) if cursor else None
+    except calendar_feed.CalendarFeedError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Get filter params
-    status_filter = request.query_params.get('status')
-    category = request.query_params.get('category')
-    start_date = request.query_params.get('start_date')
-    end_date = request.query_params.get('end_date')
-    upcoming = request.query_params.get('upcoming')
-    attendee_email = request.query_params.get('attendee_email')
-    lead_id = request.query_params.get('lead_id')
-
-    # =========================================================================
-    # 1. Get Booking objects
-    # =========================================================================
-    if user.role == 'admin':
-        # Admins see ALL bookings
-        bookings = Booking.objects.all()
-    elif user.role == 'recruiter':
-        # Recruiters see only their own bookings
-        bookings = Booking.objects.filter(organizer=user)
-    else:
-        q_filter = Q(attendee_user=user)
-        if hasattr(user, 'candidate_profile') and user.candidate_profile:
-            q_filter |= Q(candidate_profile=user.candidate_profile)
-        bookings = Booking.objects.filter(q_filter)
-
-    # Filter out bookings without scheduled_at
-    bookings = bookings.filter(scheduled_at__isnull=False)
-
-    # Apply filters to bookings
-    if status_filter:
-        bookings = bookings.filter(status=status_filter)
-    if category:
-        bookings = bookings.filter(meeting_type__category=category)
-    if start_date:
-        bookings = bookings.filter(scheduled_at__gte=start_date)
-    if end_date:
-        bookings = bookings.filter(scheduled_at__lte=end_date)
-    if upcoming == 'true':
-        bookings = bookings.filter(
-            scheduled_at__gte=timezone.now(),
-            status=BookingStatus.CONFIRMED
-        )
-    if attendee_email:
-        bookings = bookings.filter(attendee_email__iexact=attendee_email)
-    if lead_id:
-        bookings = bookings.filter(lead_id=lead_id)
-
-    # Add bookings to results
-    booking_data = BookingSerializer(bookings, many=True).data
-    for item in booking_data:
-        item['booking_type'] = 'booking'
-    results.extend(booking_data)
-
-    # =========================================================================
-    # 2. Get ApplicationStageInstance objects (interviews/meetings)
-    # =========================================================================
-    # Skip interviews when filtering by category, attendee_email, or lead_id,
-    # since those filters are specific to Booking objects (leads, onboarding, etc.)
-    # and don't apply to application interviews.
-    if category or attendee_email or lead_id:
-        # Only return booking objects when these filters are applied
-        results.sort(key=lambda x: x.get('scheduled_at') or '', reverse=False)
-        return Response(results)
-
-    # Only include scheduled stages (those with scheduled_at set)
-    if user.role == 'admin':
-        # Admins see ALL scheduled stages
-        stages = ApplicationStageInstance.objects.filter(
-            scheduled_at__isnull=False
-        ).select_related(
-            'application__candidate__user',
-            'application__job',
-            'application__job__company',
-            'stage_template',
-            'interviewer'
-        ).prefetch_related('participants').distinct()
-    elif user.role == 'recruiter':
-        # Recruiters see stages where they are directly involved:
-        # - The interviewer, OR
-        # - A participant in the interview
-        stage_q = (
-            Q(interviewer=user) |
-            Q(participants=user)
-        )
-        stages = ApplicationStageInstance.objects.filter(stage_q).filter(
-            scheduled_at__isnull=False
-        ).select_related(
-            'application__candidate__user',
-            'application__job',
-            'application__job__company',
-            'stage_template',
-            'interviewer'
-        ).prefetch_related('participants').distinct()
-    elif user.role == 'client':
-        # Clients see stages for applications to their company's jobs
-        if hasattr(user, 'company_memberships'):
-            company_ids = user.company_memberships.values_list('company_id', flat=True)
-            stages = ApplicationStageInstance.objects.filter(
-                application__job__company_id__in=company_ids,
-                scheduled_at__isnull=False
-            ).select_related(
-                'application__candidate__user',
-                'application__job',
-                'application__job__company',
-                'stage_template',
-                'interviewer'
-            ).prefetch_related('participants')
-        else:
-            stages = ApplicationStageInstance.objects.none()
-    else:
-        # Candidates see stages from their own applications
-        if hasattr(user, 'candidate_profile') and user.candidate_profile:
-            stages = ApplicationStageInstance.objects.filter(
-                application__candidate=user.candidate_profile,
-                scheduled_at__isnull=False
-            ).select_related(
-                'application__job',
-                'application__job__company',
-                'stage_template',
-                'interviewer'
-            ).prefetch_related('participants')
+    # One extra key tells us whether there is another page
+    keys = calendar_feed.page_keys(bookings, stages, after=after, limit=limit + 1)
+    has_more = len(keys) > limit
+    keys = keys[:limit]
+
+    now = timezone.now()
+    results = []
+    for kind, item in calendar_feed.load_items(keys):
+        if kind == calendar_feed.BOOKING:
+            data = BookingSerializer(item).data
+            data['booking_type'] = 'booking'
         else:
-            stages = ApplicationStageInstance.objects.none()
-
-    # Apply date filters to stages
-    if start_date:
-        stages = stages.filter(scheduled_at__gte=start_date)
-    if end_date:
-        stages = stages.filter(scheduled_at__lte=end_date)
-    if upcoming == 'true':
-        stages = stages.filter(
-            scheduled_at__gte=timezone.now(),
-            status__in=['scheduled', 'pending_booking', 'not_started']
-        )
+            data = _stage_calendar_item(item, now)
+        results.append(data)
+
+    next_cursor = calendar_feed.encode_cursor(*keys[-1][:2]) if has_more else None
+    next_url = None
+    if next_cursor:
+        params = request.query_params.copy()
+        params['cursor'] = next_cursor
+        next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
 
-    # Map stage status to booking status
-    def map_stage_status(stage_status):
-        status_map = {
-            'not_started': 'pending',
-            'pending_booking': 'pending',
-            'scheduled': 'confirmed',
-            'in_progress': 'confirmed',
-            'completed': 'completed',
-            'cancelled': 'cancelled',
-            'skipped': 'cancelled',
-            'passed': 'completed',
-            'failed': 'completed',
-        }
-        return status_map.get(stage_status, 'pending')
-
-    # Convert stages to booking-like format
-    for stage in stages:
-        app = stage.application
-        candidate = app.candidate
-        job = app.job
-        company = job.company if job else None
-        template = stage.stage_template
-        end_time = None
-        if stage.scheduled_at and stage.duration_minutes:
-            end_time = stage.scheduled_at + timezone.timedelta(minutes=stage.duration_minutes)
-
-        # Build participants list (interviewer + additional participants)
-        participants_list = []
-        if stage.interviewer:
-            participants_list.append({
-                'id': str(stage.interviewer.id),
-                'name': stage.interviewer.full_name,
-                'email': stage.interviewer.email,
-                'role': 'interviewer',
-            })
-        for participant in stage.participants.all():
-            participants_list.append({
-                'id': str(participant.id),
-                'name': participant.full_name,
-                'email': participant.email,
-                'role': 'participant',
-            })
-
-        stage_data = {
-            'id': str(stage.id),
-            'booking_type': 'interview',
-            'meeting_type': str(template.id) if template else None,
-            'meeting_type_name': template.name if template else 'Interview',
-            'meeting_type_category': 'recruitment',
-            'organizer': str(stage.interviewer.id) if stage.interviewer else None,
-            'organizer_name': stage.interviewer.full_name if stage.interviewer else 'TBD',
-            'organizer_email': stage.interviewer.email if stage.interviewer else '',
-            'attendee_user': str(candidate.user.id) if candidate and candidate.user else None,
-            'attendee_name': candidate.user.full_name if candidate and candidate.user else candidate.full_name if candidate else '',
-            'attendee_email': candidate.user.email if candidate and candidate.user else candidate.email if candidate else '',
-            'attendee_phone': candidate.user.phone if candidate and candidate.user else '',
-            'attendee_company': '',
-            'candidate_profile': str(candidate.id) if candidate else None,
-            'candidate_info': {
-                'name': candidate.full_name if candidate else '',
-                'slug': candidate.slug if candidate else '',
-                'professional_title': candidate.professional_title if candidate else '',
-            } if candidate else None,
-            'title': f"{template.name if template else 'Interview'} - {job.title if job else 'Application'}",
-            'description': f"Interview for {job.title}" if job else 'Application Interview',
-            'scheduled_at': stage.scheduled_at.isoformat() if stage.scheduled_at else None,
-            'end_time': end_time.isoformat() if end_time else None,
-            'duration_minutes': stage.duration_minutes or (template.default_duration_minutes if template else 30),
-            'timezone': 'Africa/Johannesburg',
-            'location_type': 'video' if stage.meeting_link else 'in_person',
-            'location_type_display': 'Video Call' if stage.meeting_link else 'In Person',
-            'meeting_url': stage.meeting_link or '',
-            'location': stage.location or '',
-            'status': map_stage_status(stage.status),
-            'status_display': stage.get_status_display(),
-            'is_upcoming': stage.scheduled_at > timezone.now() if stage.scheduled_at else False,
-            'is_past': stage.scheduled_at < timezone.now() if stage.scheduled_at else False,
-            'notes': stage.meeting_notes or '',
-            'source': 'application',
-            'created_at': stage.created_at.isoformat() if hasattr(stage, 'created_at') and stage.created_at else None,
-            'updated_at': stage.updated_at.isoformat() if hasattr(stage, 'updated_at') and stage.updated_at else None,
-            # Extra fields for application context
-            'job_title': job.title if job else '',
-            'job_id': str(job.id) if job else None,
-            'application_id': str(app.id) if app else None,
-            'stage_id': str(stage.id),
-            # Company info
-            'company_name': company.name if company else '',
-            'company_id': str(company.id) if company else None,
-            # Participants info
-            'participants': participants_list,
-        }
-        results.append(stage_data)
-
-    # Sort all results by scheduled_at
-    results.sort(key=lambda x: x.get('scheduled_at') or '', reverse=False)
-
-    return Response(results)
+    return Response({
+        'results': results,
+        'next_cursor': next_cursor,
+        'next': next_url,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bookings_ics(request):
+    """
+    Export the same meetings as bookings_list as an iCalendar (.ics) file.
+    Accepts the same filters and window; streamed in keyset-paginated chunks.
+    """
+    from django.http import StreamingHttpResponse
+    from .services import calendar_feed
+
+    try:
+        bookings, stages = calendar_feed.filtered_sources(request.user, request.query_params)
+    except calendar_feed.CalendarFeedError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = StreamingHttpResponse(
+        calendar_feed.iter_ics(calendar_feed.iter_items(bookings, stages)),
+        content_type='text/calendar; charset=utf-8',
+    )
+    response['Content-Disposition'] = 'attachment; filename="meetings.ics"'
+    return response
 
 
 @api_view(['GET', 'PATCH'])
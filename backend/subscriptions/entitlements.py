@@ -0,0 +1,161 @@
+"""
+Cached feature entitlements for companies.
+
+A company's enabled features are resolved in one query: every active
+PricingFeature, left-joined to the company's CompanyFeatureOverride rows.
+An override wins, otherwise the company's service type default applies.
+The result is cached per company and service type. Cache keys include two
+versions:
+- a global one, bumped when PricingFeature rows change
+- one per company, bumped when its overrides change
+(see subscriptions.signals). A service type change gives a new key by itself.
+
+Version bumps only reach other processes through a shared cache. With the
+default per-process cache, entries expire after LOCAL_ENTITLEMENTS_TIMEOUT,
+which bounds how long another worker keeps a revoked feature.
+
+Within a request (subscriptions.middleware), resolved feature sets and user
+memberships are memoized, so repeated checks are free.
+"""
+
+import contextvars
+import time
+from typing import FrozenSet, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import FilteredRelation, Q
+
+FEATURES_VERSION_KEY = 'entitlements_features_version'
+COMPANY_VERSION_KEY = 'entitlements_company_version:{company_id}'
+ENTITLEMENTS_KEY = 'entitlements:{company_id}:{service_type}:{versions}'
+ENTITLEMENTS_TIMEOUT = 60 * 60  # 1 hour; with a shared cache, versions make stale entries unreachable sooner
+LOCAL_ENTITLEMENTS_TIMEOUT = 60  # 1 minute; other processes' bumps can't be seen
+
+_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Per-request memo: {'features': {(company_id, service_type): [...]}, 'companies': {user_id: company}}
+_memo: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar('entitlements_memo', default=None)
+
+
+def _bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Start from a timestamp, so an evicted version can't repeat an old one
+        cache.set(key, time.time_ns(), None)
+
+
+def bump_features_version() -> None:
+    """Invalidate every company's entitlements after PricingFeature rows change."""
+    _bump(FEATURES_VERSION_KEY)
+    memo = _memo.get()
+    if memo is not None:
+        memo['features'].clear()
+
+
+def bump_company_version(company_id) -> None:
+    """Invalidate a company's entitlements after its overrides change."""
+    _bump(COMPANY_VERSION_KEY.format(company_id=company_id))
+    memo = _memo.get()
+    if memo is not None:
+        for key in [key for key in memo['features'] if key[0] == company_id]:
+            del memo['features'][key]
+
+
+def _timeout() -> int:
+    if settings.CACHES['default']['BACKEND'] in _LOCAL_CACHE_BACKENDS:
+        return LOCAL_ENTITLEMENTS_TIMEOUT
+    return ENTITLEMENTS_TIMEOUT
+
+
+def _versions(company_id) -> str:
+    keys = [FEATURES_VERSION_KEY, COMPANY_VERSION_KEY.format(company_id=company_id)]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return '.'.join(str(versions[key]) for key in keys)
+
+
+def _load_features(company) -> List[dict]:
+    """The company's enabled features, in display order, in one query."""
+    from cms.models.pricing import PricingFeature
+
+    default_field = {
+        'headhunting': 'included_in_headhunting',
+        'retained': 'included_in_retained',
+    }.get(company.service_type)
+    if default_field is None:
+        return []
+
+    rows = (
+        PricingFeature.objects.filter(is_active=True)
+        .annotate(override=FilteredRelation(
+            'company_overrides', condition=Q(company_overrides__company=company),
+        ))
+        .order_by('order', 'name')
+        .values('id', 'slug', 'name', 'category', default_field, 'override__is_enabled')
+    )
+    return [
+        {'id': str(row['id']), 'slug': row['slug'], 'name': row['name'], 'category': row['category']}
+        for row in rows
+        # An override wins over the service type default
+        if (row['override__is_enabled'] if row['override__is_enabled'] is not None else row[default_field])
+    ]
+
+
+def enabled_features(company) -> List[dict]:
+    """The company's enabled features (id, slug, name, category), in display order."""
+    if not company or not company.service_type:
+        return []
+
+    memo = _memo.get()
+    memo_key = (company.pk, company.service_type)
+    if memo is not None and memo_key in memo['features']:
+        return memo['features'][memo_key]
+
+    key = ENTITLEMENTS_KEY.format(
+        company_id=company.pk, service_type=company.service_type, versions=_versions(company.pk),
+    )
+    features = cache.get(key)
+    if features is None:
+        features = _load_features(company)
+        cache.set(key, features, _timeout())
+
+    if memo is not None:
+        memo['features'][memo_key] = features
+    return features
+
+
+def features_for(company) -> FrozenSet[str]:
+    """Slugs of every feature the company has, for bulk checks."""
+    return frozenset(feature['slug'] for feature in enabled_features(company))
+
+
+def company_for_user(user):
+    """The company of the user's active membership, memoized per request."""
+    from companies.models import CompanyUser
+
+    memo = _memo.get()
+    if memo is not None and user.pk in memo['companies']:
+        return memo['companies'][user.pk]
+
+    membership = CompanyUser.objects.filter(user=user, is_active=True).select_related('company').first()
+    company = membership.company if membership else None
+    if memo is not None:
+        memo['companies'][user.pk] = company
+    return company
+
+
+def start_request_memo():
+    """Begin memoizing entitlement checks; returns a token for end_request_memo()."""
+    return _memo.set({'features': {}, 'companies': {}})
+
+
+def end_request_memo(token) -> None:
+    _memo.reset(token)
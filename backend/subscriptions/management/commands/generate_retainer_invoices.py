@@ -6,30 +6,15 @@ Run daily via cron:
 
 This command:
 1. Finds all active retained subscriptions where today is their billing_day_of_month
-2. Checks if a retainer invoice already exists for the current billing period
-3. If not, generates the invoice with status SENT
+2. Skips those that already have a retainer invoice for the current billing period
+3. Generates the rest, with status SENT, in one batch
 """
 
-from datetime import date, timedelta
-from decimal import Decimal
+from datetime import date
 
 from django.core.management.base import BaseCommand
-from django.db.models import Q
-
-from companies.models import Company
-from subscriptions.models import (
-    Subscription,
-    SubscriptionStatus,
-    Invoice,
-    InvoiceType,
-    InvoiceStatus,
-    BillingMode,
-    InvoiceLineItem,
-    CompanyPricing,
-    SubscriptionActivityLog,
-    SubscriptionActivityType,
-    get_payment_terms_for_invoice,
-)
+
+from subscriptions.services.retainer_invoices import create_retainer_invoices, plan_retainer_invoices
 
 
 class Command(BaseCommand):
@@ -59,119 +44,37 @@ class Command(BaseCommand):
 
         today = date.today()
         billing_day = force_day or today.day
+        month = today.strftime('%B %Y')
 
-        self.stdout.write(f"Running retainer invoice generation for day {billing_day} of {today.strftime('%B %Y')}")
+        self.stdout.write(f"Running retainer invoice generation for day {billing_day} of {month}")
 
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN - No invoices will be created'))
 
-        # Find all active retained subscriptions due for billing today
-        subscriptions = Subscription.objects.filter(
-            status=SubscriptionStatus.ACTIVE,
-            company__service_type='retained',
-            billing_day_of_month=billing_day,
-        ).select_related('company')
-
-        if company_id:
-            subscriptions = subscriptions.filter(company_id=company_id)
+        # Active retained subscriptions due today that aren't invoiced for this month yet
+        charges, invoices_skipped = plan_retainer_invoices(today, billing_day, company_id)
 
-        if not subscriptions.exists():
+        if not charges and not invoices_skipped:
             self.stdout.write(self.style.SUCCESS(f'No subscriptions due for billing on day {billing_day}'))
             return
 
-        # Calculate billing period for current month
-        billing_period_start = today.replace(day=1)
-        if today.month == 12:
-            billing_period_end = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            billing_period_end = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
-
-        invoices_created = 0
-        invoices_skipped = 0
-
-        for subscription in subscriptions:
-            company = subscription.company
-
-            # Check if invoice already exists for this billing period
-            existing_invoice = Invoice.objects.filter(
-                company=company,
-                invoice_type=InvoiceType.RETAINER,
-                billing_period_start=billing_period_start,
-                billing_period_end=billing_period_end,
-            ).exclude(status=InvoiceStatus.CANCELLED).exists()
-
-            if existing_invoice:
+        if dry_run:
+            for charge in charges:
                 self.stdout.write(
-                    f"  SKIP: {company.name} - Invoice already exists for {billing_period_start.strftime('%B %Y')}"
+                    f"  WOULD CREATE: {charge.subscription.company.name} - R{charge.amount:,.2f} for {month} (due in {charge.payment_terms} days)"
                 )
-                invoices_skipped += 1
-                continue
-
-            # Get effective monthly retainer
-            try:
-                pricing = CompanyPricing.objects.get(company=company)
-                monthly_retainer = pricing.get_effective_retainer()
-            except CompanyPricing.DoesNotExist:
-                from cms.models.pricing import PricingConfig
-                config = PricingConfig.get_config()
-                monthly_retainer = Decimal(str(config.retained_monthly_retainer))
-
-            # Get payment terms from CMS or subscription override
-            payment_terms = get_payment_terms_for_invoice('retainer', subscription)
-
-            if dry_run:
+            invoices_created = len(charges)
+        else:
+            invoices = create_retainer_invoices(charges, today)
+            for invoice in invoices:
                 self.stdout.write(
-                    f"  WOULD CREATE: {company.name} - R{monthly_retainer:,.2f} for {billing_period_start.strftime('%B %Y')} (due in {payment_terms} days)"
-                )
-                invoices_created += 1
-                continue
-
-            # Create invoice
-            invoice = Invoice.objects.create(
-                company=company,
-                subscription=subscription,
-                invoice_number=Invoice.generate_invoice_number(),
-                invoice_type=InvoiceType.RETAINER,
-                billing_mode=BillingMode.IN_SYSTEM,
-                invoice_date=today,
-                due_date=today + timedelta(days=payment_terms),
-                billing_period_start=billing_period_start,
-                billing_period_end=billing_period_end,
-                subtotal=monthly_retainer,
-                vat_rate=Decimal('0.15'),
-                vat_amount=monthly_retainer * Decimal('0.15'),
-                total_amount=monthly_retainer * Decimal('1.15'),
-                status=InvoiceStatus.SENT,
-                description=f'Monthly retainer for {billing_period_start.strftime("%B %Y")}',
-            )
-
-            InvoiceLineItem.objects.create(
-                invoice=invoice,
-                description=f'Monthly Retainer Fee - {billing_period_start.strftime("%B %Y")}',
-                quantity=Decimal('1'),
-                unit_price=monthly_retainer,
-                amount=monthly_retainer,
-            )
-
-            # Log activity
-            SubscriptionActivityLog.objects.create(
-                company=company,
-                subscription=subscription,
-                invoice=invoice,
-                activity_type=SubscriptionActivityType.INVOICE_CREATED,
-                metadata={
-                    'invoice_type': InvoiceType.RETAINER,
-                    'billing_period': f'{billing_period_start} to {billing_period_end}',
-                    'auto_generated': True,
-                },
-            )
-
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"  CREATED: {company.name} - {invoice.invoice_number} - R{monthly_retainer:,.2f}"
+                    self.style.SUCCESS(
+                        f"  CREATED: {invoice.company.name} - {invoice.invoice_number} - R{invoice.subtotal:,.2f}"
+                    )
                 )
-            )
-            invoices_created += 1
+            invoices_created = len(invoices)
+            # Invoiced by a concurrent run
+            invoices_skipped += len(charges) - len(invoices)
 
         # Summary
         self.stdout.write('')
@@ -0,0 +1,21 @@
+"""Subscriptions Middleware - per-request entitlement memo."""
+from .entitlements import end_request_memo, start_request_memo
+
+
+class EntitlementMemoMiddleware:
+    """
+    Memoize feature entitlement checks for the duration of each request.
+
+    A view that checks several features, or the same one repeatedly, resolves
+    the company and its feature set once (see subscriptions/entitlements.py).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = start_request_memo()
+        try:
+            return self.get_response(request)
+        finally:
+            end_request_memo(token)
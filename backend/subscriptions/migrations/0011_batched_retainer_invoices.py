@@ -0,0 +1,71 @@
+# Generated by Django 5.2.9 on 2026-10-18 22:33
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+def cancel_duplicate_retainer_invoices(apps, schema_editor):
+    """
+    Leave one non-cancelled retainer invoice per company and billing period.
+
+    Earlier generators could bill a period twice; the constraint below can't
+    be added while such duplicates exist. The invoice with the most paid
+    (then the oldest) is kept and the others are cancelled with a note.
+    """
+    Invoice = apps.get_model('subscriptions', 'Invoice')
+    active = Invoice.objects.filter(invoice_type='retainer').exclude(status='cancelled')
+    duplicated = (
+        active.values('company_id', 'billing_period_start', 'billing_period_end')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+    )
+    now = timezone.now()
+    for period in duplicated:
+        kept, *extras = active.filter(
+            company_id=period['company_id'],
+            billing_period_start=period['billing_period_start'],
+            billing_period_end=period['billing_period_end'],
+        ).order_by('-amount_paid', 'created_at', 'id')
+        for invoice in extras:
+            note = f'Cancelled as a duplicate of {kept.invoice_number} for the same billing period.'
+            invoice.status = 'cancelled'
+            invoice.cancelled_at = now
+            invoice.internal_notes = f'{invoice.internal_notes}\n{note}'.strip()
+            invoice.save(update_fields=['status', 'cancelled_at', 'internal_notes'])
+
+
+def noop(apps, schema_editor):
+    """No-op reverse for the data migration."""
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0020_add_company_activity'),
+        ('jobs', '0025_stage_instance_feed_index'),
+        ('subscriptions', '0010_alter_subscription_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceNumberCounter',
+            fields=[
+                ('prefix', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('last_number', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Invoice Number Counter',
+                'verbose_name_plural': 'Invoice Number Counters',
+                'db_table': 'invoice_number_counters',
+            },
+        ),
+        migrations.RunPython(cancel_duplicate_retainer_invoices, noop),
+        migrations.AddConstraint(
+            model_name='invoice',
+            constraint=models.UniqueConstraint(condition=models.Q(('invoice_type', 'retainer'), models.Q(('status', 'cancelled'), _negated=True)), fields=('company', 'billing_period_start', 'billing_period_end'), name='unique_retainer_invoice_per_period'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django
+import re
+
+from django.db import migrations
+
+INVOICE_NUMBER = re.compile(r'^(INV-\d{6})-(\d+)$')
+
+
+def seed_counters(apps, schema_editor):
+    """Start each month's counter after the highest invoice number already issued."""
+    Invoice = apps.get_model('subscriptions', 'Invoice')
+    InvoiceNumberCounter = apps.get_model('subscriptions', 'InvoiceNumberCounter')
+
+    highest = {}
+    for invoice_number in Invoice.objects.values_list('invoice_number', flat=True).iterator():
+        match = INVOICE_NUMBER.match(invoice_number)
+        if match:
+            prefix, number = match.group(1), int(match.group(2))
+            highest[prefix] = max(highest.get(prefix, 0), number)
+
+    for prefix, number in highest.items():
+        counter, created = InvoiceNumberCounter.objects.get_or_create(
+            prefix=prefix, defaults={'last_number': number},
+        )
+        if not created and counter.last_number < number:
+            counter.last_number = number
+            counter.save(update_fields=['last_number'])
+
+
+def reverse_seed(apps, schema_editor):
+    """Reverse migration - no action needed."""
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0011_batched_retainer_invoices'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_counters, reverse_seed),
+    ]
@@ -5,7 +5,7 @@ from decimal import Decimal
 
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import connection, models
 
 from automations.registry import automatable
 
@@ -726,6 +726,15 @@ class Invoice(TimestampedModel):
             models.Index(fields=['status', 'due_date']),
             models.Index(fields=['invoice_number']),
         ]
+        constraints = [
+            # One live retainer invoice per company and billing period, so
+            # overlapping generation runs can't double-bill
+            models.UniqueConstraint(
+                fields=['company', 'billing_period_start', 'billing_period_end'],
+                condition=models.Q(invoice_type='retainer') & ~models.Q(status='cancelled'),
+                name='unique_retainer_invoice_per_period',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.invoice_number} - {self.company.name}"
@@ -756,25 +765,19 @@ class Invoice(TimestampedModel):
     @classmethod
     def generate_invoice_number(cls):
         """Generate a unique invoice number in format INV-YYYYMM-XXXX."""
-        from django.utils import timezone
-        now = timezone.now()
-        prefix = f"INV-{now.strftime('%Y%m')}"
-
-        # Find the highest number for this month
-        last_invoice = cls.objects.filter(
-            invoice_number__startswith=prefix
-        ).order_by('-invoice_number').first()
-
-        if last_invoice:
-            try:
-                last_num = int(last_invoice.invoice_number.split('-')[-1])
-                new_num = last_num + 1
-            except (ValueError, IndexError):
-                new_num = 1
-        else:
-            new_num = 1
+        return cls.reserve_invoice_numbers(1)[0]
 
-        return f"{prefix}-{new_num:04d}"
+    @classmethod
+    def reserve_invoice_numbers(cls, count, when=None):
+        """
+        Allocate count consecutive invoice numbers for when's month (default: now).
+
+        Returns the numbers in order. See InvoiceNumberCounter.
+        """
+        from django.utils import timezone
+        prefix = f"INV-{(when or timezone.now()).strftime('%Y%m')}"
+        last = InvoiceNumberCounter.reserve(prefix, count)
+        return [f"{prefix}-{number:04d}" for number in range(last - count + 1, last + 1)]
 
     def save(self, *args, **kwargs):
         """Set default due date if not provided."""
@@ -790,6 +793,44 @@ class Invoice(TimestampedModel):
         super().save(*args, **kwargs)
 
 
+class InvoiceNumberCounter(models.Model):
+    """
+    Last invoice number allocated for each INV-YYYYMM prefix.
+
+    Numbers are taken with a single upsert ... RETURNING on the prefix's row:
+    O(1) whatever the number of invoices, and concurrent allocators queue on
+    that one row instead of racing to the same number. The row stays locked
+    until the allocating transaction commits, and numbers taken by a
+    transaction that rolls back are handed out again. A block of numbers can
+    be reserved at once for bulk generation.
+    """
+    prefix = models.CharField(max_length=20, primary_key=True)
+    last_number = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'invoice_number_counters'
+        verbose_name = 'Invoice Number Counter'
+        verbose_name_plural = 'Invoice Number Counters'
+
+    def __str__(self):
+        return f"{self.prefix}: {self.last_number}"
+
+    @classmethod
+    def reserve(cls, prefix, count=1):
+        """Reserve count consecutive numbers under prefix; returns the last one reserved."""
+        if count < 1:
+            raise ValueError('count must be at least 1')
+        table = cls._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (prefix, last_number) VALUES (%s, %s) '
+                f'ON CONFLICT (prefix) DO UPDATE SET last_number = {table}.last_number + EXCLUDED.last_number '
+                f'RETURNING last_number',
+                [prefix, count],
+            )
+            return cursor.fetchone()[0]
+
+
 # =============================================================================
 # Invoice Line Item Model
 # =============================================================================
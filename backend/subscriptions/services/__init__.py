@@ -0,0 +1,3 @@
+from .retainer_invoices import generate_retainer_invoices, plan_retainer_invoices
+
+__all__ = ['generate_retainer_invoices', 'plan_retainer_invoices']
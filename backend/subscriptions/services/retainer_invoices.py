@@ -0,0 +1,221 @@
+"""
+Batched generation of monthly retainer invoices.
+
+Subscriptions due for billing are found with one anti-join against the
+period's existing retainer invoices, with each company's custom pricing
+joined in. Invoices, line items and activity logs for the whole batch are
+then inserted with bulk_create in one transaction. The
+unique_retainer_invoice_per_period constraint makes overlapping runs safe:
+an invoice another run already created is skipped rather than duplicated.
+Invoices are inserted under placeholder numbers and numbered afterwards from
+a block reserved for just the rows inserted, so skipped invoices leave no
+gaps in the sequence.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List, NamedTuple, Optional, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import post_save
+
+from subscriptions.models import (
+    BillingMode,
+    CompanyPricing,
+    Invoice,
+    InvoiceLineItem,
+    InvoiceStatus,
+    InvoiceType,
+    Subscription,
+    SubscriptionActivityLog,
+    SubscriptionActivityType,
+    SubscriptionStatus,
+    get_payment_terms_for_invoice,
+)
+
+VAT_RATE = Decimal('0.15')
+
+# Held by an invoice between its insert and numbering in the same transaction
+PENDING_NUMBER_PREFIX = 'PENDING-'
+
+
+class RetainerCharge(NamedTuple):
+    """A retainer invoice due for one subscription."""
+    subscription: Subscription
+    amount: Decimal
+    payment_terms: int
+
+
+def billing_period(today: date) -> Tuple[date, date]:
+    """First and last day of today's month."""
+    start = today.replace(day=1)
+    if today.month == 12:
+        end = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
+    else:
+        end = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
+    return start, end
+
+
+def plan_retainer_invoices(
+    today: date,
+    billing_day: Optional[int] = None,
+    company_id=None,
+) -> Tuple[List[RetainerCharge], int]:
+    """
+    Retainer charges due on billing_day (default: today's day) this month.
+
+    Returns the charges for subscriptions not yet invoiced for the period,
+    and how many due subscriptions already were.
+    """
+    period_start, period_end = billing_period(today)
+    invoiced = Invoice.objects.filter(
+        company=OuterRef('company'),
+        invoice_type=InvoiceType.RETAINER,
+        billing_period_start=period_start,
+        billing_period_end=period_end,
+    ).exclude(status=InvoiceStatus.CANCELLED)
+
+    due = Subscription.objects.filter(
+        status=SubscriptionStatus.ACTIVE,
+        company__service_type='retained',
+        billing_day_of_month=billing_day or today.day,
+    )
+    if company_id:
+        due = due.filter(company_id=company_id)
+
+    subscriptions = list(
+        due.filter(~Exists(invoiced))
+        .select_related('company', 'company__custom_pricing')
+        .order_by('company__name')
+    )
+    skipped = due.filter(Exists(invoiced)).count()
+    if not subscriptions:
+        return [], skipped
+
+    default_retainer = None
+    default_terms = None
+    charges = []
+    for subscription in subscriptions:
+        try:
+            pricing = subscription.company.custom_pricing
+        except CompanyPricing.DoesNotExist:
+            pricing = None
+
+        if pricing is not None and pricing.monthly_retainer is not None:
+            amount = pricing.monthly_retainer
+        else:
+            if default_retainer is None:
+                from cms.models.pricing import PricingConfig
+                default_retainer = Decimal(str(PricingConfig.get_config().retained_monthly_retainer))
+            amount = default_retainer
+
+        if subscription.custom_payment_terms or subscription.payment_terms_days is not None:
+            payment_terms = get_payment_terms_for_invoice('retainer', subscription)
+        else:
+            if default_terms is None:
+                default_terms = get_payment_terms_for_invoice('retainer')
+            payment_terms = default_terms
+
+        charges.append(RetainerCharge(subscription, amount, payment_terms))
+    return charges, skipped
+
+
+def create_retainer_invoices(charges: List[RetainerCharge], today: date) -> List[Invoice]:
+    """Create the invoices for charges in one transaction; returns those created."""
+    if not charges:
+        return []
+
+    period_start, period_end = billing_period(today)
+    month = period_start.strftime('%B %Y')
+
+    with transaction.atomic():
+        invoices = [
+            Invoice(
+                company=charge.subscription.company,
+                subscription=charge.subscription,
+                invoice_type=InvoiceType.RETAINER,
+                billing_mode=BillingMode.IN_SYSTEM,
+                invoice_date=today,
+                due_date=today + timedelta(days=charge.payment_terms),
+                billing_period_start=period_start,
+                billing_period_end=period_end,
+                subtotal=charge.amount,
+                vat_rate=VAT_RATE,
+                vat_amount=charge.amount * VAT_RATE,
+                total_amount=charge.amount * (1 + VAT_RATE),
+                status=InvoiceStatus.SENT,
+                description=f'Monthly retainer for {month}',
+            )
+            for charge in charges
+        ]
+        for invoice in invoices:
+            invoice.invoice_number = f'{PENDING_NUMBER_PREFIX}{invoice.id}'
+        # A run that got there first wins; its invoices are left alone
+        Invoice.objects.bulk_create(invoices, ignore_conflicts=True)
+        inserted = set(
+            Invoice.objects.filter(id__in=[invoice.id for invoice in invoices]).order_by().values_list('id', flat=True)
+        )
+        invoices = [invoice for invoice in invoices if invoice.id in inserted]
+        if not invoices:
+            return []
+
+        numbers = Invoice.reserve_invoice_numbers(len(invoices), when=today)
+        for invoice, number in zip(invoices, numbers):
+            invoice.invoice_number = number
+        Invoice.objects.bulk_update(invoices, ['invoice_number'])
+
+        InvoiceLineItem.objects.bulk_create([
+            InvoiceLineItem(
+                invoice=invoice,
+                description=f'Monthly Retainer Fee - {month}',
+                quantity=Decimal('1'),
+                unit_price=invoice.subtotal,
+                amount=invoice.subtotal,
+            )
+            for invoice in invoices
+        ])
+        SubscriptionActivityLog.objects.bulk_create([
+            SubscriptionActivityLog(
+                company=invoice.company,
+                subscription=invoice.subscription,
+                invoice=invoice,
+                activity_type=SubscriptionActivityType.INVOICE_CREATED,
+                metadata={
+                    'invoice_type': InvoiceType.RETAINER,
+                    'billing_period': f'{period_start} to {period_end}',
+                    'auto_generated': True,
+                },
+            )
+            for invoice in invoices
+        ])
+
+        # bulk_create doesn't send post_save; send it once the invoices are
+        # committed, so Xero sync and automations still see every invoice
+        transaction.on_commit(lambda: _send_created(invoices))
+
+    return invoices
+
+
+def _send_created(invoices: List[Invoice]) -> None:
+    for invoice in invoices:
+        post_save.send(
+            sender=Invoice,
+            instance=invoice,
+            created=True,
+            update_fields=None,
+            raw=False,
+            using=DEFAULT_DB_ALIAS,
+        )
+
+
+def generate_retainer_invoices(
+    today: Optional[date] = None,
+    billing_day: Optional[int] = None,
+    company_id=None,
+) -> Tuple[List[Invoice], int]:
+    """Invoice every subscription due today. Returns (invoices created, subscriptions skipped)."""
+    today = today or date.today()
+    charges, skipped = plan_retainer_invoices(today, billing_day, company_id)
+    invoices = create_retainer_invoices(charges, today)
+    return invoices, skipped + len(charges) - len(invoices)
@@ -0,0 +1,319 @@
+"""
+Subscription dashboard summary and alerts.
+
+Everything on the billing dashboard is computed with grouped, conditional
+aggregates rather than per-row loops:
+
+- one query for the subscription counts and MRR (custom retainers joined in)
+- one for the company counts
+- one grouped pass over invoices for the placement, retainer, overdue and
+  pending figures
+- one each for this month's payments and the upcoming renewals
+
+Results are cached for SUBSCRIPTION_SUMMARY_CACHE_SECONDS, keyed by a
+billing-data version that subscriptions.signals bump when subscriptions,
+pricing, invoices or payments are saved; writers that skip signals
+(queryset update(), bulk_create) call bump_billing_version() themselves.
+With a shared cache, a bumped change shows on the next request. The cache
+timeout is the only bound otherwise: a per-process cache such as LocMem
+only sees bumps made in its own process, and a write that neither sends a
+signal nor bumps is picked up once the entry expires.
+"""
+
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import BooleanField, Case, CharField, Count, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from companies.models import Company, ServiceType
+from subscriptions.models import (
+    Invoice,
+    InvoiceStatus,
+    InvoiceType,
+    Payment,
+    Subscription,
+    SubscriptionStatus,
+)
+
+BILLING_VERSION_KEY = 'subscriptions_billing_version'
+SUMMARY_KEY = 'subscriptions_summary:{version}:{today}'
+ALERTS_KEY = 'subscriptions_alerts:{version}:{today}'
+
+DEFAULT_CACHE_SECONDS = 60
+
+STATUS_KEYS = ['paid', 'partially_paid', 'pending', 'overdue', 'draft', 'cancelled']
+OPEN_STATUSES = [InvoiceStatus.SENT, InvoiceStatus.PARTIALLY_PAID]
+
+SERVICE_TYPES = [ServiceType.RETAINED.value, ServiceType.HEADHUNTING.value]
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+def bump_billing_version() -> None:
+    """Invalidate cached summaries and alerts after billing data changes."""
+    try:
+        cache.incr(BILLING_VERSION_KEY)
+    except ValueError:
+        cache.set(BILLING_VERSION_KEY, time.time_ns(), None)
+
+
+def get_billing_version():
+    version = cache.get(BILLING_VERSION_KEY)
+    if version is None:
+        # Start from a timestamp, so an evicted version can't repeat an old one
+        cache.add(BILLING_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(BILLING_VERSION_KEY)
+    return version
+
+
+def _cache_seconds() -> int:
+    return getattr(settings, 'SUBSCRIPTION_SUMMARY_CACHE_SECONDS', DEFAULT_CACHE_SECONDS)
+
+
+def _default_retainer() -> Decimal:
+    from cms.models.pricing import PricingConfig
+    return Decimal(str(PricingConfig.get_config().retained_monthly_retainer))
+
+
+def _effective_retainer(default: Decimal):
+    """A subscription's monthly retainer: the company's custom one, or the default."""
+    return Coalesce(
+        F('company__custom_pricing__monthly_retainer'),
+        Value(default, output_field=MONEY),
+        output_field=MONEY,
+    )
+
+
+def _empty_breakdown() -> Dict[str, dict]:
+    return {key: {'count': 0, 'amount': Decimal('0')} for key in STATUS_KEYS}
+
+
+def _invoice_groups(today: date) -> List[dict]:
+    """Invoice counts and totals grouped by everything the summary breaks them down by."""
+    return list(
+        Invoice.objects.annotate(
+            service_type=F('company__service_type'),
+            is_csuite=Case(
+                When(placement__job__seniority='executive', then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+            # The dashboard's status categories: sent invoices past due count as overdue
+            status_key=Case(
+                When(status=InvoiceStatus.PAID, then=Value('paid')),
+                When(status=InvoiceStatus.PARTIALLY_PAID, then=Value('partially_paid')),
+                When(status=InvoiceStatus.DRAFT, then=Value('draft')),
+                When(status=InvoiceStatus.CANCELLED, then=Value('cancelled')),
+                When(
+                    status__in=[InvoiceStatus.SENT, InvoiceStatus.OVERDUE],
+                    due_date__lt=today,
+                    then=Value('overdue'),
+                ),
+                default=Value('pending'),
+                output_field=CharField(),
+            ),
+            # Open invoices by whether they're past due, for collection figures
+            collection=Case(
+                When(status__in=OPEN_STATUSES, due_date__lt=today, then=Value('overdue')),
+                When(status__in=OPEN_STATUSES, due_date__gte=today, then=Value('pending')),
+                default=Value(''),
+                output_field=CharField(),
+            ),
+        )
+        .values('invoice_type', 'service_type', 'is_csuite', 'status_key', 'collection')
+        .annotate(count=Count('id'), total=Sum('total_amount'), paid=Sum('amount_paid'))
+        .order_by()
+    )
+
+
+def build_summary(today: date) -> dict:
+    """The subscription summary, for SubscriptionSummarySerializer."""
+    month_start = today.replace(day=1)
+    month_end = (today.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    thirty_days_from_now = today + timedelta(days=30)
+    default_retainer = _default_retainer()
+
+    active = Q(status=SubscriptionStatus.ACTIVE)
+    subscriptions = Subscription.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=active),
+        paused=Count('id', filter=Q(status=SubscriptionStatus.PAUSED)),
+        terminated=Count('id', filter=Q(status=SubscriptionStatus.TERMINATED)),
+        expired=Count('id', filter=Q(status=SubscriptionStatus.EXPIRED)),
+        expiring=Count('id', filter=active & Q(contract_end_date__gte=today, contract_end_date__lte=month_end)),
+        retained=Count('id', filter=active & Q(company__service_type=ServiceType.RETAINED)),
+        headhunting=Count('id', filter=active & Q(company__service_type=ServiceType.HEADHUNTING)),
+        mrr=Sum(_effective_retainer(default_retainer), filter=active),
+    )
+    total_mrr = subscriptions['mrr'] or Decimal('0')
+
+    companies = Company.objects.aggregate(
+        retained=Count('id', filter=Q(service_type=ServiceType.RETAINED)),
+        headhunting=Count('id', filter=Q(service_type=ServiceType.HEADHUNTING)),
+    )
+
+    # Keyed by plain strings: group values come back as str, not ServiceType
+    placements = {
+        (service_type, is_csuite): {'count': 0, 'revenue': Decimal('0'), 'breakdown': _empty_breakdown()}
+        for service_type in SERVICE_TYPES
+        for is_csuite in (False, True)
+    }
+    retainers = {'count': 0, 'revenue': Decimal('0'), 'breakdown': _empty_breakdown()}
+    collection = {key: {'count': 0, 'amount': Decimal('0')} for key in ('overdue', 'pending')}
+
+    for group in _invoice_groups(today):
+        total = group['total'] or Decimal('0')
+        if group['collection']:
+            collection[group['collection']]['count'] += group['count']
+            collection[group['collection']]['amount'] += total - (group['paid'] or Decimal('0'))
+
+        if group['invoice_type'] == InvoiceType.PLACEMENT:
+            stats = placements.get((group['service_type'], group['is_csuite']))
+        elif group['invoice_type'] == InvoiceType.RETAINER and group['service_type'] == ServiceType.RETAINED:
+            # Only retained companies have retainer subscriptions
+            stats = retainers
+        else:
+            stats = None
+        if stats is None:
+            continue
+
+        stats['breakdown'][group['status_key']]['count'] += group['count']
+        stats['breakdown'][group['status_key']]['amount'] += total
+        # Cancelled invoices aren't counted in totals
+        if group['status_key'] != 'cancelled':
+            stats['count'] += group['count']
+            stats['revenue'] += total
+
+    collected_this_month = Payment.objects.filter(
+        payment_date__gte=month_start,
+        payment_date__lte=today,
+    ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
+
+    upcoming_renewals = [
+        {
+            'company_id': renewal['company_id'],
+            'company_name': renewal['company__name'],
+            'contract_end_date': renewal['contract_end_date'],
+            'days_until_renewal': (renewal['contract_end_date'] - today).days,
+            'auto_renew': renewal['auto_renew'],
+            'monthly_retainer': renewal['monthly_retainer'],
+        }
+        for renewal in Subscription.objects.filter(
+            active,
+            contract_end_date__gte=today,
+            contract_end_date__lte=thirty_days_from_now,
+        ).annotate(
+            monthly_retainer=_effective_retainer(default_retainer),
+        ).order_by('contract_end_date').values(
+            'company_id', 'company__name', 'contract_end_date', 'auto_renew', 'monthly_retainer',
+        )[:10]
+    ]
+
+    data = {
+        # Existing subscription stats
+        'total_subscriptions': subscriptions['total'],
+        'active_subscriptions': subscriptions['active'],
+        'paused_subscriptions': subscriptions['paused'],
+        'terminated_subscriptions': subscriptions['terminated'],
+        'expired_subscriptions': subscriptions['expired'],
+        'expiring_this_month': subscriptions['expiring'],
+        'total_mrr': total_mrr,
+        'overdue_invoices_count': collection['overdue']['count'],
+        'overdue_invoices_amount': collection['overdue']['amount'],
+        # Service type breakdown with placements
+        'retained_companies': companies['retained'],
+        'headhunting_companies': companies['headhunting'],
+        'retained_subscriptions': subscriptions['retained'],
+        'headhunting_subscriptions': subscriptions['headhunting'],
+        # Retained MRR is same as total_mrr since only retained have subscriptions
+        'retained_mrr': total_mrr,
+        # Retainer invoice stats (only retained has subscriptions)
+        'retained_retainer_count': retainers['count'],
+        'retained_retainer_revenue': retainers['revenue'],
+        'retained_retainer_breakdown': retainers['breakdown'],
+        # Invoice collection stats
+        'collected_this_month': collected_this_month,
+        'pending_invoices_count': collection['pending']['count'],
+        'pending_invoices_amount': collection['pending']['amount'],
+        # Upcoming renewals
+        'upcoming_renewals': upcoming_renewals,
+    }
+    for service_type in SERVICE_TYPES:
+        for is_csuite, kind in ((False, 'regular'), (True, 'csuite')):
+            stats = placements[(service_type, is_csuite)]
+            data[f'{service_type}_{kind}_placements'] = stats['count']
+            data[f'{service_type}_{kind}_revenue'] = stats['revenue']
+            data[f'{service_type}_{kind}_breakdown'] = stats['breakdown']
+    return data
+
+
+def build_alerts(today: date) -> List[dict]:
+    """Renewals due in the next 30 days and overdue invoices, for SubscriptionAlertSerializer."""
+    alerts = []
+
+    expiring = Subscription.objects.filter(
+        status=SubscriptionStatus.ACTIVE,
+        contract_end_date__lte=today + timedelta(days=30),
+        contract_end_date__gte=today,
+    ).values('id', 'company_id', 'company__name', 'contract_end_date')
+
+    for sub in expiring:
+        days_left = (sub['contract_end_date'] - today).days
+        severity = 'critical' if days_left <= 7 else 'warning' if days_left <= 14 else 'info'
+        alerts.append({
+            'type': 'renewal_due',
+            'company_id': sub['company_id'],
+            'company_name': sub['company__name'],
+            'message': f'Subscription expires in {days_left} days',
+            'severity': severity,
+            'subscription_id': sub['id'],
+            'due_date': sub['contract_end_date'],
+        })
+
+    overdue = Invoice.objects.filter(
+        status__in=OPEN_STATUSES,
+        due_date__lt=today,
+    ).annotate(
+        balance_due=F('total_amount') - F('amount_paid'),
+    ).values('id', 'company_id', 'company__name', 'invoice_number', 'due_date', 'balance_due')
+
+    for inv in overdue:
+        days_overdue = (today - inv['due_date']).days
+        severity = 'critical' if days_overdue >= 30 else 'warning'
+        alerts.append({
+            'type': 'overdue_invoice',
+            'company_id': inv['company_id'],
+            'company_name': inv['company__name'],
+            'message': f"Invoice {inv['invoice_number']} is {days_overdue} days overdue",
+            'severity': severity,
+            'invoice_id': inv['id'],
+            'due_date': inv['due_date'],
+            'amount': inv['balance_due'],
+        })
+
+    return alerts
+
+
+def get_summary(today: date) -> dict:
+    """build_summary(), cached until billing data changes or the cache window passes."""
+    key = SUMMARY_KEY.format(version=get_billing_version(), today=today.isoformat())
+    data = cache.get(key)
+    if data is None:
+        data = build_summary(today)
+        cache.set(key, data, _cache_seconds())
+    return data
+
+
+def get_alerts(today: date) -> List[dict]:
+    """build_alerts(), cached like get_summary()."""
+    key = ALERTS_KEY.format(version=get_billing_version(), today=today.isoformat())
+    alerts = cache.get(key)
+    if alerts is None:
+        alerts = build_alerts(today)
+        cache.set(key, alerts, _cache_seconds())
+    return alerts
@@ -5,15 +5,22 @@ import logging
 from datetime import date, timedelta
 from decimal import Decimal
 
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import post_delete, pre_save, post_save
 from django.dispatch import receiver
 
 from jobs.models.application import Application, ApplicationStatus
 from jobs.models.replacement import ReplacementRequest, ReplacementStatus
 
 logger = logging.getLogger(__name__)
+from cms.models.pricing import PricingConfig, PricingFeature
+from companies.models import Company
+
+from . import entitlements
+from .services.summary import bump_billing_version
 from .models import (
+    CompanyFeatureOverride,
     Invoice,
+    Payment,
     InvoiceType,
     InvoiceStatus,
     BillingMode,
@@ -381,3 +388,32 @@ def sync_invoice_to_xero(sender, instance, created, **kwargs):
     except Exception as e:
         # Don't let Xero sync issues break invoice creation
         logger.error(f"Error queuing invoice {instance.id} for Xero sync: {e}")
+
+
+@receiver(post_save, sender=PricingFeature)
+@receiver(post_delete, sender=PricingFeature)
+def invalidate_feature_entitlements(sender, instance, **kwargs):
+    """Feature defaults or availability changed for every company."""
+    entitlements.bump_features_version()
+
+
+@receiver(post_save, sender=CompanyFeatureOverride)
+@receiver(post_delete, sender=CompanyFeatureOverride)
+def invalidate_company_entitlements(sender, instance, **kwargs):
+    """A company's feature override changed."""
+    entitlements.bump_company_version(instance.company_id)
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+@receiver(post_save, sender=CompanyPricing)
+@receiver(post_delete, sender=CompanyPricing)
+@receiver(post_save, sender=Invoice)
+@receiver(post_delete, sender=Invoice)
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=PricingConfig)
+def invalidate_billing_summary(sender, instance, **kwargs):
+    """Billing data changed: cached dashboard summaries and alerts are stale."""
+    bump_billing_version()
@@ -1,3 +1,275 @@
-from django.test import TestCase
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cms.models import PricingFeature
+from cms.models.pricing import PricingConfig
+from companies.models import Company
+from users.models import User, UserRole
+
+from . import entitlements
+from .models import (
+    CompanyFeatureOverride,
+    CompanyPricing,
+    Invoice,
+    InvoiceLineItem,
+    InvoiceNumberCounter,
+    InvoiceStatus,
+    InvoiceType,
+    Subscription,
+    SubscriptionActivityLog,
+    SubscriptionStatus,
+)
+from .services.summary import get_summary
+from .services.retainer_invoices import (
+    create_retainer_invoices,
+    generate_retainer_invoices,
+    plan_retainer_invoices,
+)
+from .utils import company_has_feature
+
+
+class InvoiceNumberTests(TestCase):
+    """Invoice numbers come from per-month counters."""
+
+    def test_numbers_are_consecutive(self):
+        first = Invoice.generate_invoice_number()
+        block = Invoice.reserve_invoice_numbers(3)
+        after = Invoice.generate_invoice_number()
+
+        prefix = first.rsplit('-', 1)[0]
+        numbers = [int(number.rsplit('-', 1)[1]) for number in [first, *block, after]]
+        self.assertEqual(numbers, list(range(numbers[0], numbers[0] + 5)))
+        self.assertTrue(all(number.startswith(f'{prefix}-') for number in block + [after]))
+
+    def test_continues_from_seeded_counter(self):
+        InvoiceNumberCounter.objects.create(prefix='INV-202401', last_number=41)
+
+        numbers = Invoice.reserve_invoice_numbers(2, when=datetime(2024, 1, 15))
+
+        self.assertEqual(numbers, ['INV-202401-0042', 'INV-202401-0043'])
+        self.assertEqual(InvoiceNumberCounter.objects.get(prefix='INV-202401').last_number, 43)
+
+    def test_months_are_numbered_separately(self):
+        self.assertEqual(Invoice.reserve_invoice_numbers(1, when=datetime(2024, 2, 1)), ['INV-202402-0001'])
+        self.assertEqual(Invoice.reserve_invoice_numbers(1, when=datetime(2024, 3, 1)), ['INV-202403-0001'])
+        self.assertEqual(Invoice.reserve_invoice_numbers(1, when=datetime(2024, 2, 1)), ['INV-202402-0002'])
+
+    def test_rejects_empty_block(self):
+        with self.assertRaises(ValueError):
+            Invoice.reserve_invoice_numbers(0)
+
+
+class RetainerInvoiceGenerationTests(TestCase):
+    """Retainer invoices for a billing day are created in one batch."""
+
+    TODAY = date(2024, 5, 15)
+
+    def add_subscription(self, name, retainer=None, service_type='retained'):
+        company = Company.objects.create(name=name, service_type=service_type)
+        if retainer is not None:
+            CompanyPricing.objects.create(company=company, monthly_retainer=retainer)
+        return Subscription.objects.create(
+            company=company,
+            contract_start_date=date(2024, 1, 1),
+            contract_end_date=date(2024, 12, 31),
+            billing_day_of_month=15,
+        )
+
+    def test_invoices_each_due_subscription_once(self):
+        custom = self.add_subscription('Acme', retainer=Decimal('5000'))
+        self.add_subscription('Globex')
+        self.add_subscription('Initech', service_type='headhunting')
+        created = []
+        post_save.connect(lambda instance, **kwargs: created.append(instance.pk), sender=Invoice, weak=False,
+                          dispatch_uid='retainer_test_receiver')
+        self.addCleanup(post_save.disconnect, sender=Invoice, dispatch_uid='retainer_test_receiver')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invoices, skipped = generate_retainer_invoices(self.TODAY)
+
+        self.assertEqual(skipped, 0)
+        self.assertEqual([invoice.company.name for invoice in invoices], ['Acme', 'Globex'])
+        self.assertEqual([invoice.invoice_number for invoice in invoices], ['INV-202405-0001', 'INV-202405-0002'])
+        acme = Invoice.objects.get(subscription=custom)
+        self.assertEqual(acme.subtotal, Decimal('5000'))
+        self.assertEqual((acme.billing_period_start, acme.billing_period_end), (date(2024, 5, 1), date(2024, 5, 31)))
+        self.assertEqual(InvoiceLineItem.objects.filter(invoice__in=invoices).count(), 2)
+        self.assertEqual(SubscriptionActivityLog.objects.filter(invoice__in=invoices).count(), 2)
+        self.assertCountEqual(created, [invoice.pk for invoice in invoices])
+
+        self.assertEqual(generate_retainer_invoices(self.TODAY), ([], 2))
+
+    def test_query_count_does_not_grow_with_subscriptions(self):
+        self.add_subscription('Acme')
+        # The first run also creates the pricing and payment-term defaults
+        generate_retainer_invoices(self.TODAY)
+        Invoice.objects.all().delete()
+        with CaptureQueriesContext(connection) as one:
+            generate_retainer_invoices(self.TODAY)
+
+        Invoice.objects.all().delete()
+        for name in ('Globex', 'Initech', 'Umbrella'):
+            self.add_subscription(name)
+        with CaptureQueriesContext(connection) as four:
+            self.assertEqual(len(generate_retainer_invoices(self.TODAY)[0]), 4)
+
+        self.assertEqual(len(four), len(one))
+
+    def test_invoice_created_by_an_overlapping_run_is_skipped_without_a_number_gap(self):
+        first = self.add_subscription('Acme')
+        self.add_subscription('Globex')
+        charges, _ = plan_retainer_invoices(self.TODAY)
+
+        # Another run invoices Acme between this run's planning and insert
+        Invoice.objects.create(
+            company=first.company,
+            subscription=first,
+            invoice_number=Invoice.reserve_invoice_numbers(1, when=self.TODAY)[0],
+            invoice_type=InvoiceType.RETAINER,
+            invoice_date=self.TODAY,
+            due_date=self.TODAY + timedelta(days=30),
+            billing_period_start=date(2024, 5, 1),
+            billing_period_end=date(2024, 5, 31),
+            subtotal=Decimal('100'),
+            vat_amount=Decimal('15'),
+            total_amount=Decimal('115'),
+            status=InvoiceStatus.SENT,
+        )
+
+        invoices = create_retainer_invoices(charges, self.TODAY)
+
+        self.assertEqual([invoice.company.name for invoice in invoices], ['Globex'])
+        self.assertEqual(
+            sorted(Invoice.objects.values_list('invoice_number', flat=True)),
+            ['INV-202405-0001', 'INV-202405-0002'],
+        )
+        self.assertEqual(InvoiceNumberCounter.objects.get(prefix='INV-202405').last_number, 2)
+        self.assertEqual(InvoiceLineItem.objects.filter(invoice__in=invoices).count(), 1)
+
+
+class SummaryCacheTests(TestCase):
+    """The billing summary is cached until billing data changes."""
+
+    TODAY = date(2024, 5, 15)
+
+    def setUp(self):
+        PricingConfig.get_config()
+        cache.clear()
+        self.subscription = Subscription.objects.create(
+            company=Company.objects.create(name='Acme', service_type='retained'),
+            contract_start_date=date(2024, 1, 1),
+            contract_end_date=date(2024, 12, 31),
+        )
+
+    def test_served_from_cache_until_a_subscription_is_saved(self):
+        self.assertEqual(get_summary(self.TODAY)['active_subscriptions'], 1)
+        with self.assertNumQueries(0):
+            get_summary(self.TODAY)
+
+        self.subscription.status = SubscriptionStatus.PAUSED
+        self.subscription.save()
+
+        summary = get_summary(self.TODAY)
+        self.assertEqual((summary['active_subscriptions'], summary['paused_subscriptions']), (0, 1))
+
+    def test_service_type_change_refreshes_the_summary(self):
+        staff = User.objects.create_user(
+            username='staff', email='staff@example.com', password='password123', role=UserRole.ADMIN,
+        )
+        company = self.subscription.company
+        self.assertEqual(get_summary(self.TODAY)['retained_companies'], 1)
+        client = APIClient()
+        client.force_authenticate(staff)
+
+        response = client.post(
+            reverse('subscriptions:company-service-type-change', args=[company.id]), {'service_type': 'headhunting'}, format='json',
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        summary = get_summary(self.TODAY)
+        self.assertEqual((summary['retained_companies'], summary['headhunting_companies']), (0, 1))
+
+
+class EntitlementTests(TestCase):
+    """A company's features come from its service type, with per-company overrides."""
+
+    def setUp(self):
+        cache.clear()
+        self.company = Company.objects.create(name='Acme', service_type='retained')
+        self.directory = PricingFeature.objects.create(
+            name='Talent directory', slug='talent-directory', order=1, included_in_retained=True,
+        )
+        self.reports = PricingFeature.objects.create(
+            name='Reports', slug='reports', order=2, included_in_retained=False,
+        )
+        PricingFeature.objects.create(
+            name='Retired', slug='retired', order=3, included_in_retained=True, is_active=False,
+        )
+
+    def test_service_type_defaults(self):
+        self.assertEqual(entitlements.features_for(self.company), frozenset({'talent-directory'}))
+        self.assertTrue(company_has_feature(self.company, 'talent-directory'))
+        self.assertFalse(company_has_feature(self.company, 'reports'))
+        self.assertFalse(company_has_feature(self.company, 'retired'))
+
+        self.company.service_type = 'headhunting'
+        self.assertEqual(entitlements.features_for(self.company), frozenset())
+
+    def test_resolved_once_then_cached(self):
+        entitlements.features_for(self.company)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(company_has_feature(self.company, 'talent-directory'))
+
+    def test_override_flips_take_effect(self):
+        self.assertTrue(company_has_feature(self.company, 'talent-directory'))
+
+        override = CompanyFeatureOverride.objects.create(
+            company=self.company, feature=self.directory, is_enabled=False,
+        )
+        self.assertFalse(company_has_feature(self.company, 'talent-directory'))
+
+        override.is_enabled = True
+        override.save()
+        self.assertTrue(company_has_feature(self.company, 'talent-directory'))
+
+        CompanyFeatureOverride.objects.create(company=self.company, feature=self.reports, is_enabled=True)
+        self.assertTrue(company_has_feature(self.company, 'reports'))
+
+        override.delete()
+        self.assertTrue(company_has_feature(self.company, 'talent-directory'))
+
+    def test_reorder_refreshes_feature_order(self):
+        self.reports.included_in_retained = True
+        self.reports.save()
+        self.assertEqual(
+            [f['slug'] for f in entitlements.enabled_features(self.company)], ['talent-directory', 'reports'],
+        )
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(
+            username='admin', email='admin@example.com', password='password123', role=UserRole.ADMIN,
+        ))
+
+        response = client.post(
+            reverse('cms-admin-pricing-features-reorder'),
+            {'feature_ids': [str(self.reports.id), str(self.directory.id)]},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [f['slug'] for f in entitlements.enabled_features(self.company)], ['reports', 'talent-directory'],
+        )
+
+    def test_local_cache_entries_expire_quickly(self):
+        self.assertEqual(entitlements._timeout(), entitlements.LOCAL_ENTITLEMENTS_TIMEOUT)
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}):
+            self.assertEqual(entitlements._timeout(), entitlements.ENTITLEMENTS_TIMEOUT)
@@ -1,5 +1,7 @@
 """Utility functions for subscription and feature management."""
 
+from subscriptions.entitlements import company_for_user, features_for
+
 
 def company_has_feature(company, feature_slug):
     """
@@ -10,6 +12,10 @@ def company_has_feature(company, feature_slug):
     2. Check service type default (included_in_headhunting or included_in_retained)
     3. Apply company-specific override if one exists
 
+    The company's whole feature set is resolved once and cached (see
+    subscriptions.entitlements); use features_for() to check several
+    features at once.
+
     Args:
         company: Company instance
         feature_slug: Slug of the feature (e.g., 'talent-directory')
@@ -17,32 +23,7 @@ def company_has_feature(company, feature_slug):
     Returns:
         bool: True if the company has access to the feature
     """
-    if not company or not company.service_type:
-        return False
-
-    from cms.models.pricing import PricingFeature
-    from subscriptions.models import CompanyFeatureOverride
-
-    # Get the feature by slug
-    try:
-        feature = PricingFeature.objects.get(slug=feature_slug, is_active=True)
-    except PricingFeature.DoesNotExist:
-        return False
-
-    # Check for company-specific override first
-    try:
-        override = CompanyFeatureOverride.objects.get(company=company, feature=feature)
-        return override.is_enabled
-    except CompanyFeatureOverride.DoesNotExist:
-        pass
-
-    # Fall back to service type default
-    if company.service_type == 'headhunting':
-        return feature.included_in_headhunting
-    elif company.service_type == 'retained':
-        return feature.included_in_retained
-
-    return False
+    return feature_slug in features_for(company)
 
 
 def user_has_feature(user, feature_slug):
@@ -56,11 +37,8 @@ def user_has_feature(user, feature_slug):
     Returns:
         bool: True if the user's company has access to the feature
     """
-    from companies.models import CompanyUser
-
-    # Get user's company
-    membership = CompanyUser.objects.filter(user=user, is_active=True).select_related('company').first()
-    if not membership:
+    company = company_for_user(user)
+    if not company:
         return False
 
-    return company_has_feature(membership.company, feature_slug)
+    return company_has_feature(company, feature_slug)
@@ -924,6 +924,9 @@ def change_service_type(request, company_id):
         subscription.service_type = new_service_type
         # Use update() to bypass the clean() validation since we're changing, not adding
         Subscription.objects.filter(pk=subscription.pk).update(service_type=new_service_type)
+        # update() sends no signal, so invalidate the billing summary here
+        from .services.summary import bump_billing_version
+        bump_billing_version()
 
     # Log the activity
     log_activity(
@@ -2028,54 +2031,12 @@ def delete_payment(request, payment_id):
 @permission_classes([IsAuthenticated])
 def get_subscription_alerts(request):
     """Get subscription alerts (renewals due, overdue invoices, etc.)."""
+    from .services.summary import get_alerts
+
     if not is_staff_user(request.user):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
 
-    alerts = []
-    today = date.today()
-
-    # Renewals due in next 30 days
-    renewal_threshold = today + timedelta(days=30)
-    expiring_subs = Subscription.objects.filter(
-        status=SubscriptionStatus.ACTIVE,
-        contract_end_date__lte=renewal_threshold,
-        contract_end_date__gte=today,
-    ).select_related('company')
-
-    for sub in expiring_subs:
-        days_left = (sub.contract_end_date - today).days
-        severity = 'critical' if days_left <= 7 else 'warning' if days_left <= 14 else 'info'
-        alerts.append({
-            'type': 'renewal_due',
-            'company_id': sub.company.id,
-            'company_name': sub.company.name,
-            'message': f'Subscription expires in {days_left} days',
-            'severity': severity,
-            'subscription_id': sub.id,
-            'due_date': sub.contract_end_date,
-        })
-
-    # Overdue invoices
-    overdue_invoices = Invoice.objects.filter(
-        status__in=[InvoiceStatus.SENT, InvoiceStatus.PARTIALLY_PAID],
-        due_date__lt=today,
-    ).select_related('company')
-
-    for inv in overdue_invoices:
-        days_overdue = (today - inv.due_date).days
-        severity = 'critical' if days_overdue >= 30 else 'warning'
-        alerts.append({
-            'type': 'overdue_invoice',
-            'company_id': inv.company.id,
-            'company_name': inv.company.name,
-            'message': f'Invoice {inv.invoice_number} is {days_overdue} days overdue',
-            'severity': severity,
-            'invoice_id': inv.id,
-            'due_date': inv.due_date,
-            'amount': inv.balance_due,
-        })
-
-    serializer = SubscriptionAlertSerializer(alerts, many=True)
+    serializer = SubscriptionAlertSerializer(get_alerts(date.today()), many=True)
     return Response(serializer.data)
 
 
@@ -2086,303 +2047,18 @@ def get_subscription_alerts(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_subscription_summary(request):
-    """Get subscription summary statistics."""
-    from companies.models import ServiceType
+    """
+    Get subscription summary statistics.
+
+    Computed in a handful of aggregate queries and cached until billing
+    data changes (see subscriptions/services/summary.py).
+    """
+    from .services.summary import get_summary
 
     if not is_staff_user(request.user):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
 
-    today = date.today()
-    month_start = today.replace(day=1)
-    month_end = (today.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
-    thirty_days_from_now = today + timedelta(days=30)
-
-    # Subscription counts
-    total = Subscription.objects.count()
-    active = Subscription.objects.filter(status=SubscriptionStatus.ACTIVE).count()
-    paused = Subscription.objects.filter(status=SubscriptionStatus.PAUSED).count()
-    terminated = Subscription.objects.filter(status=SubscriptionStatus.TERMINATED).count()
-    expired = Subscription.objects.filter(status=SubscriptionStatus.EXPIRED).count()
-
-    # Expiring this month
-    expiring = Subscription.objects.filter(
-        status=SubscriptionStatus.ACTIVE,
-        contract_end_date__gte=today,
-        contract_end_date__lte=month_end,
-    ).count()
-
-    # MRR calculation (sum of effective retainers for active subscriptions)
-    active_subs = Subscription.objects.filter(
-        status=SubscriptionStatus.ACTIVE
-    ).select_related('company')
-
-    total_mrr = Decimal('0')
-    for sub in active_subs:
-        try:
-            pricing = CompanyPricing.objects.get(company=sub.company)
-            total_mrr += pricing.get_effective_retainer()
-        except CompanyPricing.DoesNotExist:
-            config = PricingConfig.get_config()
-            total_mrr += Decimal(str(config.retained_monthly_retainer))
-
-    # Overdue invoices
-    overdue_invoices = Invoice.objects.filter(
-        status__in=[InvoiceStatus.SENT, InvoiceStatus.PARTIALLY_PAID],
-        due_date__lt=today,
-    )
-    overdue_count = overdue_invoices.count()
-    overdue_amount = overdue_invoices.aggregate(
-        total=Sum('total_amount')
-    )['total'] or Decimal('0')
-
-    # Subtract amount paid
-    overdue_paid = overdue_invoices.aggregate(
-        total=Sum('amount_paid')
-    )['total'] or Decimal('0')
-    overdue_amount = overdue_amount - overdue_paid
-
-    # ==========================================================================
-    # Service Type Breakdown with Placements & Income
-    # ==========================================================================
-    retained_companies = Company.objects.filter(service_type=ServiceType.RETAINED).count()
-    headhunting_companies = Company.objects.filter(service_type=ServiceType.HEADHUNTING).count()
-
-    # Retained MRR is same as total_mrr since only retained have subscriptions
-    retained_mrr = total_mrr
-
-    # Count active subscriptions per service type
-    retained_subscriptions = Subscription.objects.filter(
-        status=SubscriptionStatus.ACTIVE,
-        company__service_type=ServiceType.RETAINED
-    ).count()
-    headhunting_subscriptions = Subscription.objects.filter(
-        status=SubscriptionStatus.ACTIVE,
-        company__service_type=ServiceType.HEADHUNTING
-    ).count()
-
-    # ==========================================================================
-    # Placement Stats by Service Type (Actual Invoiced Revenue with Status Breakdown)
-    # ==========================================================================
-    def calculate_placement_stats(service_type):
-        """Calculate placement counts and actual invoiced revenue for a service type."""
-        # Get placement invoices for companies with this service type (including cancelled)
-        placement_invoices = Invoice.objects.filter(
-            invoice_type=InvoiceType.PLACEMENT,
-            company__service_type=service_type,
-        ).select_related('placement__job')
-
-        # Initialize stats structure
-        def empty_status_breakdown():
-            return {
-                'paid': {'count': 0, 'amount': Decimal('0')},
-                'partially_paid': {'count': 0, 'amount': Decimal('0')},
-                'pending': {'count': 0, 'amount': Decimal('0')},
-                'overdue': {'count': 0, 'amount': Decimal('0')},
-                'draft': {'count': 0, 'amount': Decimal('0')},
-                'cancelled': {'count': 0, 'amount': Decimal('0')},
-            }
-
-        regular_breakdown = empty_status_breakdown()
-        csuite_breakdown = empty_status_breakdown()
-        regular_count = 0
-        csuite_count = 0
-        regular_revenue = Decimal('0')
-        csuite_revenue = Decimal('0')
-
-        for inv in placement_invoices:
-            # Determine if C-Suite from the linked placement's job
-            is_csuite = False
-            if inv.placement and inv.placement.job:
-                is_csuite = inv.placement.job.is_csuite
-
-            # Determine status category
-            if inv.status == InvoiceStatus.PAID:
-                status_key = 'paid'
-            elif inv.status == InvoiceStatus.PARTIALLY_PAID:
-                status_key = 'partially_paid'
-            elif inv.status == InvoiceStatus.DRAFT:
-                status_key = 'draft'
-            elif inv.status == InvoiceStatus.CANCELLED:
-                status_key = 'cancelled'
-            elif inv.status in [InvoiceStatus.SENT, InvoiceStatus.OVERDUE]:
-                # Check if overdue
-                if inv.due_date and inv.due_date < today:
-                    status_key = 'overdue'
-                else:
-                    status_key = 'pending'
-            else:
-                status_key = 'pending'
-
-            breakdown = csuite_breakdown if is_csuite else regular_breakdown
-            breakdown[status_key]['count'] += 1
-            breakdown[status_key]['amount'] += inv.total_amount
-
-            # Don't count cancelled invoices in totals
-            if inv.status != InvoiceStatus.CANCELLED:
-                if is_csuite:
-                    csuite_count += 1
-                    csuite_revenue += inv.total_amount
-                else:
-                    regular_count += 1
-                    regular_revenue += inv.total_amount
-
-        return {
-            'regular_placements': regular_count,
-            'csuite_placements': csuite_count,
-            'regular_revenue': regular_revenue,
-            'csuite_revenue': csuite_revenue,
-            'regular_breakdown': regular_breakdown,
-            'csuite_breakdown': csuite_breakdown,
-        }
-
-    retained_stats = calculate_placement_stats(ServiceType.RETAINED)
-    headhunting_stats = calculate_placement_stats(ServiceType.HEADHUNTING)
-
-    # ==========================================================================
-    # Retainer Invoice Stats by Service Type (with Status Breakdown)
-    # ==========================================================================
-    def calculate_retainer_stats(service_type):
-        """Calculate retainer invoice counts and revenue for a service type."""
-        retainer_invoices = Invoice.objects.filter(
-            invoice_type=InvoiceType.RETAINER,
-            company__service_type=service_type,
-        )
-
-        # Initialize stats structure
-        breakdown = {
-            'paid': {'count': 0, 'amount': Decimal('0')},
-            'partially_paid': {'count': 0, 'amount': Decimal('0')},
-            'pending': {'count': 0, 'amount': Decimal('0')},
-            'overdue': {'count': 0, 'amount': Decimal('0')},
-            'draft': {'count': 0, 'amount': Decimal('0')},
-            'cancelled': {'count': 0, 'amount': Decimal('0')},
-        }
-        total_count = 0
-        total_revenue = Decimal('0')
-
-        for inv in retainer_invoices:
-            # Determine status category
-            if inv.status == InvoiceStatus.PAID:
-                status_key = 'paid'
-            elif inv.status == InvoiceStatus.PARTIALLY_PAID:
-                status_key = 'partially_paid'
-            elif inv.status == InvoiceStatus.DRAFT:
-                status_key = 'draft'
-            elif inv.status == InvoiceStatus.CANCELLED:
-                status_key = 'cancelled'
-            elif inv.status in [InvoiceStatus.SENT, InvoiceStatus.OVERDUE]:
-                if inv.due_date and inv.due_date < today:
-                    status_key = 'overdue'
-                else:
-                    status_key = 'pending'
-            else:
-                status_key = 'pending'
-
-            breakdown[status_key]['count'] += 1
-            breakdown[status_key]['amount'] += inv.total_amount
-
-            # Don't count cancelled in totals
-            if inv.status != InvoiceStatus.CANCELLED:
-                total_count += 1
-                total_revenue += inv.total_amount
-
-        return {
-            'count': total_count,
-            'revenue': total_revenue,
-            'breakdown': breakdown,
-        }
-
-    # Only calculate retainer stats for retained (headhunting doesn't have subscriptions)
-    retained_retainer_stats = calculate_retainer_stats(ServiceType.RETAINED)
-
-    # ==========================================================================
-    # Invoice Collection Stats
-    # ==========================================================================
-    # Collected this month (payments recorded this month)
-    collected_this_month = Payment.objects.filter(
-        payment_date__gte=month_start,
-        payment_date__lte=today,
-    ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-
-    # Pending invoices (sent but not fully paid, not overdue)
-    pending_invoices = Invoice.objects.filter(
-        status__in=[InvoiceStatus.SENT, InvoiceStatus.PARTIALLY_PAID],
-        due_date__gte=today,
-    )
-    pending_count = pending_invoices.count()
-    pending_total = pending_invoices.aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
-    pending_paid = pending_invoices.aggregate(total=Sum('amount_paid'))['total'] or Decimal('0')
-    pending_amount = pending_total - pending_paid
-
-    # ==========================================================================
-    # Upcoming Renewals (next 30 days)
-    # ==========================================================================
-    upcoming_renewals_qs = Subscription.objects.filter(
-        status=SubscriptionStatus.ACTIVE,
-        contract_end_date__gte=today,
-        contract_end_date__lte=thirty_days_from_now,
-    ).select_related('company').order_by('contract_end_date')[:10]
-
-    upcoming_renewals = []
-    for sub in upcoming_renewals_qs:
-        try:
-            pricing = CompanyPricing.objects.get(company=sub.company)
-            retainer = pricing.get_effective_retainer()
-        except CompanyPricing.DoesNotExist:
-            config = PricingConfig.get_config()
-            retainer = Decimal(str(config.retained_monthly_retainer))
-
-        upcoming_renewals.append({
-            'company_id': sub.company.id,
-            'company_name': sub.company.name,
-            'contract_end_date': sub.contract_end_date,
-            'days_until_renewal': (sub.contract_end_date - today).days,
-            'auto_renew': sub.auto_renew,
-            'monthly_retainer': retainer,
-        })
-
-    data = {
-        # Existing subscription stats
-        'total_subscriptions': total,
-        'active_subscriptions': active,
-        'paused_subscriptions': paused,
-        'terminated_subscriptions': terminated,
-        'expired_subscriptions': expired,
-        'expiring_this_month': expiring,
-        'total_mrr': total_mrr,
-        'overdue_invoices_count': overdue_count,
-        'overdue_invoices_amount': overdue_amount,
-        # Service type breakdown with placements
-        'retained_companies': retained_companies,
-        'headhunting_companies': headhunting_companies,
-        'retained_subscriptions': retained_subscriptions,
-        'headhunting_subscriptions': headhunting_subscriptions,
-        'retained_mrr': retained_mrr,
-        'retained_regular_placements': retained_stats['regular_placements'],
-        'retained_csuite_placements': retained_stats['csuite_placements'],
-        'retained_regular_revenue': retained_stats['regular_revenue'],
-        'retained_csuite_revenue': retained_stats['csuite_revenue'],
-        'retained_regular_breakdown': retained_stats['regular_breakdown'],
-        'retained_csuite_breakdown': retained_stats['csuite_breakdown'],
-        'headhunting_regular_placements': headhunting_stats['regular_placements'],
-        'headhunting_csuite_placements': headhunting_stats['csuite_placements'],
-        'headhunting_regular_revenue': headhunting_stats['regular_revenue'],
-        'headhunting_csuite_revenue': headhunting_stats['csuite_revenue'],
-        'headhunting_regular_breakdown': headhunting_stats['regular_breakdown'],
-        'headhunting_csuite_breakdown': headhunting_stats['csuite_breakdown'],
-        # Retainer invoice stats (only retained has subscriptions)
-        'retained_retainer_count': retained_retainer_stats['count'],
-        'retained_retainer_revenue': retained_retainer_stats['revenue'],
-        'retained_retainer_breakdown': retained_retainer_stats['breakdown'],
-        # Invoice collection stats
-        'collected_this_month': collected_this_month,
-        'pending_invoices_count': pending_count,
-        'pending_invoices_amount': pending_amount,
-        # Upcoming renewals
-        'upcoming_renewals': upcoming_renewals,
-    }
-
-    serializer = SubscriptionSummarySerializer(data)
+    serializer = SubscriptionSummarySerializer(get_summary(date.today()))
     return Response(serializer.data)
 
 
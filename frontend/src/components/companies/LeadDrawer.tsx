@@ -298,7 +298,7 @@ export default function LeadDrawer({
     if (lead?.id) {
       setBookingsLoading(true)
       api.get(`/scheduling/bookings/`, { params: { lead_id: lead.id } })
-        .then((res) => setBookings(res.data))
+        .then((res) => setBookings(res.data.results))
         .catch(() => setBookings([]))
         .finally(() => setBookingsLoading(false))
     }
@@ -142,6 +142,10 @@ interface UseRecruiterBookingsReturn {
   bookings: RecruiterBooking[]
   isLoading: boolean
   error: string | null
+  // The feed is keyset-paginated: the first page loads with the filters, loadMore appends the next
+  hasMore: boolean
+  isLoadingMore: boolean
+  loadMore: () => Promise<void>
   filters: BookingsFilters
   setFilters: (filters: BookingsFilters) => void
   cancelBooking: (id: string, reason?: string, isInterview?: boolean) => Promise<void>
@@ -156,33 +160,56 @@ interface UseRecruiterBookingsReturn {
 
 export function useRecruiterBookings(initialFilters?: BookingsFilters): UseRecruiterBookingsReturn {
   const [bookings, setBookings] = useState<RecruiterBooking[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [isLoading, setIsLoading] = useState(true)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
   const [isCancelling, setIsCancelling] = useState(false)
   const [isCompleting, setIsCompleting] = useState(false)
   const [isUpdating, setIsUpdating] = useState(false)
   const [error, setError] = useState<string | null>(null)
   const [filters, setFilters] = useState<BookingsFilters>(initialFilters || {})
 
+  const buildParams = useCallback((cursor?: string) => {
+    const params = new URLSearchParams()
+    if (filters.status) params.append('status', filters.status)
+    if (filters.category) params.append('category', filters.category)
+    if (filters.start_date) params.append('start_date', filters.start_date)
+    if (filters.end_date) params.append('end_date', filters.end_date)
+    if (filters.upcoming) params.append('upcoming', 'true')
+    if (cursor) params.append('cursor', cursor)
+    return params
+  }, [filters])
+
   const fetchBookings = useCallback(async () => {
     try {
       setIsLoading(true)
       setError(null)
-      const params = new URLSearchParams()
-      if (filters.status) params.append('status', filters.status)
-      if (filters.category) params.append('category', filters.category)
-      if (filters.start_date) params.append('start_date', filters.start_date)
-      if (filters.end_date) params.append('end_date', filters.end_date)
-      if (filters.upcoming) params.append('upcoming', 'true')
-
-      const response = await api.get(`/scheduling/bookings/?${params.toString()}`)
-      setBookings(response.data)
+      const response = await api.get(`/scheduling/bookings/?${buildParams().toString()}`)
+      setBookings(response.data.results)
+      setNextCursor(response.data.next_cursor)
     } catch (err) {
       const message = err instanceof Error ? err.message : 'Failed to load bookings'
       setError(message)
     } finally {
       setIsLoading(false)
     }
-  }, [filters])
+  }, [buildParams])
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor) return
+    try {
+      setIsLoadingMore(true)
+      setError(null)
+      const response = await api.get(`/scheduling/bookings/?${buildParams(nextCursor).toString()}`)
+      setBookings((prev) => [...prev, ...response.data.results])
+      setNextCursor(response.data.next_cursor)
+    } catch (err) {
+      const message = err instanceof Error ? err.message : 'Failed to load more bookings'
+      setError(message)
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }, [buildParams, nextCursor])
 
   const cancelBooking = useCallback(async (id: string, reason?: string, isInterview = false) => {
     try {
@@ -291,6 +318,9 @@ export function useRecruiterBookings(initialFilters?: BookingsFilters): UseRecru
     bookings,
     isLoading,
     error,
+    hasMore: nextCursor !== null,
+    isLoadingMore,
+    loadMore,
     filters,
     setFilters,
     cancelBooking,
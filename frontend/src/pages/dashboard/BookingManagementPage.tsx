@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import { format, parseISO, isToday, isTomorrow, isPast, isFuture } from 'date-fns'
+import { format, parseISO, isToday, isTomorrow, isPast, isFuture, addDays, subDays } from 'date-fns'
 import {
   Calendar,
   Clock,
@@ -1038,6 +1038,10 @@ function MeetingTypeModal({
   )
 }
 
+// The bookings feed requires a date window of at most 366 days
+const BOOKINGS_WINDOW_PAST_DAYS = 30
+const BOOKINGS_WINDOW_FUTURE_DAYS = 335
+
 // Main Page Component
 export default function BookingManagementPage() {
   const { user } = useAuth()
@@ -1062,15 +1066,27 @@ export default function BookingManagementPage() {
     isDeleting: isDeletingMeetingType,
   } = useMeetingTypes({ enabled: isRecruiter })
 
+  const [bookingsWindow] = useState(() => {
+    const today = new Date()
+    return {
+      start_date: format(subDays(today, BOOKINGS_WINDOW_PAST_DAYS), 'yyyy-MM-dd'),
+      end_date: format(addDays(today, BOOKINGS_WINDOW_FUTURE_DAYS), 'yyyy-MM-dd'),
+    }
+  })
+
   const {
     bookings,
     isLoading: loadingBookings,
+    hasMore: hasMoreBookings,
+    isLoadingMore: loadingMoreBookings,
+    loadMore: loadMoreBookings,
     cancelBooking,
     completeBooking,
     markNoShow,
   } = useRecruiterBookings({
     status: statusFilter || undefined,
     category: categoryFilter || undefined,
+    ...bookingsWindow,
   })
 
   // Only load invitations for recruiters/admins
@@ -1280,8 +1296,24 @@ export default function BookingManagementPage() {
                   </div>
                 </div>
               ))}
+              {hasMoreBookings && (
+                <div className="flex justify-center">
+                  <button
+                    onClick={loadMoreBookings}
+                    disabled={loadingMoreBookings}
+                    className="flex items-center gap-2 px-4 py-2 text-[13px] font-medium text-gray-700 dark:text-gray-300 bg-white dark:bg-gray-900 border border-gray-200 dark:border-gray-700 rounded-md hover:bg-gray-50 dark:hover:bg-gray-800 disabled:opacity-50"
+                  >
+                    {loadingMoreBookings && <Loader2 className="w-4 h-4 animate-spin" />}
+                    Load more
+                  </button>
+                </div>
+              )}
             </div>
           )}
+          <p className="mt-6 text-[12px] text-gray-400 dark:text-gray-500">
+            Showing bookings from {format(parseISO(bookingsWindow.start_date), 'd MMM yyyy')} to{' '}
+            {format(parseISO(bookingsWindow.end_date), 'd MMM yyyy')}
+          </p>
         </div>
       )}
 
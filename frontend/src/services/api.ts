@@ -183,6 +183,28 @@ api.interceptors.response.use(
 );
 
 // Resume parsing
+export interface ResumeParseJob {
+  id: string;
+  status: 'pending' | 'running' | 'completed' | 'failed';
+  file_name: string;
+  file_size: number;
+  is_cached: boolean;
+  result: import('@/types').ParsedResumeData | null;
+  error_message: string;
+  created_at: string;
+  started_at: string | null;
+  completed_at: string | null;
+}
+
+const RESUME_PARSE_POLL_INTERVAL_MS = 2000;
+const RESUME_PARSE_TIMEOUT_MS = 3 * 60 * 1000;
+
+export const getResumeParseJob = async (jobId: string): Promise<ResumeParseJob> => {
+  const response = await api.get(`/resume/parse/jobs/${jobId}/`);
+  return response.data;
+};
+
+// Uploads the resume, then polls the parse job until it completes
 export const parseResume = async (file: File): Promise<import('@/types').ParsedResumeData> => {
   const formData = new FormData();
   formData.append('file', file);
@@ -192,7 +214,21 @@ export const parseResume = async (file: File): Promise<import('@/types').ParsedR
       'Content-Type': 'multipart/form-data',
     },
   });
-  return response.data;
+
+  let job: ResumeParseJob = response.data;
+  const deadline = Date.now() + RESUME_PARSE_TIMEOUT_MS;
+  while (job.status === 'pending' || job.status === 'running') {
+    if (Date.now() > deadline) {
+      throw new Error('Resume parsing timed out. Please try again.');
+    }
+    await new Promise((resolve) => setTimeout(resolve, RESUME_PARSE_POLL_INTERVAL_MS));
+    job = await getResumeParseJob(job.id);
+  }
+
+  if (job.status === 'failed' || !job.result) {
+    throw new Error('Failed to parse resume. Please try again.');
+  }
+  return job.result;
 };
 
 // Resume import